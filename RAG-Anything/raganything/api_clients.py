@@ -1,149 +1,626 @@
 """
 This module provides client functions to interact with external APIs for
 embedding, chat completion, and vision tasks.
+
+All calls share the process-wide connection pool from ``raganything.http_pool``
+so that keep-alive connections are reused across requests, and go through a
+per-kind (chat, vision, embedding) rate limiter from ``raganything.rate_limit``.
+Chat and vision calls can optionally be hedged (see ``raganything.hedging``), and
+each kind can be spread over several endpoints (see ``raganything.load_balancer``).
+When enabled, every request also waits for room in the quota shared with the
+other processes on the host (see ``raganything.shared_quota``).
 """
-import base64
+
+import json
+import os
+import time
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Union,
+)
+
 import httpx
+import numpy as np
 from raganything.config import RAGAnythingConfig
+from raganything.embedding_batcher import EmbeddingCoalescer, estimate_tokens
+from raganything.hedging import HedgeBudget, Hedger, create_hedger
+from raganything.http_pool import get_existing_http_pool, get_http_pool
+from raganything.image_prep import get_image_preparer, guess_base64_image_mime
+from raganything.load_balancer import LoadBalancer, create_load_balancer
+from raganything.rate_limit import RateLimiter, create_rate_limiter
+from raganything.shared_quota import (
+    IMAGE_TOKEN_ESTIMATE,
+    default_quota_limit,
+    get_existing_shared_quota,
+    get_shared_quota,
+)
 
 # Initialize config to be used by the functions in this module
 config = RAGAnythingConfig()
 
-async def get_embedding_from_api(text: str) -> list[float]:
+# Coalesce concurrent single-text embedding calls into batched requests,
+# one coalescer per requested output dimension (None = model default)
+_embedding_coalescers: Dict[Optional[int], EmbeddingCoalescer] = {}
+
+# Rate limiters keyed by request kind ('chat', 'vision', 'embedding')
+_rate_limiters: Dict[str, RateLimiter] = {}
+
+# Endpoint load balancers keyed by request kind
+_load_balancers: Dict[str, LoadBalancer] = {}
+
+# Hedgers keyed by request kind, sharing one global hedge budget
+_hedgers: Dict[str, Hedger] = {}
+_hedge_budget: Optional[HedgeBudget] = None
+
+
+def _build_headers() -> Dict[str, str]:
+    """Build the request headers shared by all API calls"""
+    return {
+        "Authorization": f"Bearer {config.api_key}",
+        "Content-Type": "application/json",
+    }
+
+
+def get_rate_limiter(kind: str) -> RateLimiter:
     """
-    Calls an embedding API to get the vector embedding for a given text.
+    Get the rate limiter for a request kind, creating it from the config on first use.
+    """
+    limiter = _rate_limiters.get(kind)
+    if limiter is None:
+        limiter = _rate_limiters[kind] = create_rate_limiter(config, kind)
+    return limiter
+
+
+def get_load_balancer(kind: str) -> LoadBalancer:
+    """
+    Get the endpoint load balancer for a request kind, creating it on first use.
     """
-    async with httpx.AsyncClient() as client:
+    balancer = _load_balancers.get(kind)
+    if balancer is None:
+        balancer = _load_balancers[kind] = create_load_balancer(config, kind)
+    return balancer
+
+
+def _endpoint_sender(
+    client: httpx.AsyncClient,
+    kind: str,
+    payload: Dict[str, Any],
+    timeout: float,
+    stream: bool = False,
+) -> Callable[[], Awaitable[httpx.Response]]:
+    """
+    Build a request factory that sends ``payload`` to the best endpoint of ``kind``.
+    A new endpoint is picked for every attempt, so retries can move elsewhere.
+    """
+    balancer = get_load_balancer(kind)
+    quota = get_shared_quota()
+    tokens = _estimate_payload_tokens(payload) if quota is not None else 0
+
+    async def send() -> httpx.Response:
+        endpoint = balancer.acquire()
+        body = {**payload, "model": endpoint.model} if endpoint.model else payload
+        quota_entry = None
+        if quota is not None:
+            # Every attempt, retries included, counts against the provider quota
+            try:
+                quota_entry = await quota.acquire(
+                    body.get("model", ""), tokens, default_quota_limit(config, kind)
+                )
+            except BaseException:
+                balancer.cancel(endpoint)
+                raise
+        request = client.build_request(
+            "POST",
+            endpoint.url,
+            headers=_build_headers(),
+            json=body,
+            timeout=timeout,
+        )
+        start = time.monotonic()
         try:
-            response = await client.post(
-                config.embedding_api_url,
-                headers={
-                    "Authorization": f"Bearer {config.api_key}",
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "input": text,
-                    "model": config.embedding_model_name,
-                },
-                timeout=30,
-            )
-            response.raise_for_status()
-            embedding = response.json()["data"][0]["embedding"]
-            return embedding
-        except httpx.HTTPStatusError as e:
-            print(f"Error calling embedding API: {e}")
-            print(f"Response body: {e.response.text}")
+            response = await client.send(request, stream=stream)
+        except httpx.TransportError:
+            balancer.release(endpoint, time.monotonic() - start, success=False)
             raise
-        except Exception as e:
-            print(f"An unexpected error occurred in get_embedding_from_api: {e}")
+        except BaseException:
+            balancer.cancel(endpoint)
             raise
+        balancer.release(
+            endpoint,
+            time.monotonic() - start,
+            success=response.status_code < 500 and response.status_code != 429,
+        )
+        if quota_entry is not None and not stream and response.status_code == 200:
+            # Replace the estimate with the usage reported by the provider
+            try:
+                usage = response.json().get("usage") or {}
+            except ValueError:
+                usage = {}
+            if usage.get("total_tokens"):
+                quota.settle(quota_entry, usage["total_tokens"])
+        return response
+
+    return send
 
-async def get_llm_answer_from_api(context_str: str, query_str: str) -> str:
+
+def get_hedger(kind: str) -> Optional[Hedger]:
     """
-    Calls a chat completion API to generate an answer based on context and a query.
+    Get the hedger for a request kind, or None if hedging is disabled for it.
+    """
+    global _hedge_budget
+    if not config.enable_api_hedging or kind not in config.api_hedge_kinds:
+        return None
+    hedger = _hedgers.get(kind)
+    if hedger is None:
+        if _hedge_budget is None:
+            _hedge_budget = HedgeBudget(ratio=config.api_hedge_budget_ratio)
+        hedger = _hedgers[kind] = create_hedger(config, kind, _hedge_budget)
+    return hedger
+
+
+def _estimate_payload_tokens(payload: Dict[str, Any]) -> int:
+    """
+    Estimate the tokens a request counts against a tokens/minute quota.
+    """
+    if "input" in payload:
+        texts = payload["input"]
+        if isinstance(texts, str):
+            texts = [texts]
+        return sum(estimate_tokens(text) for text in texts)
+
+    tokens = payload.get("max_tokens") or 0
+    for message in payload.get("messages", []):
+        content = message.get("content")
+        if isinstance(content, str):
+            tokens += estimate_tokens(content)
+            continue
+        for part in content or []:
+            if part.get("type") == "text":
+                tokens += estimate_tokens(part.get("text", ""))
+            elif part.get("type") == "image_url":
+                tokens += IMAGE_TOKEN_ESTIMATE
+    return tokens
+
+
+async def _post_json(payload: Dict[str, Any], timeout: float, kind: str) -> Dict:
+    """
+    POST a JSON payload using the shared pooled client and return the decoded body.
+    Throttled and transient failures are retried by the rate limiter of ``kind``,
+    and slow calls are hedged when hedging is enabled for ``kind``.
+    """
+    hedger = get_hedger(kind)
+    if hedger is not None:
+        return await hedger.call(lambda: _send_json(payload, timeout, kind))
+    return await _send_json(payload, timeout, kind)
+
+
+async def _send_json(payload: Dict[str, Any], timeout: float, kind: str) -> Dict:
+    """
+    Send one rate-limited JSON POST request and return the decoded body.
+    """
+    client = await get_http_pool().get_client()
+    response = await get_rate_limiter(kind).execute(
+        _endpoint_sender(client, kind, payload, timeout),
+        tokens=_estimate_payload_tokens(payload),
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+async def _stream_chat_completion(
+    payload: Dict[str, Any], timeout: float, kind: str
+) -> AsyncIterator[str]:
+    """
+    POST a chat completion request with ``stream=True`` and yield content deltas
+    from the server-sent events as they arrive.
+    """
+    client = await get_http_pool().get_client()
+    payload = {**payload, "stream": True}
+    response = await get_rate_limiter(kind).execute(
+        _endpoint_sender(client, kind, payload, timeout, stream=True),
+        tokens=_estimate_payload_tokens(payload),
+    )
+    try:
+        if response.is_error:
+            await response.aread()
+            response.raise_for_status()
+        async for line in response.aiter_lines():
+            line = line.strip()
+            if not line.startswith("data:"):
+                continue
+            data = line[len("data:") :].strip()
+            if data == "[DONE]":
+                break
+            choices = json.loads(data).get("choices") or []
+            if not choices:
+                continue
+            content = (choices[0].get("delta") or {}).get("content")
+            if content:
+                yield content
+    finally:
+        await response.aclose()
+
+
+async def get_embeddings_from_api(
+    texts: List[str], dimensions: Optional[int] = None
+) -> List[List[float]]:
+    """
+    Calls an embedding API with a batch of texts in a single request.
+    Vectors are returned in the same order as the input texts.
+    ``dimensions`` asks models that support it for shortened vectors.
+    """
+    payload = {
+        "input": texts,
+        "model": config.embedding_model_name,
+    }
+    if dimensions:
+        payload["dimensions"] = dimensions
+    try:
+        data = await _post_json(
+            payload,
+            timeout=30,
+            kind="embedding",
+        )
+        items = sorted(data["data"], key=lambda item: item.get("index", 0))
+        return [item["embedding"] for item in items]
+    except httpx.HTTPStatusError as e:
+        print(f"Error calling embedding API: {e}")
+        print(f"Response body: {e.response.text}")
+        raise
+    except Exception as e:
+        print(f"An unexpected error occurred in get_embeddings_from_api: {e}")
+        raise
+
+
+def get_embedding_coalescer(dimensions: Optional[int] = None) -> EmbeddingCoalescer:
+    """
+    Get the shared embedding coalescer for an output dimension, creating it from
+    the config on first use.
+    """
+    coalescer = _embedding_coalescers.get(dimensions)
+    if coalescer is None:
+        coalescer = _embedding_coalescers[dimensions] = EmbeddingCoalescer(
+            lambda texts: get_embeddings_from_api(texts, dimensions),
+            max_wait_ms=config.embedding_batch_wait_ms,
+            max_batch_size=config.embedding_batch_max_items,
+            max_batch_tokens=config.embedding_batch_max_tokens,
+            max_concurrent_batches=config.embedding_batch_max_concurrency,
+        )
+    return coalescer
+
+
+async def get_embedding_from_api(
+    text: str, dimensions: Optional[int] = None
+) -> list[float]:
+    """
+    Calls an embedding API to get the vector embedding for a given text.
+    Concurrent calls are coalesced into batched requests.
+    """
+    return await get_embedding_coalescer(dimensions).embed(text)
+
+
+async def embed_texts_with_api(
+    texts: List[str], dimensions: Optional[int] = None
+) -> np.ndarray:
+    """
+    Embeds a list of texts through the coalescer and returns a numpy array,
+    as expected by LightRAG's EmbeddingFunc.
+    """
+    vectors = await get_embedding_coalescer(dimensions).embed_many(list(texts))
+    return np.array(vectors, dtype=np.float32)
+
+
+async def get_chat_completion_from_api(
+    prompt: str,
+    system_prompt: Optional[str] = None,
+    history_messages: Optional[List[Dict[str, Any]]] = None,
+    stream: bool = False,
+    **kwargs,
+) -> Union[str, AsyncIterator[str]]:
+    """
+    Calls a chat completion API with the llm_model_func signature used by LightRAG
+    (prompt, system_prompt, history_messages). Extra LightRAG keyword arguments
+    such as ``hashing_kv`` or ``keyword_extraction`` are ignored.
+    """
+    messages = []
+    if system_prompt:
+        messages.append({"role": "system", "content": system_prompt})
+    messages.extend(history_messages or [])
+    messages.append({"role": "user", "content": prompt})
+    payload = {"model": config.chat_model_name, "messages": messages}
+
+    if stream:
+        return _stream_chat_answer(payload)
+
+    try:
+        data = await _post_json(payload, timeout=120, kind="chat")
+        return data["choices"][0]["message"]["content"]
+    except httpx.HTTPStatusError as e:
+        print(f"Error calling chat API: {e}")
+        print(f"Response body: {e.response.text}")
+        raise
+    except Exception as e:
+        print(f"An unexpected error occurred in get_chat_completion_from_api: {e}")
+        raise
+
+
+async def _stream_chat_answer(payload: Dict[str, Any]) -> AsyncIterator[str]:
+    """
+    Streams a chat completion answer token by token using server-sent events.
+    """
+    try:
+        async for token in _stream_chat_completion(payload, timeout=120, kind="chat"):
+            yield token
+    except httpx.HTTPStatusError as e:
+        print(f"Error calling chat API: {e}")
+        print(f"Response body: {e.response.text}")
+        raise
+    except Exception as e:
+        print(f"An unexpected error occurred in streaming chat call: {e}")
+        raise
+
+
+def _build_chat_messages(context_str: str, query_str: str) -> List[Dict[str, Any]]:
+    """
+    Build the chat messages for answering a query from retrieved context.
     """
     prompt = f"""
     Use the following context to answer the user's question accurately and in detail.
-    
+
     Context:
     ---
     {context_str}
     ---
-    
+
     Question: {query_str}
-    
+
     Answer:
     """
-    
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.post(
-                config.chat_api_url,
-                headers={
-                    "Authorization": f"Bearer {config.api_key}",
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "model": config.chat_model_name,
-                    "messages": [
-                        {"role": "system", "content": "You are a helpful AI assistant."},
-                        {"role": "user", "content": prompt}
-                    ],
-                },
-                timeout=120,
-            )
-            response.raise_for_status()
-            answer = response.json()["choices"][0]["message"]["content"]
-            return answer
-        except httpx.HTTPStatusError as e:
-            print(f"Error calling chat API: {e}")
-            print(f"Response body: {e.response.text}")
-            raise
-        except Exception as e:
-            print(f"An unexpected error occurred in get_llm_answer_from_api: {e}")
-            raise
+    return [
+        {"role": "system", "content": "You are a helpful AI assistant."},
+        {"role": "user", "content": prompt},
+    ]
+
 
-async def get_vision_answer_from_api(**kwargs) -> str:
+async def get_llm_answer_from_api(
+    context_str: str, query_str: str, stream: bool = False
+) -> Union[str, AsyncIterator[str]]:
     """
-    Calls a vision-capable API. Handles two scenarios:
-    1. Describing an image for indexing: kwargs contain 'image_path' and 'context'.
-    2. Answering a query with image context: kwargs contain 'context_str', 'query_str', 'images'.
+    Calls a chat completion API to generate an answer based on context and a query.
+    With ``stream=True`` an async iterator of tokens is returned instead.
+    """
+    if stream:
+        return stream_llm_answer_from_api(context_str, query_str)
+
+    try:
+        data = await _post_json(
+            {
+                "model": config.chat_model_name,
+                "messages": _build_chat_messages(context_str, query_str),
+            },
+            timeout=120,
+            kind="chat",
+        )
+        answer = data["choices"][0]["message"]["content"]
+        return answer
+    except httpx.HTTPStatusError as e:
+        print(f"Error calling chat API: {e}")
+        print(f"Response body: {e.response.text}")
+        raise
+    except Exception as e:
+        print(f"An unexpected error occurred in get_llm_answer_from_api: {e}")
+        raise
+
+
+async def stream_llm_answer_from_api(
+    context_str: str, query_str: str
+) -> AsyncIterator[str]:
+    """
+    Streams a chat completion answer token by token using server-sent events.
+    """
+    try:
+        async for token in _stream_chat_completion(
+            {
+                "model": config.chat_model_name,
+                "messages": _build_chat_messages(context_str, query_str),
+            },
+            timeout=120,
+            kind="chat",
+        ):
+            yield token
+    except httpx.HTTPStatusError as e:
+        print(f"Error calling chat API: {e}")
+        print(f"Response body: {e.response.text}")
+        raise
+    except Exception as e:
+        print(f"An unexpected error occurred in stream_llm_answer_from_api: {e}")
+        raise
+
+
+async def _build_vision_messages(
+    prompt: str, kwargs: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """
+    Build the vision chat messages from the keyword arguments of a vision call.
     """
     messages = []
-    
+
     if "image_path" in kwargs:
         image_path = kwargs["image_path"]
         context = kwargs.get("context", "")
-        
-        try:
-            with open(image_path, "rb") as image_file:
-                base64_image = base64.b64encode(image_file.read()).decode('utf-8')
-        except FileNotFoundError:
-            return f"Error: Image file not found at {image_path}"
-
-        messages = [{
-            "role": "user",
-            "content": [
-                {"type": "text", "text": f"Based on the surrounding text and this image, create a detailed and rich description of the image. Context: {context}"},
-                {"type": "image_url", "image_url": {"url": f"data:image/jpeg;base64,{base64_image}"}}
-            ]
-        }]
-    
+
+        if not os.path.exists(image_path):
+            raise FileNotFoundError(f"Image file not found at {image_path}")
+        image = await get_image_preparer().prepare_async(
+            image_path, config.vision_model_name
+        )
+
+        messages = [
+            {
+                "role": "user",
+                "content": [
+                    {
+                        "type": "text",
+                        "text": f"Based on the surrounding text and this image, create a detailed and rich description of the image. Context: {context}",
+                    },
+                    {
+                        "type": "image_url",
+                        "image_url": {"url": image.data_url},
+                    },
+                ],
+            }
+        ]
+
     elif "images" in kwargs:
         context_str = kwargs.get("context_str", "")
         query_str = kwargs.get("query_str", "")
         base64_images = kwargs.get("images", [])
-        
-        content = [{"type": "text", "text": f"Based on the context and the following image(s), answer the question: {query_str}\nContext: {context_str}"}]
+
+        content = [
+            {
+                "type": "text",
+                "text": f"Based on the context and the following image(s), answer the question: {query_str}\nContext: {context_str}",
+            }
+        ]
         for b64_img in base64_images:
-            content.append({"type": "image_url", "image_url": {"url": f"data:image/jpeg;base64,{b64_img}"}})
-        
+            content.append(
+                {
+                    "type": "image_url",
+                    "image_url": {
+                        "url": f"data:{guess_base64_image_mime(b64_img)};base64,{b64_img}"
+                    },
+                }
+            )
+
         messages = [{"role": "user", "content": content}]
-        
+
+    elif "messages" in kwargs:
+        # Pre-built OpenAI-style messages (e.g. from the VLM enhanced query)
+        messages = kwargs["messages"]
+
+    elif kwargs.get("image_data"):
+        # Modal processor convention: prompt plus one base64 encoded image
+        image_data = kwargs["image_data"]
+        if kwargs.get("system_prompt"):
+            messages.append({"role": "system", "content": kwargs["system_prompt"]})
+        messages.append(
+            {
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": prompt},
+                    {
+                        "type": "image_url",
+                        "image_url": {
+                            "url": f"data:{guess_base64_image_mime(image_data)};base64,{image_data}"
+                        },
+                    },
+                ],
+            }
+        )
+
+    elif prompt:
+        # Plain text prompt, optionally with a system prompt
+        if kwargs.get("system_prompt"):
+            messages.append({"role": "system", "content": kwargs["system_prompt"]})
+        messages.append({"role": "user", "content": prompt})
+
     else:
+        raise ValueError("Invalid parameters for vision API call.")
+
+    return messages
+
+
+async def get_vision_answer_from_api(
+    prompt: str = "", **kwargs
+) -> Union[str, AsyncIterator[str]]:
+    """
+    Calls a vision-capable API. Handles five scenarios:
+    1. Describing an image for indexing: kwargs contain 'image_path' and 'context'.
+    2. Answering a query with image context: kwargs contain 'context_str', 'query_str', 'images'.
+    3. Answering with pre-built messages: kwargs contain 'messages'.
+    4. Describing a base64 image: 'prompt' with 'image_data' (modal processors).
+    5. Plain text prompt: 'prompt' with an optional 'system_prompt'.
+    With ``stream=True`` an async iterator of tokens is returned instead.
+    """
+    try:
+        messages = await _build_vision_messages(prompt, kwargs)
+    except FileNotFoundError as e:
+        return f"Error: {e}"
+    except ValueError:
         return "Error: Invalid parameters for vision API call."
 
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.post(
-                config.vision_api_url,
-                headers={
-                    "Authorization": f"Bearer {config.api_key}",
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "model": config.vision_model_name,
-                    "messages": messages,
-                    "max_tokens": 2048,
-                },
-                timeout=180,
-            )
-            response.raise_for_status()
-            return response.json()["choices"][0]["message"]["content"]
-        except httpx.HTTPStatusError as e:
-            print(f"Error calling vision API: {e}")
-            print(f"Response body: {e.response.text}")
-            raise
-        except Exception as e:
-            print(f"An unexpected error occurred in get_vision_answer_from_api: {e}")
-            raise
+    payload = {
+        "model": config.vision_model_name,
+        "messages": messages,
+        "max_tokens": 2048,
+    }
+    if kwargs.get("stream"):
+        return _stream_vision_answer(payload)
+
+    try:
+        data = await _post_json(payload, timeout=180, kind="vision")
+        return data["choices"][0]["message"]["content"]
+    except httpx.HTTPStatusError as e:
+        print(f"Error calling vision API: {e}")
+        print(f"Response body: {e.response.text}")
+        raise
+    except Exception as e:
+        print(f"An unexpected error occurred in get_vision_answer_from_api: {e}")
+        raise
+
+
+async def _stream_vision_answer(payload: Dict[str, Any]) -> AsyncIterator[str]:
+    """
+    Streams a vision completion answer token by token using server-sent events.
+    """
+    try:
+        async for token in _stream_chat_completion(payload, timeout=180, kind="vision"):
+            yield token
+    except httpx.HTTPStatusError as e:
+        print(f"Error calling vision API: {e}")
+        print(f"Response body: {e.response.text}")
+        raise
+    except Exception as e:
+        print(f"An unexpected error occurred in streaming vision call: {e}")
+        raise
+
+
+def get_api_client_stats() -> Dict[str, Any]:
+    """
+    Get runtime statistics for the API clients (connection reuse, etc.).
+    """
+    # Only what is in use; asking for stats must not create the pool, the
+    # ledger or a coalescer
+    pool = get_existing_http_pool()
+    quota = get_existing_shared_quota()
+    coalescers = list(_embedding_coalescers.items())
+    if not coalescers:
+        embedding_batching: Dict[str, Any] = {}
+    elif len(coalescers) == 1:
+        embedding_batching = coalescers[0][1].get_stats()
+    else:
+        embedding_batching = {
+            str(dimensions or "default"): coalescer.get_stats()
+            for dimensions, coalescer in coalescers
+        }
+    return {
+        "connection_pool": pool.get_stats() if pool is not None else {},
+        "embedding_batching": embedding_batching,
+        "rate_limits": {
+            kind: limiter.get_stats() for kind, limiter in _rate_limiters.items()
+        },
+        "endpoints": {
+            kind: balancer.get_stats() for kind, balancer in _load_balancers.items()
+        },
+        "hedging": {
+            **{kind: hedger.get_stats() for kind, hedger in _hedgers.items()},
+            "budget_denied": _hedge_budget.denied if _hedge_budget else 0,
+        },
+        "shared_quota": quota.get_stats() if quota is not None else {},
+    }
@@ -11,6 +11,9 @@ from typing import List, Dict, Any, Optional, TYPE_CHECKING
 import time
 
 from .batch_parser import BatchParser, BatchProcessingResult
+from .mineru_worker import configure_mineru_worker_pool
+from .docling_backend import configure_docling_pool
+from .office_converter import configure_office_converter
 
 if TYPE_CHECKING:
     from .config import RAGAnythingConfig
@@ -206,12 +209,26 @@ class BatchMixin:
         if recursive is None:
             recursive = self.config.recursive_folder_processing
 
+        # Office documents go through the shared LibreOffice slots of this config
+        configure_office_converter(self.config)
+
         # Create batch parser
         batch_parser = BatchParser(
             parser_type=self.config.parser,
             max_workers=max_workers,
             show_progress=show_progress,
             skip_installation_check=True,  # Skip installation check for better UX
+            worker_pool=configure_mineru_worker_pool(self.config),
+            converter_pool=configure_docling_pool(self.config),
+            text_parser=self.config.text_parser,
+            office_parser=self.config.office_parser,
+            spreadsheet_rows_per_block=self.config.spreadsheet_rows_per_block,
+            text_page_chars=self.config.text_page_chars,
+            pdf_shard_pages=self.config.pdf_shard_pages,
+            pdf_shard_workers=self.config.pdf_shard_workers,
+            pdf_text_layer=self.config.pdf_text_layer,
+            threads_per_worker=self.config.parse_threads_per_worker,
+            cpu_affinity=self.config.parse_cpu_affinity,
         )
 
         # Process batch
@@ -258,12 +275,26 @@ class BatchMixin:
         if recursive is None:
             recursive = self.config.recursive_folder_processing
 
+        # Office documents go through the shared LibreOffice slots of this config
+        configure_office_converter(self.config)
+
         # Create batch parser
         batch_parser = BatchParser(
             parser_type=self.config.parser,
             max_workers=max_workers,
             show_progress=show_progress,
             skip_installation_check=True,  # Skip installation check for better UX
+            worker_pool=configure_mineru_worker_pool(self.config),
+            converter_pool=configure_docling_pool(self.config),
+            text_parser=self.config.text_parser,
+            office_parser=self.config.office_parser,
+            spreadsheet_rows_per_block=self.config.spreadsheet_rows_per_block,
+            text_page_chars=self.config.text_page_chars,
+            pdf_shard_pages=self.config.pdf_shard_pages,
+            pdf_shard_workers=self.config.pdf_shard_workers,
+            pdf_text_layer=self.config.pdf_text_layer,
+            threads_per_worker=self.config.parse_threads_per_worker,
+            cpu_affinity=self.config.parse_cpu_affinity,
         )
 
         # Process batch asynchronously
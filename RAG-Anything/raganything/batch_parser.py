@@ -10,12 +10,13 @@ import logging
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import time
 
 from tqdm import tqdm
 
-from .parser import MineruParser, DoclingParser
+from .parser import MineruParser, DoclingParser, HtmlParser
+from .parse_scheduler import ParseScheduler, WorkerCpuStats
 
 
 @dataclass
@@ -28,6 +29,7 @@ class BatchProcessingResult:
     processing_time: float
     errors: Dict[str, str]
     output_dir: str
+    worker_stats: List[WorkerCpuStats] = field(default_factory=list)
 
     @property
     def success_rate(self) -> float:
@@ -38,7 +40,7 @@ class BatchProcessingResult:
 
     def summary(self) -> str:
         """Generate a summary of the batch processing results"""
-        return (
+        summary = (
             f"Batch Processing Summary:\n"
             f"  Total files: {self.total_files}\n"
             f"  Successful: {len(self.successful_files)} ({self.success_rate:.1f}%)\n"
@@ -46,6 +48,11 @@ class BatchProcessingResult:
             f"  Processing time: {self.processing_time:.2f} seconds\n"
             f"  Output directory: {self.output_dir}"
         )
+        if self.worker_stats:
+            summary += "\n  CPU usage per worker:" + "".join(
+                f"\n    {stats.summary()}" for stats in self.worker_stats
+            )
+        return summary
 
 
 class BatchParser:
@@ -63,28 +70,75 @@ class BatchParser:
         show_progress: bool = True,
         timeout_per_file: int = 300,
         skip_installation_check: bool = False,
+        worker_pool=None,
+        converter_pool=None,
+        text_parser: str = "native",
+        office_parser: str = "native",
+        spreadsheet_rows_per_block: int = 100,
+        text_page_chars: int = 3000,
+        pdf_shard_pages: int = 0,
+        pdf_shard_workers: int = 4,
+        pdf_text_layer: bool = True,
+        threads_per_worker: int = 0,
+        cpu_affinity: bool = False,
     ):
         """
         Initialize batch parser
 
         Args:
-            parser_type: Type of parser to use ("mineru" or "docling")
+            parser_type: Type of parser to use ("mineru", "docling" or "html")
             max_workers: Maximum number of parallel workers
             show_progress: Whether to show progress bars
             timeout_per_file: Timeout in seconds for each file
             skip_installation_check: Skip parser installation check (useful for testing)
+            worker_pool: Optional MineruWorkerPool of resident MinerU processes
+            converter_pool: Optional DoclingConverterPool of warm Docling converters
+            text_parser: 'native' to parse plain-text files directly, or 'pdf'
+            office_parser: 'native' to read Office files directly with MinerU, or 'pdf'
+            spreadsheet_rows_per_block: Data rows per table item of native spreadsheets
+            text_page_chars: Characters per synthetic page of natively parsed text
+            pdf_shard_pages: Split PDFs longer than this into page ranges parsed concurrently (0 = disabled)
+            pdf_shard_workers: Maximum number of PDF page ranges parsed at the same time
+            pdf_text_layer: Read born-digital PDF pages from their text layer instead of MinerU
+            threads_per_worker: Thread cap of the parser processes of each worker
+                (0 = split the CPU cores evenly between workers, -1 = no cap)
+            cpu_affinity: Pin the parser processes of each worker to its own cores (Linux)
         """
         self.parser_type = parser_type
         self.max_workers = max_workers
+        self.threads_per_worker = threads_per_worker
+        self.cpu_affinity = cpu_affinity
         self.show_progress = show_progress
         self.timeout_per_file = timeout_per_file
         self.logger = logging.getLogger(__name__)
 
         # Initialize parser
+        if parser_type in ("mineru", "html"):
+            mineru_parser = MineruParser(
+                worker_pool=worker_pool,
+                shard_pages=pdf_shard_pages,
+                shard_workers=pdf_shard_workers,
+                text_parser=text_parser,
+                text_page_chars=text_page_chars,
+                office_parser=office_parser,
+                spreadsheet_rows_per_block=spreadsheet_rows_per_block,
+                pdf_text_layer=pdf_text_layer,
+            )
         if parser_type == "mineru":
-            self.parser = MineruParser()
+            self.parser = mineru_parser
         elif parser_type == "docling":
-            self.parser = DoclingParser()
+            self.parser = DoclingParser(
+                converter_pool=converter_pool,
+                text_parser=text_parser,
+                text_page_chars=text_page_chars,
+            )
+        elif parser_type == "html":
+            # PDF, Office and image files of a mixed corpus go to MinerU
+            self.parser = HtmlParser(
+                text_parser=text_parser,
+                text_page_chars=text_page_chars,
+                fallback_parser=mineru_parser,
+            )
         else:
             raise ValueError(f"Unsupported parser type: {parser_type}")
 
@@ -100,10 +154,15 @@ class BatchParser:
 
     def get_supported_extensions(self) -> List[str]:
         """Get list of supported file extensions"""
+        extensions = set(self.parser.TEXT_FORMATS)
+        if isinstance(self.parser, HtmlParser):
+            extensions |= self.parser.HTML_FORMATS
+            if self.parser.fallback_parser is None:
+                return list(extensions)
         return list(
-            self.parser.OFFICE_FORMATS
+            extensions
+            | self.parser.OFFICE_FORMATS
             | self.parser.IMAGE_FORMATS
-            | self.parser.TEXT_FORMATS
             | {".pdf"}
         )
 
@@ -155,6 +214,41 @@ class BatchParser:
 
         return supported_files
 
+    def preconvert_office_files(self, file_paths: List[str]) -> int:
+        """
+        Convert the Office documents of a batch to PDF before parsing
+
+        LibreOffice converts them in a few long-lived sessions instead of one
+        start per document; the parser then picks the PDFs from the converter
+        cache. Documents that fail here are retried (and reported) by the parser.
+
+        Args:
+            file_paths: Files of the batch
+
+        Returns:
+            Number of Office documents converted
+        """
+        office_files = [
+            file_path
+            for file_path in file_paths
+            if Path(file_path).suffix.lower() in self.parser.OFFICE_FORMATS
+            and not self.parser.parses_office_natively(file_path)
+        ]
+        if len(office_files) < 2:
+            return 0
+
+        from .office_converter import find_office_binary, get_office_converter
+
+        converter = get_office_converter()
+        if not find_office_binary(converter.preferred_binary):
+            return 0
+        try:
+            converted = converter.convert_batch(office_files)
+        except Exception as e:
+            self.logger.warning(f"Office batch conversion failed: {str(e)}")
+            return 0
+        return len(converted)
+
     def process_single_file(
         self, file_path: str, output_dir: str, parse_method: str = "auto", **kwargs
     ) -> Tuple[bool, str, Optional[str]]:
@@ -200,6 +294,13 @@ class BatchParser:
             self.logger.error(error_msg)
             return False, file_path, error_msg
 
+    def _process_scheduled_file(
+        self, scheduler: ParseScheduler, *args, **kwargs
+    ) -> Tuple[bool, str, Optional[str]]:
+        """Process a single file within the CPU budget of a free worker slot"""
+        with scheduler.slot():
+            return self.process_single_file(*args, **kwargs)
+
     def process_batch(
         self,
         file_paths: List[str],
@@ -243,6 +344,12 @@ class BatchParser:
         output_path = Path(output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
 
+        # Convert Office documents to PDF up front in shared LibreOffice sessions
+        if isinstance(self.parser, MineruParser) or isinstance(
+            getattr(self.parser, "fallback_parser", None), MineruParser
+        ):
+            self.preconvert_office_files(supported_files)
+
         # Process files in parallel
         successful_files = []
         failed_files = []
@@ -257,12 +364,21 @@ class BatchParser:
                 unit="file",
             )
 
+        # Split the CPU cores between the files parsed at the same time
+        scheduler = ParseScheduler(
+            workers=min(self.max_workers, len(supported_files)),
+            threads_per_worker=self.threads_per_worker,
+            cpu_affinity=self.cpu_affinity,
+        )
+        scheduler.start()
+
         try:
             with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
                 # Submit all tasks
                 future_to_file = {
                     executor.submit(
-                        self.process_single_file,
+                        self._process_scheduled_file,
+                        scheduler,
                         file_path,
                         output_dir,
                         parse_method,
@@ -298,6 +414,7 @@ class BatchParser:
                         pbar.update(1)
 
         finally:
+            scheduler.close()
             if pbar:
                 pbar.close()
 
@@ -311,6 +428,7 @@ class BatchParser:
             processing_time=processing_time,
             errors=errors,
             output_dir=output_dir,
+            worker_stats=scheduler.report(),
         )
 
         # Log summary
@@ -361,7 +479,7 @@ def main():
     parser.add_argument("--output", "-o", required=True, help="Output directory")
     parser.add_argument(
         "--parser",
-        choices=["mineru", "docling"],
+        choices=["mineru", "docling", "html"],
         default="mineru",
         help="Parser to use",
     )
@@ -386,6 +504,23 @@ def main():
     parser.add_argument(
         "--timeout", type=int, default=300, help="Timeout per file (seconds)"
     )
+    parser.add_argument(
+        "--threads-per-worker",
+        type=int,
+        default=0,
+        help="Thread cap of each worker's parser processes (0 = split the cores evenly, -1 = no cap)",
+    )
+    parser.add_argument(
+        "--cpu-affinity",
+        action="store_true",
+        help="Pin each worker's parser processes to its own CPU cores (Linux)",
+    )
+    parser.add_argument(
+        "--mineru-workers",
+        type=int,
+        default=0,
+        help="Resident MinerU worker processes (0 = one mineru CLI process per file)",
+    )
 
     args = parser.parse_args()
 
@@ -395,6 +530,12 @@ def main():
         format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
     )
 
+    worker_pool = None
+    if args.parser == "mineru" and args.mineru_workers > 0:
+        from .mineru_worker import MineruWorkerPool
+
+        worker_pool = MineruWorkerPool(size=args.mineru_workers)
+
     try:
         # Create batch parser
         batch_parser = BatchParser(
@@ -402,6 +543,9 @@ def main():
             max_workers=args.workers,
             show_progress=not args.no_progress,
             timeout_per_file=args.timeout,
+            worker_pool=worker_pool,
+            threads_per_worker=args.threads_per_worker,
+            cpu_affinity=args.cpu_affinity,
         )
 
         # Process files
@@ -425,6 +569,10 @@ def main():
         print(f"Error: {str(e)}")
         return 1
 
+    finally:
+        if worker_pool is not None:
+            worker_pool.close()
+
 
 if __name__ == "__main__":
     exit(main())
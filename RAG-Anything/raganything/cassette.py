@@ -0,0 +1,314 @@
+"""
+Record/replay cassettes for model functions
+
+A cassette sits in front of ``llm_model_func``, ``vision_model_func`` and
+``embedding_func``. In ``record`` mode every call goes to the real model and
+its response and latency are appended to a JSONL file keyed by a hash of the
+request; in ``replay`` mode responses are served from that file, optionally
+sleeping for the recorded latency multiplied by ``latency_scale``, so that an
+ingestion workload can be re-run offline with reproducible model behaviour.
+``auto`` replays what is recorded and records the rest.
+
+Embeddings are recorded per text, so a replay does not depend on how texts
+were grouped into batches. Vectors are stored as base64 float32.
+"""
+
+import asyncio
+import base64
+import functools
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import replace
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+from lightrag.utils import EmbeddingFunc, logger
+
+CASSETTE_MODES = ("off", "record", "replay", "auto")
+
+# Keyword arguments that never influence the response
+_IGNORED_KWARGS = frozenset({"hashing_kv", "_priority", "_timeout"})
+
+
+class CassetteMissError(LookupError):
+    """Raised in replay mode when a request was never recorded"""
+
+
+def _canonical(value: Any) -> Any:
+    """JSON-compatible form of a request argument, or None if it has none"""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _canonical(item) for key, item in sorted(value.items())}
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return None
+
+
+def request_key(kind: str, args: tuple, kwargs: Dict[str, Any]) -> str:
+    """Stable hash of a model request"""
+    payload = {
+        "kind": kind,
+        "args": _canonical(list(args)),
+        "kwargs": {
+            key: _canonical(value)
+            for key, value in sorted(kwargs.items())
+            if key not in _IGNORED_KWARGS
+        },
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _encode_vector(vector: Any) -> str:
+    data = np.asarray(vector, dtype=np.float32).reshape(-1).tobytes()
+    return base64.b64encode(data).decode("ascii")
+
+
+def _decode_vector(data: str) -> np.ndarray:
+    return np.frombuffer(base64.b64decode(data), dtype=np.float32)
+
+
+class Cassette:
+    """Append-only JSONL store of model responses keyed by request hash"""
+
+    def __init__(self, path: str, mode: str = "record", latency_scale: float = 1.0):
+        """Initialize the cassette
+
+        Args:
+            path: JSONL file holding the recorded calls
+            mode: 'record', 'replay' or 'auto'
+            latency_scale: Multiplier of recorded latencies on replay (0 = no delay)
+        """
+        if mode not in CASSETTE_MODES or mode == "off":
+            raise ValueError(f"Invalid cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.latency_scale = max(0.0, latency_scale)
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._file = None
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.recorded = 0
+        self.replayed_latency = 0.0
+
+        self._load()
+        if mode != "replay":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._file = open(path, "a", encoding="utf-8")
+
+    def _load(self) -> None:
+        if self.mode == "record" or not os.path.exists(self.path):
+            if self.mode == "replay":
+                logger.warning(
+                    f"Cassette {self.path} does not exist, nothing to replay"
+                )
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                    self._entries[entry["key"]] = entry
+                except (ValueError, KeyError):
+                    # A run interrupted mid-write leaves a truncated last line
+                    logger.warning(
+                        f"Skipping malformed cassette entry {self.path}:{line_number}"
+                    )
+
+    def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        """Recorded entry for a request, or None if it must go to the model"""
+        if self.mode == "record":
+            return None
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry
+        self.misses += 1
+        if self.mode == "replay":
+            raise CassetteMissError(
+                f"Request {key[:12]} is not recorded in cassette {self.path}"
+            )
+        return None
+
+    def record(self, key: str, kind: str, latency: float, **data: Any) -> None:
+        """Store the response of a request"""
+        entry = {"key": key, "kind": kind, "latency": round(latency, 6), **data}
+        line = json.dumps(entry, ensure_ascii=False)
+        with self._lock:
+            self._entries[key] = entry
+            if self._file is not None:
+                self._file.write(line + "\n")
+                self._file.flush()
+            self.recorded += 1
+
+    async def delay(self, latency: float) -> None:
+        """Sleep for a recorded latency scaled by ``latency_scale``"""
+        seconds = latency * self.latency_scale
+        if seconds > 0:
+            self.replayed_latency += seconds
+            await asyncio.sleep(seconds)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get replay and recording statistics"""
+        return {
+            "path": self.path,
+            "mode": self.mode,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "recorded": self.recorded,
+            "replayed_latency_seconds": round(self.replayed_latency, 3),
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __deepcopy__(self, memo) -> "Cassette":
+        # LightRAG deep-copies its config; the open file is shared, not copied
+        return self
+
+
+class CassetteModelFunc:
+    """LLM/VLM function wrapper recording or replaying completions
+
+    Streamed responses are recorded as their list of chunks and replayed as an
+    async iterator with the recorded latency spread over the chunks.
+    """
+
+    def __init__(self, func: Callable, cassette: Cassette, kind: str):
+        self.func = func
+        self.cassette = cassette
+        self.kind = kind
+        functools.update_wrapper(self, func, updated=())
+
+    async def __call__(self, *args, **kwargs):
+        key = request_key(self.kind, args, kwargs)
+        entry = self.cassette.lookup(key)
+        if entry is not None:
+            if "chunks" in entry:
+                return self._replay_stream(entry)
+            await self.cassette.delay(entry["latency"])
+            return entry["response"]
+
+        start = time.monotonic()
+        response = await self.func(*args, **kwargs)
+        if hasattr(response, "__aiter__"):
+            return self._record_stream(key, response, start)
+        if isinstance(response, str):
+            self.cassette.record(
+                key, self.kind, time.monotonic() - start, response=response
+            )
+        else:
+            logger.debug(f"Not recording non-text {self.kind} response")
+        return response
+
+    async def _replay_stream(self, entry: Dict[str, Any]):
+        chunks = entry["chunks"]
+        step = entry["latency"] / max(1, len(chunks))
+        for chunk in chunks:
+            await self.cassette.delay(step)
+            yield chunk
+
+    async def _record_stream(self, key: str, stream, start: float):
+        chunks: List[str] = []
+        async for chunk in stream:
+            chunks.append(chunk)
+            yield chunk
+        self.cassette.record(key, self.kind, time.monotonic() - start, chunks=chunks)
+
+
+class CassetteEmbeddingFunc:
+    """Embedding function wrapper recording or replaying vectors per text"""
+
+    def __init__(self, func: Callable, cassette: Cassette):
+        self.func = func
+        self.cassette = cassette
+        # Keep the wrapped function's name, used to describe the model
+        functools.update_wrapper(self, func, updated=())
+
+    async def __call__(self, texts, *args, **kwargs):
+        single = isinstance(texts, str)
+        text_list = [texts] if single else list(texts)
+        keys = [request_key("embedding", (text, *args), kwargs) for text in text_list]
+
+        found: Dict[str, np.ndarray] = {}
+        latency = 0.0
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, text_list):
+            entry = self.cassette.lookup(key)
+            if entry is not None:
+                found[key] = _decode_vector(entry["vector"])
+                latency = max(latency, entry["latency"])
+            elif key not in missing:
+                missing[key] = text
+        if found:
+            # The recorded batch latency is shared by the texts of the batch
+            await self.cassette.delay(latency)
+
+        result_is_array = False
+        if missing:
+            missing_keys = list(missing.keys())
+            missing_texts = [missing[key] for key in missing_keys]
+            start = time.monotonic()
+            if single:
+                vectors = [await self.func(missing_texts[0], *args, **kwargs)]
+            else:
+                vectors = await self.func(missing_texts, *args, **kwargs)
+            elapsed = time.monotonic() - start
+            result_is_array = isinstance(vectors, np.ndarray)
+            for key, vector in zip(missing_keys, vectors):
+                found[key] = np.asarray(vector, dtype=np.float32).reshape(-1)
+                self.cassette.record(
+                    key, "embedding", elapsed, vector=_encode_vector(vector)
+                )
+
+        ordered = [found[key] for key in keys]
+        if single:
+            return ordered[0].tolist()
+        if result_is_array or isinstance(self.func, EmbeddingFunc):
+            return np.vstack(ordered) if ordered else np.empty((0, 0))
+        return [vector.tolist() for vector in ordered]
+
+
+def wrap_model_func_with_cassette(
+    func: Callable, cassette: Cassette, kind: str
+) -> Callable:
+    """Wrap an LLM or VLM function with a cassette"""
+    return CassetteModelFunc(func, cassette, kind)
+
+
+def wrap_embedding_func_with_cassette(func: Callable, cassette: Cassette) -> Callable:
+    """Wrap an embedding function with a cassette, preserving EmbeddingFunc attributes"""
+    wrapped = CassetteEmbeddingFunc(func, cassette)
+    if isinstance(func, EmbeddingFunc):
+        return replace(func, func=wrapped, send_dimensions=False)
+    return wrapped
+
+
+def create_cassette(config) -> Optional[Cassette]:
+    """Create a Cassette from a RAGAnythingConfig, or None if disabled"""
+    mode = config.cassette_mode.lower()
+    if mode == "off":
+        return None
+    path = config.cassette_path or os.path.join(
+        config.working_dir, "model_cassette.jsonl"
+    )
+    cassette = Cassette(path, mode=mode, latency_scale=config.cassette_latency_scale)
+    logger.info(
+        f"Model cassette in '{mode}' mode: {path} "
+        f"({len(cassette._entries)} recorded calls)"
+    )
+    return cassette
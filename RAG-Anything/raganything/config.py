@@ -27,13 +27,80 @@ class RAGAnythingConfig:
     """Default output directory for parsed content."""
 
     parser: str = field(default=get_env_value("PARSER", "mineru", str))
-    """Parser selection: 'mineru' or 'docling'."""
+    """Parser selection: 'mineru', 'docling' or 'html' (native parsing of HTML pages and text files, no external tools; PDF, Office and image files go to MinerU)."""
+
+    docling_mode: str = field(default=get_env_value("DOCLING_MODE", "thread", str))
+    """Docling execution: 'thread' (warm in-process converters), 'process' (converters in worker processes) or 'cli'."""
+
+    docling_workers: int = field(default=get_env_value("DOCLING_WORKERS", 1, int))
+    """Number of warm Docling converters (threads or worker processes)."""
+
+    text_parser: str = field(default=get_env_value("TEXT_PARSER", "native", str))
+    """Text and Markdown files: 'native' (split into paragraph, heading, table, equation and image items directly) or 'pdf' (render with ReportLab and parse the PDF)."""
+
+    text_page_chars: int = field(default=get_env_value("TEXT_PAGE_CHARS", 3000, int))
+    """Characters per synthetic page of natively parsed text and Markdown files."""
+
+    office_parser: str = field(default=get_env_value("OFFICE_PARSER", "native", str))
+    """MinerU parser for .docx/.pptx/.xlsx/.xls: 'native' (read the files directly, LibreOffice+MinerU for unsupported content; .xls needs xlrd) or 'pdf'."""
+
+    spreadsheet_rows_per_block: int = field(
+        default=get_env_value("SPREADSHEET_ROWS_PER_BLOCK", 100, int)
+    )
+    """Data rows per table item of natively parsed spreadsheets; longer sheets are split."""
+
+    office_workers: int = field(default=get_env_value("OFFICE_WORKERS", 1, int))
+    """Number of LibreOffice slots converting Office documents to PDF in parallel."""
+
+    office_conversion_timeout: float = field(
+        default=get_env_value("OFFICE_CONVERSION_TIMEOUT", 60.0, float)
+    )
+    """Seconds allowed for converting one Office document to PDF."""
+
+    office_listener: bool = field(default=get_env_value("OFFICE_LISTENER", True, bool))
+    """Keep resident LibreOffice listeners and convert over UNO when the bindings are importable."""
+
+    office_binary: str = field(default=get_env_value("OFFICE_BINARY", "", str))
+    """LibreOffice binary to use (empty = detect libreoffice/soffice)."""
+
+    office_work_dir: str = field(default=get_env_value("OFFICE_WORK_DIR", "", str))
+    """Directory for LibreOffice profiles and converted PDFs (empty = system temp directory)."""
+
+    parse_timeout: float = field(default=get_env_value("PARSE_TIMEOUT", 0.0, float))
+    """Per-file parsing deadline in seconds; the parser process tree is killed when it expires (0 = no limit)."""
 
     display_content_stats: bool = field(
         default=get_env_value("DISPLAY_CONTENT_STATS", True, bool)
     )
     """Whether to display content statistics during parsing."""
 
+    mineru_workers: int = field(default=get_env_value("MINERU_WORKERS", 0, int))
+    """Number of resident MinerU worker processes (0 = one mineru CLI process per file)."""
+
+    mineru_worker_max_jobs: int = field(
+        default=get_env_value("MINERU_WORKER_MAX_JOBS", 50, int)
+    )
+    """Parse jobs after which a MinerU worker is restarted to release memory (0 = never)."""
+
+    mineru_worker_job_timeout: float = field(
+        default=get_env_value("MINERU_WORKER_JOB_TIMEOUT", 1800.0, float)
+    )
+    """Seconds before a parse job is abandoned and its worker killed (0 = no limit)."""
+
+    mineru_worker_startup_timeout: float = field(
+        default=get_env_value("MINERU_WORKER_STARTUP_TIMEOUT", 600.0, float)
+    )
+    """Seconds allowed for a MinerU worker to load its models."""
+
+    pdf_shard_pages: int = field(default=get_env_value("PDF_SHARD_PAGES", 0, int))
+    """Split PDFs longer than this many pages into ranges parsed concurrently by MinerU (0 = disabled)."""
+
+    pdf_shard_workers: int = field(default=get_env_value("PDF_SHARD_WORKERS", 4, int))
+    """Maximum number of PDF page ranges parsed at the same time."""
+
+    pdf_text_layer: bool = field(default=get_env_value("PDF_TEXT_LAYER", True, bool))
+    """Read born-digital PDF pages from their text layer and send only pages with figures, tables, formulas or no usable text to MinerU (methods 'auto' and 'txt')."""
+
     # Multimodal Processing Configuration
     # ---
     enable_image_processing: bool = field(
@@ -51,6 +118,38 @@ class RAGAnythingConfig:
     )
     """Enable equation content processing."""
 
+    # Vision Payload Configuration
+    # ---
+    vision_image_max_edge: int = field(
+        default=get_env_value("VISION_IMAGE_MAX_EDGE", 2048, int)
+    )
+    """Longest image side in pixels sent to vision models; larger images are downscaled."""
+
+    vision_image_max_bytes: int = field(
+        default=get_env_value("VISION_IMAGE_MAX_BYTES", 4 * 1024 * 1024, int)
+    )
+    """Maximum encoded image size in bytes sent to vision models."""
+
+    vision_image_model_limits: str = field(
+        default=get_env_value("VISION_IMAGE_MODEL_LIMITS", "", str)
+    )
+    """Per-model overrides as 'model=max_edge:max_bytes,...' (e.g., 'llava=672:1000000')."""
+
+    vision_image_format: str = field(
+        default=get_env_value("VISION_IMAGE_FORMAT", "JPEG", str)
+    )
+    """Format images are re-encoded to for vision models: 'JPEG', 'WEBP' or 'PNG'."""
+
+    vision_image_quality: int = field(
+        default=get_env_value("VISION_IMAGE_QUALITY", 85, int)
+    )
+    """Initial encoder quality for JPEG/WEBP vision payloads."""
+
+    vision_image_cache_dir: str = field(
+        default=get_env_value("VISION_IMAGE_CACHE_DIR", "", str)
+    )
+    """Directory caching prepared vision payloads (defaults to '<working_dir>/image_cache')."""
+
     # Batch Processing Configuration
     # ---
     max_concurrent_files: int = field(
@@ -72,6 +171,16 @@ class RAGAnythingConfig:
     )
     """Whether to recursively process subfolders in batch mode."""
 
+    parse_threads_per_worker: int = field(
+        default=get_env_value("PARSE_THREADS_PER_WORKER", 0, int)
+    )
+    """Thread cap of the parser processes of each concurrent file in batch mode (0 = split the CPU cores evenly, -1 = no cap)."""
+
+    parse_cpu_affinity: bool = field(
+        default=get_env_value("PARSE_CPU_AFFINITY", False, bool)
+    )
+    """Pin the parser processes of each concurrent file to its own CPU cores in batch mode (Linux only)."""
+
     # Context Extraction Configuration
     # ---
     context_window: int = field(default=get_env_value("CONTEXT_WINDOW", 1, int))
@@ -148,6 +257,253 @@ class RAGAnythingConfig:
     )
     """Dimension of the vector embeddings (e.g., 1536 for text-embedding-3-small)."""
 
+    # API Endpoint Load Balancing Configuration
+    # ---
+    chat_api_endpoints: str = field(
+        default=get_env_value("CHAT_API_ENDPOINTS", "", str)
+    )
+    """Comma-separated 'url|weight|model' chat endpoints (overrides chat_api_url when set)."""
+
+    vision_api_endpoints: str = field(
+        default=get_env_value("VISION_API_ENDPOINTS", "", str)
+    )
+    """Comma-separated 'url|weight|model' vision endpoints (overrides vision_api_url when set)."""
+
+    embedding_api_endpoints: str = field(
+        default=get_env_value("EMBEDDING_API_ENDPOINTS", "", str)
+    )
+    """Comma-separated 'url|weight|model' embedding endpoints (overrides embedding_api_url when set)."""
+
+    api_lb_ewma_alpha: float = field(
+        default=get_env_value("API_LB_EWMA_ALPHA", 0.3, float)
+    )
+    """Smoothing factor of the per-endpoint latency EWMA."""
+
+    api_lb_eject_failures: int = field(
+        default=get_env_value("API_LB_EJECT_FAILURES", 3, int)
+    )
+    """Consecutive failures after which an endpoint is temporarily ejected."""
+
+    api_lb_eject_seconds: float = field(
+        default=get_env_value("API_LB_EJECT_SECONDS", 30.0, float)
+    )
+    """Seconds an ejected endpoint is skipped before being probed again."""
+
+    # API Connection Pool Configuration
+    # ---
+    api_max_connections: int = field(
+        default=get_env_value("API_MAX_CONNECTIONS", 100, int)
+    )
+    """Maximum number of concurrent connections kept by the shared API client."""
+
+    api_max_keepalive_connections: int = field(
+        default=get_env_value("API_MAX_KEEPALIVE_CONNECTIONS", 20, int)
+    )
+    """Maximum number of idle keep-alive connections kept by the shared API client."""
+
+    api_keepalive_expiry: float = field(
+        default=get_env_value("API_KEEPALIVE_EXPIRY", 30.0, float)
+    )
+    """Seconds an idle API connection is kept open before being closed."""
+
+    api_http2: bool = field(default=get_env_value("API_HTTP2", True, bool))
+    """Use HTTP/2 for API calls when the optional 'h2' package is installed."""
+
+    api_connect_timeout: float = field(
+        default=get_env_value("API_CONNECT_TIMEOUT", 10.0, float)
+    )
+    """Timeout in seconds for establishing a connection to an API endpoint."""
+
+    # API Rate Limiting Configuration
+    # ---
+    api_chat_rpm: float = field(default=get_env_value("API_CHAT_RPM", 0, float))
+    """Requests per minute allowed for chat calls (0 = unlimited)."""
+
+    api_chat_tpm: float = field(default=get_env_value("API_CHAT_TPM", 0, float))
+    """Tokens per minute allowed for chat calls (0 = unlimited)."""
+
+    api_vision_rpm: float = field(default=get_env_value("API_VISION_RPM", 0, float))
+    """Requests per minute allowed for vision calls (0 = unlimited)."""
+
+    api_vision_tpm: float = field(default=get_env_value("API_VISION_TPM", 0, float))
+    """Tokens per minute allowed for vision calls (0 = unlimited)."""
+
+    api_embedding_rpm: float = field(
+        default=get_env_value("API_EMBEDDING_RPM", 0, float)
+    )
+    """Requests per minute allowed for embedding calls (0 = unlimited)."""
+
+    api_embedding_tpm: float = field(
+        default=get_env_value("API_EMBEDDING_TPM", 0, float)
+    )
+    """Tokens per minute allowed for embedding calls (0 = unlimited)."""
+
+    api_max_retries: int = field(default=get_env_value("API_MAX_RETRIES", 5, int))
+    """Maximum number of retries for throttled (429) or transient API failures."""
+
+    api_retry_base_delay: float = field(
+        default=get_env_value("API_RETRY_BASE_DELAY", 1.0, float)
+    )
+    """Base delay in seconds of the exponential retry backoff."""
+
+    api_retry_max_delay: float = field(
+        default=get_env_value("API_RETRY_MAX_DELAY", 60.0, float)
+    )
+    """Maximum delay in seconds between two retries (also caps Retry-After)."""
+
+    api_initial_concurrency: int = field(
+        default=get_env_value("API_INITIAL_CONCURRENCY", 8, int)
+    )
+    """Initial number of in-flight requests per kind for the AIMD controller."""
+
+    api_min_concurrency: int = field(
+        default=get_env_value("API_MIN_CONCURRENCY", 1, int)
+    )
+    """Lower bound of the adaptive in-flight request limit."""
+
+    api_max_concurrency: int = field(
+        default=get_env_value("API_MAX_CONCURRENCY", 64, int)
+    )
+    """Upper bound of the adaptive in-flight request limit."""
+
+    api_latency_target: float = field(
+        default=get_env_value("API_LATENCY_TARGET", 0.0, float)
+    )
+    """Latency in seconds above which concurrency is reduced (0 = only react to 429s)."""
+
+    # Shared Quota Configuration
+    # ---
+    enable_shared_quota: bool = field(
+        default=get_env_value("ENABLE_SHARED_QUOTA", False, bool)
+    )
+    """Share the requests/tokens per minute quota with the other processes of this host."""
+
+    shared_quota_path: str = field(default=get_env_value("SHARED_QUOTA_PATH", "", str))
+    """SQLite ledger shared by the processes (defaults to '<tmp>/raganything_quota.sqlite')."""
+
+    shared_quota_limits: str = field(
+        default=get_env_value("SHARED_QUOTA_LIMITS", "", str)
+    )
+    """Per-model limits as 'model=rpm:tpm,...' (other models use the API_<KIND>_RPM/TPM values)."""
+
+    # API Request Hedging Configuration
+    # ---
+    enable_api_hedging: bool = field(
+        default=get_env_value("ENABLE_API_HEDGING", False, bool)
+    )
+    """Send a duplicate request when a call is slower than recent calls, keeping the first answer."""
+
+    api_hedge_kinds: List[str] = field(
+        default_factory=lambda: get_env_value(
+            "API_HEDGE_KINDS", "chat,vision", str
+        ).split(",")
+    )
+    """Request kinds that may be hedged ('chat', 'vision')."""
+
+    api_hedge_percentile: float = field(
+        default=get_env_value("API_HEDGE_PERCENTILE", 95.0, float)
+    )
+    """Latency percentile of recent calls after which a hedge is sent."""
+
+    api_hedge_budget_ratio: float = field(
+        default=get_env_value("API_HEDGE_BUDGET_RATIO", 0.05, float)
+    )
+    """Maximum fraction of extra requests spent on hedges across all kinds."""
+
+    api_hedge_min_delay: float = field(
+        default=get_env_value("API_HEDGE_MIN_DELAY", 0.5, float)
+    )
+    """Minimum seconds to wait before hedging a call."""
+
+    api_hedge_min_samples: int = field(
+        default=get_env_value("API_HEDGE_MIN_SAMPLES", 20, int)
+    )
+    """Number of latencies observed per kind before hedging starts."""
+
+    # Embedding Batching Configuration
+    # ---
+    embedding_batch_wait_ms: float = field(
+        default=get_env_value("EMBEDDING_BATCH_WAIT_MS", 5.0, float)
+    )
+    """Milliseconds an embedding request waits for others to join its batch."""
+
+    embedding_batch_max_items: int = field(
+        default=get_env_value("EMBEDDING_BATCH_MAX_ITEMS", 64, int)
+    )
+    """Maximum number of texts sent in one batched embedding call."""
+
+    embedding_batch_max_tokens: int = field(
+        default=get_env_value("EMBEDDING_BATCH_MAX_TOKENS", 8000, int)
+    )
+    """Maximum estimated tokens sent in one batched embedding call."""
+
+    embedding_batch_max_concurrency: int = field(
+        default=get_env_value("EMBEDDING_BATCH_MAX_CONCURRENCY", 4, int)
+    )
+    """Maximum number of batched embedding calls in flight at once."""
+
+    # Embedding Cache Configuration
+    # ---
+    enable_embedding_cache: bool = field(
+        default=get_env_value("ENABLE_EMBEDDING_CACHE", True, bool)
+    )
+    """Cache embeddings on disk keyed by model, dimension and normalized text hash."""
+
+    embedding_cache_dir: str = field(
+        default=get_env_value("EMBEDDING_CACHE_DIR", "", str)
+    )
+    """Directory of the embedding cache (defaults to '<working_dir>/embedding_cache')."""
+
+    embedding_cache_memory_items: int = field(
+        default=get_env_value("EMBEDDING_CACHE_MEMORY_ITEMS", 10000, int)
+    )
+    """Number of vectors kept in the in-memory LRU tier."""
+
+    embedding_cache_max_entries: int = field(
+        default=get_env_value("EMBEDDING_CACHE_MAX_ENTRIES", 500000, int)
+    )
+    """Maximum number of vectors kept on disk before least recently used ones are evicted."""
+
+    embedding_cache_model_name: str = field(
+        default=get_env_value("EMBEDDING_CACHE_MODEL_NAME", "", str)
+    )
+    """Override for the model name used in cache keys (auto-detected when empty)."""
+
+    # Embedding Storage Configuration
+    # ---
+    embedding_storage_dimension: int = field(
+        default=get_env_value("EMBEDDING_STORAGE_DIMENSION", 0, int)
+    )
+    """Dimension of stored vectors; smaller than the model output truncates them (0 = full)."""
+
+    embedding_truncation_mode: str = field(
+        default=get_env_value("EMBEDDING_TRUNCATION_MODE", "local", str)
+    )
+    """How vectors are shortened: 'local' (truncate + renormalize) or 'api' (request 'dimensions')."""
+
+    embedding_storage_dtype: str = field(
+        default=get_env_value("EMBEDDING_STORAGE_DTYPE", "float32", str)
+    )
+    """Format of vectors persisted in the embedding cache: 'float32', 'float16' or 'int8'."""
+
+    enable_embedding_rerank: bool = field(
+        default=get_env_value("ENABLE_EMBEDDING_RERANK", False, bool)
+    )
+    """Re-rank retrieved candidates with full-dimension, full-precision embeddings."""
+
+    # Model Cassette Configuration
+    # ---
+    cassette_mode: str = field(default=get_env_value("CASSETTE_MODE", "off", str))
+    """Record/replay of model calls: 'off', 'record', 'replay' (offline) or 'auto'."""
+
+    cassette_path: str = field(default=get_env_value("CASSETTE_PATH", "", str))
+    """JSONL file of recorded model calls (defaults to '<working_dir>/model_cassette.jsonl')."""
+
+    cassette_latency_scale: float = field(
+        default=get_env_value("CASSETTE_LATENCY_SCALE", 1.0, float)
+    )
+    """Multiplier of recorded latencies on replay (0 replays without delay)."""
+
     def __post_init__(self):
         """Post-initialization setup for backward compatibility"""
         # Support legacy environment variable names for backward compatibility
@@ -0,0 +1,264 @@
+"""
+In-process Docling conversion with a pool of warm converters
+
+The ``docling`` CLI reloads its models on every invocation. Here each converter
+is built once and reused: one conversion produces the document, which is saved
+both as JSON (with embedded pictures) and as markdown in the layout the CLI
+would write, so ``DoclingParser._read_output_files`` reads it unchanged.
+
+Two pool modes are available:
+
+- ``thread``: converters live in this process and are handed out to the calling
+  threads, one document per converter at a time;
+- ``process``: each worker process of a ``ProcessPoolExecutor`` builds its own
+  converter, for CPU parallelism beyond the GIL.
+
+The thread caps of a parse scheduler slot only reach parser subprocesses, so in
+both modes the converters get their own cap: the available cores are split
+between the converters of the pool (``PARSE_THREADS_PER_WORKER`` applies too).
+"""
+
+from __future__ import annotations
+
+import atexit
+import importlib.util
+import logging
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from queue import Empty, Queue
+from typing import TYPE_CHECKING, Any, Dict, Optional, Union
+
+from raganything.parse_scheduler import available_cpus
+
+if TYPE_CHECKING:
+    from docling.document_converter import DocumentConverter
+
+logger = logging.getLogger(__name__)
+
+# docling pulls in torch; it is only imported when a converter is built
+DOCLING_AVAILABLE = importlib.util.find_spec("docling") is not None
+
+DOCLING_POOL_MODES = ("cli", "thread", "process")
+
+
+def _accelerator_options(num_threads: int):
+    try:
+        from docling.datamodel.accelerator_options import AcceleratorOptions
+    except ImportError:
+        try:
+            from docling.datamodel.pipeline_options import AcceleratorOptions
+        except ImportError:
+            logger.debug("This docling version has no thread setting")
+            return None
+    return AcceleratorOptions(num_threads=num_threads)
+
+
+def create_docling_converter(num_threads: Optional[int] = None) -> "DocumentConverter":
+    """Build a converter with the options the docling CLI uses for JSON/markdown export
+
+    Args:
+        num_threads: Thread cap of the converter's models (None = docling default)
+    """
+    from docling.datamodel.base_models import InputFormat
+    from docling.datamodel.pipeline_options import PdfPipelineOptions
+    from docling.document_converter import DocumentConverter, PdfFormatOption
+
+    pipeline_options = PdfPipelineOptions()
+    if num_threads:
+        accelerator_options = _accelerator_options(num_threads)
+        if accelerator_options is not None:
+            pipeline_options.accelerator_options = accelerator_options
+    # Pictures are embedded in the JSON output and turned into image blocks
+    pipeline_options.generate_page_images = True
+    pipeline_options.generate_picture_images = True
+    pipeline_options.images_scale = 2
+    pdf_option = PdfFormatOption(pipeline_options=pipeline_options)
+    return DocumentConverter(
+        format_options={InputFormat.PDF: pdf_option, InputFormat.IMAGE: pdf_option}
+    )
+
+
+def convert_and_save(
+    converter: "DocumentConverter",
+    input_path: Union[str, Path],
+    file_output_dir: Union[str, Path],
+) -> None:
+    """Convert one document and write ``<stem>.json`` and ``<stem>.md`` from the same result"""
+    from docling_core.types.doc import ImageRefMode
+
+    input_path = Path(input_path)
+    file_output_dir = Path(file_output_dir)
+    file_output_dir.mkdir(parents=True, exist_ok=True)
+
+    result = converter.convert(input_path)
+    document = result.document
+    document.save_as_json(
+        file_output_dir / f"{input_path.stem}.json", image_mode=ImageRefMode.EMBEDDED
+    )
+    document.save_as_markdown(
+        file_output_dir / f"{input_path.stem}.md", image_mode=ImageRefMode.EMBEDDED
+    )
+
+
+# Converter of a process-pool worker, built once by the pool initializer
+_process_converter = None
+
+
+def _init_process_worker(num_threads: Optional[int]) -> None:
+    global _process_converter
+    _process_converter = create_docling_converter(num_threads)
+
+
+def _convert_in_process_worker(input_path: str, file_output_dir: str) -> None:
+    convert_and_save(_process_converter, input_path, file_output_dir)
+
+
+class DoclingConverterPool:
+    """Pool of warm Docling converters shared by all DoclingParser instances"""
+
+    def __init__(
+        self, size: int = 1, mode: str = "thread", threads_per_converter: int = 0
+    ):
+        """Initialize the pool
+
+        Args:
+            size: Number of converters (threads or worker processes)
+            mode: 'thread' (converters in this process) or 'process'
+            threads_per_converter: Thread cap of each converter (0 = split the
+                available cores evenly, -1 = no cap)
+        """
+        if not DOCLING_AVAILABLE:
+            raise ImportError(
+                "docling is not installed. Install it with: pip install docling"
+            )
+        if mode not in ("thread", "process"):
+            raise ValueError(f"Invalid Docling pool mode: {mode}")
+        self.size = max(1, size)
+        self.mode = mode
+        if threads_per_converter == 0:
+            self.threads: Optional[int] = max(1, len(available_cpus()) // self.size)
+        elif threads_per_converter > 0:
+            self.threads = threads_per_converter
+        else:
+            self.threads = None
+        self._idle: Queue = Queue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        if mode == "process":
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.size,
+                initializer=_init_process_worker,
+                initargs=(self.threads,),
+            )
+
+        # Statistics
+        self.conversions = 0
+        self.failures = 0
+        self.convert_seconds = 0.0
+
+    def _acquire_converter(self) -> "DocumentConverter":
+        try:
+            return self._idle.get_nowait()
+        except Empty:
+            pass
+        with self._lock:
+            create = self._created < self.size
+            if create:
+                self._created += 1
+        if create:
+            logger.info(
+                f"Loading Docling converter {self._created}/{self.size} "
+                f"(models stay loaded for later documents)"
+            )
+            try:
+                return create_docling_converter(self.threads)
+            except BaseException:
+                with self._lock:
+                    self._created -= 1
+                raise
+        return self._idle.get()
+
+    def convert(
+        self, input_path: Union[str, Path], file_output_dir: Union[str, Path]
+    ) -> None:
+        """Convert a document with a warm converter, writing JSON and markdown output"""
+        start = time.monotonic()
+        try:
+            if self._executor is not None:
+                self._executor.submit(
+                    _convert_in_process_worker, str(input_path), str(file_output_dir)
+                ).result()
+            else:
+                converter = self._acquire_converter()
+                try:
+                    convert_and_save(converter, input_path, file_output_dir)
+                finally:
+                    self._idle.put(converter)
+        except Exception:
+            self.failures += 1
+            raise
+        self.conversions += 1
+        self.convert_seconds += time.monotonic() - start
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get conversion statistics"""
+        return {
+            "mode": self.mode,
+            "size": self.size,
+            "threads_per_converter": self.threads,
+            "converters_loaded": self._created if self._executor is None else self.size,
+            "conversions": self.conversions,
+            "failures": self.failures,
+            "avg_convert_seconds": round(self.convert_seconds / self.conversions, 3)
+            if self.conversions
+            else 0.0,
+        }
+
+    def close(self) -> None:
+        """Shut down worker processes and drop the loaded converters"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        while True:
+            try:
+                self._idle.get_nowait()
+            except Empty:
+                break
+
+    def __deepcopy__(self, memo) -> "DoclingConverterPool":
+        # The loaded models are shared, never copied
+        return self
+
+
+_pool: Optional[DoclingConverterPool] = None
+_pool_configured = False
+_pool_lock = threading.Lock()
+
+
+def configure_docling_pool(config) -> Optional[DoclingConverterPool]:
+    """Create (or return) the process-wide converter pool from a RAGAnythingConfig
+
+    Returns None in 'cli' mode, or when docling cannot be imported (the CLI is
+    used then). The first configuration wins.
+    """
+    global _pool, _pool_configured
+    with _pool_lock:
+        if not _pool_configured:
+            _pool_configured = True
+            mode = config.docling_mode.lower()
+            if mode not in DOCLING_POOL_MODES:
+                logger.warning(f"Unknown DOCLING_MODE '{mode}', using the docling CLI")
+            elif mode != "cli":
+                if DOCLING_AVAILABLE:
+                    _pool = DoclingConverterPool(
+                        size=config.docling_workers,
+                        mode=mode,
+                        threads_per_converter=config.parse_threads_per_worker,
+                    )
+                    atexit.register(_pool.close)
+                else:
+                    logger.info("docling package not importable, using the docling CLI")
+        return _pool
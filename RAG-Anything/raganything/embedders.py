@@ -1,9 +1,16 @@
 """
 This module defines custom Embedder classes for RAG-Anything.
 """
+from typing import List, Optional, Union
+
 from lightrag.core import Embedder
-from raganything.api_clients import get_embedding_from_api
+from raganything.api_clients import get_embedding_coalescer
 from raganything.config import RAGAnythingConfig
+from raganything.embedding_cache import (
+    EmbeddingCache,
+    create_embedding_cache,
+    wrap_embedding_func_with_cache,
+)
 
 # Initialize config to be used by the classes in this module
 config = RAGAnythingConfig()
@@ -12,18 +19,50 @@ class APIEmbedder(Embedder):
     """
     An Embedder that uses an external API for generating vector embeddings.
     """
-    def __init__(self):
+    def __init__(
+        self, dimensions: Optional[int] = None, cache: Optional[EmbeddingCache] = None
+    ):
         """
         Initializes the APIEmbedder.
-        The dimension is fetched from the global config.
+        The dimension is fetched from the global config, unless a shortened
+        output dimension is requested from the API via `dimensions`.
+        Embeddings go through `cache`, by default the persistent embedding
+        cache of the global config (none when ENABLE_EMBEDDING_CACHE is off).
         """
-        super().__init__(model_name="api_based_embedder", dimension=config.embedding_dimension)
+        super().__init__(
+            model_name="api_based_embedder",
+            dimension=dimensions or config.embedding_dimension,
+        )
+        self.dimensions = dimensions
+        if cache is None:
+            cache = create_embedding_cache(
+                config, config.embedding_model_name, self.dimension
+            )
+        self.cache = cache
+        self._embed = self._embed_with_api
+        if cache is not None:
+            self._embed = wrap_embedding_func_with_cache(self._embed_with_api, cache)
     
-    async def embed(self, text: str, **kwargs) -> list[float]:
+    async def embed(
+        self, text: Union[str, List[str]], **kwargs
+    ) -> Union[List[float], List[List[float]]]:
         """
         Calls the API function to get the embedding for the given text.
+
+        Accepts a single text or a list of texts (as passed by LightRAG when
+        upserting chunks and entities). Texts already in the embedding cache
+        are not sent; concurrent requests for the others are coalesced into
+        batched calls to the embeddings endpoint.
         """
-        return await get_embedding_from_api(text)
+        return await self._embed(text, **kwargs)
+
+    async def _embed_with_api(
+        self, text: Union[str, List[str]], **kwargs
+    ) -> Union[List[float], List[List[float]]]:
+        coalescer = get_embedding_coalescer(self.dimensions)
+        if isinstance(text, str):
+            return await coalescer.embed(text)
+        return await coalescer.embed_many(list(text))
 
     def _to_json(self):
         """
@@ -33,6 +72,7 @@ class APIEmbedder(Embedder):
         return {
             "model_name": self.model_name,
             "dimension": self.dimension,
+            "dimensions": self.dimensions,
             # Add a class identifier for correct deserialization
             "__classname__": self.__class__.__name__ 
         }
@@ -43,5 +83,5 @@ class APIEmbedder(Embedder):
         Deserializes the Embedder from a dictionary.
         This allows LightRAG to reconstruct the correct Embedder object.
         """
-        return cls()
+        return cls(dimensions=a_dict.get("dimensions"))
 
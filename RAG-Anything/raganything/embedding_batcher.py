@@ -0,0 +1,168 @@
+"""
+Micro-batching coalescer for embedding requests
+
+Collects concurrent single-text embedding requests for a few milliseconds and
+sends them as one batched call to an OpenAI-compatible ``/embeddings`` endpoint,
+then routes each vector back to its caller.
+"""
+
+import asyncio
+import weakref
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from lightrag.utils import logger
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token) used for batch sizing"""
+    return max(1, len(text) // 4)
+
+
+@dataclass
+class _LoopState:
+    """Pending batch for one event loop"""
+
+    pending: List[Tuple[str, asyncio.Future]] = field(default_factory=list)
+    pending_tokens: int = 0
+    timer: Optional[asyncio.TimerHandle] = None
+    semaphore: Optional[asyncio.Semaphore] = None
+    tasks: set = field(default_factory=set)
+
+
+class EmbeddingCoalescer:
+    """Coalesce concurrent embedding requests into batched API calls
+
+    A batch is flushed when the oldest request has waited ``max_wait_ms``, when it
+    holds ``max_batch_size`` texts, or when adding a text would exceed
+    ``max_batch_tokens``. Identical texts within a batch are sent only once.
+    """
+
+    def __init__(
+        self,
+        batch_func: Callable[[List[str]], Awaitable[List[List[float]]]],
+        max_wait_ms: float = 5.0,
+        max_batch_size: int = 64,
+        max_batch_tokens: int = 8000,
+        max_concurrent_batches: int = 4,
+    ):
+        """Initialize the coalescer
+
+        Args:
+            batch_func: Async function embedding a list of texts, returning vectors in order
+            max_wait_ms: Maximum time a request waits for other requests to join its batch
+            max_batch_size: Maximum number of texts per batched call
+            max_batch_tokens: Maximum estimated tokens per batched call
+            max_concurrent_batches: Maximum number of batched calls in flight
+        """
+        self.batch_func = batch_func
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_batch_tokens = max(1, max_batch_tokens)
+        self.max_concurrent_batches = max(1, max_concurrent_batches)
+
+        self._states: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+        # Statistics
+        self._requests = 0
+        self._batches = 0
+        self._texts_sent = 0
+
+    def _state_for(self, loop: asyncio.AbstractEventLoop) -> _LoopState:
+        state = self._states.get(loop)
+        if state is None:
+            state = _LoopState(semaphore=asyncio.Semaphore(self.max_concurrent_batches))
+            self._states[loop] = state
+        return state
+
+    async def embed(self, text: str) -> List[float]:
+        """Embed a single text, sharing the API call with concurrent requests"""
+        loop = asyncio.get_running_loop()
+        state = self._state_for(loop)
+        future = loop.create_future()
+        tokens = estimate_tokens(text)
+        self._requests += 1
+
+        # Flush first if this text would overflow the pending batch
+        if state.pending and (
+            len(state.pending) + 1 > self.max_batch_size
+            or state.pending_tokens + tokens > self.max_batch_tokens
+        ):
+            self._flush(state)
+
+        state.pending.append((text, future))
+        state.pending_tokens += tokens
+
+        if (
+            len(state.pending) >= self.max_batch_size
+            or state.pending_tokens >= self.max_batch_tokens
+            or self.max_wait == 0
+        ):
+            self._flush(state)
+        elif state.timer is None:
+            state.timer = loop.call_later(self.max_wait, self._flush, state)
+
+        return await future
+
+    async def embed_many(self, texts: List[str]) -> List[List[float]]:
+        """Embed several texts; they are coalesced with any concurrent requests"""
+        return list(await asyncio.gather(*(self.embed(text) for text in texts)))
+
+    def _flush(self, state: _LoopState) -> None:
+        """Send the pending batch of a loop"""
+        if state.timer is not None:
+            state.timer.cancel()
+            state.timer = None
+        if not state.pending:
+            return
+
+        batch, state.pending = state.pending, []
+        state.pending_tokens = 0
+
+        task = asyncio.ensure_future(self._send(state, batch))
+        state.tasks.add(task)
+        task.add_done_callback(state.tasks.discard)
+
+    async def _send(
+        self, state: _LoopState, batch: List[Tuple[str, asyncio.Future]]
+    ) -> None:
+        """Run one batched call and resolve the futures of its callers"""
+        # Deduplicate identical texts inside the batch
+        unique_texts: List[str] = []
+        positions: Dict[str, int] = {}
+        for text, _ in batch:
+            if text not in positions:
+                positions[text] = len(unique_texts)
+                unique_texts.append(text)
+
+        try:
+            async with state.semaphore:
+                vectors = await self.batch_func(unique_texts)
+            if len(vectors) != len(unique_texts):
+                raise ValueError(
+                    f"Embedding API returned {len(vectors)} vectors for "
+                    f"{len(unique_texts)} inputs"
+                )
+        except Exception as e:
+            logger.error(f"Batched embedding call failed ({len(batch)} texts): {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self._batches += 1
+        self._texts_sent += len(unique_texts)
+        for text, future in batch:
+            if not future.done():
+                future.set_result(vectors[positions[text]])
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get batching statistics"""
+        return {
+            "requests": self._requests,
+            "batches": self._batches,
+            "texts_sent": self._texts_sent,
+            "avg_batch_size": self._texts_sent / self._batches
+            if self._batches
+            else 0.0,
+        }
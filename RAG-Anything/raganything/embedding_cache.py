@@ -0,0 +1,323 @@
+"""
+Persistent content-addressed embedding cache
+
+Embeddings are keyed by (model name, dimension, normalized text hash) and kept
+in a two-tier cache: an in-memory LRU in front of a size-bounded SQLite store.
+The cache wraps any embedding function (LightRAG EmbeddingFunc, APIEmbedder.embed
+or a plain async callable) so it works for both the local and the 'api' backend.
+"""
+
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import replace
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+from lightrag.utils import EmbeddingFunc, logger
+from raganything.embedding_quant import SUPPORTED_DTYPES, decode_vector, encode_vector
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text so that trivially different inputs share a cache entry"""
+    text = unicodedata.normalize("NFC", text)
+    return " ".join(text.split())
+
+
+class EmbeddingCache:
+    """Two-tier (memory LRU + SQLite) embedding cache with hit/miss counters"""
+
+    def __init__(
+        self,
+        cache_dir: str,
+        model_name: str,
+        dimension: int,
+        max_memory_items: int = 10000,
+        max_disk_entries: int = 500000,
+        dtype: str = "float32",
+    ):
+        """Initialize the cache
+
+        Args:
+            cache_dir: Directory holding the SQLite database
+            model_name: Embedding model name, part of the cache key
+            dimension: Embedding dimension, part of the cache key
+            max_memory_items: Maximum number of vectors kept in the in-memory LRU
+            max_disk_entries: Maximum number of vectors kept on disk before eviction
+            dtype: On-disk vector format: 'float32', 'float16' or 'int8'
+        """
+        if dtype not in SUPPORTED_DTYPES:
+            raise ValueError(
+                f"Unsupported embedding storage dtype '{dtype}', "
+                f"expected one of {SUPPORTED_DTYPES}"
+            )
+        self.model_name = model_name
+        self.dimension = dimension
+        self.dtype = dtype
+        self.max_memory_items = max(0, max_memory_items)
+        self.max_disk_entries = max(1, max_disk_entries)
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self.db_path = os.path.join(cache_dir, "embeddings.sqlite")
+
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "key TEXT PRIMARY KEY, vector BLOB NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_embeddings_last_access "
+            "ON embeddings(last_access)"
+        )
+        self._conn.commit()
+        self._disk_entries = self._conn.execute(
+            "SELECT COUNT(*) FROM embeddings"
+        ).fetchone()[0]
+
+        # Statistics
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def with_dtype(self, dtype: str) -> "EmbeddingCache":
+        """A cache for the same model in the same database, storing ``dtype`` vectors"""
+        return EmbeddingCache(
+            cache_dir=os.path.dirname(self.db_path),
+            model_name=self.model_name,
+            dimension=self.dimension,
+            max_memory_items=self.max_memory_items,
+            max_disk_entries=self.max_disk_entries,
+            dtype=dtype,
+        )
+
+    def key_for(self, text: str, context: Optional[str] = None) -> str:
+        """Build the content-addressed key for a text"""
+        digest = hashlib.sha256()
+        parts = [self.model_name, str(self.dimension), context or ""]
+        if self.dtype != "float32":
+            # Entries written with another codec must not be decoded with this one
+            parts.append(self.dtype)
+        for part in parts:
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\x00")
+        digest.update(normalize_text(text).encode("utf-8"))
+        return digest.hexdigest()
+
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        """Insert a vector into the memory LRU"""
+        if not self.max_memory_items:
+            return
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, np.ndarray]:
+        """Look up keys in memory first, then on disk"""
+        found: Dict[str, np.ndarray] = {}
+        missing: List[str] = []
+        with self._lock:
+            for key in keys:
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = vector
+                    self.memory_hits += 1
+                else:
+                    missing.append(key)
+
+            if missing:
+                now = time.time()
+                for start in range(0, len(missing), 500):
+                    batch = missing[start : start + 500]
+                    placeholders = ",".join("?" * len(batch))
+                    rows = self._conn.execute(
+                        f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                        batch,
+                    ).fetchall()
+                    for key, blob in rows:
+                        vector = decode_vector(blob, self.dtype)
+                        found[key] = vector
+                        self._remember(key, vector)
+                        self.disk_hits += 1
+                    if rows:
+                        self._conn.executemany(
+                            "UPDATE embeddings SET last_access = ? WHERE key = ?",
+                            [(now, key) for key, _ in rows],
+                        )
+                self._conn.commit()
+                self.misses += len(missing) - sum(1 for k in missing if k in found)
+        return found
+
+    def put_many(self, items: Dict[str, Any]) -> Dict[str, np.ndarray]:
+        """Store vectors in memory and on disk, evicting old disk entries if needed
+
+        Returns:
+            The vectors as later lookups will return them (decoded from the
+            storage dtype)
+        """
+        stored: Dict[str, np.ndarray] = {}
+        if not items:
+            return stored
+        now = time.time()
+        rows = []
+        with self._lock:
+            for key, vector in items.items():
+                blob = encode_vector(vector, self.dtype)
+                # Keep what a later disk read would return in memory as well
+                vector = stored[key] = decode_vector(blob, self.dtype)
+                self._remember(key, vector)
+                rows.append((key, blob, now))
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector, last_access) "
+                "VALUES (?, ?, ?)",
+                rows,
+            )
+            self._disk_entries += self._conn.total_changes - before
+            if self._disk_entries > self.max_disk_entries:
+                self._evict()
+            self._conn.commit()
+        return stored
+
+    def _evict(self) -> None:
+        """Drop the least recently used disk entries (10% headroom)"""
+        self._disk_entries = self._conn.execute(
+            "SELECT COUNT(*) FROM embeddings"
+        ).fetchone()[0]
+        target = int(self.max_disk_entries * 0.9)
+        excess = self._disk_entries - target
+        if excess <= 0:
+            return
+        self._conn.execute(
+            "DELETE FROM embeddings WHERE key IN ("
+            "SELECT key FROM embeddings ORDER BY last_access ASC LIMIT ?)",
+            (excess,),
+        )
+        self._disk_entries -= excess
+        self.evictions += excess
+        logger.debug(f"Evicted {excess} entries from embedding cache")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss statistics"""
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "model_name": self.model_name,
+            "dimension": self.dimension,
+            "dtype": self.dtype,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.memory_hits + self.disk_hits) / lookups
+            if lookups
+            else 0.0,
+            "memory_items": len(self._memory),
+            "disk_entries": self._disk_entries,
+            "evictions": self.evictions,
+        }
+
+    def close(self) -> None:
+        """Close the underlying database"""
+        with self._lock:
+            try:
+                self._conn.close()
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to close embedding cache: {e}")
+
+    def __deepcopy__(self, memo) -> "EmbeddingCache":
+        # LightRAG deep-copies its config (embedding_func included); the
+        # database connection is shared rather than copied
+        return self
+
+
+class CachedEmbeddingFunc:
+    """Embedding function wrapper that serves repeated texts from an EmbeddingCache
+
+    Accepts a single text or a list of texts and returns results in the same
+    shape as the wrapped function (a vector, a list of vectors or a numpy array).
+    """
+
+    def __init__(self, func: Callable, cache: EmbeddingCache):
+        self.func = func
+        self.cache = cache
+
+    async def __call__(self, texts, *args, **kwargs):
+        single = isinstance(texts, str)
+        text_list = [texts] if single else list(texts)
+        context = kwargs.get("context")
+        keys = [self.cache.key_for(text, context) for text in text_list]
+
+        found = await asyncio.to_thread(self.cache.get_many, keys)
+
+        # Embed each distinct missing text once
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, text_list):
+            if key not in found and key not in missing:
+                missing[key] = text
+
+        result_is_array = False
+        if missing:
+            missing_keys = list(missing.keys())
+            missing_texts = [missing[key] for key in missing_keys]
+            if single:
+                vectors = [await self.func(missing_texts[0], *args, **kwargs)]
+            else:
+                vectors = await self.func(missing_texts, *args, **kwargs)
+            result_is_array = isinstance(vectors, np.ndarray)
+            new_items = {
+                key: np.asarray(vector, dtype=np.float32).reshape(-1)
+                for key, vector in zip(missing_keys, vectors)
+            }
+            # Return what a later hit returns, so a text always gets the same
+            # vector whatever the cache state (float16/int8 storage is lossy)
+            found.update(await asyncio.to_thread(self.cache.put_many, new_items))
+
+        ordered = [found[key] for key in keys]
+        if single:
+            return ordered[0].tolist()
+        if result_is_array or isinstance(self.func, EmbeddingFunc):
+            return (
+                np.vstack(ordered) if ordered else np.empty((0, self.cache.dimension))
+            )
+        return [vector.tolist() for vector in ordered]
+
+
+def wrap_embedding_func_with_cache(func: Callable, cache: EmbeddingCache) -> Callable:
+    """Wrap an embedding function with a cache, preserving LightRAG's EmbeddingFunc attributes"""
+    cached = CachedEmbeddingFunc(func, cache)
+    if isinstance(func, EmbeddingFunc):
+        return replace(func, func=cached, send_dimensions=False)
+    return cached
+
+
+def create_embedding_cache(
+    config, model_name: str, dimension: int
+) -> Optional[EmbeddingCache]:
+    """Create an EmbeddingCache from a RAGAnythingConfig, or None if disabled"""
+    if not config.enable_embedding_cache:
+        return None
+    cache_dir = config.embedding_cache_dir or os.path.join(
+        config.working_dir, "embedding_cache"
+    )
+    try:
+        return EmbeddingCache(
+            cache_dir=cache_dir,
+            model_name=model_name,
+            dimension=dimension,
+            max_memory_items=config.embedding_cache_memory_items,
+            max_disk_entries=config.embedding_cache_max_entries,
+            dtype=config.embedding_storage_dtype,
+        )
+    except (sqlite3.Error, ValueError) as e:
+        logger.warning(f"Embedding cache disabled, failed to open {cache_dir}: {e}")
+        return None
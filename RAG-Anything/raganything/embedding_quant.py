@@ -0,0 +1,217 @@
+"""
+Reduced-dimension and quantized embedding storage
+
+- Truncation: vectors are cut to ``embedding_storage_dimension`` and
+  re-normalized (equivalent to the ``dimensions`` parameter of Matryoshka-style
+  models such as text-embedding-3-*), either by the API or locally.
+- Quantization: vectors persisted by RAG-Anything (the embedding cache) can be
+  stored as float16 or int8 with a per-vector scale.
+- Re-ranking: an optional LightRAG ``rerank_model_func`` re-scores retrieved
+  candidates with full-dimension, full-precision embeddings to recover recall.
+- Format manifest: the format used to build an index is recorded in the working
+  directory, so an existing index keeps loading with the dimension it was built with.
+"""
+
+import json
+import os
+from dataclasses import asdict, dataclass, replace
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+from lightrag.utils import EmbeddingFunc, logger
+
+SUPPORTED_DTYPES = ("float32", "float16", "int8")
+
+FORMAT_MANIFEST = "embedding_format.json"
+
+
+def encode_vector(vector: np.ndarray, dtype: str = "float32") -> bytes:
+    """Serialize a vector in the given storage dtype
+
+    int8 vectors are prefixed with their float32 scale (max(|v|) / 127).
+    """
+    vector = np.asarray(vector, dtype=np.float32).reshape(-1)
+    if dtype == "float16":
+        return vector.astype(np.float16).tobytes()
+    if dtype == "int8":
+        peak = float(np.max(np.abs(vector))) if vector.size else 0.0
+        scale = peak / 127.0 if peak > 0 else 1.0
+        quantized = np.clip(np.rint(vector / scale), -127, 127).astype(np.int8)
+        return np.float32(scale).tobytes() + quantized.tobytes()
+    return vector.tobytes()
+
+
+def decode_vector(blob: bytes, dtype: str = "float32") -> np.ndarray:
+    """Deserialize a vector written by encode_vector as float32"""
+    if dtype == "float16":
+        return np.frombuffer(blob, dtype=np.float16).astype(np.float32)
+    if dtype == "int8":
+        scale = np.frombuffer(blob[:4], dtype=np.float32)[0]
+        return np.frombuffer(blob[4:], dtype=np.int8).astype(np.float32) * scale
+    return np.frombuffer(blob, dtype=np.float32)
+
+
+def truncate_embeddings(vectors: Any, dimension: int) -> np.ndarray:
+    """Keep the first ``dimension`` components of each vector and re-normalize"""
+    array = np.asarray(vectors, dtype=np.float32)
+    if array.ndim == 1:
+        return truncate_embeddings(array[None, :], dimension)[0]
+    if dimension <= 0 or array.shape[-1] <= dimension:
+        return array
+    truncated = array[:, :dimension]
+    norms = np.linalg.norm(truncated, axis=1, keepdims=True)
+    return truncated / np.where(norms > 0, norms, 1.0)
+
+
+@dataclass
+class EmbeddingFormat:
+    """Storage format of the vectors in a working directory"""
+
+    model_name: str
+    full_dimension: int
+    dimension: int
+    dtype: str = "float32"
+    truncation: str = "none"
+
+    @property
+    def is_truncated(self) -> bool:
+        return self.dimension < self.full_dimension
+
+
+def load_embedding_format(working_dir: str) -> Optional[EmbeddingFormat]:
+    """Load the recorded storage format of a working directory, if any"""
+    path = os.path.join(working_dir, FORMAT_MANIFEST)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return EmbeddingFormat(**json.load(f))
+    except FileNotFoundError:
+        return None
+    except (TypeError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable embedding format manifest {path}: {e}")
+        return None
+
+
+def save_embedding_format(working_dir: str, fmt: EmbeddingFormat) -> None:
+    """Record the storage format of a working directory"""
+    os.makedirs(working_dir, exist_ok=True)
+    path = os.path.join(working_dir, FORMAT_MANIFEST)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(asdict(fmt), f, indent=2)
+
+
+def _has_existing_index(working_dir: str) -> bool:
+    """Check whether LightRAG vector storage files already exist"""
+    try:
+        return any(name.startswith("vdb_") for name in os.listdir(working_dir))
+    except FileNotFoundError:
+        return False
+
+
+def resolve_embedding_format(
+    working_dir: str, requested: EmbeddingFormat
+) -> EmbeddingFormat:
+    """Decide the storage format for a working directory and record it
+
+    A recorded format always wins for the vector dimension, and an index built
+    before formats were recorded is treated as full-dimension float32, so that
+    existing indexes keep loading. The cache dtype may change freely because
+    cache entries are keyed by dtype.
+    """
+    recorded = load_embedding_format(working_dir)
+    if recorded is None and _has_existing_index(working_dir):
+        recorded = EmbeddingFormat(
+            model_name=requested.model_name,
+            full_dimension=requested.full_dimension,
+            dimension=requested.full_dimension,
+        )
+        if requested.dimension != recorded.dimension:
+            logger.warning(
+                f"Existing index in {working_dir} was built with "
+                f"{recorded.dimension}-dim vectors; reduced-dimension storage "
+                f"only applies to new working directories"
+            )
+
+    if recorded is not None and recorded.full_dimension != requested.full_dimension:
+        # A different embedding model cannot read the old index anyway
+        logger.warning(
+            f"Embedding model output changed from {recorded.full_dimension} to "
+            f"{requested.full_dimension} dimensions in {working_dir}; "
+            f"re-index documents built with the previous model"
+        )
+        recorded = None
+
+    if recorded is not None:
+        if recorded.dimension != requested.dimension:
+            logger.warning(
+                f"Keeping recorded embedding dimension {recorded.dimension} "
+                f"(requested {requested.dimension}) for {working_dir}"
+            )
+        fmt = replace(
+            requested,
+            dimension=recorded.dimension,
+            truncation=requested.truncation
+            if recorded.dimension < requested.full_dimension
+            else "none",
+        )
+    else:
+        fmt = requested
+
+    if fmt != recorded:
+        save_embedding_format(working_dir, fmt)
+    return fmt
+
+
+class TruncatingEmbeddingFunc:
+    """Embedding function wrapper returning truncated, re-normalized vectors"""
+
+    def __init__(self, func: Callable, dimension: int):
+        self.func = func
+        self.dimension = dimension
+
+    async def __call__(self, texts, *args, **kwargs):
+        vectors = await self.func(texts, *args, **kwargs)
+        truncated = truncate_embeddings(vectors, self.dimension)
+        if isinstance(vectors, np.ndarray) or isinstance(self.func, EmbeddingFunc):
+            return truncated
+        return truncated.tolist()
+
+
+def wrap_embedding_func_with_truncation(func: Callable, dimension: int) -> Callable:
+    """Wrap an embedding function so that it returns ``dimension``-dim vectors"""
+    truncating = TruncatingEmbeddingFunc(func, dimension)
+    if isinstance(func, EmbeddingFunc):
+        return replace(
+            func, func=truncating, embedding_dim=dimension, send_dimensions=False
+        )
+    return truncating
+
+
+class FullPrecisionReranker:
+    """LightRAG rerank_model_func scoring candidates with full-precision embeddings
+
+    Candidates retrieved from the reduced-dimension index are re-scored by
+    cosine similarity of full-dimension vectors (usually served from the
+    embedding cache, so re-ranking rarely triggers new embedding calls).
+    """
+
+    def __init__(self, embedding_func: Callable):
+        self.embedding_func = embedding_func
+
+    async def __call__(
+        self, query: str, documents: List[str], top_n: Optional[int] = None, **kwargs
+    ) -> List[Dict[str, Any]]:
+        if not documents:
+            return []
+        vectors = np.asarray(
+            await self.embedding_func([query, *documents]), dtype=np.float32
+        )
+        query_vector, doc_vectors = vectors[0], vectors[1:]
+        norms = np.linalg.norm(doc_vectors, axis=1) * np.linalg.norm(query_vector)
+        scores = doc_vectors @ query_vector / np.where(norms > 0, norms, 1.0)
+        order = np.argsort(-scores)
+        if top_n:
+            order = order[:top_n]
+        return [
+            {"index": int(index), "relevance_score": float(scores[index])}
+            for index in order
+        ]
@@ -0,0 +1,177 @@
+"""
+Hedged requests for the 'api' backend
+
+A hedged call starts the request normally and, if it has not completed after a
+percentile of recently observed latencies, sends a duplicate and returns
+whichever finishes first. A global budget caps duplicates to a fraction of the
+primary requests so that hedging cannot multiply the load on the provider.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+from lightrag.utils import logger
+
+T = TypeVar("T")
+
+
+class LatencyTracker:
+    """Sliding window of recent latencies with percentile lookup"""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.min_samples = max(1, min_samples)
+        self._samples: deque = deque(maxlen=max(self.min_samples, window))
+
+    def record(self, latency: float) -> None:
+        self._samples.append(latency)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Return the p-th percentile, or None until enough samples are collected"""
+        if len(self._samples) < self.min_samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, max(0, round(p / 100.0 * len(ordered)) - 1))
+        return ordered[index]
+
+
+class HedgeBudget:
+    """Global allowance of hedged requests
+
+    Every primary request earns ``ratio`` credits (capped at ``max_credits``) and
+    every hedge spends one, so hedges stay below ``ratio`` of the traffic.
+    """
+
+    def __init__(self, ratio: float = 0.05, max_credits: float = 10.0):
+        self.ratio = max(0.0, ratio)
+        self.max_credits = max(1.0, max_credits)
+        self._credits = 1.0
+        self._lock = threading.Lock()
+        self.denied = 0
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._credits = min(self.max_credits, self._credits + self.ratio)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self._credits >= 1.0:
+                self._credits -= 1.0
+                return True
+            self.denied += 1
+            return False
+
+
+class Hedger:
+    """Issue a duplicate request when the first one is slower than usual"""
+
+    def __init__(
+        self,
+        kind: str,
+        budget: HedgeBudget,
+        percentile: float = 95.0,
+        min_delay: float = 0.5,
+        min_samples: int = 20,
+    ):
+        """Initialize the hedger
+
+        Args:
+            kind: Request kind, used in logs and statistics
+            budget: Hedge budget shared by all hedgers
+            percentile: Latency percentile after which a duplicate is sent
+            min_delay: Lower bound in seconds of the hedge delay
+            min_samples: Latencies to observe before hedging starts
+        """
+        self.kind = kind
+        self.budget = budget
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.tracker = LatencyTracker(min_samples=min_samples)
+
+        # Statistics
+        self.calls = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def hedge_delay(self) -> Optional[float]:
+        """Current hedge delay, or None while latencies are still being sampled"""
+        threshold = self.tracker.percentile(self.percentile)
+        if threshold is None:
+            return None
+        return max(self.min_delay, threshold)
+
+    async def _timed(self, factory: Callable[[], Awaitable[T]]) -> T:
+        start = time.monotonic()
+        result = await factory()
+        self.tracker.record(time.monotonic() - start)
+        return result
+
+    async def call(self, factory: Callable[[], Awaitable[T]]) -> T:
+        """Run ``factory()``, hedging it with a second call if it is too slow
+
+        ``factory`` must start a fresh request on every call.
+        """
+        self.calls += 1
+        self.budget.deposit()
+        delay = self.hedge_delay()
+        if delay is None:
+            return await self._timed(factory)
+
+        start = time.monotonic()
+        primary = asyncio.ensure_future(self._timed(factory))
+        tasks = [primary]
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done or not self.budget.try_spend():
+                return await primary
+
+            self.hedges += 1
+            logger.debug(f"Hedging {self.kind} API call after {delay:.2f}s")
+            hedge = asyncio.ensure_future(self._timed(factory))
+            tasks.append(hedge)
+            pending = {primary, hedge}
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.hedge_wins += 1
+                            # Keep the slow primary visible in the latency window
+                            self.tracker.record(time.monotonic() - start)
+                        return task.result()
+                    error = error or task.exception()
+            raise error
+        finally:
+            # Cancel the loser (or both, if this call was cancelled) and let it
+            # clean up, e.g. release its rate limiter slot, before returning
+            unfinished = [task for task in tasks if not task.done()]
+            for task in unfinished:
+                task.cancel()
+            if unfinished:
+                await asyncio.gather(*unfinished, return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hedging statistics"""
+        return {
+            "calls": self.calls,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "hedge_rate": self.hedges / self.calls if self.calls else 0.0,
+            "current_delay": self.hedge_delay(),
+        }
+
+
+def create_hedger(config, kind: str, budget: HedgeBudget) -> Hedger:
+    """Create the hedger for a request kind from a RAGAnythingConfig"""
+    return Hedger(
+        kind,
+        budget,
+        percentile=config.api_hedge_percentile,
+        min_delay=config.api_hedge_min_delay,
+        min_samples=config.api_hedge_min_samples,
+    )
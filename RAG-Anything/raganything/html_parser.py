@@ -0,0 +1,812 @@
+"""
+Native streaming parsing of HTML pages
+
+Crawled pages are mostly page chrome around a little content. They are read in
+a single pass with one tokenizing regular expression (several times faster than
+``html.parser``), and tags and text are mapped directly to ``content_list``
+items:
+
+- ``h1``-``h6``: ``text`` items with ``text_level``
+- paragraphs, lists, quotes and preformatted blocks: ``text`` items
+- data tables: ``table`` items with an HTML ``table_body``; layout tables
+  (``role="presentation"`` or tables holding other tables) are read as text
+- local and ``data:`` images: ``image`` items with an absolute ``img_path``
+
+Scripts, forms, navigation, page headers and footers, sidebars and hidden
+elements are dropped with their whole subtree. Page indices are synthetic, as
+for plain text.
+"""
+
+import base64
+import binascii
+import hashlib
+import html
+import logging
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+from urllib.parse import unquote
+
+from raganything.ooxml_parser import RASTER_IMAGE_EXTENSIONS
+from raganything.text_parser import (
+    DEFAULT_PAGE_CHARS,
+    SyntheticPages,
+    decode_text,
+    split_long_paragraph,
+)
+
+logger = logging.getLogger(__name__)
+
+HTML_FORMATS = {".html", ".htm", ".xhtml"}
+
+_VOID_TAGS = {
+    "area",
+    "base",
+    "br",
+    "col",
+    "embed",
+    "hr",
+    "img",
+    "input",
+    "link",
+    "meta",
+    "param",
+    "source",
+    "track",
+    "wbr",
+}
+
+# Dropped together with their content
+_SKIPPED_TAGS = {
+    "audio",
+    "button",
+    "canvas",
+    "dialog",
+    "form",
+    "iframe",
+    "map",
+    "nav",
+    "aside",
+    "noscript",
+    "object",
+    "script",
+    "select",
+    "style",
+    "svg",
+    "template",
+    "textarea",
+    "video",
+}
+
+# Page chrome, unless inside <article>/<main> where they hold titles and bylines
+_CHROME_TAGS = {"header", "footer"}
+_CONTENT_TAGS = {"article", "main"}
+# Page-wide wrappers whose class names often mention the page layout
+_NEVER_STRIPPED_BY_NAME = {"html", "body", "article", "main"}
+
+_BOILERPLATE_ROLES = {
+    "banner",
+    "complementary",
+    "contentinfo",
+    "dialog",
+    "menu",
+    "menubar",
+    "navigation",
+    "search",
+}
+
+# class/id names of navigation and page furniture
+_BOILERPLATE_NAME = re.compile(
+    r"(?:^|[\s_-])(?:nav|navbar|navigation|menu|breadcrumbs?|sidebar|cookies?"
+    r"|skip|share|social|pagination|footer|masthead|toolbar|sr-only"
+    r"|visually-hidden)(?:$|[\s_-])",
+    re.IGNORECASE,
+)
+
+_HEADINGS = {"h1": 1, "h2": 2, "h3": 3, "h4": 4, "h5": 5, "h6": 6}
+
+# An element matched by class/id is kept when it holds headings or more than
+# this share of the page text: the name is then on a page-wide wrapper
+# ("has-sidebar", "main-menu-and-content"), not on the furniture itself
+_HEADING_TAG = re.compile(r"<h[1-6][\s/>]", re.IGNORECASE)
+_WRAPPER_TEXT_SHARE = 0.5
+
+_BLOCK_TAGS = {
+    "address",
+    "article",
+    "blockquote",
+    "body",
+    "center",
+    "dd",
+    "details",
+    "div",
+    "dl",
+    "dt",
+    "fieldset",
+    "figure",
+    "header",
+    "footer",
+    "hr",
+    "main",
+    "p",
+    "section",
+    "summary",
+}
+
+_WHITESPACE = re.compile(r"\s+")
+
+# A tag, a comment, or a declaration. Quoted attribute values may hold ">";
+# no part of a tag may hold "<", which keeps broken markup from being rescanned
+_TOKEN = re.compile(
+    r"<(?:(?P<end>/)?(?P<tag>[a-zA-Z][^\s/<>]*)"
+    r"(?P<attrs>[^<>\"']*(?:(?:\"[^<\"]*\"|'[^<']*')[^<>\"']*)*)>"
+    r"|!--.*?(?:-->|\Z)|[!?][^<>]*>)",
+    re.DOTALL,
+)
+_ATTRIBUTE = re.compile(
+    r"""([^\s=/>"']+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+)))?"""
+)
+
+# Elements whose end tag may be left out; dropped ones are read tag by tag
+_OPTIONAL_END_TAGS = {
+    "body",
+    "caption",
+    "colgroup",
+    "dd",
+    "dt",
+    "head",
+    "html",
+    "li",
+    "optgroup",
+    "option",
+    "p",
+    "tbody",
+    "td",
+    "tfoot",
+    "th",
+    "thead",
+    "tr",
+}
+_SAME_TAG: Dict[str, "re.Pattern[str]"] = {}
+
+# Elements whose content is text up to their end tag, not markup
+_RAW_TEXT_END = {
+    tag: re.compile(rf"</{tag}\s*>", re.IGNORECASE)
+    for tag in ("script", "style", "textarea", "title")
+}
+
+_META_CHARSET = re.compile(
+    rb"""<meta[^>]+charset\s*=\s*["']?\s*([A-Za-z0-9_.:-]+)""", re.IGNORECASE
+)
+
+# Declared charsets browsers read differently (WHATWG encoding standard)
+_CHARSET_ALIASES = {
+    "ascii": "cp1252",
+    "us-ascii": "cp1252",
+    "iso-8859-1": "cp1252",
+    "latin1": "cp1252",
+    "gb2312": "gb18030",
+    "gbk": "gb18030",
+    "utf-16": "utf-8",
+    "utf-16le": "utf-8",
+    "utf-16be": "utf-8",
+}
+
+_DATA_URI = re.compile(r"data:image/([a-z+.-]+);base64,(.*)", re.IGNORECASE | re.DOTALL)
+
+# Images with a declared side below this are icons, spacers or tracking pixels
+_MIN_IMAGE_SIDE = 32
+
+
+def decode_html(data: bytes) -> str:
+    """Decode an HTML page using its BOM, its ``<meta charset>`` or detection"""
+    if not data.startswith((b"\xef\xbb\xbf", b"\xff\xfe", b"\xfe\xff")):
+        match = _META_CHARSET.search(data[:4096])
+        if match:
+            charset = match.group(1).decode("ascii").lower()
+            try:
+                return data.decode(_CHARSET_ALIASES.get(charset, charset))
+            except (LookupError, UnicodeDecodeError):
+                pass
+    return decode_text(data)[0]
+
+
+def _normalize(text: str) -> str:
+    lines = (" ".join(line.split()) for line in text.split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def _render_table(rows: List[List[Dict[str, Any]]]) -> str:
+    out = ["<table>"]
+    for row in rows:
+        out.append("<tr>")
+        for cell in row:
+            tag = "th" if cell["header"] else "td"
+            attrs = ""
+            if cell["colspan"] > 1:
+                attrs += f' colspan="{cell["colspan"]}"'
+            if cell["rowspan"] > 1:
+                attrs += f' rowspan="{cell["rowspan"]}"'
+            text = html.escape(cell["text"]).replace("\n", "<br>")
+            out.append(f"<{tag}{attrs}>{text}</{tag}>")
+        out.append("</tr>")
+    out.append("</table>")
+    return "".join(out)
+
+
+def _span(value: Optional[str]) -> int:
+    try:
+        return max(1, int(value or 1))
+    except ValueError:
+        return 1
+
+
+class _Table:
+    """A table being collected; ``layout`` tables are read as ordinary text"""
+
+    def __init__(self, layout: bool):
+        self.layout = layout
+        self.rows: List[List[Dict[str, Any]]] = []
+        self.row: Optional[List[Dict[str, Any]]] = None
+        self.cell: Optional[Dict[str, Any]] = None
+        self.caption: Optional[List[str]] = None
+        self.captions: List[str] = []
+        self.images: List[Dict[str, Any]] = []
+
+    def close_cell(self) -> None:
+        if self.cell is not None:
+            self.cell["text"] = _normalize("".join(self.cell["text"]))
+            if self.row is None:
+                self.row = []
+            self.row.append(self.cell)
+            self.cell = None
+
+    def close_row(self) -> None:
+        self.close_cell()
+        if self.row:
+            self.rows.append(self.row)
+        self.row = None
+
+    def cell_texts(self) -> str:
+        self.close_row()
+        return "\n".join(
+            " ".join(cell["text"] for cell in row if cell["text"]) for row in self.rows
+        )
+
+
+def _end_of_element(text: str, position: int, tag: str) -> Optional[int]:
+    """Position after the end tag closing the element opened just before ``position``"""
+    pattern = _SAME_TAG.get(tag)
+    if pattern is None:
+        pattern = _SAME_TAG[tag] = re.compile(
+            rf"<(/?){re.escape(tag)}(?=[\s/>])[^<>]*>", re.IGNORECASE
+        )
+    depth = 1
+    for match in pattern.finditer(text, position):
+        if match.group(1):
+            depth -= 1
+            if depth == 0:
+                return match.end()
+        elif not match.group(0).endswith("/>"):
+            depth += 1
+    return None
+
+
+_HIDDEN_TEXT = re.compile(
+    r"<(script|style|template)\b.*?(?:</\1\s*>|\Z)", re.IGNORECASE | re.DOTALL
+)
+
+
+def _text_volume(markup: str) -> int:
+    """Characters of visible text in a piece of markup, whitespace excluded"""
+    text = _TOKEN.sub(" ", _HIDDEN_TEXT.sub(" ", markup))
+    return sum(len(word) for word in text.split())
+
+
+def _unescape(text: str) -> str:
+    return html.unescape(text) if "&" in text else text
+
+
+def _parse_attributes(raw: str) -> List[Tuple[str, Optional[str]]]:
+    attrs: List[Tuple[str, Optional[str]]] = []
+    for match in _ATTRIBUTE.finditer(raw):
+        name, double, single, bare = match.groups()
+        value = double if double is not None else single
+        if value is None:
+            value = bare
+        attrs.append((name.lower(), _unescape(value) if value else value))
+    return attrs
+
+
+class _HtmlContentBuilder:
+    """Map parser events to content items while the page is read"""
+
+    def __init__(
+        self,
+        base_dir: Optional[Path],
+        image_dir: Optional[Path],
+        page_chars: int,
+        strip_by_name: bool = True,
+    ):
+        self.base_dir = base_dir
+        self.image_dir = image_dir
+        self.strip_by_name = strip_by_name
+        self.pages = SyntheticPages(page_chars)
+        self.content_list: List[Dict[str, Any]] = []
+        self.title: List[str] = []
+        self._stack: List[str] = []
+        # Open elements per tag name, to ignore stray end tags quickly
+        self._open_counts: Dict[str, int] = {}
+        # Stack depth of the element being dropped, if any
+        self._skip_depth: Optional[int] = None
+        self._in_title = False
+        self._text: List[str] = []
+        self._heading: Optional[int] = None
+        self._pre = 0
+        # One entry per open list: 0 for bullets, else the next number
+        self._lists: List[int] = []
+        self._tables: List[_Table] = []
+        self._pending_images: List[Dict[str, Any]] = []
+        self._figures: List[List[Dict[str, Any]]] = []
+        self._figcaption: Optional[List[str]] = None
+        # Page being fed and the position after the current start tag
+        self._source = ""
+        self._source_volume = 0
+        self._position = 0
+
+    def _add(self, item: Dict[str, Any], size: int) -> None:
+        item["page_idx"] = self.pages.place(size)
+        self.content_list.append(item)
+
+    def _add_text(self, text: str, level: Optional[int] = None) -> None:
+        if level:
+            self._add({"type": "text", "text": text, "text_level": level}, len(text))
+            return
+        for block in split_long_paragraph(text, self.pages.page_chars):
+            self._add({"type": "text", "text": block}, len(block))
+
+    def _flush(self) -> None:
+        if self._text:
+            raw = "".join(self._text)
+            self._text = []
+            text = raw.strip("\n") if self._pre else _normalize(raw)
+            if text:
+                self._add_text(text, self._heading)
+        for image in self._pending_images:
+            self._add(image, 0)
+        self._pending_images = []
+
+    def _collecting(self) -> Optional[_Table]:
+        """The data table receiving cell text, if any"""
+        if self._tables and not self._tables[-1].layout:
+            return self._tables[-1]
+        return None
+
+    def _sink(self) -> List[str]:
+        if self._figcaption is not None:
+            return self._figcaption
+        table = self._collecting()
+        if table is not None:
+            if table.caption is not None:
+                return table.caption
+            if table.cell is not None:
+                return table.cell["text"]
+        return self._text
+
+    def _line_break(self) -> None:
+        """End a block: a new line inside cells and lists, else a new item"""
+        if self._collecting() is not None or self._figcaption is not None:
+            self._sink().append("\n")
+        elif self._lists:
+            self._text.append("\n")
+        else:
+            self._flush()
+
+    def _is_boilerplate(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> bool:
+        if tag in _SKIPPED_TAGS:
+            return True
+        if tag in _CHROME_TAGS and not any(
+            self._open_counts.get(content_tag) for content_tag in _CONTENT_TAGS
+        ):
+            return True
+        for name, value in attrs:
+            if value is None:
+                if name == "hidden":
+                    return True
+                continue
+            if name == "role":
+                if value.lower() in _BOILERPLATE_ROLES:
+                    return True
+            elif name == "aria-hidden":
+                if value.lower() == "true":
+                    return True
+            elif name == "style":
+                style = value.replace(" ", "").lower()
+                if "display:none" in style or "visibility:hidden" in style:
+                    return True
+            elif (
+                name in ("class", "id")
+                and self.strip_by_name
+                and tag not in _NEVER_STRIPPED_BY_NAME
+            ):
+                if _BOILERPLATE_NAME.search(value) and not self._wraps_content(tag):
+                    return True
+        return False
+
+    def _wraps_content(self, tag: str) -> bool:
+        """Whether the element starting at the current position holds the content"""
+        end = _end_of_element(self._source, self._position, tag)
+        inner = self._source[self._position : end]
+        if _HEADING_TAG.search(inner):
+            return True
+        return _text_volume(inner) > self._source_volume * _WRAPPER_TEXT_SHARE
+
+    def feed(self, text: str) -> None:
+        """Tokenize a page and dispatch its tags and text"""
+        self._source = text
+        self._source_volume = _text_volume(text) if self.strip_by_name else 0
+        position = 0
+        search = _TOKEN.search
+        while True:
+            match = search(text, position)
+            if match is None:
+                break
+            if match.start() > position:
+                self.handle_data(_unescape(text[position : match.start()]))
+            position = match.end()
+            is_end, tag, raw = match.group("end", "tag", "attrs")
+            if tag is None:
+                continue
+            tag = tag.lower()
+            if is_end:
+                self.handle_endtag(tag)
+                continue
+            self._position = position
+            self.handle_starttag(tag, _parse_attributes(raw) if raw else [])
+            if raw.endswith("/") and tag not in _VOID_TAGS:
+                self.handle_endtag(tag)
+            elif tag in _RAW_TEXT_END:
+                end = _RAW_TEXT_END[tag].search(text, position)
+                stop = end.start() if end else len(text)
+                self.handle_data(_unescape(text[position:stop]))
+                position = end.end() if end else len(text)
+                self.handle_endtag(tag)
+            elif self._skip_depth == len(self._stack) and tag not in _OPTIONAL_END_TAGS:
+                # Jump over a dropped element instead of reading its markup
+                end = _end_of_element(text, position, tag)
+                if end is not None:
+                    position = end
+                    self.handle_endtag(tag)
+        if position < len(text):
+            self.handle_data(_unescape(text[position:]))
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]):
+        if tag in _VOID_TAGS:
+            if self._skip_depth is None:
+                self._void(tag, attrs)
+            return
+        skipping = self._skip_depth is not None
+        if not skipping and self._is_boilerplate(tag, attrs):
+            self._skip_depth = len(self._stack) + 1
+            skipping = True
+        self._stack.append(tag)
+        self._open_counts[tag] = self._open_counts.get(tag, 0) + 1
+        if not skipping:
+            self._open(tag, attrs)
+
+    def handle_endtag(self, tag: str):
+        if not self._open_counts.get(tag):
+            return
+        # Close everything left open inside the element as well
+        while self._stack:
+            open_tag = self._stack.pop()
+            self._open_counts[open_tag] -= 1
+            if self._skip_depth is not None:
+                if len(self._stack) < self._skip_depth:
+                    self._skip_depth = None
+            else:
+                self._close(open_tag)
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data: str):
+        if self._skip_depth is not None:
+            return
+        if self._in_title:
+            self.title.append(data)
+        elif self._pre:
+            self._sink().append(data)
+        else:
+            self._sink().append(_WHITESPACE.sub(" ", data))
+
+    def _open(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        if tag in _BLOCK_TAGS:
+            self._line_break()
+            if tag == "figure":
+                self._figures.append([])
+        elif tag in _HEADINGS:
+            if self._collecting() is None:
+                self._flush()
+                self._heading = _HEADINGS[tag]
+        elif tag in ("ul", "ol"):
+            if self._lists or self._collecting() is not None:
+                self._line_break()
+            else:
+                self._flush()
+            self._lists.append(1 if tag == "ol" else 0)
+        elif tag == "li":
+            self._line_break()
+            if self._lists:
+                number = self._lists[-1]
+                if number:
+                    self._lists[-1] += 1
+                self._sink().append(f"{number}. " if number else "- ")
+        elif tag == "pre":
+            if self._collecting() is None:
+                self._flush()
+            self._pre += 1
+        elif tag == "figcaption":
+            if self._figures:
+                self._flush()
+                self._figcaption = []
+        elif tag == "title":
+            self._in_title = True
+        elif tag == "table":
+            self._open_table(attrs)
+        elif tag in ("tr", "td", "th", "caption"):
+            self._open_table_part(tag, attrs)
+
+    def _close(self, tag: str) -> None:
+        if tag in _BLOCK_TAGS:
+            if tag == "figure" and self._figures:
+                self._figures.pop()
+            self._line_break()
+        elif tag in _HEADINGS:
+            if self._collecting() is None:
+                self._flush()
+                self._heading = None
+        elif tag in ("ul", "ol"):
+            if self._lists:
+                self._lists.pop()
+            if self._lists or self._collecting() is not None:
+                self._line_break()
+            else:
+                self._flush()
+        elif tag == "li":
+            self._line_break()
+        elif tag == "pre":
+            if self._collecting() is None:
+                self._flush()
+            self._pre = max(0, self._pre - 1)
+        elif tag == "figcaption":
+            if self._figcaption is not None:
+                caption = _normalize("".join(self._figcaption))
+                self._figcaption = None
+                if caption and self._figures:
+                    for image in self._figures[-1]:
+                        image["image_caption"].append(caption)
+        elif tag == "title":
+            self._in_title = False
+        elif tag == "table":
+            self._close_table()
+        elif tag in ("tr", "td", "th", "caption"):
+            self._close_table_part(tag)
+
+    def _void(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        if tag == "br":
+            self._sink().append("\n")
+        elif tag == "hr":
+            self._line_break()
+        elif tag == "img":
+            self._image(dict(attrs))
+
+    def _open_table(self, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        self._flush()
+        # Tables holding tables lay out the page: read what they hold as text
+        for table in self._tables:
+            if not table.layout:
+                table.layout = True
+                text = table.cell_texts()
+                table.rows = []
+                if text:
+                    self._add_text(text)
+                for image in table.images:
+                    self._add(image, 0)
+                table.images = []
+        role = next((value for name, value in attrs if name == "role"), None)
+        self._tables.append(_Table(layout=(role or "").lower() == "presentation"))
+
+    def _close_table(self) -> None:
+        table = self._tables.pop()
+        if table.layout:
+            self._flush()
+            return
+        table.close_row()
+        cells = sum(len(row) for row in table.rows)
+        if cells > 1:
+            table_body = _render_table(table.rows)
+            self._add(
+                {
+                    "type": "table",
+                    "table_body": table_body,
+                    "table_caption": table.captions,
+                    "table_footnote": [],
+                },
+                len(table_body),
+            )
+        else:
+            # A single cell frames content rather than tabulating it
+            text = "\n".join(table.captions + [table.cell_texts()]).strip()
+            if text:
+                self._add_text(text)
+        for image in table.images:
+            self._add(image, 0)
+
+    def _open_table_part(
+        self, tag: str, attrs: List[Tuple[str, Optional[str]]]
+    ) -> None:
+        table = self._collecting()
+        if table is None:
+            if self._tables:
+                self._line_break()
+            return
+        if tag == "tr":
+            table.close_row()
+            table.row = []
+        elif tag == "caption":
+            table.close_cell()
+            table.caption = []
+        else:
+            table.close_cell()
+            values = dict(attrs)
+            table.cell = {
+                "text": [],
+                "header": tag == "th",
+                "colspan": _span(values.get("colspan")),
+                "rowspan": _span(values.get("rowspan")),
+            }
+
+    def _close_table_part(self, tag: str) -> None:
+        table = self._collecting()
+        if table is None:
+            if self._tables:
+                self._line_break()
+            return
+        if tag == "tr":
+            table.close_row()
+        elif tag == "caption":
+            if table.caption is not None:
+                caption = _normalize("".join(table.caption))
+                if caption:
+                    table.captions.append(caption)
+                table.caption = None
+        else:
+            table.close_cell()
+
+    def _image(self, attrs: Dict[str, Optional[str]]) -> None:
+        for side in ("width", "height"):
+            value = (attrs.get(side) or "").strip().lower().removesuffix("px")
+            if value.isdigit() and int(value) < _MIN_IMAGE_SIDE:
+                return
+        path = self._image_path((attrs.get("src") or "").strip())
+        if path is None:
+            return
+        image = {
+            "type": "image",
+            "img_path": path,
+            "image_caption": [
+                caption.strip()
+                for caption in (attrs.get("alt"), attrs.get("title"))
+                if caption and caption.strip()
+            ],
+            "image_footnote": [],
+        }
+        if self._figures:
+            self._figures[-1].append(image)
+        table = self._collecting()
+        if table is not None:
+            table.images.append(image)
+        else:
+            self._pending_images.append(image)
+
+    def _image_path(self, src: str) -> Optional[str]:
+        """Absolute path of a local or embedded raster image, else None"""
+        if src[:5].lower() == "data:":
+            return self._write_data_uri(src)
+        if src.startswith("file://"):
+            src = src[7:]
+        elif self.base_dir is None or "://" in src or src.startswith(("//", "#")):
+            return None
+        path = Path(unquote(src.split("#", 1)[0].split("?", 1)[0]))
+        if path.suffix.lower() not in RASTER_IMAGE_EXTENSIONS:
+            return None
+        if not path.is_absolute() and self.base_dir is not None:
+            path = self.base_dir / path
+        return str(path.resolve()) if path.is_file() else None
+
+    def _write_data_uri(self, src: str) -> Optional[str]:
+        match = _DATA_URI.match(src)
+        if match is None or self.image_dir is None:
+            return None
+        extension = "." + match.group(1).lower().replace("jpeg", "jpg")
+        if extension not in RASTER_IMAGE_EXTENSIONS:
+            return None
+        try:
+            data = base64.b64decode(match.group(2), validate=False)
+        except (binascii.Error, ValueError):
+            return None
+        if len(data) < 128:
+            return None
+        self.image_dir.mkdir(parents=True, exist_ok=True)
+        path = self.image_dir / (hashlib.sha1(data).hexdigest()[:16] + extension)
+        if not path.exists():
+            path.write_bytes(data)
+        return str(path.resolve())
+
+    def finish(self) -> List[Dict[str, Any]]:
+        while self._tables:
+            self._close_table()
+        self._flush()
+        return self.content_list
+
+
+def html_to_content_list(
+    text: str,
+    base_dir: Optional[Union[str, Path]] = None,
+    image_dir: Optional[Union[str, Path]] = None,
+    page_chars: int = DEFAULT_PAGE_CHARS,
+) -> List[Dict[str, Any]]:
+    """Convert an HTML page into typed content items
+
+    Args:
+        text: HTML source
+        base_dir: Directory relative image links are resolved against (local
+            images are skipped when None)
+        image_dir: Directory ``data:`` images are written to (skipped when None)
+        page_chars: Characters per synthetic page
+
+    Returns:
+        List of text, table and image items in document order
+    """
+    base_dir = Path(base_dir).resolve() if base_dir is not None else None
+    image_dir = Path(image_dir) if image_dir is not None else None
+    builder = _HtmlContentBuilder(base_dir, image_dir, page_chars)
+    builder.feed(text)
+    content_list = builder.finish()
+    if not any(item["type"] != "image" for item in content_list):
+        # The class and id heuristics can catch a page-wide wrapper
+        builder = _HtmlContentBuilder(
+            base_dir, image_dir, page_chars, strip_by_name=False
+        )
+        builder.feed(text)
+        content_list = builder.finish()
+    # Pages without a main heading are titled by <title>
+    title = _normalize("".join(builder.title))
+    if title and not any(item.get("text_level") == 1 for item in content_list):
+        content_list.insert(
+            0, {"type": "text", "text": title, "text_level": 1, "page_idx": 0}
+        )
+    return content_list
+
+
+def parse_html_file(
+    html_path: Union[str, Path],
+    output_dir: Optional[Union[str, Path]] = None,
+    page_chars: int = DEFAULT_PAGE_CHARS,
+) -> List[Dict[str, Any]]:
+    """Parse an HTML page into typed ``content_list`` items
+
+    Embedded ``data:`` images are written to ``<output_dir>/<stem>/html/images``.
+    """
+    html_path = Path(html_path)
+    if not html_path.exists():
+        raise FileNotFoundError(f"HTML file does not exist: {html_path}")
+    base_output_dir = Path(output_dir) if output_dir else html_path.parent / "output"
+    content_list = html_to_content_list(
+        decode_html(html_path.read_bytes()),
+        base_dir=html_path.parent,
+        image_dir=base_output_dir / html_path.stem / "html" / "images",
+        page_chars=page_chars,
+    )
+    logger.info(f"Parsed {html_path.name} natively: {len(content_list)} content blocks")
+    return content_list
@@ -0,0 +1,210 @@
+"""
+Shared HTTP client pool for the 'api' backend
+
+Keeps one long-lived httpx.AsyncClient per event loop so that embedding, chat
+and vision calls reuse keep-alive (and, when available, HTTP/2) connections
+instead of paying a TCP+TLS handshake on every request.
+"""
+
+import asyncio
+import importlib.util
+import threading
+import weakref
+from typing import Any, Dict, Optional
+
+import httpx
+from lightrag.utils import logger
+
+
+class HTTPClientPool:
+    """Process-wide, lifecycle-managed pool of httpx.AsyncClient instances
+
+    httpx clients are bound to the event loop they were first used on, so the
+    pool lazily creates one client per running loop and shares it between all
+    callers on that loop.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: bool = True,
+        connect_timeout: float = 10.0,
+    ):
+        """Initialize the pool
+
+        Args:
+            max_connections: Maximum number of concurrent connections per client
+            max_keepalive_connections: Maximum number of idle keep-alive connections
+            keepalive_expiry: Seconds an idle connection is kept open
+            http2: Enable HTTP/2 when the optional 'h2' package is installed
+            connect_timeout: Timeout in seconds for establishing a connection
+        """
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.connect_timeout = connect_timeout
+        self.http2 = http2 and self._http2_available()
+
+        self._clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._users = 0
+
+        # Connection reuse statistics
+        self._seen_streams: weakref.WeakSet = weakref.WeakSet()
+        self._requests = 0
+        self._connections_opened = 0
+        self._clients_created = 0
+        self._http_versions: Dict[str, int] = {}
+
+    @staticmethod
+    def _http2_available() -> bool:
+        """Check whether the optional 'h2' dependency is installed"""
+        if importlib.util.find_spec("h2") is None:
+            logger.warning(
+                "HTTP/2 requested for API clients but 'h2' is not installed, "
+                "falling back to HTTP/1.1. Install it with: pip install 'httpx[http2]'"
+            )
+            return False
+        return True
+
+    def _create_client(self) -> httpx.AsyncClient:
+        """Create a new AsyncClient with the configured limits"""
+        limits = httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+        timeout = httpx.Timeout(None, connect=self.connect_timeout)
+        self._clients_created += 1
+        return httpx.AsyncClient(
+            limits=limits,
+            timeout=timeout,
+            http2=self.http2,
+            event_hooks={"response": [self._record_response]},
+        )
+
+    async def _record_response(self, response: httpx.Response) -> None:
+        """Response hook that tracks how often connections are reused"""
+        self._requests += 1
+        http_version = response.extensions.get("http_version", b"")
+        if isinstance(http_version, bytes):
+            http_version = http_version.decode("ascii", errors="ignore")
+        if http_version:
+            self._http_versions[http_version] = (
+                self._http_versions.get(http_version, 0) + 1
+            )
+
+        stream = response.extensions.get("network_stream")
+        if stream is None:
+            return
+        try:
+            if stream not in self._seen_streams:
+                self._seen_streams.add(stream)
+                self._connections_opened += 1
+        except TypeError:
+            # Stream object does not support weak references, count as new
+            self._connections_opened += 1
+
+    async def get_client(self) -> httpx.AsyncClient:
+        """Return the shared client for the running event loop"""
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None or client.is_closed:
+            client = self._create_client()
+            self._clients[loop] = client
+        return client
+
+    def acquire(self) -> "HTTPClientPool":
+        """Register a user of the pool (e.g. a RAGAnything instance)"""
+        with self._lock:
+            self._users += 1
+        return self
+
+    async def release(self) -> None:
+        """Unregister a user and close the clients once nobody uses the pool"""
+        with self._lock:
+            self._users = max(0, self._users - 1)
+            should_close = self._users == 0
+        if should_close:
+            await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close all clients owned by the pool"""
+        try:
+            current_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            current_loop = None
+
+        for loop, client in list(self._clients.items()):
+            if client.is_closed:
+                continue
+            if loop is current_loop:
+                await client.aclose()
+            elif not loop.is_closed() and loop.is_running():
+                asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+        self._clients.clear()
+        logger.debug("HTTP client pool closed")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get connection reuse statistics"""
+        reused = max(0, self._requests - self._connections_opened)
+        return {
+            "requests": self._requests,
+            "connections_opened": self._connections_opened,
+            "connections_reused": reused,
+            "reuse_ratio": reused / self._requests if self._requests else 0.0,
+            "clients_created": self._clients_created,
+            "open_clients": sum(
+                1 for client in self._clients.values() if not client.is_closed
+            ),
+            "http2_enabled": self.http2,
+            "http_versions": dict(self._http_versions),
+        }
+
+
+_pool: Optional[HTTPClientPool] = None
+_pool_lock = threading.Lock()
+
+
+def configure_http_pool(config) -> HTTPClientPool:
+    """Create (or return) the process-wide pool using limits from a RAGAnythingConfig
+
+    The first configuration wins; later calls return the existing pool so that
+    all RAGAnything instances in a process share the same connections.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = HTTPClientPool(
+                max_connections=config.api_max_connections,
+                max_keepalive_connections=config.api_max_keepalive_connections,
+                keepalive_expiry=config.api_keepalive_expiry,
+                http2=config.api_http2,
+                connect_timeout=config.api_connect_timeout,
+            )
+        return _pool
+
+
+def get_http_pool() -> HTTPClientPool:
+    """Get the process-wide pool, creating it from the default config if needed"""
+    if _pool is None:
+        from raganything.config import RAGAnythingConfig
+
+        return configure_http_pool(RAGAnythingConfig())
+    return _pool
+
+
+def get_existing_http_pool() -> Optional[HTTPClientPool]:
+    """Get the process-wide pool if it has been created, without creating it"""
+    return _pool
+
+
+async def close_http_pool() -> None:
+    """Close and discard the process-wide pool"""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        await pool.aclose()
@@ -0,0 +1,370 @@
+"""
+Image preparation for vision model payloads
+
+Page crops produced by MinerU are often multi-megabyte PNGs. Before an image is
+sent to a vision model it is downscaled to the model's resolution cap,
+re-encoded to an efficient format (JPEG by default) until it fits the byte
+budget, and labelled with the MIME type of the bytes actually sent. Prepared
+payloads are cached by file content hash (in memory and optionally on disk), and
+the CPU-heavy work runs in a thread pool so it never blocks the event loop.
+"""
+
+import asyncio
+import base64
+import hashlib
+import io
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from lightrag.utils import logger
+
+try:
+    from PIL import Image
+
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+# Output formats supported for re-encoding, with their MIME types
+_FORMAT_MIME = {
+    "JPEG": "image/jpeg",
+    "WEBP": "image/webp",
+    "PNG": "image/png",
+}
+
+# Magic numbers used to detect the MIME type of raw image bytes
+_MAGIC_MIME = (
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+    (b"BM", "image/bmp"),
+    (b"II*\x00", "image/tiff"),
+    (b"MM\x00*", "image/tiff"),
+)
+
+
+def guess_image_mime(data: bytes, default: str = "image/jpeg") -> str:
+    """Detect the MIME type of image bytes from their magic number"""
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+    for magic, mime in _MAGIC_MIME:
+        if data.startswith(magic):
+            return mime
+    return default
+
+
+def guess_base64_image_mime(data_b64: str, default: str = "image/jpeg") -> str:
+    """Detect the MIME type of a base64 encoded image"""
+    try:
+        head = base64.b64decode(data_b64[:24] + "=" * (-len(data_b64[:24]) % 4))
+    except ValueError:
+        return default
+    return guess_image_mime(head, default)
+
+
+@dataclass(frozen=True)
+class ImageLimits:
+    """Resolution and size caps for one vision model"""
+
+    max_edge: int = 2048
+    max_bytes: int = 4 * 1024 * 1024
+
+
+@dataclass
+class PreparedImage:
+    """Image payload ready to be sent to a vision model"""
+
+    data_b64: str
+    mime_type: str
+    width: int = 0
+    height: int = 0
+    source_bytes: int = 0
+    encoded_bytes: int = 0
+
+    @property
+    def data_url(self) -> str:
+        return f"data:{self.mime_type};base64,{self.data_b64}"
+
+
+def parse_model_limits(spec: str) -> Dict[str, ImageLimits]:
+    """Parse per-model limits given as ``model=max_edge:max_bytes,...``"""
+    limits = {}
+    for entry in spec.split(","):
+        entry = entry.strip()
+        if not entry or "=" not in entry:
+            continue
+        model, _, values = entry.partition("=")
+        edge, _, size = values.partition(":")
+        try:
+            limits[model.strip()] = ImageLimits(
+                max_edge=int(edge) if edge else ImageLimits.max_edge,
+                max_bytes=int(size) if size else ImageLimits.max_bytes,
+            )
+        except ValueError:
+            logger.warning(f"Ignoring invalid vision image limit: {entry}")
+    return limits
+
+
+class ImagePreparer:
+    """Downscale, re-encode and cache images for vision model calls"""
+
+    def __init__(
+        self,
+        default_limits: Optional[ImageLimits] = None,
+        model_limits: Optional[Dict[str, ImageLimits]] = None,
+        output_format: str = "JPEG",
+        quality: int = 85,
+        cache_dir: Optional[str] = None,
+        max_cached_items: int = 256,
+        max_workers: Optional[int] = None,
+    ):
+        """Initialize the preparer
+
+        Args:
+            default_limits: Caps used for models without a specific entry
+            model_limits: Caps keyed by model name
+            output_format: Re-encoding format: 'JPEG', 'WEBP' or 'PNG'
+            quality: Initial encoder quality for lossy formats
+            cache_dir: Optional directory persisting prepared payloads
+            max_cached_items: Number of prepared payloads kept in memory
+            max_workers: Worker threads used by prepare_async
+        """
+        self.default_limits = default_limits or ImageLimits()
+        self.model_limits = model_limits or {}
+        self.output_format = output_format.upper()
+        if self.output_format not in _FORMAT_MIME:
+            logger.warning(
+                f"Unsupported vision image format '{output_format}', using JPEG"
+            )
+            self.output_format = "JPEG"
+        self.quality = quality
+        self.cache_dir = cache_dir
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        self.max_cached_items = max_cached_items
+        self._cache: "OrderedDict[str, PreparedImage]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or min(4, os.cpu_count() or 1),
+            thread_name_prefix="image-prep",
+        )
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def limits_for(self, model: Optional[str]) -> ImageLimits:
+        return self.model_limits.get(model or "", self.default_limits)
+
+    def _cache_key(self, data: bytes, limits: ImageLimits) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        return (
+            f"{digest}_{limits.max_edge}_{limits.max_bytes}_"
+            f"{self.output_format}_{self.quality}"
+        )
+
+    def _cache_get(self, key: str) -> Optional[PreparedImage]:
+        with self._lock:
+            prepared = self._cache.get(key)
+            if prepared is not None:
+                self._cache.move_to_end(key)
+                return prepared
+        if self.cache_dir:
+            path = os.path.join(self.cache_dir, key)
+            try:
+                with open(path, "rb") as f:
+                    data = f.read()
+            except OSError:
+                return None
+            prepared = PreparedImage(
+                data_b64=base64.b64encode(data).decode("utf-8"),
+                mime_type=guess_image_mime(data),
+                encoded_bytes=len(data),
+            )
+            self._cache_put(key, prepared, None)
+            return prepared
+        return None
+
+    def _cache_put(
+        self, key: str, prepared: PreparedImage, data: Optional[bytes]
+    ) -> None:
+        with self._lock:
+            self._cache[key] = prepared
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_cached_items:
+                self._cache.popitem(last=False)
+        if data is not None and self.cache_dir:
+            path = os.path.join(self.cache_dir, key)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            try:
+                with open(tmp_path, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                logger.debug(f"Could not persist prepared image {key}: {e}")
+
+    def _encode(self, data: bytes, limits: ImageLimits) -> Tuple[bytes, str, int, int]:
+        """Downscale and re-encode image bytes to fit the limits"""
+        if not PIL_AVAILABLE:
+            return data, guess_image_mime(data), 0, 0
+
+        with Image.open(io.BytesIO(data)) as image:
+            image.load()
+            width, height = image.size
+            mime = guess_image_mime(data)
+            fits = (
+                max(width, height) <= limits.max_edge
+                and len(data) <= limits.max_bytes
+                and mime == _FORMAT_MIME[self.output_format]
+            )
+            if fits:
+                return data, mime, width, height
+
+            if max(width, height) > limits.max_edge:
+                image.thumbnail(
+                    (limits.max_edge, limits.max_edge), Image.Resampling.LANCZOS
+                )
+
+            if self.output_format == "JPEG" and image.mode not in ("RGB", "L"):
+                # JPEG has no alpha channel: flatten onto white
+                rgba = image.convert("RGBA")
+                image = Image.new("RGB", rgba.size, (255, 255, 255))
+                image.paste(rgba, mask=rgba.getchannel("A"))
+            elif self.output_format == "WEBP" and image.mode not in (
+                "RGB",
+                "RGBA",
+                "L",
+            ):
+                image = image.convert("RGBA")
+
+            quality = self.quality
+            while True:
+                buffer = io.BytesIO()
+                save_kwargs = {"optimize": True}
+                if self.output_format in ("JPEG", "WEBP"):
+                    save_kwargs["quality"] = quality
+                image.save(buffer, format=self.output_format, **save_kwargs)
+                encoded = buffer.getvalue()
+                if len(encoded) <= limits.max_bytes:
+                    break
+                # Over budget: lower quality first, then resolution
+                if self.output_format != "PNG" and quality > 50:
+                    quality -= 10
+                elif min(image.size) > 64:
+                    image = image.resize(
+                        (max(1, image.width * 3 // 4), max(1, image.height * 3 // 4)),
+                        Image.Resampling.LANCZOS,
+                    )
+                else:
+                    break
+
+            return (
+                encoded,
+                _FORMAT_MIME[self.output_format],
+                image.width,
+                image.height,
+            )
+
+    def prepare(self, image_path: str, model: Optional[str] = None) -> PreparedImage:
+        """Prepare an image file for a vision model (blocking)"""
+        with open(image_path, "rb") as f:
+            data = f.read()
+        limits = self.limits_for(model)
+        key = self._cache_key(data, limits)
+
+        prepared = self._cache_get(key)
+        if prepared is not None:
+            self.hits += 1
+            return prepared
+
+        self.misses += 1
+        try:
+            encoded, mime, width, height = self._encode(data, limits)
+        except Exception as e:
+            logger.warning(f"Could not re-encode {image_path}, sending original: {e}")
+            encoded, mime, width, height = data, guess_image_mime(data), 0, 0
+
+        prepared = PreparedImage(
+            data_b64=base64.b64encode(encoded).decode("utf-8"),
+            mime_type=mime,
+            width=width,
+            height=height,
+            source_bytes=len(data),
+            encoded_bytes=len(encoded),
+        )
+        self.bytes_in += len(data)
+        self.bytes_out += len(encoded)
+        # Images sent unchanged are not worth duplicating on disk
+        self._cache_put(key, prepared, encoded if encoded is not data else None)
+        return prepared
+
+    async def prepare_async(
+        self, image_path: str, model: Optional[str] = None
+    ) -> PreparedImage:
+        """Prepare an image file in the worker pool without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, self.prepare, image_path, model
+        )
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get cache and size reduction statistics"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "cached_items": len(self._cache),
+        }
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+
+
+_preparer: Optional[ImagePreparer] = None
+_preparer_lock = threading.Lock()
+
+
+def configure_image_preparer(config) -> ImagePreparer:
+    """Create (or return) the process-wide preparer from a RAGAnythingConfig
+
+    The first configuration wins so that ingest and query share one cache.
+    """
+    global _preparer
+    with _preparer_lock:
+        if _preparer is None:
+            if not PIL_AVAILABLE:
+                logger.warning(
+                    "Pillow is not installed, images are sent to vision models "
+                    "without resizing. Install it with: pip install raganything[image]"
+                )
+            cache_dir = config.vision_image_cache_dir or os.path.join(
+                config.working_dir, "image_cache"
+            )
+            _preparer = ImagePreparer(
+                default_limits=ImageLimits(
+                    max_edge=config.vision_image_max_edge,
+                    max_bytes=config.vision_image_max_bytes,
+                ),
+                model_limits=parse_model_limits(config.vision_image_model_limits),
+                output_format=config.vision_image_format,
+                quality=config.vision_image_quality,
+                cache_dir=cache_dir,
+            )
+        return _preparer
+
+
+def get_image_preparer() -> ImagePreparer:
+    """Get the process-wide preparer, creating it from the default config if needed"""
+    if _preparer is None:
+        from raganything.config import RAGAnythingConfig
+
+        return configure_image_preparer(RAGAnythingConfig())
+    return _preparer
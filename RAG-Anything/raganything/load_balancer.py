@@ -0,0 +1,179 @@
+"""
+Latency-aware load balancing across OpenAI-compatible endpoints
+
+Each request kind (chat, vision, embedding) can be served by several weighted
+endpoints, e.g. a hosted gateway plus local Ollama boxes. Endpoints are picked
+with "power of two choices": two weighted-random candidates are compared on
+EWMA latency x (outstanding requests + 1) / weight and the cheaper one wins.
+Endpoints that fail repeatedly are ejected for a while and then probed again.
+"""
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from lightrag.utils import logger
+
+
+@dataclass
+class Endpoint:
+    """One OpenAI-compatible endpoint and its live statistics"""
+
+    url: str
+    weight: float = 1.0
+    model: Optional[str] = None
+
+    ewma_latency: Optional[float] = None
+    outstanding: int = 0
+    consecutive_failures: int = 0
+    ejected_until: float = 0.0
+    requests: int = 0
+    errors: int = 0
+    ejections: int = 0
+
+    def is_available(self, now: float) -> bool:
+        return now >= self.ejected_until
+
+
+def parse_endpoints(spec: str) -> List[Endpoint]:
+    """Parse a comma-separated endpoint list
+
+    Each entry is ``url|weight|model``; weight and model are optional, e.g.
+    ``https://gw.example.com/v1/chat/completions|3,http://ollama:11434/v1/chat/completions|1|llama3.1``.
+    """
+    endpoints = []
+    for entry in spec.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        parts = [part.strip() for part in entry.split("|")]
+        try:
+            weight = float(parts[1]) if len(parts) > 1 and parts[1] else 1.0
+        except ValueError:
+            weight = 0.0
+        if not 0 < weight < float("inf"):
+            logger.warning(f"Ignoring endpoint with invalid weight: {entry}")
+            continue
+        model = parts[2] if len(parts) > 2 and parts[2] else None
+        endpoints.append(Endpoint(url=parts[0], weight=weight, model=model))
+    return endpoints
+
+
+class LoadBalancer:
+    """Pick endpoints by EWMA latency and outstanding requests, ejecting failing ones"""
+
+    def __init__(
+        self,
+        kind: str,
+        endpoints: List[Endpoint],
+        ewma_alpha: float = 0.3,
+        eject_failures: int = 3,
+        eject_seconds: float = 30.0,
+    ):
+        """Initialize the balancer
+
+        Args:
+            kind: Request kind, used in logs and statistics
+            endpoints: Candidate endpoints (at least one)
+            ewma_alpha: Smoothing factor of the latency EWMA
+            eject_failures: Consecutive failures after which an endpoint is ejected
+            eject_seconds: How long an ejected endpoint is skipped
+        """
+        if not endpoints:
+            raise ValueError(f"No endpoints configured for {kind} API calls")
+        self.kind = kind
+        self.endpoints = endpoints
+        self.ewma_alpha = ewma_alpha
+        self.eject_failures = max(1, eject_failures)
+        self.eject_seconds = eject_seconds
+        self._lock = threading.Lock()
+
+    def _cost(self, endpoint: Endpoint) -> float:
+        # Unmeasured endpoints look fast so that they get sampled early
+        latency = endpoint.ewma_latency if endpoint.ewma_latency is not None else 0.0
+        return (latency + 1e-3) * (endpoint.outstanding + 1) / endpoint.weight
+
+    def acquire(self) -> Endpoint:
+        """Pick an endpoint for one request and count it as outstanding"""
+        with self._lock:
+            now = time.monotonic()
+            candidates = [ep for ep in self.endpoints if ep.is_available(now)]
+            if not candidates:
+                # Everything is ejected: try the one that comes back first
+                endpoint = min(self.endpoints, key=lambda ep: ep.ejected_until)
+            elif len(candidates) == 1:
+                endpoint = candidates[0]
+            else:
+                weights = [ep.weight for ep in candidates]
+                first, second = random.choices(candidates, weights=weights, k=2)
+                endpoint = min(first, second, key=self._cost)
+            endpoint.outstanding += 1
+            endpoint.requests += 1
+            return endpoint
+
+    def release(self, endpoint: Endpoint, latency: float, success: bool) -> None:
+        """Record the outcome of a request sent to ``endpoint``"""
+        with self._lock:
+            endpoint.outstanding = max(0, endpoint.outstanding - 1)
+            if success:
+                endpoint.consecutive_failures = 0
+                if endpoint.ewma_latency is None:
+                    endpoint.ewma_latency = latency
+                else:
+                    endpoint.ewma_latency += self.ewma_alpha * (
+                        latency - endpoint.ewma_latency
+                    )
+                return
+
+            endpoint.errors += 1
+            endpoint.consecutive_failures += 1
+            if endpoint.consecutive_failures >= self.eject_failures:
+                endpoint.ejected_until = time.monotonic() + self.eject_seconds
+                endpoint.consecutive_failures = 0
+                endpoint.ejections += 1
+                logger.warning(
+                    f"Ejecting {self.kind} endpoint {endpoint.url} for "
+                    f"{self.eject_seconds:.0f}s after repeated failures"
+                )
+
+    def cancel(self, endpoint: Endpoint) -> None:
+        """Forget a request that was cancelled before it completed"""
+        with self._lock:
+            endpoint.outstanding = max(0, endpoint.outstanding - 1)
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        """Get per-endpoint statistics"""
+        now = time.monotonic()
+        return [
+            {
+                "url": ep.url,
+                "weight": ep.weight,
+                "model": ep.model,
+                "ewma_latency": ep.ewma_latency,
+                "outstanding": ep.outstanding,
+                "requests": ep.requests,
+                "errors": ep.errors,
+                "ejections": ep.ejections,
+                "available": ep.is_available(now),
+            }
+            for ep in self.endpoints
+        ]
+
+
+def create_load_balancer(config, kind: str) -> LoadBalancer:
+    """Create the balancer for a request kind from a RAGAnythingConfig
+
+    Falls back to the single ``<kind>_api_url`` when no endpoint list is set.
+    """
+    endpoints = parse_endpoints(getattr(config, f"{kind}_api_endpoints"))
+    if not endpoints:
+        endpoints = [Endpoint(url=getattr(config, f"{kind}_api_url"))]
+    return LoadBalancer(
+        kind,
+        endpoints,
+        ewma_alpha=config.api_lb_ewma_alpha,
+        eject_failures=config.api_lb_eject_failures,
+        eject_seconds=config.api_lb_eject_seconds,
+    )
@@ -0,0 +1,308 @@
+"""
+Native structure-aware parsing of Markdown files
+
+Markdown source is split into its blocks in a single pass over the lines and
+each block becomes a typed ``content_list`` item, as MinerU would produce from
+a rendered page:
+
+- ATX and setext headings: ``text`` items with ``text_level``
+- paragraphs, lists, quotes and code: ``text`` items
+- GFM pipe tables: ``table`` items with the table source as ``table_body``
+- ``$$...$$`` / ``\\[...\\]`` blocks and ``math`` fences: ``equation`` items
+- local image links: ``image`` items with an absolute ``img_path``
+
+Page indices are synthetic, as for plain text.
+"""
+
+import logging
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+from urllib.parse import unquote
+
+from raganything.text_parser import (
+    DEFAULT_PAGE_CHARS,
+    SyntheticPages,
+    read_text_file,
+    split_long_paragraph,
+)
+
+logger = logging.getLogger(__name__)
+
+_ATX_HEADING = re.compile(r"^ {0,3}(#{1,6})(?:[ \t]+(.*?))?(?:[ \t]+#+)?[ \t]*$")
+_SETEXT_UNDERLINE = re.compile(r"^ {0,3}(?:=+|-+)[ \t]*$")
+_THEMATIC_BREAK = re.compile(r"^ {0,3}([-*_])(?:[ \t]*\1){2,}[ \t]*$")
+_FENCE_OPEN = re.compile(r"^ {0,3}(`{3,}|~{3,})(.*)$")
+_TABLE_DELIMITER = re.compile(
+    r"^ {0,3}\|?[ \t]*:?-+:?[ \t]*(?:\|[ \t]*:?-+:?[ \t]*)*\|?[ \t]*$"
+)
+_IMAGE = re.compile(r"!\[([^\]]*)\]\(\s*<?([^)\s>]+)>?(?:\s+[\"']([^\"']*)[\"'])?\s*\)")
+
+# Display math delimiters: opener -> closer
+_MATH_BLOCKS = {"$$": "$$", "\\[": "\\]"}
+_MATH_FENCE_INFO = {"math", "latex", "tex"}
+_REMOTE_PREFIXES = ("data:", "//", "mailto:")
+# Top-level line of a YAML front matter mapping
+_FRONT_MATTER_KEY = re.compile(r"^[A-Za-z_][\w.-]*:(?:[ \t]|$)")
+
+
+class _ContentBuilder:
+    """Collect typed content items with synthetic page indices"""
+
+    def __init__(self, base_dir: Optional[Path], page_chars: int):
+        self.base_dir = base_dir
+        self.pages = SyntheticPages(page_chars)
+        self.content_list: List[Dict[str, Any]] = []
+
+    def _add(self, item: Dict[str, Any], size: int) -> None:
+        item["page_idx"] = self.pages.place(size)
+        self.content_list.append(item)
+
+    def _add_text(self, text: str) -> None:
+        for block in split_long_paragraph(text, self.pages.page_chars):
+            self._add({"type": "text", "text": block}, len(block))
+
+    def heading(self, text: str, level: int) -> None:
+        text = text.strip()
+        if text:
+            self._add({"type": "text", "text": text, "text_level": level}, len(text))
+
+    def paragraph(self, lines: List[str]) -> None:
+        if not lines:
+            return
+        text = "\n".join(lines).strip()
+        images: List[Dict[str, Any]] = []
+        if "![" in text:
+            only_images = not _IMAGE.sub("", text).strip()
+            text = _IMAGE.sub(lambda m: self._collect_image(m, images), text).strip()
+            if only_images:
+                text = ""
+        if text:
+            self._add_text(text)
+        for image in images:
+            self._add(image, 0)
+
+    def code(self, fence: str, info: str, body: List[str]) -> None:
+        self._add_text("\n".join([fence + info, *body, fence]))
+
+    def equation(self, latex: str) -> None:
+        latex = latex.strip()
+        if latex:
+            self._add(
+                {
+                    "type": "equation",
+                    "text": f"$$\n{latex}\n$$",
+                    "text_format": "latex",
+                },
+                len(latex),
+            )
+
+    def table(self, rows: List[str]) -> None:
+        table_body = "\n".join(row.strip() for row in rows)
+        self._add(
+            {
+                "type": "table",
+                "table_body": table_body,
+                "table_caption": [],
+                "table_footnote": [],
+            },
+            len(table_body),
+        )
+
+    def _resolve_local(self, src: str) -> Optional[Path]:
+        if self.base_dir is None or "://" in src or src.startswith(_REMOTE_PREFIXES):
+            return None
+        path = Path(unquote(src.split("#", 1)[0].split("?", 1)[0]))
+        if not path.is_absolute():
+            path = self.base_dir / path
+        return path.resolve() if path.is_file() else None
+
+    def _collect_image(self, match: re.Match, images: List[Dict[str, Any]]) -> str:
+        """Collect a local image link as an image item, leaving its alt text in place"""
+        alt, src, title = match.group(1), match.group(2), match.group(3)
+        path = self._resolve_local(src)
+        if path is None:
+            return alt
+        images.append(
+            {
+                "type": "image",
+                "img_path": str(path),
+                "image_caption": [caption for caption in (alt, title) if caption],
+                "image_footnote": [],
+            }
+        )
+        return alt
+
+
+def _front_matter_end(lines: List[str]) -> int:
+    """Index of the first line after YAML front matter (0 when there is none)
+
+    A leading ``---`` is also a horizontal rule, so the block only counts as
+    front matter when its lines form a YAML mapping of ``key: value`` entries.
+    """
+    if not lines or lines[0].strip() != "---":
+        return 0
+    has_key = False
+    for j in range(1, len(lines)):
+        line = lines[j]
+        if line.strip() in ("---", "..."):
+            return j + 1 if has_key else 0
+        if _FRONT_MATTER_KEY.match(line):
+            has_key = True
+        elif line.strip() and not line.lstrip().startswith("#"):
+            # Nested values and list entries only follow a key
+            if not has_key or not (line[0] in " \t" or line.startswith("- ")):
+                return 0
+    return 0
+
+
+def markdown_to_content_list(
+    text: str,
+    base_dir: Optional[Union[str, Path]] = None,
+    page_chars: int = DEFAULT_PAGE_CHARS,
+) -> List[Dict[str, Any]]:
+    """Convert Markdown source into typed content items
+
+    Args:
+        text: Markdown with ``\\n`` line endings
+        base_dir: Directory relative image links are resolved against (images
+            are kept as alt text when None)
+        page_chars: Characters per synthetic page
+
+    Returns:
+        List of text, table, equation and image items in document order
+    """
+    builder = _ContentBuilder(
+        Path(base_dir).resolve() if base_dir is not None else None, page_chars
+    )
+    lines = text.split("\n")
+    n = len(lines)
+    i = 0
+
+    i = _front_matter_end(lines)
+
+    paragraph: List[str] = []
+    while i < n:
+        line = lines[i]
+        stripped = line.strip()
+        if not stripped:
+            builder.paragraph(paragraph)
+            paragraph = []
+            i += 1
+            continue
+        first = stripped[0]
+
+        if first == "#":
+            match = _ATX_HEADING.match(line)
+            if match:
+                builder.paragraph(paragraph)
+                paragraph = []
+                builder.heading(match.group(2) or "", len(match.group(1)))
+                i += 1
+                continue
+
+        elif first in "`~":
+            match = _FENCE_OPEN.match(line)
+            if match and not (first == "`" and "`" in match.group(2)):
+                builder.paragraph(paragraph)
+                paragraph = []
+                fence = match.group(1)
+                info = match.group(2).strip()
+                body: List[str] = []
+                i += 1
+                while i < n:
+                    closing = lines[i].strip()
+                    i += 1
+                    if len(closing) >= len(fence) and closing == fence[0] * len(
+                        closing
+                    ):
+                        break
+                    body.append(lines[i - 1])
+                language = info.split()[0].lower() if info else ""
+                if language in _MATH_FENCE_INFO:
+                    builder.equation("\n".join(body))
+                else:
+                    builder.code(fence, info, body)
+                continue
+
+        elif first in "$\\":
+            opener = stripped[:2]
+            closer = _MATH_BLOCKS.get(opener)
+            rest = stripped[2:]
+            # A single-line block closes only at the end: "$$a$$ and more" and
+            # "$$a$$ and $$b$$" are inline math and stay in the paragraph
+            closes_at = rest.find(closer) if closer else -1
+            single_line = closes_at >= 0 and closes_at == len(rest) - len(closer)
+            if closer and (closer not in rest or single_line):
+                builder.paragraph(paragraph)
+                paragraph = []
+                i += 1
+                if single_line:
+                    builder.equation(rest[: -len(closer)])
+                    continue
+                parts = [rest] if rest else []
+                while i < n:
+                    closing = lines[i].rstrip()
+                    i += 1
+                    if closing.endswith(closer):
+                        parts.append(closing[: -len(closer)])
+                        break
+                    parts.append(closing)
+                builder.equation("\n".join(parts))
+                continue
+
+        if (
+            "|" in line
+            and i + 1 < n
+            and "|" in lines[i + 1]
+            and "-" in lines[i + 1]
+            and _TABLE_DELIMITER.match(lines[i + 1])
+        ):
+            builder.paragraph(paragraph)
+            paragraph = []
+            rows = [line, lines[i + 1]]
+            i += 2
+            while i < n and "|" in lines[i] and lines[i].strip():
+                rows.append(lines[i])
+                i += 1
+            builder.table(rows)
+            continue
+
+        if paragraph and first in "=-" and _SETEXT_UNDERLINE.match(line):
+            builder.heading("\n".join(paragraph), 1 if first == "=" else 2)
+            paragraph = []
+            i += 1
+            continue
+
+        if first in "-*_" and _THEMATIC_BREAK.match(line):
+            builder.paragraph(paragraph)
+            paragraph = []
+            i += 1
+            continue
+
+        if stripped.startswith("<!--"):
+            builder.paragraph(paragraph)
+            paragraph = []
+            while i < n and "-->" not in lines[i]:
+                i += 1
+            i += 1
+            continue
+
+        paragraph.append(line)
+        i += 1
+
+    builder.paragraph(paragraph)
+    return builder.content_list
+
+
+def parse_markdown_file(
+    md_path: Union[str, Path], page_chars: int = DEFAULT_PAGE_CHARS
+) -> List[Dict[str, Any]]:
+    """Parse a Markdown file into typed ``content_list`` items"""
+    md_path = Path(md_path)
+    if not md_path.exists():
+        raise FileNotFoundError(f"Markdown file does not exist: {md_path}")
+    text, _ = read_text_file(md_path)
+    content_list = markdown_to_content_list(text, md_path.parent, page_chars)
+    logger.info(f"Parsed {md_path.name} natively: {len(content_list)} content blocks")
+    return content_list
@@ -0,0 +1,580 @@
+"""
+Persistent MinerU worker processes
+
+Running the ``mineru`` CLI once per document pays Python start-up and model
+loading for every file. A worker process (``raganything.mineru_worker.serve``)
+imports MinerU once, keeps its models loaded and serves parse jobs as JSON lines
+over its stdin/stdout pipes. ``MineruWorkerPool`` manages a few of those workers:
+
+- jobs are dispatched to idle workers (workers are started lazily);
+- workers that have been idle for a while are pinged before use, and dead or
+  hung workers are replaced;
+- a worker is recycled after ``max_jobs_per_worker`` jobs to cap memory growth;
+- device and model source are per-process settings in MinerU, so workers are
+  dedicated to one (device, source) pair.
+
+Outputs are written in the same layout as the CLI, so ``MineruParser`` reads
+them unchanged.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import itertools
+import json
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from queue import Empty, Queue
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from raganything.parse_scheduler import subprocess_env, track_process
+from raganything.parser import MineruExecutionError
+
+logger = logging.getLogger(__name__)
+
+EnvKey = Tuple[Optional[str], Optional[str]]
+
+# Run serve() without re-executing this module as __main__ (the package
+# __init__ already imports it)
+_WORKER_ENTRY = (
+    "import sys; from raganything.mineru_worker import serve; sys.exit(serve())"
+)
+
+
+class WorkerUnavailableError(RuntimeError):
+    """Raised when a MinerU worker cannot be started or stops responding"""
+
+
+class MineruWorker:
+    """One resident MinerU process speaking JSON lines over pipes"""
+
+    def __init__(self, env_key: EnvKey, startup_timeout: float = 600.0):
+        device, source = env_key
+        # Thread caps of the batch worker starting it, if any
+        env = subprocess_env(dict(os.environ))
+        if device:
+            env["MINERU_DEVICE_MODE"] = device
+        if source:
+            env["MINERU_MODEL_SOURCE"] = source
+
+        self.env_key = env_key
+        self.jobs_done = 0
+        self.last_used = time.monotonic()
+        self._ids = itertools.count(1)
+        self._messages: Queue = Queue()
+        self._eof = threading.Event()
+
+        self.process = subprocess.Popen(
+            [sys.executable, "-c", _WORKER_ENTRY],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            errors="ignore",
+            bufsize=1,
+            env=env,
+        )
+        self.pid = self.process.pid
+        threading.Thread(target=self._read_messages, daemon=True).start()
+        threading.Thread(target=self._log_stderr, daemon=True).start()
+
+        ready = self._next_message(startup_timeout)
+        if ready is None or ready.get("event") != "ready":
+            error = (ready or {}).get("error", "no response")
+            self.kill()
+            raise WorkerUnavailableError(f"MinerU worker failed to start: {error}")
+        logger.info(f"[MinerU worker {self.pid}] ready")
+
+    def _read_messages(self) -> None:
+        for line in self.process.stdout:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                self._messages.put(json.loads(line))
+            except ValueError:
+                logger.debug(f"[MinerU worker {self.pid}] {line}")
+        # EOF: the process is gone
+        self._eof.set()
+        self._messages.put(None)
+
+    def _log_stderr(self) -> None:
+        for line in self.process.stderr:
+            line = line.strip()
+            if not line:
+                continue
+            lowered = line.lower()
+            if "error" in lowered:
+                logger.error(f"[MinerU worker {self.pid}] {line}")
+            elif "warning" in lowered:
+                logger.warning(f"[MinerU worker {self.pid}] {line}")
+            else:
+                logger.info(f"[MinerU worker {self.pid}] {line}")
+
+    def _next_message(self, timeout: Optional[float]) -> Optional[Dict[str, Any]]:
+        try:
+            return self._messages.get(timeout=timeout)
+        except Empty:
+            return None
+
+    def is_alive(self) -> bool:
+        return self.process.poll() is None
+
+    def request(
+        self, op: str, timeout: Optional[float] = None, **payload: Any
+    ) -> Dict[str, Any]:
+        """Send one request and wait for its response
+
+        Raises:
+            WorkerUnavailableError: If the worker died or did not answer in time
+                (the worker is killed in that case)
+        """
+        request_id = next(self._ids)
+        try:
+            self.process.stdin.write(
+                json.dumps({"id": request_id, "op": op, **payload}) + "\n"
+            )
+            self.process.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            self.kill()
+            raise WorkerUnavailableError(f"MinerU worker {self.pid} is gone: {e}")
+
+        deadline = time.monotonic() + timeout if timeout else None
+        while True:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                self.kill()
+                raise WorkerUnavailableError(
+                    f"MinerU worker {self.pid} did not answer '{op}' within {timeout:.0f}s"
+                )
+            message = self._next_message(remaining)
+            if message is None:
+                # A timeout is checked above; after EOF no answer can come,
+                # even if the process has not been reaped yet
+                if not self._eof.is_set() and remaining is not None:
+                    continue
+                self.kill()
+                raise WorkerUnavailableError(
+                    f"MinerU worker {self.pid} exited with code {self.process.poll()}"
+                )
+            if message.get("id") == request_id:
+                self.last_used = time.monotonic()
+                return message
+
+    def ping(self, timeout: float = 10.0) -> bool:
+        """Check that the worker still answers"""
+        if not self.is_alive():
+            return False
+        try:
+            return bool(self.request("ping", timeout=timeout).get("ok"))
+        except WorkerUnavailableError:
+            return False
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Ask the worker to exit, killing it if it does not"""
+        if self.is_alive():
+            try:
+                self.request("shutdown", timeout=timeout)
+                self.process.wait(timeout=timeout)
+            except (WorkerUnavailableError, subprocess.TimeoutExpired):
+                pass
+        self.kill()
+
+    def kill(self) -> None:
+        if self.is_alive():
+            self.process.kill()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                pass
+
+
+class _JobHandle:
+    """Worker running an async job, so that cancelling the job can kill it"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._worker: Optional[MineruWorker] = None
+        self._cancelled = False
+
+    def start(self, worker: MineruWorker) -> bool:
+        """Record the worker of the job; False if the job was already cancelled"""
+        with self._lock:
+            self._worker = worker
+            return not self._cancelled
+
+    def cancel(self) -> Optional[MineruWorker]:
+        """Mark the job cancelled and return its worker, if it has one"""
+        with self._lock:
+            self._cancelled = True
+            return self._worker
+
+
+def _ignore_result(future: asyncio.Future) -> None:
+    if not future.cancelled():
+        future.exception()
+
+
+class MineruWorkerPool:
+    """Pool of resident MinerU workers with health checks and recycling"""
+
+    def __init__(
+        self,
+        size: int = 1,
+        max_jobs_per_worker: int = 50,
+        job_timeout: float = 1800.0,
+        startup_timeout: float = 600.0,
+        health_check_interval: float = 60.0,
+    ):
+        """Initialize the pool
+
+        Args:
+            size: Maximum number of worker processes
+            max_jobs_per_worker: Jobs after which a worker is restarted (0 = never)
+            job_timeout: Seconds before a parse job is abandoned and its worker killed (0 = no limit)
+            startup_timeout: Seconds allowed for a worker to import MinerU
+            health_check_interval: Idle seconds after which a worker is pinged before use
+        """
+        self.size = max(1, size)
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.job_timeout = job_timeout or None
+        self.startup_timeout = startup_timeout
+        self.health_check_interval = health_check_interval
+
+        self._idle: List[MineruWorker] = []
+        self._total = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+        # Statistics
+        self.jobs = 0
+        self.failures = 0
+        self.workers_started = 0
+        self.workers_recycled = 0
+        self.workers_replaced = 0
+
+    def _acquire(self, env_key: EnvKey) -> MineruWorker:
+        """Take an idle worker for ``env_key``, starting one if there is room"""
+        retired = None
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise WorkerUnavailableError("MinerU worker pool is closed")
+                for worker in self._idle:
+                    if worker.env_key == env_key:
+                        self._idle.remove(worker)
+                        return worker
+                if self._total < self.size:
+                    self._total += 1
+                    break
+                if self._idle:
+                    # Only workers for other settings are idle: replace one
+                    retired = self._idle.pop(0)
+                    break
+                self._condition.wait()
+
+        if retired is not None:
+            retired.stop()
+        try:
+            worker = MineruWorker(env_key, startup_timeout=self.startup_timeout)
+        except BaseException:
+            with self._condition:
+                self._total -= 1
+                self._condition.notify()
+            raise
+        self.workers_started += 1
+        return worker
+
+    def _acquire_healthy(self, env_key: EnvKey) -> MineruWorker:
+        """Take a worker, replacing one that was idle for long and fails a ping"""
+        worker = self._acquire(env_key)
+        if time.monotonic() - worker.last_used <= self.health_check_interval:
+            return worker
+        try:
+            healthy = worker.ping()
+        except BaseException:
+            self._release(worker, discard=True)
+            raise
+        if healthy:
+            return worker
+        logger.warning(f"MinerU worker {worker.pid} failed health check")
+        self.workers_replaced += 1
+        worker.kill()
+        # The failed worker's place is given back before a new one is taken
+        self._release(worker, discard=True)
+        return self._acquire(env_key)
+
+    def _release(self, worker: Optional[MineruWorker], discard: bool = False) -> None:
+        """Return a worker to the pool, or retire it"""
+        recycle = (
+            worker is not None
+            and not discard
+            and self.max_jobs_per_worker
+            and worker.jobs_done >= self.max_jobs_per_worker
+        )
+        if worker is not None and (discard or recycle):
+            if recycle:
+                self.workers_recycled += 1
+                logger.info(
+                    f"Recycling MinerU worker {worker.pid} after {worker.jobs_done} jobs"
+                )
+            worker.stop()
+            worker = None
+        with self._condition:
+            if worker is None or self._closed:
+                self._total -= 1
+            else:
+                self._idle.append(worker)
+            self._condition.notify()
+        if worker is not None and self._closed:
+            worker.stop()
+
+    def run(
+        self,
+        input_path: Union[str, Path],
+        output_dir: Union[str, Path],
+        method: str = "auto",
+        lang: Optional[str] = None,
+        backend: Optional[str] = None,
+        start_page: Optional[int] = None,
+        end_page: Optional[int] = None,
+        formula: bool = True,
+        table: bool = True,
+        device: Optional[str] = None,
+        source: Optional[str] = None,
+        vlm_url: Optional[str] = None,
+        _job: Optional["_JobHandle"] = None,
+    ) -> Dict[str, Any]:
+        """Parse one file in a worker; same arguments as ``mineru`` CLI runs
+
+        Returns:
+            Dict[str, Any]: Worker response with the ``output_path`` of the results
+
+        Raises:
+            MineruExecutionError: If MinerU failed or the worker died or timed out
+            WorkerUnavailableError: If no worker could be started
+        """
+        job = {
+            "input_path": str(input_path),
+            "output_dir": str(output_dir),
+            "method": method,
+            "lang": lang,
+            "backend": backend,
+            "start_page": start_page,
+            "end_page": end_page,
+            "formula": formula,
+            "table": table,
+            "vlm_url": vlm_url,
+        }
+        worker = self._acquire_healthy((device, source))
+        discard = False
+        try:
+            if _job is not None and not _job.start(worker):
+                raise MineruExecutionError(-1, ["parse cancelled"])
+            self.jobs += 1
+            logger.info(
+                f"[MinerU worker {worker.pid}] parsing {input_path} (method={method})"
+            )
+            # Workers are shared by all batch workers: record CPU time, don't pin
+            cpu_usage = track_process(worker.pid, pin=False)
+            try:
+                response = worker.request("parse", timeout=self.job_timeout, **job)
+            except WorkerUnavailableError as e:
+                discard = True
+                self.failures += 1
+                raise MineruExecutionError(-1, [str(e)]) from e
+            finally:
+                cpu_usage.finish()
+            worker.jobs_done += 1
+            if not response.get("ok"):
+                self.failures += 1
+                raise MineruExecutionError(1, [response.get("error", "unknown error")])
+            return response
+        finally:
+            self._release(worker, discard=discard)
+
+    async def arun(self, **kwargs: Any) -> Dict[str, Any]:
+        """Async version of run; cancelling it (or a deadline) kills the worker"""
+        job = _JobHandle()
+        future = asyncio.ensure_future(asyncio.to_thread(self.run, _job=job, **kwargs))
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            worker = job.cancel()
+            if worker is not None:
+                logger.warning(
+                    f"Killing MinerU worker {worker.pid}: its job was cancelled"
+                )
+                worker.kill()
+                # The job fails at once and the pool replaces the worker
+                await asyncio.gather(future, return_exceptions=True)
+            else:
+                # Still waiting for a worker: the job is dropped when it gets one
+                future.add_done_callback(_ignore_result)
+            raise
+
+    def health_check(self) -> List[Dict[str, Any]]:
+        """Ping the idle workers, dropping the ones that do not answer"""
+        with self._condition:
+            workers, self._idle = self._idle, []
+        statuses = []
+        for worker in workers:
+            healthy = worker.ping()
+            statuses.append(
+                {"pid": worker.pid, "healthy": healthy, "jobs_done": worker.jobs_done}
+            )
+            if not healthy:
+                self.workers_replaced += 1
+            self._release(worker, discard=not healthy)
+        return statuses
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool statistics"""
+        return {
+            "size": self.size,
+            "workers": self._total,
+            "idle_workers": len(self._idle),
+            "jobs": self.jobs,
+            "failures": self.failures,
+            "workers_started": self.workers_started,
+            "workers_recycled": self.workers_recycled,
+            "workers_replaced": self.workers_replaced,
+        }
+
+    def close(self) -> None:
+        """Stop all idle workers; busy workers stop when their job finishes"""
+        with self._condition:
+            self._closed = True
+            workers, self._idle = self._idle, []
+            self._total -= len(workers)
+            self._condition.notify_all()
+        for worker in workers:
+            worker.stop()
+
+
+_pool: Optional[MineruWorkerPool] = None
+_pool_lock = threading.Lock()
+
+
+def configure_mineru_worker_pool(config) -> Optional[MineruWorkerPool]:
+    """Create (or return) the process-wide worker pool from a RAGAnythingConfig
+
+    Returns None when ``mineru_workers`` is 0 (one CLI process per file).
+    The first configuration wins so that all parsers share the workers.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None and config.mineru_workers > 0:
+            _pool = MineruWorkerPool(
+                size=config.mineru_workers,
+                max_jobs_per_worker=config.mineru_worker_max_jobs,
+                job_timeout=config.mineru_worker_job_timeout,
+                startup_timeout=config.mineru_worker_startup_timeout,
+            )
+            atexit.register(_pool.close)
+        return _pool
+
+
+# ---------------------------------------------------------------------------
+# Worker process side
+# ---------------------------------------------------------------------------
+
+
+def _prepare_mineru_env() -> None:
+    """Apply the environment defaults the mineru CLI sets before parsing"""
+    from mineru.utils.config_reader import get_device
+    from mineru.utils.model_utils import get_vram
+
+    if os.getenv("MINERU_DEVICE_MODE") is None:
+        os.environ["MINERU_DEVICE_MODE"] = get_device()
+    device = os.environ["MINERU_DEVICE_MODE"]
+    if os.getenv("MINERU_VIRTUAL_VRAM_SIZE") is None:
+        vram = round(get_vram(device)) if device.startswith(("cuda", "npu")) else 1
+        os.environ["MINERU_VIRTUAL_VRAM_SIZE"] = str(vram)
+    if os.getenv("MINERU_MODEL_SOURCE") is None:
+        os.environ["MINERU_MODEL_SOURCE"] = "huggingface"
+
+
+def _parse_job(job: Dict[str, Any], do_parse, read_fn) -> Dict[str, Any]:
+    input_path = Path(job["input_path"])
+    output_dir = job["output_dir"]
+    backend = job.get("backend") or "pipeline"
+    method = job.get("method") or "auto"
+    os.makedirs(output_dir, exist_ok=True)
+
+    do_parse(
+        output_dir=output_dir,
+        pdf_file_names=[input_path.stem],
+        pdf_bytes_list=[read_fn(input_path)],
+        p_lang_list=[job.get("lang") or "ch"],
+        backend=backend,
+        parse_method=method,
+        p_formula_enable=job.get("formula", True),
+        p_table_enable=job.get("table", True),
+        server_url=job.get("vlm_url"),
+        start_page_id=job.get("start_page") or 0,
+        end_page_id=job.get("end_page"),
+    )
+    method_dir = "vlm" if backend.startswith("vlm-") else method
+    return {"output_path": os.path.join(output_dir, input_path.stem, method_dir)}
+
+
+def serve() -> int:
+    """Serve parse jobs read from stdin until shutdown or EOF"""
+    # Keep stdout for the protocol; anything MinerU prints goes to stderr
+    protocol = os.fdopen(os.dup(sys.stdout.fileno()), "w", encoding="utf-8")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+    def send(message: Dict[str, Any]) -> None:
+        protocol.write(json.dumps(message) + "\n")
+        protocol.flush()
+
+    try:
+        from mineru.cli.common import do_parse, read_fn
+
+        _prepare_mineru_env()
+    except Exception as e:
+        send({"event": "error", "error": f"{type(e).__name__}: {e}"})
+        return 1
+    send({"event": "ready", "pid": os.getpid()})
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        job = json.loads(line)
+        op = job.get("op")
+        if op == "ping":
+            send({"id": job["id"], "ok": True})
+        elif op == "shutdown":
+            send({"id": job["id"], "ok": True})
+            break
+        elif op == "parse":
+            start = time.monotonic()
+            try:
+                result = _parse_job(job, do_parse, read_fn)
+                send(
+                    {
+                        "id": job["id"],
+                        "ok": True,
+                        "seconds": round(time.monotonic() - start, 3),
+                        **result,
+                    }
+                )
+            except Exception as e:
+                send(
+                    {"id": job["id"], "ok": False, "error": f"{type(e).__name__}: {e}"}
+                )
+        else:
+            send({"id": job.get("id"), "ok": False, "error": f"Unknown op: {op}"})
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(serve())
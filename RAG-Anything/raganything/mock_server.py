@@ -0,0 +1,548 @@
+"""
+Local OpenAI-compatible mock server for the 'api' backend
+
+Serves deterministic responses for:
+
+- ``POST /v1/embeddings``: hash-seeded, L2-normalized vectors (honors ``dimensions``);
+- ``POST /v1/chat/completions``: text and vision messages, optionally streamed
+  as server-sent events. Answers are shaped like the outputs RAG-Anything and
+  LightRAG parse (entity extraction records, keyword JSON, modal descriptions)
+  so that a full insert/query pipeline runs against it;
+- ``GET /stats`` and ``GET /health``.
+
+Latency, error rate and 429 throttling are configurable, which makes the server
+suitable for throughput benchmarks and for exercising retries, hedging and
+load balancing without a real provider::
+
+    python -m raganything.mock_server --port 8765 --latency lognormal:0.2:0.5 --rate-429 0.05
+
+Only the standard library and numpy are used.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    429: "Too Many Requests",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+
+@dataclass
+class LatencyModel:
+    """Latency distribution in seconds
+
+    ``spec`` is one of ``fixed:S``, ``uniform:LO:HI``, ``normal:MEAN:STD`` or
+    ``lognormal:MEDIAN:SIGMA``; ``per_token`` adds seconds per output token.
+    """
+
+    kind: str = "fixed"
+    params: Tuple[float, ...] = (0.0,)
+    per_token: float = 0.0
+
+    @classmethod
+    def parse(cls, spec: str, per_token: float = 0.0) -> "LatencyModel":
+        kind, _, rest = spec.partition(":")
+        params = tuple(float(value) for value in rest.split(":") if value)
+        expected = {"fixed": 1, "uniform": 2, "normal": 2, "lognormal": 2}
+        if kind not in expected or len(params) != expected[kind]:
+            raise ValueError(f"Invalid latency spec: {spec}")
+        return cls(kind=kind, params=params, per_token=per_token)
+
+    def sample(self, rng: random.Random, tokens: int = 0) -> float:
+        if self.kind == "uniform":
+            value = rng.uniform(*self.params)
+        elif self.kind == "normal":
+            value = rng.gauss(*self.params)
+        elif self.kind == "lognormal":
+            median, sigma = self.params
+            value = rng.lognormvariate(math.log(max(median, 1e-6)), sigma)
+        else:
+            value = self.params[0]
+        return max(0.0, value) + self.per_token * tokens
+
+
+@dataclass
+class MockServerConfig:
+    """Behaviour of the mock server"""
+
+    host: str = "127.0.0.1"
+    port: int = 8765
+    embedding_dimension: int = 1536
+    chat_latency: LatencyModel = field(default_factory=LatencyModel)
+    embedding_latency: LatencyModel = field(default_factory=LatencyModel)
+    error_rate: float = 0.0
+    """Fraction of requests answered with HTTP 500."""
+    rate_429: float = 0.0
+    """Fraction of requests answered with HTTP 429."""
+    retry_after: float = 1.0
+    """Retry-After seconds sent with 429 responses (0 omits the header)."""
+    rpm_limit: int = 0
+    """Requests per minute before 429s are returned (0 disables)."""
+    stream_chunk_delay: float = 0.0
+    """Delay between server-sent event chunks."""
+    seed: int = 0
+
+
+class MockStats:
+    """Request counters and latency samples"""
+
+    def __init__(self):
+        self.requests: Dict[str, int] = {}
+        self.status: Dict[int, int] = {}
+        self.embedded_texts = 0
+        self.images = 0
+        self.latencies: Dict[str, List[float]] = {}
+
+    def record(self, route: str, status: int, latency: float) -> None:
+        self.requests[route] = self.requests.get(route, 0) + 1
+        self.status[status] = self.status.get(status, 0) + 1
+        self.latencies.setdefault(route, []).append(latency)
+
+    def snapshot(self) -> Dict[str, Any]:
+        latency = {}
+        for route, samples in self.latencies.items():
+            ordered = sorted(samples)
+            latency[route] = {
+                f"p{p}": ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+                for p in (50, 90, 99)
+            }
+        return {
+            "requests": dict(self.requests),
+            "status": {str(code): count for code, count in self.status.items()},
+            "embedded_texts": self.embedded_texts,
+            "images": self.images,
+            "latency": latency,
+        }
+
+
+def _seed_for(*parts: str) -> int:
+    digest = hashlib.sha256("\x1f".join(parts).encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "little")
+
+
+def embed_text(text: str, dimension: int) -> List[float]:
+    """Deterministic unit vector for a text"""
+    rng = np.random.default_rng(_seed_for("embedding", text))
+    vector = rng.standard_normal(dimension)
+    vector /= np.linalg.norm(vector) or 1.0
+    return vector.astype(np.float32).tolist()
+
+
+def _message_text(message: Dict[str, Any]) -> Tuple[str, int]:
+    """Text of a chat message and the number of images it carries"""
+    content = message.get("content") or ""
+    if isinstance(content, str):
+        return content, 0
+    texts, images = [], 0
+    for part in content:
+        if part.get("type") == "text":
+            texts.append(part.get("text", ""))
+        elif part.get("type") == "image_url":
+            images += 1
+    return "\n".join(texts), images
+
+
+def _title_words(text: str, limit: int) -> List[str]:
+    words = []
+    for word in re.findall(r"\b[A-Z][A-Za-z0-9]{2,}\b", text):
+        if word not in words:
+            words.append(word)
+        if len(words) >= limit:
+            break
+    return words or ["Document"]
+
+
+def chat_usage(messages: List[Dict[str, Any]], answer: str) -> Dict[str, int]:
+    """OpenAI-style token usage of a chat completion (about 4 characters per token)"""
+    prompt_tokens = sum(len(_message_text(message)[0]) // 4 for message in messages)
+    completion_tokens = len(answer.split(" "))
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
+
+
+def build_answer(messages: List[Dict[str, Any]]) -> Tuple[str, int]:
+    """Deterministic answer shaped after what the caller expects to parse"""
+    texts, images = [], 0
+    for message in messages:
+        text, count = _message_text(message)
+        texts.append(text)
+        images += count
+    prompt = "\n".join(texts)
+    last = texts[-1] if texts else ""
+    rng = random.Random(_seed_for("chat", prompt))
+
+    if "<|#|>" in prompt and "<|COMPLETE|>" in prompt:
+        # LightRAG entity/relation extraction records
+        section = last.split("---Input Text---")[-1]
+        names = _title_words(section, 4)
+        lines = [
+            f"entity<|#|>{name}<|#|>Concept<|#|>{name} is mentioned in the input text."
+            for name in names
+        ]
+        lines += [
+            f"relation<|#|>{a}<|#|>{b}<|#|>co-occurrence<|#|>{a} appears together with {b}."
+            for a, b in zip(names, names[1:])
+        ]
+        lines.append("<|COMPLETE|>")
+        return "\n".join(lines), images
+
+    if "high_level_keywords" in prompt:
+        words = _title_words(last, 3)
+        return (
+            json.dumps(
+                {
+                    "high_level_keywords": [w.lower() for w in words[:1]],
+                    "low_level_keywords": words,
+                }
+            ),
+            images,
+        )
+
+    if "entity_info" in prompt and "detailed_description" in prompt:
+        # Modal processor description
+        name = f"{'Image' if images else 'Content'} {rng.randrange(10**6):06d}"
+        return (
+            json.dumps(
+                {
+                    "detailed_description": f"Mock description of {name.lower()}.",
+                    "entity_info": {
+                        "entity_name": name,
+                        "entity_type": "image" if images else "content",
+                        "summary": f"Mock summary of {name.lower()}.",
+                    },
+                }
+            ),
+            images,
+        )
+
+    words = " ".join(_title_words(last, 5))
+    answer = f"Mock answer ({rng.randrange(10**6):06d}) about {words}."
+    if images:
+        answer += f" {images} image(s) inspected."
+    return answer, images
+
+
+class MockOpenAIServer:
+    """asyncio HTTP/1.1 server speaking a subset of the OpenAI API"""
+
+    def __init__(self, config: Optional[MockServerConfig] = None):
+        self.config = config or MockServerConfig()
+        self.stats = MockStats()
+        self._rng = random.Random(self.config.seed)
+        self._window: List[float] = []
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: Dict[asyncio.StreamWriter, asyncio.Task] = {}
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.config.host}:{self.config.port}/v1"
+
+    async def start(self) -> "MockOpenAIServer":
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.config.host, self.config.port
+        )
+        # Port 0 picks a free port
+        self.config.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            # Drop idle keep-alive connections so their handlers can finish
+            for writer in list(self._connections):
+                writer.close()
+            await asyncio.gather(*self._connections.values(), return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self._connections[writer] = asyncio.current_task()
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                body = await reader.readexactly(length) if length else b""
+                await self._dispatch(method, path.split("?")[0], body, writer)
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            self._connections.pop(writer, None)
+            writer.close()
+
+    async def _send(
+        self,
+        writer: asyncio.StreamWriter,
+        status: int,
+        payload: Any,
+        extra_headers: Optional[Dict[str, str]] = None,
+    ) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        headers = {
+            "Content-Type": "application/json",
+            "Content-Length": str(len(body)),
+            **(extra_headers or {}),
+        }
+        head = f"HTTP/1.1 {status} {_REASONS.get(status, 'OK')}\r\n" + "".join(
+            f"{name}: {value}\r\n" for name, value in headers.items()
+        )
+        writer.write(head.encode("latin-1") + b"\r\n" + body)
+        await writer.drain()
+
+    def _injected_failure(self) -> Optional[Tuple[int, Dict[str, str]]]:
+        """Decide whether this request is throttled or fails"""
+        now = time.monotonic()
+        if self.config.rpm_limit:
+            self._window = [t for t in self._window if now - t < 60.0]
+            if len(self._window) >= self.config.rpm_limit:
+                wait = 60.0 - (now - self._window[0])
+                return 429, {"Retry-After": f"{max(wait, 0.0):.2f}"}
+            self._window.append(now)
+        roll = self._rng.random()
+        if roll < self.config.rate_429:
+            headers = {}
+            if self.config.retry_after > 0:
+                headers["Retry-After"] = f"{self.config.retry_after:g}"
+            return 429, headers
+        if roll < self.config.rate_429 + self.config.error_rate:
+            return 500, {}
+        return None
+
+    async def _dispatch(
+        self, method: str, path: str, body: bytes, writer: asyncio.StreamWriter
+    ) -> None:
+        start = time.monotonic()
+        route = path.rstrip("/").removeprefix("/v1")
+        if method == "GET" and route == "/health":
+            await self._send(writer, 200, {"status": "ok"})
+            return
+        if method == "GET" and route == "/stats":
+            await self._send(writer, 200, self.stats.snapshot())
+            return
+        if method != "POST" or route not in ("/embeddings", "/chat/completions"):
+            await self._send(writer, 404, {"error": {"message": f"No route {path}"}})
+            return
+
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            self.stats.record(route, 400, 0.0)
+            await self._send(writer, 400, {"error": {"message": "Invalid JSON"}})
+            return
+
+        failure = self._injected_failure()
+        if failure is not None:
+            status, headers = failure
+            self.stats.record(route, status, time.monotonic() - start)
+            await self._send(
+                writer,
+                status,
+                {"error": {"message": "Injected failure", "code": status}},
+                headers,
+            )
+            return
+
+        if route == "/embeddings":
+            await self._embeddings(payload, writer)
+        else:
+            await self._chat_completions(payload, writer)
+        self.stats.record(route, 200, time.monotonic() - start)
+
+    async def _embeddings(
+        self, payload: Dict[str, Any], writer: asyncio.StreamWriter
+    ) -> None:
+        texts = payload.get("input") or []
+        if isinstance(texts, str):
+            texts = [texts]
+        dimension = int(payload.get("dimensions") or self.config.embedding_dimension)
+        await asyncio.sleep(self.config.embedding_latency.sample(self._rng))
+        self.stats.embedded_texts += len(texts)
+        await self._send(
+            writer,
+            200,
+            {
+                "object": "list",
+                "model": payload.get("model", "mock-embedding"),
+                "data": [
+                    {
+                        "object": "embedding",
+                        "index": index,
+                        "embedding": embed_text(text, dimension),
+                    }
+                    for index, text in enumerate(texts)
+                ],
+                "usage": {
+                    "prompt_tokens": sum(len(t) // 4 for t in texts),
+                    "total_tokens": sum(len(t) // 4 for t in texts),
+                },
+            },
+        )
+
+    async def _chat_completions(
+        self, payload: Dict[str, Any], writer: asyncio.StreamWriter
+    ) -> None:
+        messages = payload.get("messages") or []
+        answer, images = build_answer(messages)
+        self.stats.images += images
+        model = payload.get("model", "mock-chat")
+        tokens = answer.split(" ")
+        await asyncio.sleep(self.config.chat_latency.sample(self._rng, len(tokens)))
+
+        if not payload.get("stream"):
+            await self._send(
+                writer,
+                200,
+                {
+                    "id": f"mock-{_seed_for(answer) % 10**12}",
+                    "object": "chat.completion",
+                    "model": model,
+                    "choices": [
+                        {
+                            "index": 0,
+                            "message": {"role": "assistant", "content": answer},
+                            "finish_reason": "stop",
+                        }
+                    ],
+                    "usage": chat_usage(messages, answer),
+                },
+            )
+            return
+
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: text/event-stream\r\n"
+            b"Transfer-Encoding: chunked\r\n\r\n"
+        )
+        for index, token in enumerate(tokens):
+            chunk = {
+                "object": "chat.completion.chunk",
+                "model": model,
+                "choices": [
+                    {
+                        "index": 0,
+                        "delta": {"content": token if index == 0 else f" {token}"},
+                    }
+                ],
+            }
+            self._write_chunk(writer, f"data: {json.dumps(chunk)}\n\n")
+            await writer.drain()
+            if self.config.stream_chunk_delay:
+                await asyncio.sleep(self.config.stream_chunk_delay)
+        if (payload.get("stream_options") or {}).get("include_usage"):
+            # Like OpenAI: a last chunk without choices carries the usage
+            chunk = {
+                "object": "chat.completion.chunk",
+                "model": model,
+                "choices": [],
+                "usage": chat_usage(messages, answer),
+            }
+            self._write_chunk(writer, f"data: {json.dumps(chunk)}\n\n")
+        self._write_chunk(writer, "data: [DONE]\n\n")
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    @staticmethod
+    def _write_chunk(writer: asyncio.StreamWriter, data: str) -> None:
+        encoded = data.encode("utf-8")
+        writer.write(f"{len(encoded):x}\r\n".encode("latin-1") + encoded + b"\r\n")
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Local OpenAI-compatible mock server for RAG-Anything"
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--embedding-dimension", type=int, default=1536)
+    parser.add_argument(
+        "--latency",
+        default="fixed:0",
+        help="Chat latency: fixed:S, uniform:LO:HI, normal:MEAN:STD or lognormal:MEDIAN:SIGMA",
+    )
+    parser.add_argument(
+        "--latency-per-token",
+        type=float,
+        default=0.0,
+        help="Extra chat latency per output token, in seconds",
+    )
+    parser.add_argument(
+        "--embedding-latency", default="fixed:0", help="Embedding latency spec"
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--rpm-limit", type=int, default=0)
+    parser.add_argument("--stream-chunk-delay", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    return parser
+
+
+def config_from_args(args: argparse.Namespace) -> MockServerConfig:
+    return MockServerConfig(
+        host=args.host,
+        port=args.port,
+        embedding_dimension=args.embedding_dimension,
+        chat_latency=LatencyModel.parse(args.latency, args.latency_per_token),
+        embedding_latency=LatencyModel.parse(args.embedding_latency),
+        error_rate=args.error_rate,
+        rate_429=args.rate_429,
+        retry_after=args.retry_after,
+        rpm_limit=args.rpm_limit,
+        stream_chunk_delay=args.stream_chunk_delay,
+        seed=args.seed,
+    )
+
+
+def main() -> None:
+    server = MockOpenAIServer(config_from_args(build_arg_parser().parse_args()))
+
+    async def run():
+        await server.start()
+        print(f"Mock OpenAI server listening on {server.base_url}")
+        await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -12,7 +12,6 @@ Includes:
 import re
 import json
 import time
-import base64
 from typing import Dict, Any, Tuple, List
 from pathlib import Path
 from dataclasses import dataclass
@@ -28,6 +27,7 @@ from lightrag.operate import extract_entities, merge_nodes_and_edges
 
 # Import prompt templates
 from raganything.prompt import PROMPTS
+from raganything.utils import aprepare_image_for_vlm, encode_image_to_base64
 
 
 @dataclass
@@ -798,14 +798,13 @@ class ImageModalProcessor(BaseModalProcessor):
         super().__init__(lightrag, modal_caption_func, context_extractor)
 
     def _encode_image_to_base64(self, image_path: str) -> str:
-        """Encode image to base64"""
-        try:
-            with open(image_path, "rb") as image_file:
-                encoded_string = base64.b64encode(image_file.read()).decode("utf-8")
-            return encoded_string
-        except Exception as e:
-            logger.error(f"Failed to encode image {image_path}: {e}")
-            return ""
+        """Encode image to base64 (downscaled and re-encoded for the vision model)"""
+        return encode_image_to_base64(image_path)
+
+    async def _aencode_image_to_base64(self, image_path: str) -> str:
+        """Encode image to base64 in a worker thread, reusing cached payloads"""
+        prepared = await aprepare_image_for_vlm(image_path)
+        return prepared.data_b64 if prepared else ""
 
     async def generate_description_only(
         self,
@@ -885,7 +884,7 @@ class ImageModalProcessor(BaseModalProcessor):
                 )
 
             # Encode image to base64
-            image_base64 = self._encode_image_to_base64(image_path)
+            image_base64 = await self._aencode_image_to_base64(image_path)
             if not image_base64:
                 raise RuntimeError(f"Failed to encode image to base64: {image_path}")
 
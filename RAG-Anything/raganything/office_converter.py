@@ -0,0 +1,584 @@
+"""
+Resident LibreOffice conversion of Office documents to PDF
+
+Starting ``soffice`` for every document costs seconds of start-up, and
+concurrent runs sharing the default user profile interfere with each other.
+``OfficeConverter`` keeps a few conversion slots, each with its own persistent
+(warm) LibreOffice profile:
+
+- when the UNO Python bindings (``import uno``) are available, every slot runs
+  a resident headless LibreOffice listening on a local socket, and documents
+  are converted over UNO without starting a process;
+- otherwise each conversion runs the CLI with the slot's warm profile, and
+  ``convert_batch`` converts many documents in one LibreOffice session.
+
+The working binary is detected once. Converted PDFs are cached by source path,
+size and modification time, so a batch conversion done up front serves the
+later per-document calls. PDFs are written under a temporary name and moved
+into place once complete, so an interrupted conversion never leaves a cache hit.
+"""
+
+from __future__ import annotations
+
+import atexit
+import hashlib
+import logging
+import os
+import platform
+import shutil
+import signal
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from queue import Empty, Queue
+from typing import Dict, List, Optional, Sequence, Union
+
+logger = logging.getLogger(__name__)
+
+try:
+    import uno
+    from com.sun.star.beans import PropertyValue
+
+    UNO_AVAILABLE = True
+except ImportError:
+    UNO_AVAILABLE = False
+
+# Binaries tried in order when none is configured
+OFFICE_BINARY_CANDIDATES = ("libreoffice", "soffice")
+_DEFAULT_INSTALL_PATHS = (
+    "/Applications/LibreOffice.app/Contents/MacOS/soffice",
+    r"C:\Program Files\LibreOffice\program\soffice.exe",
+    r"C:\Program Files (x86)\LibreOffice\program\soffice.exe",
+)
+
+# PDF export filter per document service
+_PDF_FILTERS = (
+    ("com.sun.star.text.WebDocument", "writer_web_pdf_Export"),
+    ("com.sun.star.text.GenericTextDocument", "writer_pdf_Export"),
+    ("com.sun.star.sheet.SpreadsheetDocument", "calc_pdf_Export"),
+    ("com.sun.star.presentation.PresentationDocument", "impress_pdf_Export"),
+    ("com.sun.star.drawing.DrawingDocument", "draw_pdf_Export"),
+)
+
+_binary_lock = threading.Lock()
+_working_binary: Optional[str] = None
+
+
+def find_office_binary(preferred: Optional[str] = None) -> Optional[str]:
+    """Locate the LibreOffice binary, remembering the result for later calls"""
+    global _working_binary
+    with _binary_lock:
+        if _working_binary is None:
+            candidates = [preferred] if preferred else []
+            candidates += list(OFFICE_BINARY_CANDIDATES)
+            for candidate in candidates:
+                found = shutil.which(candidate)
+                if found:
+                    _working_binary = found
+                    break
+            else:
+                for path in _DEFAULT_INSTALL_PATHS:
+                    if os.path.exists(path):
+                        _working_binary = path
+                        break
+            if _working_binary:
+                logger.info(f"Using LibreOffice binary: {_working_binary}")
+        return _working_binary
+
+
+def _forget_office_binary() -> None:
+    global _working_binary
+    with _binary_lock:
+        _working_binary = None
+
+
+def _popen_group_kwargs() -> Dict:
+    if platform.system() == "Windows":
+        return {
+            "creationflags": subprocess.CREATE_NO_WINDOW
+            | subprocess.CREATE_NEW_PROCESS_GROUP
+        }
+    return {"start_new_session": True}
+
+
+def _kill_group(process: subprocess.Popen) -> None:
+    """Kill a LibreOffice process with its children (soffice.bin behind the launcher)"""
+    if process.poll() is not None:
+        return
+    try:
+        if platform.system() == "Windows":
+            subprocess.run(
+                ["taskkill", "/F", "/T", "/PID", str(process.pid)],
+                capture_output=True,
+                creationflags=subprocess.CREATE_NO_WINDOW,
+            )
+        else:
+            os.killpg(process.pid, signal.SIGKILL)
+    except (ProcessLookupError, OSError):
+        pass
+    try:
+        process.kill()
+        process.wait(timeout=5)
+    except (ProcessLookupError, subprocess.TimeoutExpired):
+        pass
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class OfficeConversionError(RuntimeError):
+    """Raised when LibreOffice fails to convert a document"""
+
+
+class _OfficeSlot:
+    """One LibreOffice profile, optionally with a resident UNO listener"""
+
+    def __init__(self, index: int, profile_dir: Path, use_listener: bool):
+        self.index = index
+        self.profile_dir = profile_dir
+        self.profile_url = profile_dir.resolve().as_uri()
+        self.use_listener = use_listener
+        self.process: Optional[subprocess.Popen] = None
+        self.desktop = None
+        self.conversions = 0
+
+    def base_command(self, binary: str) -> List[str]:
+        return [
+            binary,
+            "--headless",
+            "--invisible",
+            "--nologo",
+            "--norestore",
+            "--nolockcheck",
+            f"-env:UserInstallation={self.profile_url}",
+        ]
+
+    # Resident listener -------------------------------------------------
+
+    def ensure_listener(self, binary: str, startup_timeout: float) -> None:
+        """Start the listener (or restart it after a crash) and connect to it"""
+        if self.process is not None and self.process.poll() is None and self.desktop:
+            return
+        self.stop()
+        port = _free_port()
+        self.process = subprocess.Popen(
+            self.base_command(binary)
+            + [
+                "--nodefault",
+                f"--accept=socket,host=127.0.0.1,port={port};urp;StarOffice.ComponentContext",
+            ],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            **_popen_group_kwargs(),
+        )
+        local_context = uno.getComponentContext()
+        resolver = local_context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.UnoUrlResolver", local_context
+        )
+        deadline = time.monotonic() + startup_timeout
+        while True:
+            try:
+                context = resolver.resolve(
+                    f"uno:socket,host=127.0.0.1,port={port};urp;StarOffice.ComponentContext"
+                )
+                break
+            except Exception:
+                if self.process.poll() is not None or time.monotonic() > deadline:
+                    self.stop()
+                    raise OfficeConversionError(
+                        f"LibreOffice listener {self.index} did not start"
+                    )
+                time.sleep(0.25)
+        self.desktop = context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.frame.Desktop", context
+        )
+        logger.info(
+            f"LibreOffice listener {self.index} ready on port {port} "
+            f"(pid {self.process.pid})"
+        )
+
+    @staticmethod
+    def _properties(**values) -> tuple:
+        properties = []
+        for name, value in values.items():
+            prop = PropertyValue()
+            prop.Name = name
+            prop.Value = value
+            properties.append(prop)
+        return tuple(properties)
+
+    def convert_with_listener(
+        self, doc_path: Path, pdf_path: Path, timeout: float
+    ) -> None:
+        # A hung conversion is aborted by killing the listener
+        watchdog = threading.Timer(timeout, self.stop)
+        watchdog.start()
+        document = None
+        try:
+            document = self.desktop.loadComponentFromURL(
+                uno.systemPathToFileUrl(str(doc_path.resolve())),
+                "_blank",
+                0,
+                self._properties(Hidden=True, ReadOnly=True),
+            )
+            if document is None:
+                raise OfficeConversionError(f"LibreOffice could not open {doc_path}")
+            pdf_filter = next(
+                (
+                    name
+                    for service, name in _PDF_FILTERS
+                    if document.supportsService(service)
+                ),
+                "writer_pdf_Export",
+            )
+            document.storeToURL(
+                uno.systemPathToFileUrl(str(pdf_path.resolve())),
+                self._properties(FilterName=pdf_filter),
+            )
+        except OfficeConversionError:
+            raise
+        except Exception as e:
+            if not watchdog.is_alive():
+                raise OfficeConversionError(
+                    f"LibreOffice conversion of {doc_path.name} timed out after {timeout:.0f}s"
+                ) from e
+            # The listener may be in a bad state; restart it for the next document
+            self.stop()
+            raise OfficeConversionError(
+                f"LibreOffice conversion of {doc_path.name} failed: {e}"
+            ) from e
+        finally:
+            watchdog.cancel()
+            if document is not None:
+                try:
+                    document.close(True)
+                except Exception:
+                    pass
+
+    # CLI ------------------------------------------------------------
+
+    def convert_with_cli(
+        self, binary: str, doc_paths: Sequence[Path], out_dir: Path, timeout: float
+    ) -> None:
+        """Convert documents in one LibreOffice session using the slot's warm profile"""
+        cmd = self.base_command(binary) + [
+            "--convert-to",
+            "pdf",
+            "--outdir",
+            str(out_dir),
+            *[str(path) for path in doc_paths],
+        ]
+        process = subprocess.Popen(
+            cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            errors="ignore",
+            **_popen_group_kwargs(),
+        )
+        try:
+            _, stderr = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            _kill_group(process)
+            raise OfficeConversionError(
+                f"LibreOffice timed out after {timeout:.0f}s converting "
+                f"{len(doc_paths)} document(s)"
+            )
+        if process.returncode != 0:
+            raise OfficeConversionError(
+                f"LibreOffice exited with code {process.returncode}: {stderr.strip()}"
+            )
+
+    def stop(self) -> None:
+        self.desktop = None
+        if self.process is not None:
+            _kill_group(self.process)
+            self.process = None
+
+
+class OfficeConverter:
+    """Pool of LibreOffice slots converting Office documents to PDF"""
+
+    def __init__(
+        self,
+        size: int = 1,
+        timeout: float = 60.0,
+        use_listener: bool = True,
+        binary: Optional[str] = None,
+        work_dir: Optional[str] = None,
+        startup_timeout: float = 60.0,
+    ):
+        """Initialize the converter
+
+        Args:
+            size: Number of LibreOffice slots (parallel conversions)
+            timeout: Seconds allowed per document (per batch session in CLI mode,
+                scaled by the number of documents)
+            use_listener: Use resident UNO listeners when the bindings are available
+            binary: LibreOffice binary (detected if None)
+            work_dir: Directory for slot profiles and converted PDFs
+            startup_timeout: Seconds allowed for a listener to accept connections
+        """
+        self.size = max(1, size)
+        self.timeout = timeout
+        self.use_listener = use_listener and UNO_AVAILABLE
+        self.preferred_binary = binary
+        self.startup_timeout = startup_timeout
+        self.work_dir = Path(
+            work_dir or os.path.join(tempfile.gettempdir(), "raganything_office")
+        )
+        self.cache_dir = self.work_dir / "pdf"
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        self._slots: Queue = Queue()
+        for index in range(self.size):
+            profile_dir = self.work_dir / "profiles" / f"slot_{index}"
+            profile_dir.mkdir(parents=True, exist_ok=True)
+            self._slots.put(_OfficeSlot(index, profile_dir, self.use_listener))
+        self._all_slots = list(self._slots.queue)
+
+        # Statistics, updated from the conversion threads
+        self._stats_lock = threading.Lock()
+        self.conversions = 0
+        self.cache_hits = 0
+        self.failures = 0
+        self.batch_sessions = 0
+
+    def _count(self, counter: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    def _binary(self) -> str:
+        binary = find_office_binary(self.preferred_binary)
+        if not binary:
+            raise FileNotFoundError("LibreOffice (libreoffice/soffice) not found")
+        return binary
+
+    def cached_pdf_path(self, doc_path: Union[str, Path]) -> Path:
+        """Cache location of the PDF of a document, keyed by path, size and mtime"""
+        doc_path = Path(doc_path).resolve()
+        stat = doc_path.stat()
+        key = f"{doc_path}\x00{stat.st_size}\x00{stat.st_mtime_ns}"
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+        return self.cache_dir / f"{digest}.pdf"
+
+    def _partial_path(self, pdf_path: Path) -> Path:
+        """Temporary name of a PDF being written, unique per thread"""
+        return pdf_path.with_name(
+            f"{pdf_path.stem}.{os.getpid()}.{threading.get_ident()}.part"
+        )
+
+    def _take_slot(self) -> _OfficeSlot:
+        return self._slots.get()
+
+    def convert(self, doc_path: Union[str, Path]) -> Path:
+        """Convert one document, returning the (cached) PDF path
+
+        Raises:
+            FileNotFoundError: If LibreOffice is not installed
+            OfficeConversionError: If the conversion fails
+        """
+        doc_path = Path(doc_path)
+        pdf_path = self.cached_pdf_path(doc_path)
+        if pdf_path.exists():
+            self._count("cache_hits")
+            return pdf_path
+
+        try:
+            self._convert_in_slot(doc_path, pdf_path)
+        except Exception:
+            self._count("failures")
+            raise
+        if not pdf_path.exists():
+            self._count("failures")
+            raise OfficeConversionError(
+                f"LibreOffice produced no PDF for {doc_path.name}"
+            )
+        self._count("conversions")
+        return pdf_path
+
+    def _convert_in_slot(self, doc_path: Path, pdf_path: Path) -> None:
+        """Convert one document into the cache with the next free slot"""
+        binary = self._binary()
+        slot = self._take_slot()
+        try:
+            if slot.use_listener:
+                slot.ensure_listener(binary, self.startup_timeout)
+                partial_path = self._partial_path(pdf_path)
+                try:
+                    slot.convert_with_listener(doc_path, partial_path, self.timeout)
+                    if partial_path.exists():
+                        os.replace(partial_path, pdf_path)
+                finally:
+                    partial_path.unlink(missing_ok=True)
+            else:
+                self._convert_session(slot, binary, [doc_path])
+            slot.conversions += 1
+        except FileNotFoundError:
+            _forget_office_binary()
+            raise
+        finally:
+            self._slots.put(slot)
+
+    def _convert_session(
+        self, slot: _OfficeSlot, binary: str, doc_paths: List[Path]
+    ) -> None:
+        """Run one CLI session and move its PDFs into the cache"""
+        with tempfile.TemporaryDirectory(dir=self.work_dir) as out_dir:
+            out_path = Path(out_dir)
+            slot.convert_with_cli(
+                binary, doc_paths, out_path, self.timeout * len(doc_paths)
+            )
+            for doc_path in doc_paths:
+                produced = out_path / f"{doc_path.stem}.pdf"
+                if produced.exists():
+                    # Same file system as the cache: an atomic rename
+                    os.replace(produced, self.cached_pdf_path(doc_path))
+
+    def convert_batch(
+        self, doc_paths: Sequence[Union[str, Path]], session_size: int = 50
+    ) -> Dict[str, Path]:
+        """Convert many documents, reusing LibreOffice sessions
+
+        In CLI mode each slot converts up to ``session_size`` documents per
+        LibreOffice start. Documents that fail are left out of the result (a
+        later ``convert`` call reports their error).
+
+        Returns:
+            Dict mapping each converted source path to its PDF
+        """
+        results: Dict[str, Path] = {}
+        pending: List[Path] = []
+        for doc_path in doc_paths:
+            doc_path = Path(doc_path)
+            pdf_path = self.cached_pdf_path(doc_path)
+            if pdf_path.exists():
+                self._count("cache_hits")
+                results[str(doc_path)] = pdf_path
+            else:
+                pending.append(doc_path)
+        if not pending:
+            return results
+
+        if self.use_listener:
+            sessions = [[doc_path] for doc_path in pending]
+        else:
+            # LibreOffice names outputs by stem: keep stems unique per session
+            sessions: List[List[Path]] = []
+            for doc_path in pending:
+                for session in sessions:
+                    if len(session) < session_size and all(
+                        other.stem != doc_path.stem for other in session
+                    ):
+                        session.append(doc_path)
+                        break
+                else:
+                    sessions.append([doc_path])
+
+        def run(session: List[Path]) -> None:
+            try:
+                if self.use_listener:
+                    doc_path = session[0]
+                    self._convert_in_slot(doc_path, self.cached_pdf_path(doc_path))
+                    return
+                binary = self._binary()
+                slot = self._take_slot()
+                try:
+                    self._convert_session(slot, binary, session)
+                    slot.conversions += len(session)
+                    self._count("batch_sessions")
+                finally:
+                    self._slots.put(slot)
+            except Exception as e:
+                logger.warning(f"LibreOffice batch conversion failed: {e}")
+
+        # One thread per slot drains the sessions, however many documents there are
+        with ThreadPoolExecutor(
+            max_workers=min(self.size, len(sessions)),
+            thread_name_prefix="office-convert",
+        ) as executor:
+            list(executor.map(run, sessions))
+
+        converted = 0
+        for doc_path in pending:
+            pdf_path = self.cached_pdf_path(doc_path)
+            if pdf_path.exists():
+                converted += 1
+                results[str(doc_path)] = pdf_path
+        self._count("conversions", converted)
+        self._count("failures", len(pending) - converted)
+        logger.info(
+            f"Converted {len(results)}/{len(doc_paths)} Office documents to PDF "
+            f"in {len(sessions)} LibreOffice session(s)"
+        )
+        return results
+
+    def get_stats(self) -> Dict:
+        """Get conversion statistics"""
+        return {
+            "mode": "listener" if self.use_listener else "cli",
+            "slots": self.size,
+            "binary": _working_binary,
+            "conversions": self.conversions,
+            "cache_hits": self.cache_hits,
+            "failures": self.failures,
+            "batch_sessions": self.batch_sessions,
+        }
+
+    def close(self) -> None:
+        """Stop the resident listeners"""
+        for slot in self._all_slots:
+            slot.stop()
+        while True:
+            try:
+                self._slots.get_nowait()
+            except Empty:
+                break
+        for slot in self._all_slots:
+            self._slots.put(slot)
+
+    def __deepcopy__(self, memo) -> "OfficeConverter":
+        # Listener processes are shared, never copied
+        return self
+
+
+_converter: Optional[OfficeConverter] = None
+_converter_lock = threading.Lock()
+
+
+def configure_office_converter(config) -> OfficeConverter:
+    """Create (or return) the process-wide converter from a RAGAnythingConfig
+
+    The first configuration wins so that all parsers share the LibreOffice slots.
+    """
+    global _converter
+    with _converter_lock:
+        if _converter is None:
+            _converter = OfficeConverter(
+                size=config.office_workers,
+                timeout=config.office_conversion_timeout,
+                use_listener=config.office_listener,
+                binary=config.office_binary or None,
+                work_dir=config.office_work_dir or None,
+            )
+            atexit.register(_converter.close)
+        return _converter
+
+
+def get_office_converter() -> OfficeConverter:
+    """Get the process-wide converter, configuring it from the default config if needed"""
+    if _converter is None:
+        from raganything.config import RAGAnythingConfig
+
+        return configure_office_converter(RAGAnythingConfig())
+    return _converter
@@ -0,0 +1,588 @@
+"""
+Native parsing of Office Open XML documents (.docx, .pptx)
+
+Word and PowerPoint files are zip packages of XML parts that already hold the
+document structure, so they are read directly instead of being converted to
+PDF with LibreOffice and parsed back with layout/OCR models:
+
+- Word: body paragraphs (heading levels from paragraph styles and outline
+  levels), tables (with merged cells) and embedded pictures. ``page_idx``
+  follows the page breaks Word recorded when it last saved the file, or the
+  explicit page and section breaks when there are none.
+- PowerPoint: text shapes (slide titles as headings), tables and pictures,
+  with one ``page_idx`` per slide.
+
+Documents using features this parser cannot represent (equations, charts,
+SmartArt, embedded OLE objects) raise ``UnsupportedOOXMLError`` so the caller
+can fall back to LibreOffice and MinerU.
+"""
+
+import html
+import logging
+import posixpath
+import zipfile
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+OOXML_FORMATS = {".docx", ".pptx"}
+
+# Picture formats the vision model can read; vector formats (emf, wmf) are skipped
+RASTER_IMAGE_EXTENSIONS = {
+    ".png",
+    ".jpg",
+    ".jpeg",
+    ".gif",
+    ".bmp",
+    ".tif",
+    ".tiff",
+    ".webp",
+}
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_A = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+_P = "{http://schemas.openxmlformats.org/presentationml/2006/main}"
+_R = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_WP = "{http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing}"
+_MC = "{http://schemas.openxmlformats.org/markup-compatibility/2006}"
+_M = "{http://schemas.openxmlformats.org/officeDocument/2006/math}"
+_V = "{urn:schemas-microsoft-com:vml}"
+_PKG_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+# graphicData kinds that only a rendering pipeline can capture
+_UNSUPPORTED_GRAPHICS = {
+    "http://schemas.openxmlformats.org/drawingml/2006/chart": "charts",
+    "http://schemas.microsoft.com/office/drawing/2014/chartex": "charts",
+    "http://schemas.openxmlformats.org/drawingml/2006/diagram": "SmartArt diagrams",
+    "http://schemas.openxmlformats.org/presentationml/2006/ole": "embedded objects",
+}
+
+# Word elements whose subtree holds nothing to extract
+_W_SKIPPED = {
+    f"{_W}pPr",
+    f"{_W}rPr",
+    f"{_W}sectPr",
+    f"{_W}del",
+    f"{_W}instrText",
+    f"{_MC}Fallback",
+}
+_W_CONTAINERS = {
+    f"{_W}sdt",
+    f"{_W}sdtContent",
+    f"{_W}customXml",
+    f"{_W}ins",
+    f"{_MC}AlternateContent",
+    f"{_MC}Choice",
+}
+
+
+class UnsupportedOOXMLError(Exception):
+    """Raised when a document cannot be parsed natively"""
+
+
+def _html_table(rows: List[List[Dict[str, Any]]]) -> str:
+    """Render rows of ``{"text", "colspan", "rowspan"}`` cells as an HTML table"""
+    out = ["<table>"]
+    for row in rows:
+        out.append("<tr>")
+        for cell in row:
+            attrs = ""
+            if cell["colspan"] > 1:
+                attrs += f' colspan="{cell["colspan"]}"'
+            if cell["rowspan"] > 1:
+                attrs += f' rowspan="{cell["rowspan"]}"'
+            text = html.escape(cell["text"]).replace("\n", "<br>")
+            out.append(f"<td{attrs}>{text}</td>")
+        out.append("</tr>")
+    out.append("</table>")
+    return "".join(out)
+
+
+class OOXMLPackage:
+    """Zip package with relationship lookup and picture extraction"""
+
+    def __init__(self, zf: zipfile.ZipFile, image_dir: Path):
+        self.zf = zf
+        self.image_dir = image_dir
+        self._rels: Dict[str, Dict[str, Tuple[str, bool]]] = {}
+        self._images: Dict[str, Optional[str]] = {}
+
+    def xml(self, part: str) -> ET.Element:
+        return ET.fromstring(self.zf.read(part))
+
+    def rels(self, part: str) -> Dict[str, Tuple[str, bool]]:
+        """Relationships of a part: id -> (target part, external)"""
+        if part not in self._rels:
+            directory, name = posixpath.split(part)
+            rels: Dict[str, Tuple[str, bool]] = {}
+            try:
+                root = self.xml(posixpath.join(directory, "_rels", f"{name}.rels"))
+            except KeyError:
+                root = None
+            if root is not None:
+                for rel in root.iter(f"{_PKG_REL}Relationship"):
+                    target = rel.get("Target", "")
+                    external = rel.get("TargetMode") == "External"
+                    if not external:
+                        target = (
+                            target.lstrip("/")
+                            if target.startswith("/")
+                            else posixpath.normpath(posixpath.join(directory, target))
+                        )
+                    rels[rel.get("Id")] = (target, external)
+            self._rels[part] = rels
+        return self._rels[part]
+
+    def image(self, part: str, r_id: Optional[str]) -> Optional[str]:
+        """Extract a picture referenced from a part, returning its absolute path"""
+        rel = self.rels(part).get(r_id) if r_id else None
+        if rel is None or rel[1]:
+            return None
+        target = rel[0]
+        if target not in self._images:
+            path = None
+            if Path(target).suffix.lower() in RASTER_IMAGE_EXTENSIONS:
+                try:
+                    data = self.zf.read(target)
+                except KeyError:
+                    data = b""
+                if data:
+                    self.image_dir.mkdir(parents=True, exist_ok=True)
+                    out = self.image_dir / posixpath.basename(target)
+                    out.write_bytes(data)
+                    path = str(out.resolve())
+            else:
+                logger.debug(f"Skipping non-raster picture {target}")
+            self._images[target] = path
+        return self._images[target]
+
+
+class _ContentItems:
+    """content_list under construction; repeated pictures are kept once"""
+
+    def __init__(self):
+        self.content_list: List[Dict[str, Any]] = []
+        self._images = set()
+
+    def add_text(self, text: str, page_idx: int, level: int = 0) -> None:
+        item: Dict[str, Any] = {"type": "text", "text": text}
+        if level:
+            item["text_level"] = level
+        item["page_idx"] = page_idx
+        self.content_list.append(item)
+
+    def add_table(self, table_body: str, page_idx: int) -> None:
+        self.content_list.append(
+            {
+                "type": "table",
+                "table_body": table_body,
+                "table_caption": [],
+                "table_footnote": [],
+                "page_idx": page_idx,
+            }
+        )
+
+    def add_image(self, path: str, captions: List[str], page_idx: int) -> None:
+        if path in self._images:
+            return
+        self._images.add(path)
+        self.content_list.append(
+            {
+                "type": "image",
+                "img_path": path,
+                "image_caption": captions,
+                "image_footnote": [],
+                "page_idx": page_idx,
+            }
+        )
+
+    def attach_caption(self, text: str) -> bool:
+        """Attach a caption paragraph to the preceding table or picture"""
+        last = self.content_list[-1] if self.content_list else None
+        if last is None or last["type"] not in ("image", "table"):
+            return False
+        last[f"{last['type']}_caption"].append(text)
+        return True
+
+
+class _DocxReader:
+    """Read the body of word/document.xml"""
+
+    PART = "word/document.xml"
+
+    def __init__(self, package: OOXMLPackage):
+        self.package = package
+        self.items = _ContentItems()
+        self.page_idx = 0
+        self.rendered_breaks = False
+        self.styles = self._read_styles()
+        self._first_text_page: Optional[int] = None
+        self._picture_captions: List[str] = []
+
+    def _read_styles(self) -> Dict[str, Tuple[int, bool]]:
+        """Paragraph style id -> (heading level, is caption)"""
+        try:
+            root = self.package.xml("word/styles.xml")
+        except KeyError:
+            return {}
+        raw = {}
+        for style in root.iter(f"{_W}style"):
+            if style.get(f"{_W}type") != "paragraph":
+                continue
+            name = style.find(f"{_W}name")
+            outline = style.find(f"{_W}pPr/{_W}outlineLvl")
+            based_on = style.find(f"{_W}basedOn")
+            raw[style.get(f"{_W}styleId")] = (
+                (name.get(f"{_W}val", "") if name is not None else "").lower(),
+                outline.get(f"{_W}val") if outline is not None else None,
+                based_on.get(f"{_W}val") if based_on is not None else None,
+            )
+
+        def level_of(style_id: str) -> int:
+            for _ in range(10):
+                if style_id not in raw:
+                    return 0
+                name, outline, based_on = raw[style_id]
+                if name == "title":
+                    return 1
+                if name.startswith("heading ") and name[8:].isdigit():
+                    return int(name[8:])
+                if outline is not None and outline.isdigit() and int(outline) < 9:
+                    return int(outline) + 1
+                if based_on is None:
+                    return 0
+                style_id = based_on
+            return 0
+
+        return {
+            style_id: (level_of(style_id), name == "caption")
+            for style_id, (name, _, _) in raw.items()
+        }
+
+    def read(self) -> None:
+        data = self.package.zf.read(self.PART)
+        # Word records where pages ended when it last laid the document out
+        self.rendered_breaks = b"lastRenderedPageBreak" in data
+        root = ET.fromstring(data)
+        body = root.find(f"{_W}body")
+        if root.tag != f"{_W}document" or body is None:
+            raise UnsupportedOOXMLError("not a transitional WordprocessingML document")
+        self._blocks(body)
+
+    def _blocks(self, container: ET.Element) -> None:
+        for child in container:
+            if child.tag == f"{_W}p":
+                self._paragraph(child)
+            elif child.tag == f"{_W}tbl":
+                self._table(child)
+            elif child.tag in _W_CONTAINERS:
+                self._blocks(child)
+
+    def _collect(
+        self, element: ET.Element, parts: List[str], images: List[Tuple[str, List[str]]]
+    ) -> None:
+        """Gather the text and pictures below an element, tracking page breaks"""
+        for child in element:
+            tag = child.tag
+            if tag == f"{_W}t":
+                if self._first_text_page is None:
+                    self._first_text_page = self.page_idx
+                parts.append(child.text or "")
+            elif tag == f"{_W}tab":
+                parts.append("\t")
+            elif tag == f"{_W}br":
+                if child.get(f"{_W}type") == "page":
+                    if not self.rendered_breaks:
+                        self.page_idx += 1
+                else:
+                    parts.append("\n")
+            elif tag == f"{_W}cr":
+                parts.append("\n")
+            elif tag == f"{_W}lastRenderedPageBreak":
+                self.page_idx += 1
+            elif tag in _W_SKIPPED:
+                continue
+            elif tag in (f"{_M}oMath", f"{_M}oMathPara"):
+                raise UnsupportedOOXMLError("equations")
+            elif tag == f"{_W}object":
+                raise UnsupportedOOXMLError("embedded objects")
+            elif tag == f"{_A}graphicData":
+                kind = _UNSUPPORTED_GRAPHICS.get(child.get("uri", ""))
+                if kind:
+                    raise UnsupportedOOXMLError(kind)
+                self._collect(child, parts, images)
+            elif tag == f"{_WP}docPr":
+                self._picture_captions = [
+                    caption
+                    for caption in (child.get("descr"), child.get("title"))
+                    if caption
+                ]
+            elif tag == f"{_A}blip":
+                path = self.package.image(self.PART, child.get(f"{_R}embed"))
+                if path:
+                    images.append((path, self._picture_captions))
+            elif tag == f"{_V}imagedata":
+                path = self.package.image(self.PART, child.get(f"{_R}id"))
+                if path:
+                    images.append((path, []))
+            elif tag == f"{_W}p":
+                # Paragraphs of text boxes
+                self._collect(child, parts, images)
+                parts.append("\n")
+            else:
+                self._collect(child, parts, images)
+
+    def _paragraph(self, paragraph: ET.Element) -> None:
+        level, is_caption, is_list = 0, False, False
+        properties = paragraph.find(f"{_W}pPr")
+        if properties is not None:
+            style = properties.find(f"{_W}pStyle")
+            if style is not None:
+                level, is_caption = self.styles.get(style.get(f"{_W}val"), (0, False))
+            outline = properties.find(f"{_W}outlineLvl")
+            if outline is not None:
+                value = outline.get(f"{_W}val", "")
+                level = int(value) + 1 if value.isdigit() and int(value) < 9 else 0
+            is_list = properties.find(f"{_W}numPr") is not None
+            if (
+                not self.rendered_breaks
+                and properties.find(f"{_W}pageBreakBefore") is not None
+            ):
+                self.page_idx += 1
+
+        self._first_text_page = None
+        parts: List[str] = []
+        images: List[Tuple[str, List[str]]] = []
+        self._collect(paragraph, parts, images)
+        page_idx = (
+            self._first_text_page
+            if self._first_text_page is not None
+            else self.page_idx
+        )
+
+        text = "".join(parts).strip()
+        if text and not (is_caption and self.items.attach_caption(text)):
+            if is_list and not level:
+                text = f"- {text}"
+            self.items.add_text(text, page_idx, level)
+        for path, captions in images:
+            self.items.add_image(path, captions, page_idx)
+
+        # A section break ends the page unless Word recorded the real breaks
+        if (
+            properties is not None
+            and not self.rendered_breaks
+            and properties.find(f"{_W}sectPr") is not None
+        ):
+            self.page_idx += 1
+
+    def _cell_text(
+        self, container: ET.Element, images: List[Tuple[str, List[str]]]
+    ) -> str:
+        lines = []
+        for child in container:
+            if child.tag == f"{_W}p":
+                parts: List[str] = []
+                self._collect(child, parts, images)
+                lines.append("".join(parts).strip())
+            elif child.tag == f"{_W}tbl":
+                # Nested tables are flattened into the cell text
+                for row in child.findall(f"{_W}tr"):
+                    lines.append(
+                        " | ".join(
+                            self._cell_text(cell, images)
+                            for cell in row.findall(f"{_W}tc")
+                        )
+                    )
+            elif child.tag in _W_CONTAINERS:
+                lines.append(self._cell_text(child, images))
+        return "\n".join(line for line in lines if line)
+
+    def _table(self, table: ET.Element) -> None:
+        page_idx = self.page_idx
+        images: List[Tuple[str, List[str]]] = []
+        rows: List[List[Dict[str, Any]]] = []
+        # Cells starting a vertical merge, by grid column
+        merge_origins: Dict[int, Dict[str, Any]] = {}
+        for tr in table.findall(f"{_W}tr"):
+            row: List[Dict[str, Any]] = []
+            column = 0
+            grid_before = tr.find(f"{_W}trPr/{_W}gridBefore")
+            if grid_before is not None:
+                column += int(grid_before.get(f"{_W}val", "0"))
+            for tc in tr.findall(f"{_W}tc"):
+                span_element = tc.find(f"{_W}tcPr/{_W}gridSpan")
+                span = (
+                    int(span_element.get(f"{_W}val", "1"))
+                    if span_element is not None
+                    else 1
+                )
+                merge = tc.find(f"{_W}tcPr/{_W}vMerge")
+                if merge is not None and merge.get(f"{_W}val") != "restart":
+                    origin = merge_origins.get(column)
+                    if origin is not None:
+                        origin["rowspan"] += 1
+                        column += span
+                        continue
+                cell = {
+                    "text": self._cell_text(tc, images),
+                    "colspan": span,
+                    "rowspan": 1,
+                }
+                if merge is not None:
+                    merge_origins[column] = cell
+                else:
+                    merge_origins.pop(column, None)
+                row.append(cell)
+                column += span
+            rows.append(row)
+        if rows:
+            self.items.add_table(_html_table(rows), page_idx)
+        for path, captions in images:
+            self.items.add_image(path, captions, page_idx)
+
+
+class _PptxReader:
+    """Read the visible slides of a presentation in order"""
+
+    def __init__(self, package: OOXMLPackage):
+        self.package = package
+        self.items = _ContentItems()
+
+    def read(self) -> None:
+        presentation = self.package.xml("ppt/presentation.xml")
+        rels = self.package.rels("ppt/presentation.xml")
+        slide_ids = presentation.find(f"{_P}sldIdLst")
+        for slide_idx, slide_id in enumerate(
+            slide_ids if slide_ids is not None else []
+        ):
+            rel = rels.get(slide_id.get(f"{_R}id"))
+            if rel is None or rel[1]:
+                continue
+            slide = self.package.xml(rel[0])
+            if slide.get("show") == "0":
+                continue
+            tree = slide.find(f"{_P}cSld/{_P}spTree")
+            if tree is not None:
+                self._shapes(tree, rel[0], slide_idx)
+
+    def _shapes(self, tree: ET.Element, part: str, page_idx: int) -> None:
+        for shape in tree:
+            tag = shape.tag
+            if tag == f"{_P}sp":
+                body = shape.find(f"{_P}txBody")
+                text = self._text_body(body) if body is not None else ""
+                if text:
+                    placeholder = shape.find(f"{_P}nvSpPr/{_P}nvPr/{_P}ph")
+                    is_title = placeholder is not None and placeholder.get("type") in (
+                        "title",
+                        "ctrTitle",
+                    )
+                    self.items.add_text(text, page_idx, 1 if is_title else 0)
+            elif tag == f"{_P}pic":
+                blip = shape.find(f"{_P}blipFill/{_A}blip")
+                path = (
+                    self.package.image(part, blip.get(f"{_R}embed"))
+                    if blip is not None
+                    else None
+                )
+                if path:
+                    properties = shape.find(f"{_P}nvPicPr/{_P}cNvPr")
+                    captions = (
+                        [
+                            caption
+                            for caption in (
+                                properties.get("descr"),
+                                properties.get("title"),
+                            )
+                            if caption
+                        ]
+                        if properties is not None
+                        else []
+                    )
+                    self.items.add_image(path, captions, page_idx)
+            elif tag == f"{_P}graphicFrame":
+                data = shape.find(f"{_A}graphic/{_A}graphicData")
+                if data is None:
+                    continue
+                kind = _UNSUPPORTED_GRAPHICS.get(data.get("uri", ""))
+                if kind:
+                    raise UnsupportedOOXMLError(kind)
+                table = data.find(f"{_A}tbl")
+                if table is not None:
+                    self.items.add_table(self._table(table), page_idx)
+            elif tag == f"{_P}grpSp":
+                self._shapes(shape, part, page_idx)
+            elif tag == f"{_MC}AlternateContent":
+                choice = shape.find(f"{_MC}Choice")
+                if choice is not None:
+                    self._shapes(choice, part, page_idx)
+
+    def _text_body(self, body: ET.Element) -> str:
+        lines = []
+        for paragraph in body.findall(f"{_A}p"):
+            parts = []
+            for child in paragraph:
+                if child.tag in (f"{_A}r", f"{_A}fld"):
+                    text = child.find(f"{_A}t")
+                    if text is not None and text.text:
+                        parts.append(text.text)
+                elif child.tag == f"{_A}br":
+                    parts.append("\n")
+                elif child.tag == f"{_MC}AlternateContent":
+                    if child.find(f".//{_M}oMath") is not None:
+                        raise UnsupportedOOXMLError("equations")
+            line = "".join(parts).strip()
+            if line:
+                lines.append(line)
+        return "\n".join(lines)
+
+    def _table(self, table: ET.Element) -> str:
+        rows = []
+        for tr in table.findall(f"{_A}tr"):
+            row = []
+            for tc in tr.findall(f"{_A}tc"):
+                # Cells covered by a merge carry hMerge/vMerge
+                if tc.get("hMerge") == "1" or tc.get("vMerge") == "1":
+                    continue
+                body = tc.find(f"{_A}txBody")
+                row.append(
+                    {
+                        "text": self._text_body(body) if body is not None else "",
+                        "colspan": int(tc.get("gridSpan", "1")),
+                        "rowspan": int(tc.get("rowSpan", "1")),
+                    }
+                )
+            rows.append(row)
+        return _html_table(rows)
+
+
+def parse_ooxml_file(
+    doc_path: Union[str, Path], output_dir: Union[str, Path]
+) -> List[Dict[str, Any]]:
+    """Parse a .docx or .pptx file into ``content_list`` items
+
+    Embedded pictures are written to ``<output_dir>/<stem>/ooxml/images``.
+
+    Raises:
+        UnsupportedOOXMLError: If the file is not a readable package or uses
+            features that need the LibreOffice/MinerU route
+    """
+    doc_path = Path(doc_path)
+    ext = doc_path.suffix.lower()
+    if ext not in OOXML_FORMATS:
+        raise UnsupportedOOXMLError(f"unsupported format {ext}")
+    image_dir = Path(output_dir) / doc_path.stem / "ooxml" / "images"
+    try:
+        with zipfile.ZipFile(doc_path) as zf:
+            package = OOXMLPackage(zf, image_dir)
+            reader = _DocxReader(package) if ext == ".docx" else _PptxReader(package)
+            reader.read()
+    except (zipfile.BadZipFile, KeyError, ET.ParseError, ValueError) as e:
+        raise UnsupportedOOXMLError(f"unreadable package: {e}") from e
+
+    content_list = reader.items.content_list
+    logger.info(f"Parsed {doc_path.name} natively: {len(content_list)} content blocks")
+    return content_list
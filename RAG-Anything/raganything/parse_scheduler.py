@@ -0,0 +1,362 @@
+"""
+CPU budgets for concurrent parser processes
+
+MinerU and Docling size their thread pools (PyTorch, OpenMP, BLAS) for the
+whole machine, so N concurrent parser processes run N times as many threads as
+there are cores and spend their time switching. The scheduler splits the
+available cores between the concurrent workers of a batch:
+
+- each worker gets a slot with a thread budget, passed to the parser processes
+  it starts through the usual thread cap variables (``OMP_NUM_THREADS``, ...)
+- optionally each slot gets its own set of cores and its processes are pinned
+  to it (Linux only)
+- the CPU time of the parser processes and of the worker thread is recorded
+  per slot, so the number of workers can be tuned from the reported
+  utilization
+
+Parsers find the slot of the calling thread with :func:`subprocess_env` and
+:func:`track_process`; outside a scheduled batch both leave processes alone.
+The CPU time of a process can only be read until it is reaped, so parsers wait
+for it with :func:`process_exited` or :func:`wait_unreaped` and ``finish()``
+its usage before reaping it.
+"""
+
+import logging
+import os
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from queue import Queue
+from typing import Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Thread pool sizes read by PyTorch, OpenMP, BLAS backends and tokenizers
+THREAD_ENV_VARS = (
+    "OMP_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+    "RAYON_NUM_THREADS",
+)
+
+# Seconds between CPU time samples of the tracked processes
+SAMPLE_INTERVAL = 0.5
+
+AFFINITY_AVAILABLE = hasattr(os, "sched_setaffinity") and hasattr(
+    os, "sched_getaffinity"
+)
+
+# Waiting for a child without reaping it (Linux, BSD)
+WAITID_AVAILABLE = hasattr(os, "waitid") and hasattr(os, "WNOWAIT")
+
+_local = threading.local()
+
+
+def available_cpus() -> List[int]:
+    """CPU cores this process may run on"""
+    if AFFINITY_AVAILABLE:
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def process_exited(process: subprocess.Popen) -> bool:
+    """Whether a child process has exited, leaving it unreaped where possible"""
+    if process.returncode is not None:
+        return True
+    if WAITID_AVAILABLE:
+        try:
+            flags = os.WEXITED | os.WNOHANG | os.WNOWAIT
+            return os.waitid(os.P_PID, process.pid, flags) is not None
+        except ChildProcessError:
+            pass
+    return process.poll() is not None
+
+
+def wait_unreaped(process: subprocess.Popen) -> None:
+    """Block until a child process exits, without reaping it where possible
+
+    The process stays a zombie until ``process.wait()``, so its final CPU time
+    can still be read. Where ``os.waitid`` is missing this reaps the process.
+    """
+    if process.returncode is not None:
+        return
+    if WAITID_AVAILABLE:
+        try:
+            os.waitid(os.P_PID, process.pid, os.WEXITED | os.WNOWAIT)
+            return
+        except ChildProcessError:
+            pass
+    process.wait()
+
+
+def _process_cpu_seconds(pid: int) -> Optional[float]:
+    """CPU time of a process and its reaped children, or None if unknown"""
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as stat:
+            # Fields after the command name, which may contain spaces
+            fields = stat.read().rsplit(b")", 1)[1].split()
+    except (OSError, IndexError):
+        return None
+    # utime, stime, cutime, cstime
+    ticks = sum(int(value) for value in fields[11:15])
+    return ticks / os.sysconf("SC_CLK_TCK")
+
+
+@dataclass
+class WorkerCpuStats:
+    """CPU usage of one concurrent parse worker"""
+
+    worker: int
+    threads: Optional[int]
+    cpus: Optional[List[int]]
+    files: int = 0
+    busy_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+
+    @property
+    def cores_used(self) -> float:
+        """Average number of cores kept busy while the worker was parsing"""
+        if not self.busy_seconds:
+            return 0.0
+        return self.cpu_seconds / self.busy_seconds
+
+    @property
+    def utilization(self) -> Optional[float]:
+        """Share of the thread budget used, as a percentage"""
+        if not self.threads:
+            return None
+        return self.cores_used / self.threads * 100
+
+    def summary(self) -> str:
+        budget = f"{self.threads} threads" if self.threads else "no thread cap"
+        if self.cpus:
+            budget += f", CPUs {_format_cpus(self.cpus)}"
+        line = (
+            f"Worker {self.worker} ({budget}): {self.files} files, "
+            f"{self.busy_seconds:.1f}s busy, {self.cores_used:.2f} cores"
+        )
+        if self.utilization is not None:
+            line += f" ({self.utilization:.0f}% of budget)"
+        return line
+
+
+def _format_cpus(cpus: List[int]) -> str:
+    ranges = []
+    start = previous = cpus[0]
+    for cpu in cpus[1:] + [None]:
+        if cpu is not None and cpu == previous + 1:
+            previous = cpu
+            continue
+        ranges.append(str(start) if start == previous else f"{start}-{previous}")
+        if cpu is not None:
+            start = previous = cpu
+    return ",".join(ranges)
+
+
+class ProcessUsage:
+    """CPU time used by a process on behalf of a slot, from now until finish()"""
+
+    def __init__(self, slot: Optional["_Slot"] = None, pid: int = 0):
+        self.slot = slot
+        self.pid = pid
+        self.baseline = _process_cpu_seconds(pid) if slot is not None else None
+        self.last = self.baseline
+        self.finished = slot is None
+
+    def sample(self) -> None:
+        if self.slot is None:
+            return
+        cpu_seconds = _process_cpu_seconds(self.pid)
+        if cpu_seconds is not None:
+            self.last = cpu_seconds
+
+    def finish(self) -> None:
+        """Charge the CPU time used so far to the slot (idempotent)
+
+        Call before the process is reaped: its time cannot be read afterwards
+        and only the last periodic sample would be charged.
+        """
+        if self.finished:
+            return
+        self.finished = True
+        self.sample()
+        with self.slot.scheduler._lock:
+            self.slot.processes.remove(self)
+            if self.last is not None:
+                self.slot.stats.cpu_seconds += max(
+                    0.0, self.last - (self.baseline or 0.0)
+                )
+
+
+class _Slot:
+    def __init__(
+        self,
+        scheduler: "ParseScheduler",
+        index: int,
+        threads: Optional[int],
+        cpus: Optional[List[int]],
+    ):
+        self.scheduler = scheduler
+        self.threads = threads
+        self.cpus = cpus
+        self.processes: List[ProcessUsage] = []
+        self.stats = WorkerCpuStats(worker=index, threads=threads, cpus=cpus)
+
+
+class ParseScheduler:
+    """Share the CPU cores of the machine between concurrent parse workers"""
+
+    def __init__(
+        self,
+        workers: int,
+        threads_per_worker: int = 0,
+        cpu_affinity: bool = False,
+    ):
+        """Initialize the scheduler
+
+        Args:
+            workers: Number of files parsed at the same time
+            threads_per_worker: Thread budget of each worker (0 = split the
+                available cores evenly, -1 = no cap)
+            cpu_affinity: Pin the parser processes of each worker to its own
+                cores (ignored where the platform does not support it)
+        """
+        workers = max(1, workers)
+        cpus = available_cpus()
+        if threads_per_worker == 0:
+            threads: Optional[int] = max(1, len(cpus) // workers)
+        elif threads_per_worker > 0:
+            threads = threads_per_worker
+        else:
+            threads = None
+
+        if cpu_affinity and not AFFINITY_AVAILABLE:
+            logger.warning("CPU affinity is not supported on this platform")
+            cpu_affinity = False
+
+        self._lock = threading.Lock()
+        self._free: Queue = Queue()
+        self.slots: List[_Slot] = []
+        for index in range(workers):
+            slot_cpus = None
+            if cpu_affinity and workers <= len(cpus):
+                slot_cpus = cpus[
+                    index * len(cpus) // workers : (index + 1) * len(cpus) // workers
+                ]
+            elif cpu_affinity:
+                # More workers than cores: share them round-robin
+                slot_cpus = [cpus[index % len(cpus)]]
+            slot_threads = threads
+            if slot_cpus and threads_per_worker == 0:
+                slot_threads = len(slot_cpus)
+            slot = _Slot(self, index, slot_threads, slot_cpus)
+            self.slots.append(slot)
+            self._free.put(slot)
+
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        logger.info(
+            f"Parse scheduler: {workers} workers on {len(cpus)} CPUs, "
+            + (f"{threads} threads each" if threads else "no thread cap")
+            + (", pinned to separate cores" if cpu_affinity else "")
+        )
+
+    def __enter__(self) -> "ParseScheduler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def start(self) -> None:
+        """Start sampling the CPU time of the tracked parser processes"""
+        if self._sampler is None:
+            self._stop.clear()
+            self._sampler = threading.Thread(
+                target=self._sample, name="parse-cpu-sampler", daemon=True
+            )
+            self._sampler.start()
+
+    def close(self) -> None:
+        if self._sampler is not None:
+            self._stop.set()
+            self._sampler.join()
+            self._sampler = None
+
+    def _sample(self) -> None:
+        # Processes are reaped by the parsers, so their last sample is kept
+        while not self._stop.wait(SAMPLE_INTERVAL):
+            with self._lock:
+                processes = [usage for slot in self.slots for usage in slot.processes]
+            for usage in processes:
+                usage.sample()
+
+    @contextmanager
+    def slot(self) -> Iterator[WorkerCpuStats]:
+        """Run the calling thread's parser processes in a free slot"""
+        slot = self._free.get()
+        _local.slot = slot
+        started = time.monotonic()
+        thread_started = time.thread_time()
+        try:
+            yield slot.stats
+        finally:
+            for usage in list(slot.processes):
+                usage.finish()
+            with self._lock:
+                slot.stats.files += 1
+                slot.stats.busy_seconds += time.monotonic() - started
+                slot.stats.cpu_seconds += time.thread_time() - thread_started
+            _local.slot = None
+            self._free.put(slot)
+
+    def report(self) -> List[WorkerCpuStats]:
+        """CPU usage of each worker so far"""
+        with self._lock:
+            return [WorkerCpuStats(**vars(slot.stats)) for slot in self.slots]
+
+
+def _current_slot() -> Optional[_Slot]:
+    return getattr(_local, "slot", None)
+
+
+def subprocess_env(base: Optional[Dict[str, str]] = None) -> Optional[Dict[str, str]]:
+    """Environment for a parser process started by the calling thread
+
+    Adds the thread caps of the thread's slot to ``base`` (default: the current
+    environment); caps already set there are kept. Returns ``base`` unchanged
+    (None by default, i.e. inherit) outside a scheduled batch.
+    """
+    slot = _current_slot()
+    if slot is None or not slot.threads:
+        return base
+    env = dict(os.environ if base is None else base)
+    for name in THREAD_ENV_VARS:
+        env.setdefault(name, str(slot.threads))
+    return env
+
+
+def track_process(pid: int, pin: bool = True) -> ProcessUsage:
+    """Record the CPU time of a parser process for the calling thread's slot
+
+    Call right after starting the process and ``finish()`` the result once it
+    has exited but before it is reaped; unfinished processes are charged when the slot is released. With
+    ``pin`` the process is also moved to the slot's cores, which threads it
+    starts afterwards inherit. Does nothing outside a scheduled batch.
+    """
+    slot = _current_slot()
+    if slot is None:
+        return ProcessUsage()
+    if pin and slot.cpus:
+        try:
+            os.sched_setaffinity(pid, slot.cpus)
+        except OSError as e:
+            logger.debug(f"Could not pin process {pid}: {e}")
+    usage = ProcessUsage(slot, pid)
+    with slot.scheduler._lock:
+        slot.processes.append(usage)
+    return usage
@@ -12,14 +12,23 @@ For Office documents (.doc, .docx, .ppt, .pptx), please convert them to PDF form
 from __future__ import annotations
 
 
+import asyncio
 import json
 import argparse
 import base64
+import os
+import re
+import signal
 import subprocess
+import sys
 import tempfile
+import threading
 import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import (
+    Callable,
     Dict,
     List,
     Optional,
@@ -43,6 +52,174 @@ class MineruExecutionError(Exception):
         )
 
 
+def _kill_process_tree(
+    process: Union[asyncio.subprocess.Process, subprocess.Popen],
+) -> None:
+    """Kill a process started by run_command_async together with its children"""
+    if isinstance(process, subprocess.Popen):
+        process.poll()
+    if process.returncode is not None:
+        return
+    try:
+        if sys.platform == "win32":
+            subprocess.run(
+                ["taskkill", "/F", "/T", "/PID", str(process.pid)],
+                capture_output=True,
+                creationflags=subprocess.CREATE_NO_WINDOW,
+            )
+        else:
+            # The command runs in its own session, so its process group id is its pid
+            os.killpg(process.pid, signal.SIGKILL)
+    except (ProcessLookupError, OSError):
+        pass
+    try:
+        process.kill()
+    except ProcessLookupError:
+        pass
+
+
+class _ParseProcesses:
+    """CLI processes started by a blocking parse, killed if the parse is cancelled"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._processes: List[subprocess.Popen] = []
+        self._cancelled = False
+
+    def add(self, process: subprocess.Popen) -> None:
+        with self._lock:
+            if not self._cancelled:
+                self._processes.append(process)
+                return
+        _kill_process_tree(process)
+
+    def remove(self, process: subprocess.Popen) -> None:
+        with self._lock:
+            if process in self._processes:
+                self._processes.remove(process)
+
+    def kill_all(self) -> bool:
+        """Kill the running processes and any started later; False if none ran"""
+        with self._lock:
+            self._cancelled = True
+            processes, self._processes = self._processes, []
+        for process in processes:
+            _kill_process_tree(process)
+        return bool(processes)
+
+
+_parse_thread = threading.local()
+
+
+def _track_parse_process(process: subprocess.Popen) -> Callable[[], None]:
+    """Let a cancelled async parse kill ``process``; returns the untrack callback"""
+    processes = getattr(_parse_thread, "processes", None)
+    if processes is None:
+        return lambda: None
+    processes.add(process)
+    return lambda: processes.remove(process)
+
+
+def _in_parse_thread(
+    processes: Optional[_ParseProcesses], function: Callable[..., Any], /, **kwargs
+) -> Any:
+    """Run ``function`` in this thread with the process tracker of a parse
+
+    Threads do not inherit the tracker: work a parse hands to other threads
+    (e.g. PDF shards) runs through this so that a cancel still reaches it.
+    """
+    _parse_thread.processes = processes
+    try:
+        return function(**kwargs)
+    finally:
+        _parse_thread.processes = None
+
+
+def _ignore_result(future: asyncio.Future) -> None:
+    if not future.cancelled():
+        future.exception()
+
+
+async def run_command_async(
+    cmd: List[str],
+    on_stdout: Optional[Callable[[str], None]] = None,
+    on_stderr: Optional[Callable[[str], None]] = None,
+    timeout: Optional[float] = None,
+) -> int:
+    """
+    Run a command with asyncio subprocesses, streaming its output line by line
+
+    The command gets its own process group. If the coroutine is cancelled or the
+    timeout expires, the whole process tree is killed before the cancellation
+    (or ``asyncio.TimeoutError``) propagates.
+
+    Inside a scheduled batch the command gets the thread budget of the calling
+    thread's slot and its CPU time is recorded. asyncio reaps the process
+    itself, so the last sample is taken when its output ends.
+
+    Args:
+        cmd: Command and arguments
+        on_stdout: Called with each non-empty stdout line
+        on_stderr: Called with each non-empty stderr line
+        timeout: Seconds before the command is killed (None = no limit)
+
+    Returns:
+        int: Return code of the command
+    """
+    from raganything.parse_scheduler import subprocess_env, track_process
+
+    subprocess_kwargs: Dict[str, Any] = {}
+    # Thread budget of the batch worker running this file, if any
+    env = subprocess_env()
+    if env is not None:
+        subprocess_kwargs["env"] = env
+    if sys.platform == "win32":
+        subprocess_kwargs["creationflags"] = (
+            subprocess.CREATE_NO_WINDOW | subprocess.CREATE_NEW_PROCESS_GROUP
+        )
+    else:
+        subprocess_kwargs["start_new_session"] = True
+
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        limit=1024 * 1024,  # Progress bars can produce very long lines
+        **subprocess_kwargs,
+    )
+    cpu_usage = track_process(process.pid)
+
+    async def pump(stream: asyncio.StreamReader, callback) -> None:
+        async for raw_line in stream:
+            line = raw_line.decode("utf-8", errors="ignore").strip()
+            if line and callback is not None:
+                callback(line)
+
+    async def communicate() -> int:
+        await asyncio.gather(
+            pump(process.stdout, on_stdout), pump(process.stderr, on_stderr)
+        )
+        # The output has ended: the process is exiting, sample it before the
+        # child watcher reaps it
+        cpu_usage.sample()
+        return await process.wait()
+
+    try:
+        if timeout:
+            return await asyncio.wait_for(communicate(), timeout)
+        return await communicate()
+    except BaseException:
+        _kill_process_tree(process)
+        try:
+            await asyncio.wait_for(process.wait(), 5)
+        except BaseException:
+            pass
+        raise
+    finally:
+        cpu_usage.finish()
+
+
 class Parser:
     """
     Base class for document parsing utilities.
@@ -54,13 +231,42 @@ class Parser:
     OFFICE_FORMATS = {".doc", ".docx", ".ppt", ".pptx", ".xls", ".xlsx"}
     IMAGE_FORMATS = {".png", ".jpeg", ".jpg", ".bmp", ".tiff", ".tif", ".gif", ".webp"}
     TEXT_FORMATS = {".txt", ".md"}
+    # Text formats parsed without rendering them to PDF first
+    NATIVE_TEXT_FORMATS = {".txt", ".md"}
 
     # Class-level logger
     logger = logging.getLogger(__name__)
 
-    def __init__(self) -> None:
-        """Initialize the base parser."""
-        pass
+    def __init__(
+        self, text_parser: str = "native", text_page_chars: int = 3000
+    ) -> None:
+        """Initialize the base parser.
+
+        Args:
+            text_parser: 'native' to read text files directly, or 'pdf' to render
+                them to PDF and parse the PDF
+            text_page_chars: Characters per synthetic page of natively parsed text
+        """
+        self.text_parser = text_parser
+        self.text_page_chars = text_page_chars
+
+    def parses_text_natively(self, file_path: Union[str, Path]) -> bool:
+        """Whether a text file is parsed natively instead of through a PDF"""
+        return (
+            self.text_parser != "pdf"
+            and Path(file_path).suffix.lower() in self.NATIVE_TEXT_FORMATS
+        )
+
+    def parse_text_natively(self, text_path: Union[str, Path]) -> List[Dict[str, Any]]:
+        """Parse a text or Markdown file directly into content blocks"""
+        if Path(text_path).suffix.lower() == ".md":
+            from raganything.markdown_parser import parse_markdown_file
+
+            return parse_markdown_file(text_path, page_chars=self.text_page_chars)
+
+        from raganything.text_parser import parse_text_file
+
+        return parse_text_file(text_path, page_chars=self.text_page_chars)
 
     @staticmethod
     def convert_office_to_pdf(
@@ -93,108 +299,49 @@ class Parser:
 
             base_output_dir.mkdir(parents=True, exist_ok=True)
 
-            # Create temporary directory for PDF conversion
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_path = Path(temp_dir)
-
-                # Convert to PDF using LibreOffice
-                logging.info(f"Converting {doc_path.name} to PDF using LibreOffice...")
-
-                # Prepare subprocess parameters to hide console window on Windows
-                import platform
-
-                # Try LibreOffice commands in order of preference
-                commands_to_try = ["libreoffice", "soffice"]
-
-                conversion_successful = False
-                for cmd in commands_to_try:
-                    try:
-                        convert_cmd = [
-                            cmd,
-                            "--headless",
-                            "--convert-to",
-                            "pdf",
-                            "--outdir",
-                            str(temp_path),
-                            str(doc_path),
-                        ]
-
-                        # Prepare conversion subprocess parameters
-                        convert_subprocess_kwargs = {
-                            "capture_output": True,
-                            "text": True,
-                            "timeout": 60,  # 60 second timeout
-                            "encoding": "utf-8",
-                            "errors": "ignore",
-                        }
-
-                        # Hide console window on Windows
-                        if platform.system() == "Windows":
-                            convert_subprocess_kwargs["creationflags"] = (
-                                subprocess.CREATE_NO_WINDOW
-                            )
-
-                        result = subprocess.run(
-                            convert_cmd, **convert_subprocess_kwargs
-                        )
-
-                        if result.returncode == 0:
-                            conversion_successful = True
-                            logging.info(
-                                f"Successfully converted {doc_path.name} to PDF using {cmd}"
-                            )
-                            break
-                        else:
-                            logging.warning(
-                                f"LibreOffice command '{cmd}' failed: {result.stderr}"
-                            )
-                    except FileNotFoundError:
-                        logging.warning(f"LibreOffice command '{cmd}' not found")
-                    except subprocess.TimeoutExpired:
-                        logging.warning(f"LibreOffice command '{cmd}' timed out")
-                    except Exception as e:
-                        logging.error(
-                            f"LibreOffice command '{cmd}' failed with exception: {e}"
-                        )
+            from raganything.office_converter import (
+                OfficeConversionError,
+                get_office_converter,
+            )
 
-                if not conversion_successful:
-                    raise RuntimeError(
-                        f"LibreOffice conversion failed for {doc_path.name}. "
-                        f"Please ensure LibreOffice is installed:\n"
-                        "- Windows: Download from https://www.libreoffice.org/download/download/\n"
-                        "- macOS: brew install --cask libreoffice\n"
-                        "- Ubuntu/Debian: sudo apt-get install libreoffice\n"
-                        "- CentOS/RHEL: sudo yum install libreoffice\n"
-                        "Alternatively, convert the document to PDF manually."
-                    )
+            # Convert to PDF using the shared LibreOffice converter
+            logging.info(f"Converting {doc_path.name} to PDF using LibreOffice...")
+            try:
+                pdf_path = get_office_converter().convert(doc_path)
+            except FileNotFoundError:
+                raise RuntimeError(
+                    f"LibreOffice conversion failed for {doc_path.name}. "
+                    f"Please ensure LibreOffice is installed:\n"
+                    "- Windows: Download from https://www.libreoffice.org/download/download/\n"
+                    "- macOS: brew install --cask libreoffice\n"
+                    "- Ubuntu/Debian: sudo apt-get install libreoffice\n"
+                    "- CentOS/RHEL: sudo yum install libreoffice\n"
+                    "Alternatively, convert the document to PDF manually."
+                )
+            except OfficeConversionError as e:
+                raise RuntimeError(
+                    f"PDF conversion failed for {doc_path.name}: {e}. "
+                    f"Please check LibreOffice installation or try manual conversion."
+                ) from e
 
-                # Find the generated PDF
-                pdf_files = list(temp_path.glob("*.pdf"))
-                if not pdf_files:
-                    raise RuntimeError(
-                        f"PDF conversion failed for {doc_path.name} - no PDF file generated. "
-                        f"Please check LibreOffice installation or try manual conversion."
-                    )
+            logging.info(
+                f"Generated PDF: {pdf_path.name} ({pdf_path.stat().st_size} bytes)"
+            )
 
-                pdf_path = pdf_files[0]
-                logging.info(
-                    f"Generated PDF: {pdf_path.name} ({pdf_path.stat().st_size} bytes)"
+            # Validate the generated PDF
+            if pdf_path.stat().st_size < 100:  # Very small file, likely empty
+                raise RuntimeError(
+                    "Generated PDF appears to be empty or corrupted. "
+                    "Original file may have issues or LibreOffice conversion failed."
                 )
 
-                # Validate the generated PDF
-                if pdf_path.stat().st_size < 100:  # Very small file, likely empty
-                    raise RuntimeError(
-                        "Generated PDF appears to be empty or corrupted. "
-                        "Original file may have issues or LibreOffice conversion failed."
-                    )
-
-                # Copy PDF to final output directory
-                final_pdf_path = base_output_dir / f"{name_without_suff}.pdf"
-                import shutil
+            # Copy PDF to final output directory
+            final_pdf_path = base_output_dir / f"{name_without_suff}.pdf"
+            import shutil
 
-                shutil.copy2(pdf_path, final_pdf_path)
+            shutil.copy2(pdf_path, final_pdf_path)
 
-                return final_pdf_path
+            return final_pdf_path
 
         except Exception as e:
             logging.error(f"Error in convert_office_to_pdf: {str(e)}")
@@ -224,24 +371,10 @@ class Parser:
             if text_path.suffix.lower() not in supported_text_formats:
                 raise ValueError(f"Unsupported text format: {text_path.suffix}")
 
-            # Read the text content
-            try:
-                with open(text_path, "r", encoding="utf-8") as f:
-                    text_content = f.read()
-            except UnicodeDecodeError:
-                # Try with different encodings
-                for encoding in ["gbk", "latin-1", "cp1252"]:
-                    try:
-                        with open(text_path, "r", encoding=encoding) as f:
-                            text_content = f.read()
-                        logging.info(f"Successfully read file with {encoding} encoding")
-                        break
-                    except UnicodeDecodeError:
-                        continue
-                else:
-                    raise RuntimeError(
-                        f"Could not decode text file {text_path.name} with any supported encoding"
-                    )
+            # Read the text content, detecting its encoding
+            from raganything.text_parser import read_text_file
+
+            text_content, _ = read_text_file(text_path)
 
             # Prepare output directory
             if output_dir:
@@ -552,6 +685,170 @@ class Parser:
         """
         raise NotImplementedError("parse_document must be implemented by subclasses")
 
+    async def _aparse(self, method_name: str, **kwargs) -> List[Dict[str, Any]]:
+        """
+        Run a parse method for the async API.
+
+        The default runs the blocking method in a worker thread. Cancellation
+        (or a deadline) kills the CLI processes it started, which makes it fail
+        at once; parsing done in this process (native parsers, warm Docling
+        converters) cannot be interrupted and finishes in the background.
+        Parsers with native async execution override this.
+        """
+        processes = _ParseProcesses()
+        future = asyncio.ensure_future(
+            asyncio.to_thread(
+                _in_parse_thread, processes, getattr(self, method_name), **kwargs
+            )
+        )
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            if processes.kill_all():
+                await asyncio.gather(future, return_exceptions=True)
+            else:
+                future.add_done_callback(_ignore_result)
+            raise
+
+    @staticmethod
+    async def _with_deadline(coro, timeout: Optional[float], file_path) -> Any:
+        """Await a parse coroutine, raising TimeoutError after ``timeout`` seconds"""
+        if not timeout:
+            return await coro
+        try:
+            return await asyncio.wait_for(coro, timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(
+                f"Parsing {file_path} did not finish within {timeout:.0f} seconds"
+            ) from None
+
+    async def aparse_pdf(
+        self,
+        pdf_path: Union[str, Path],
+        output_dir: Optional[str] = None,
+        method: str = "auto",
+        lang: Optional[str] = None,
+        timeout: Optional[float] = None,
+        **kwargs,
+    ) -> List[Dict[str, Any]]:
+        """
+        Async version of parse_pdf.
+
+        Args:
+            timeout: Per-file deadline in seconds (None = no limit)
+            Other arguments as for parse_pdf
+
+        Returns:
+            List[Dict[str, Any]]: List of content blocks
+        """
+        return await self._with_deadline(
+            self._aparse(
+                "parse_pdf",
+                pdf_path=pdf_path,
+                output_dir=output_dir,
+                method=method,
+                lang=lang,
+                **kwargs,
+            ),
+            timeout,
+            pdf_path,
+        )
+
+    async def aparse_image(
+        self,
+        image_path: Union[str, Path],
+        output_dir: Optional[str] = None,
+        lang: Optional[str] = None,
+        timeout: Optional[float] = None,
+        **kwargs,
+    ) -> List[Dict[str, Any]]:
+        """
+        Async version of parse_image.
+
+        Args:
+            timeout: Per-file deadline in seconds (None = no limit)
+            Other arguments as for parse_image
+
+        Returns:
+            List[Dict[str, Any]]: List of content blocks
+        """
+        return await self._with_deadline(
+            self._aparse(
+                "parse_image",
+                image_path=image_path,
+                output_dir=output_dir,
+                lang=lang,
+                **kwargs,
+            ),
+            timeout,
+            image_path,
+        )
+
+    async def aparse_office_doc(
+        self,
+        doc_path: Union[str, Path],
+        output_dir: Optional[str] = None,
+        lang: Optional[str] = None,
+        timeout: Optional[float] = None,
+        **kwargs,
+    ) -> List[Dict[str, Any]]:
+        """
+        Async version of parse_office_doc.
+
+        Args:
+            timeout: Per-file deadline in seconds (None = no limit)
+            Other arguments as for parse_office_doc
+
+        Returns:
+            List[Dict[str, Any]]: List of content blocks
+        """
+        return await self._with_deadline(
+            self._aparse(
+                "parse_office_doc",
+                doc_path=doc_path,
+                output_dir=output_dir,
+                lang=lang,
+                **kwargs,
+            ),
+            timeout,
+            doc_path,
+        )
+
+    async def aparse_document(
+        self,
+        file_path: Union[str, Path],
+        method: str = "auto",
+        output_dir: Optional[str] = None,
+        lang: Optional[str] = None,
+        timeout: Optional[float] = None,
+        **kwargs,
+    ) -> List[Dict[str, Any]]:
+        """
+        Async version of parse_document.
+
+        Cancelling the coroutine cancels the parse; with native async execution
+        (MinerU CLI) the parser process tree is killed.
+
+        Args:
+            timeout: Per-file deadline in seconds (None = no limit)
+            Other arguments as for parse_document
+
+        Returns:
+            List[Dict[str, Any]]: List of content blocks
+        """
+        return await self._with_deadline(
+            self._aparse(
+                "parse_document",
+                file_path=file_path,
+                method=method,
+                output_dir=output_dir,
+                lang=lang,
+                **kwargs,
+            ),
+            timeout,
+            file_path,
+        )
+
     def check_installation(self) -> bool:
         """
         Abstract method to check if the parser is properly installed.
@@ -580,12 +877,60 @@ class MineruParser(Parser):
     # Class-level logger
     logger = logging.getLogger(__name__)
 
-    def __init__(self) -> None:
-        """Initialize MineruParser"""
-        super().__init__()
+    def __init__(
+        self,
+        worker_pool=None,
+        shard_pages: int = 0,
+        shard_workers: int = 4,
+        text_parser: str = "native",
+        text_page_chars: int = 3000,
+        office_parser: str = "native",
+        spreadsheet_rows_per_block: int = 100,
+        pdf_text_layer: bool = True,
+    ) -> None:
+        """Initialize MineruParser
+
+        Args:
+            worker_pool: Optional ``MineruWorkerPool`` of resident MinerU processes.
+                Without it every document runs a fresh ``mineru`` CLI process.
+            shard_pages: Split PDFs longer than this many pages into page ranges
+                parsed concurrently (0 = parse each PDF in one run)
+            shard_workers: Maximum number of page ranges parsed at the same time
+            text_parser: 'native' or 'pdf' (render text files and parse with MinerU)
+            text_page_chars: Characters per synthetic page of natively parsed text
+            office_parser: 'native' to read .docx/.pptx/.xlsx (and .xls with xlrd)
+                directly, falling back to LibreOffice and MinerU for unsupported
+                content, or 'pdf'
+            spreadsheet_rows_per_block: Data rows per table item of natively
+                parsed spreadsheets
+            pdf_text_layer: With methods 'auto' and 'txt', read PDF pages with a
+                good text layer directly and send only the other pages (scans,
+                figures, tables, formulas) to MinerU by page range
+        """
+        super().__init__(text_parser=text_parser, text_page_chars=text_page_chars)
+        self.office_parser = office_parser
+        self.spreadsheet_rows_per_block = spreadsheet_rows_per_block
+        self.pdf_text_layer = pdf_text_layer
+        self.worker_pool = worker_pool
+        self.shard_pages = shard_pages
+        self.shard_workers = max(1, shard_workers)
+
+    def _run_mineru(self, **kwargs) -> None:
+        """Run MinerU in a resident worker if a pool is set, else with the CLI"""
+        if self.worker_pool is not None:
+            from raganything.mineru_worker import WorkerUnavailableError
+
+            try:
+                self.worker_pool.run(**kwargs)
+                return
+            except WorkerUnavailableError as e:
+                self.logger.warning(
+                    f"MinerU worker unavailable, falling back to the CLI: {e}"
+                )
+        self._run_mineru_command(**kwargs)
 
     @staticmethod
-    def _run_mineru_command(
+    def _build_mineru_command(
         input_path: Union[str, Path],
         output_dir: Union[str, Path],
         method: str = "auto",
@@ -598,24 +943,8 @@ class MineruParser(Parser):
         device: Optional[str] = None,
         source: Optional[str] = None,
         vlm_url: Optional[str] = None,
-    ) -> None:
-        """
-        Run mineru command line tool
-
-        Args:
-            input_path: Path to input file or directory
-            output_dir: Output directory path
-            method: Parsing method (auto, txt, ocr)
-            lang: Document language for OCR optimization
-            backend: Parsing backend
-            start_page: Starting page number (0-based)
-            end_page: Ending page number (0-based)
-            formula: Enable formula parsing
-            table: Enable table parsing
-            device: Inference device
-            source: Model source
-            vlm_url: When the backend is `vlm-sglang-client`, you need to specify the server_url
-        """
+    ) -> List[str]:
+        """Build the mineru command line (arguments as for _run_mineru_command)"""
         cmd = [
             "mineru",
             "-p",
@@ -644,9 +973,58 @@ class MineruParser(Parser):
             cmd.extend(["-d", device])
         if vlm_url:
             cmd.extend(["-u", vlm_url])
+        return cmd
+
+    @staticmethod
+    def _run_mineru_command(
+        input_path: Union[str, Path],
+        output_dir: Union[str, Path],
+        method: str = "auto",
+        lang: Optional[str] = None,
+        backend: Optional[str] = None,
+        start_page: Optional[int] = None,
+        end_page: Optional[int] = None,
+        formula: bool = True,
+        table: bool = True,
+        device: Optional[str] = None,
+        source: Optional[str] = None,
+        vlm_url: Optional[str] = None,
+    ) -> None:
+        """
+        Run mineru command line tool
+
+        Args:
+            input_path: Path to input file or directory
+            output_dir: Output directory path
+            method: Parsing method (auto, txt, ocr)
+            lang: Document language for OCR optimization
+            backend: Parsing backend
+            start_page: Starting page number (0-based)
+            end_page: Ending page number (0-based)
+            formula: Enable formula parsing
+            table: Enable table parsing
+            device: Inference device
+            source: Model source
+            vlm_url: When the backend is `vlm-sglang-client`, you need to specify the server_url
+        """
+        cmd = MineruParser._build_mineru_command(
+            input_path=input_path,
+            output_dir=output_dir,
+            method=method,
+            lang=lang,
+            backend=backend,
+            start_page=start_page,
+            end_page=end_page,
+            formula=formula,
+            table=table,
+            device=device,
+            source=source,
+            vlm_url=vlm_url,
+        )
 
         output_lines = []
         error_lines = []
+        process = None
 
         try:
             # Prepare subprocess parameters to hide console window on Windows
@@ -654,6 +1032,12 @@ class MineruParser(Parser):
             import threading
             from queue import Queue, Empty
 
+            from raganything.parse_scheduler import (
+                process_exited,
+                subprocess_env,
+                track_process,
+            )
+
             # Log the command being executed
             logging.info(f"Executing mineru command: {' '.join(cmd)}")
 
@@ -669,6 +1053,14 @@ class MineruParser(Parser):
             # Hide console window on Windows
             if platform.system() == "Windows":
                 subprocess_kwargs["creationflags"] = subprocess.CREATE_NO_WINDOW
+            else:
+                # Own process group, so that the whole tree can be killed
+                subprocess_kwargs["start_new_session"] = True
+
+            # Thread budget of the batch worker running this file, if any
+            env = subprocess_env()
+            if env is not None:
+                subprocess_kwargs["env"] = env
 
             # Function to read output from subprocess and add to queue
             def enqueue_output(pipe, queue, prefix):
@@ -682,6 +1074,8 @@ class MineruParser(Parser):
 
             # Start subprocess
             process = subprocess.Popen(cmd, **subprocess_kwargs)
+            cpu_usage = track_process(process.pid)
+            untrack = _track_parse_process(process)
 
             # Create queues for stdout and stderr
             stdout_queue = Queue()
@@ -700,8 +1094,8 @@ class MineruParser(Parser):
             stdout_thread.start()
             stderr_thread.start()
 
-            # Process output in real time
-            while process.poll() is None:
+            # Process output in real time (the exited process is reaped below)
+            while not process_exited(process):
                 # Check stdout queue
                 try:
                     while True:
@@ -756,8 +1150,10 @@ class MineruParser(Parser):
             except Empty:
                 pass
 
-            # Wait for process to complete and get return code
+            # Charge the final CPU time, then reap the process
+            cpu_usage.finish()
             return_code = process.wait()
+            untrack()
 
             # Wait for threads to finish
             stdout_thread.join(timeout=5)
@@ -785,6 +1181,65 @@ class MineruParser(Parser):
             error_message = f"Unexpected error running mineru command: {e}"
             logging.error(error_message)
             raise RuntimeError(error_message) from e
+        finally:
+            # Interrupted (e.g. Ctrl-C): the session gets no SIGINT. A no-op
+            # once the process has exited.
+            if process is not None:
+                _kill_process_tree(process)
+
+    @staticmethod
+    async def _arun_mineru_command(**kwargs) -> None:
+        """
+        Run mineru command line tool with asyncio (arguments as for _run_mineru_command)
+
+        Output is logged as it arrives. Cancelling the coroutine kills the mineru
+        process and its children.
+        """
+        cmd = MineruParser._build_mineru_command(**kwargs)
+        error_lines = []
+
+        def on_stdout(line: str) -> None:
+            logging.info(f"[MinerU] {line}")
+
+        def on_stderr(line: str) -> None:
+            if "warning" in line.lower():
+                logging.warning(f"[MinerU] {line}")
+            elif "error" in line.lower():
+                logging.error(f"[MinerU] {line}")
+                error_lines.append(line.split("\n")[0])
+            else:
+                logging.info(f"[MinerU] {line}")
+
+        logging.info(f"Executing mineru command: {' '.join(cmd)}")
+        try:
+            return_code = await run_command_async(
+                cmd, on_stdout=on_stdout, on_stderr=on_stderr
+            )
+        except FileNotFoundError:
+            raise RuntimeError(
+                "mineru command not found. Please ensure MinerU 2.0 is properly installed:\n"
+                "pip install -U 'mineru[core]' or uv pip install -U 'mineru[core]'"
+            )
+
+        if return_code != 0 or error_lines:
+            logging.info("[MinerU] Command executed failed")
+            raise MineruExecutionError(return_code, error_lines)
+        logging.info("[MinerU] Command executed successfully")
+
+    async def _arun_mineru(self, **kwargs) -> None:
+        """Async version of _run_mineru"""
+        if self.worker_pool is not None:
+            from raganything.mineru_worker import WorkerUnavailableError
+
+            try:
+                # Cancellation and deadlines kill the worker running the job
+                await self.worker_pool.arun(**kwargs)
+                return
+            except WorkerUnavailableError as e:
+                self.logger.warning(
+                    f"MinerU worker unavailable, falling back to the CLI: {e}"
+                )
+        await self._arun_mineru_command(**kwargs)
 
     @staticmethod
     def _read_output_files(
@@ -890,13 +1345,41 @@ class MineruParser(Parser):
 
             base_output_dir.mkdir(parents=True, exist_ok=True)
 
-            # Run mineru command
-            self._run_mineru_command(
-                input_path=pdf_path,
-                output_dir=base_output_dir,
-                method=method,
-                lang=lang,
-                **kwargs,
+            text_layer = self._plan_text_layer(
+                pdf_path, method, kwargs.get("start_page"), kwargs.get("end_page")
+            )
+            if text_layer:
+                shards, text_pages = text_layer
+                return self._parse_pdf_sharded(
+                    pdf_path,
+                    base_output_dir,
+                    shards,
+                    method=method,
+                    lang=lang,
+                    text_pages=text_pages,
+                    **kwargs,
+                )
+
+            shards = self._plan_shards(
+                pdf_path, kwargs.get("start_page"), kwargs.get("end_page")
+            )
+            if shards:
+                return self._parse_pdf_sharded(
+                    pdf_path,
+                    base_output_dir,
+                    shards,
+                    method=method,
+                    lang=lang,
+                    **kwargs,
+                )
+
+            # Run mineru command
+            self._run_mineru(
+                input_path=pdf_path,
+                output_dir=base_output_dir,
+                method=method,
+                lang=lang,
+                **kwargs,
             )
 
             # Read the generated output files
@@ -915,6 +1398,397 @@ class MineruParser(Parser):
             logging.error(f"Error in parse_pdf: {str(e)}")
             raise
 
+    @staticmethod
+    def _count_pdf_pages(pdf_path: Path) -> Optional[int]:
+        """Number of pages of a PDF, or None if it cannot be determined"""
+        try:
+            import pypdfium2 as pdfium  # installed with MinerU
+        except ImportError:
+            return None
+        try:
+            pdf = pdfium.PdfDocument(str(pdf_path))
+            try:
+                return len(pdf)
+            finally:
+                pdf.close()
+        except Exception as e:
+            logging.warning(f"Could not count pages of {pdf_path}: {e}")
+            return None
+
+    def _plan_shards(
+        self,
+        pdf_path: Path,
+        start_page: Optional[int] = None,
+        end_page: Optional[int] = None,
+    ) -> Optional[List[Tuple[int, int]]]:
+        """Split the requested page range into inclusive (start, end) shards
+
+        Returns None when sharding is disabled or the range fits in one shard.
+        """
+        if self.shard_pages <= 0:
+            return None
+        page_count = self._count_pdf_pages(pdf_path)
+        if page_count is None:
+            logging.info(
+                "Page count unavailable (pypdfium2 not installed?), parsing without sharding"
+            )
+            return None
+        first = max(0, start_page or 0)
+        last = page_count - 1 if end_page is None else min(end_page, page_count - 1)
+        if last - first + 1 <= self.shard_pages:
+            return None
+        return [
+            (shard_start, min(shard_start + self.shard_pages - 1, last))
+            for shard_start in range(first, last + 1, self.shard_pages)
+        ]
+
+    def _plan_text_layer(
+        self,
+        pdf_path: Path,
+        method: str = "auto",
+        start_page: Optional[int] = None,
+        end_page: Optional[int] = None,
+    ) -> Optional[Tuple[List[Tuple[int, int]], Dict[int, List[Dict[str, Any]]]]]:
+        """Split the requested pages into text-layer pages and MinerU page ranges
+
+        Returns:
+            The inclusive (start, end) ranges left to MinerU (split into shards
+            when sharding is enabled) and the content items of the pages read
+            from the text layer, or None when the document is better parsed by
+            a single MinerU run
+        """
+        if not self.pdf_text_layer or method not in ("auto", "txt"):
+            return None
+        from raganything.pdf_text_layer import plan_mineru_ranges, read_text_layer
+
+        pages = read_text_layer(pdf_path, start_page, end_page)
+        if not pages:
+            return None
+        ranges = plan_mineru_ranges(pages)
+        if ranges is None:
+            logging.info(
+                f"Too many pages of {pdf_path.name} need MinerU, parsing it in one run"
+            )
+            return None
+        text_pages = {
+            page: items
+            for page, items in pages.items()
+            if not any(start <= page <= end for start, end in ranges)
+        }
+        if not text_pages:
+            return None
+        if self.shard_pages > 0:
+            ranges = [
+                (start, min(start + self.shard_pages - 1, end))
+                for range_start, end in ranges
+                for start in range(range_start, end + 1, self.shard_pages)
+            ]
+        return ranges, text_pages
+
+    def _parse_pdf_sharded(
+        self,
+        pdf_path: Path,
+        base_output_dir: Path,
+        shards: List[Tuple[int, int]],
+        method: str = "auto",
+        lang: Optional[str] = None,
+        text_pages: Optional[Dict[int, List[Dict[str, Any]]]] = None,
+        **kwargs,
+    ) -> List[Dict[str, Any]]:
+        """Parse page ranges of a PDF concurrently and merge them in page order
+
+        Each shard is written to ``<output>/<stem>/shards/<start>-<end>``. The merged
+        content list (``page_idx`` relative to the first requested page, as for an
+        unsharded run) and markdown are written where an unsharded run would put
+        them, so cached output is read back the same way. ``text_pages`` holds the
+        items of pages already read from the text layer, merged in between.
+        """
+        if shards:
+            shard_jobs = self._shard_jobs(
+                pdf_path, base_output_dir, shards, method=method, lang=lang, **kwargs
+            )
+            with ThreadPoolExecutor(
+                max_workers=self._shard_concurrency(shards),
+                thread_name_prefix="mineru-shard",
+            ) as executor:
+                # The shard threads report their processes to this parse
+                processes = getattr(_parse_thread, "processes", None)
+                futures = [
+                    executor.submit(
+                        _in_parse_thread, processes, self._run_mineru, **job
+                    )
+                    for job in shard_jobs
+                ]
+                try:
+                    for future in as_completed(futures):
+                        future.result()
+                except BaseException:
+                    for pending in futures:
+                        pending.cancel()
+                    raise
+
+        return self._merge_pdf_shards(
+            pdf_path,
+            base_output_dir,
+            shards,
+            method,
+            kwargs.get("backend"),
+            text_pages=text_pages,
+        )
+
+    async def _aparse_pdf_sharded(
+        self,
+        pdf_path: Path,
+        base_output_dir: Path,
+        shards: List[Tuple[int, int]],
+        method: str = "auto",
+        lang: Optional[str] = None,
+        text_pages: Optional[Dict[int, List[Dict[str, Any]]]] = None,
+        **kwargs,
+    ) -> List[Dict[str, Any]]:
+        """Async version of _parse_pdf_sharded"""
+        shard_jobs = self._shard_jobs(
+            pdf_path, base_output_dir, shards, method=method, lang=lang, **kwargs
+        )
+        semaphore = asyncio.Semaphore(self._shard_concurrency(shards) or 1)
+
+        async def run_shard(job: Dict[str, Any]) -> None:
+            async with semaphore:
+                await self._arun_mineru(**job)
+
+        tasks = [asyncio.ensure_future(run_shard(job)) for job in shard_jobs]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            # One failed or cancelled shard stops the others
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        return await asyncio.to_thread(
+            self._merge_pdf_shards,
+            pdf_path,
+            base_output_dir,
+            shards,
+            method,
+            kwargs.get("backend"),
+            text_pages,
+        )
+
+    def _shard_jobs(
+        self,
+        pdf_path: Path,
+        base_output_dir: Path,
+        shards: List[Tuple[int, int]],
+        method: str = "auto",
+        lang: Optional[str] = None,
+        **kwargs,
+    ) -> List[Dict[str, Any]]:
+        """MinerU arguments of each shard, creating the shard output directories"""
+        if not shards:
+            return []
+        kwargs = {
+            key: value
+            for key, value in kwargs.items()
+            if key not in ("start_page", "end_page")
+        }
+        logging.info(
+            f"Parsing {len(shards)} page ranges of {pdf_path.name} with MinerU "
+            f"({self._shard_concurrency(shards)} at a time)"
+        )
+        jobs = []
+        for shard in shards:
+            shard_dir = self._shard_dir(base_output_dir, pdf_path.stem, shard)
+            shard_dir.mkdir(parents=True, exist_ok=True)
+            jobs.append(
+                {
+                    "input_path": pdf_path,
+                    "output_dir": shard_dir,
+                    "method": method,
+                    "lang": lang,
+                    "start_page": shard[0],
+                    "end_page": shard[1],
+                    **kwargs,
+                }
+            )
+        return jobs
+
+    def _shard_concurrency(self, shards: List[Tuple[int, int]]) -> int:
+        """Page ranges run at the same time: concurrent runs need sharding enabled"""
+        if self.shard_pages <= 0:
+            return min(1, len(shards))
+        return min(self.shard_workers, len(shards))
+
+    @staticmethod
+    def _shard_dir(base_output_dir: Path, stem: str, shard: Tuple[int, int]) -> Path:
+        return base_output_dir / stem / "shards" / f"{shard[0]:05d}-{shard[1]:05d}"
+
+    def _merge_pdf_shards(
+        self,
+        pdf_path: Path,
+        base_output_dir: Path,
+        shards: List[Tuple[int, int]],
+        method: str = "auto",
+        backend: Optional[str] = None,
+        text_pages: Optional[Dict[int, List[Dict[str, Any]]]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Merge the outputs of parsed shards and text-layer pages in page order"""
+        from raganything.pdf_text_layer import text_items_to_markdown
+
+        text_pages = text_pages or {}
+        stem = pdf_path.stem
+        method_dir = "vlm" if (backend or "").startswith("vlm-") else method
+        range_start = min([shard[0] for shard in shards] + list(text_pages))
+        merged_dir = base_output_dir / stem / method_dir
+        merged_dir.mkdir(parents=True, exist_ok=True)
+        content_list: List[Dict[str, Any]] = []
+        md_parts: List[str] = []
+        segments = sorted(
+            [(shard[0], shard) for shard in shards]
+            + [(page, None) for page in text_pages],
+            key=lambda segment: segment[0],
+        )
+        for first_page, shard in segments:
+            if shard is None:
+                items = text_pages[first_page]
+                for item in items:
+                    item["page_idx"] = first_page - range_start
+                content_list.extend(items)
+                md_parts.append(text_items_to_markdown(items))
+                continue
+            shard_dir = self._shard_dir(base_output_dir, stem, shard)
+            shard_content, shard_md = self._read_output_files(
+                shard_dir, stem, method=method_dir
+            )
+            # MinerU numbers the pages of a range from 0
+            for item in shard_content:
+                if isinstance(item, dict) and "page_idx" in item:
+                    item["page_idx"] = item["page_idx"] + shard[0] - range_start
+            content_list.extend(shard_content)
+
+            # Point relative markdown links (images) at the shard output
+            shard_rel = os.path.relpath(shard_dir / stem / method_dir, merged_dir)
+            md_parts.append(
+                re.sub(
+                    r"\]\((?!/|[a-zA-Z][a-zA-Z0-9+.-]*:|#)([^)]+)\)",
+                    lambda m: f"]({Path(shard_rel, m.group(1)).as_posix()})",
+                    shard_md,
+                )
+            )
+
+        with open(merged_dir / f"{stem}_content_list.json", "w", encoding="utf-8") as f:
+            json.dump(content_list, f, ensure_ascii=False, indent=4)
+        with open(merged_dir / f"{stem}.md", "w", encoding="utf-8") as f:
+            f.write("\n\n".join(part for part in md_parts if part))
+
+        logging.info(
+            f"Merged {len(shards)} MinerU page ranges and {len(text_pages)} "
+            f"text-layer pages of {pdf_path.name}: {len(content_list)} blocks"
+        )
+        return content_list
+
+    @staticmethod
+    def _prepare_image_input(image_path: Path) -> Tuple[Path, Optional[Path]]:
+        """
+        Check an image and convert it to PNG if MinerU cannot read it natively
+
+        Returns:
+            Tuple of (image to parse, temporary converted file or None)
+        """
+        if not image_path.exists():
+            raise FileNotFoundError(f"Image file does not exist: {image_path}")
+
+        # Supported image formats by MinerU 2.0
+        mineru_supported_formats = {".png", ".jpeg", ".jpg"}
+
+        # All supported image formats (including those we can convert)
+        all_supported_formats = {
+            ".png",
+            ".jpeg",
+            ".jpg",
+            ".bmp",
+            ".tiff",
+            ".tif",
+            ".gif",
+            ".webp",
+        }
+
+        ext = image_path.suffix.lower()
+        if ext not in all_supported_formats:
+            raise ValueError(
+                f"Unsupported image format: {ext}. Supported formats: {', '.join(all_supported_formats)}"
+            )
+
+        # Determine the actual image file to process
+        actual_image_path = image_path
+        temp_converted_file = None
+
+        # If format is not natively supported by MinerU, convert it
+        if ext not in mineru_supported_formats:
+            logging.info(f"Converting {ext} image to PNG for MinerU compatibility...")
+
+            try:
+                from PIL import Image
+            except ImportError:
+                raise RuntimeError(
+                    "PIL/Pillow is required for image format conversion. "
+                    "Please install it using: pip install Pillow"
+                )
+
+            # Create temporary directory for conversion
+            temp_dir = Path(tempfile.mkdtemp())
+            temp_converted_file = temp_dir / f"{image_path.stem}_converted.png"
+
+            try:
+                # Open and convert image
+                with Image.open(image_path) as img:
+                    # Handle different image modes
+                    if img.mode in ("RGBA", "LA", "P"):
+                        # For images with transparency or palette, convert to RGB first
+                        if img.mode == "P":
+                            img = img.convert("RGBA")
+
+                        # Create white background for transparent images
+                        background = Image.new("RGB", img.size, (255, 255, 255))
+                        if img.mode == "RGBA":
+                            background.paste(
+                                img, mask=img.split()[-1]
+                            )  # Use alpha channel as mask
+                        else:
+                            background.paste(img)
+                        img = background
+                    elif img.mode not in ("RGB", "L"):
+                        # Convert other modes to RGB
+                        img = img.convert("RGB")
+
+                    # Save as PNG
+                    img.save(temp_converted_file, "PNG", optimize=True)
+                    logging.info(
+                        f"Successfully converted {image_path.name} to PNG ({temp_converted_file.stat().st_size / 1024:.1f} KB)"
+                    )
+
+                    actual_image_path = temp_converted_file
+
+            except Exception as e:
+                if temp_converted_file and temp_converted_file.exists():
+                    temp_converted_file.unlink()
+                raise RuntimeError(
+                    f"Failed to convert image {image_path.name}: {str(e)}"
+                )
+
+        return actual_image_path, temp_converted_file
+
+    @staticmethod
+    def _remove_converted_image(temp_converted_file: Optional[Path]) -> None:
+        """Clean up a temporary file created by _prepare_image_input"""
+        if temp_converted_file and temp_converted_file.exists():
+            try:
+                temp_converted_file.unlink()
+                temp_converted_file.parent.rmdir()  # Remove temp directory if empty
+            except Exception:
+                pass  # Ignore cleanup errors
+
     def parse_image(
         self,
         image_path: Union[str, Path],
@@ -940,88 +1814,9 @@ class MineruParser(Parser):
         try:
             # Convert to Path object for easier handling
             image_path = Path(image_path)
-            if not image_path.exists():
-                raise FileNotFoundError(f"Image file does not exist: {image_path}")
-
-            # Supported image formats by MinerU 2.0
-            mineru_supported_formats = {".png", ".jpeg", ".jpg"}
-
-            # All supported image formats (including those we can convert)
-            all_supported_formats = {
-                ".png",
-                ".jpeg",
-                ".jpg",
-                ".bmp",
-                ".tiff",
-                ".tif",
-                ".gif",
-                ".webp",
-            }
-
-            ext = image_path.suffix.lower()
-            if ext not in all_supported_formats:
-                raise ValueError(
-                    f"Unsupported image format: {ext}. Supported formats: {', '.join(all_supported_formats)}"
-                )
-
-            # Determine the actual image file to process
-            actual_image_path = image_path
-            temp_converted_file = None
-
-            # If format is not natively supported by MinerU, convert it
-            if ext not in mineru_supported_formats:
-                logging.info(
-                    f"Converting {ext} image to PNG for MinerU compatibility..."
-                )
-
-                try:
-                    from PIL import Image
-                except ImportError:
-                    raise RuntimeError(
-                        "PIL/Pillow is required for image format conversion. "
-                        "Please install it using: pip install Pillow"
-                    )
-
-                # Create temporary directory for conversion
-                temp_dir = Path(tempfile.mkdtemp())
-                temp_converted_file = temp_dir / f"{image_path.stem}_converted.png"
-
-                try:
-                    # Open and convert image
-                    with Image.open(image_path) as img:
-                        # Handle different image modes
-                        if img.mode in ("RGBA", "LA", "P"):
-                            # For images with transparency or palette, convert to RGB first
-                            if img.mode == "P":
-                                img = img.convert("RGBA")
-
-                            # Create white background for transparent images
-                            background = Image.new("RGB", img.size, (255, 255, 255))
-                            if img.mode == "RGBA":
-                                background.paste(
-                                    img, mask=img.split()[-1]
-                                )  # Use alpha channel as mask
-                            else:
-                                background.paste(img)
-                            img = background
-                        elif img.mode not in ("RGB", "L"):
-                            # Convert other modes to RGB
-                            img = img.convert("RGB")
-
-                        # Save as PNG
-                        img.save(temp_converted_file, "PNG", optimize=True)
-                        logging.info(
-                            f"Successfully converted {image_path.name} to PNG ({temp_converted_file.stat().st_size / 1024:.1f} KB)"
-                        )
-
-                        actual_image_path = temp_converted_file
-
-                except Exception as e:
-                    if temp_converted_file and temp_converted_file.exists():
-                        temp_converted_file.unlink()
-                    raise RuntimeError(
-                        f"Failed to convert image {image_path.name}: {str(e)}"
-                    )
+            actual_image_path, temp_converted_file = self._prepare_image_input(
+                image_path
+            )
 
             name_without_suff = image_path.stem
 
@@ -1035,7 +1830,7 @@ class MineruParser(Parser):
 
             try:
                 # Run mineru command (images are processed with OCR method)
-                self._run_mineru_command(
+                self._run_mineru(
                     input_path=actual_image_path,
                     output_dir=base_output_dir,
                     method="ocr",  # Images require OCR method
@@ -1054,12 +1849,7 @@ class MineruParser(Parser):
 
             finally:
                 # Clean up temporary converted file if it was created
-                if temp_converted_file and temp_converted_file.exists():
-                    try:
-                        temp_converted_file.unlink()
-                        temp_converted_file.parent.rmdir()  # Remove temp directory if empty
-                    except Exception:
-                        pass  # Ignore cleanup errors
+                self._remove_converted_image(temp_converted_file)
 
         except Exception as e:
             logging.error(f"Error in parse_image: {str(e)}")
@@ -1077,6 +1867,9 @@ class MineruParser(Parser):
 
         Note: This method requires LibreOffice to be installed separately for PDF conversion.
         MinerU 2.0 no longer includes built-in Office document conversion.
+        .docx, .pptx and spreadsheets are read natively unless they contain content
+        only the PDF route can capture, or the parser was created with
+        ``office_parser="pdf"``.
 
         Supported formats: .doc, .docx, .ppt, .pptx, .xls, .xlsx
 
@@ -1090,6 +1883,10 @@ class MineruParser(Parser):
             List[Dict[str, Any]]: List of content blocks
         """
         try:
+            content_list = self._parse_office_natively(doc_path, output_dir)
+            if content_list is not None:
+                return content_list
+
             # Convert Office document to PDF using base class method
             pdf_path = self.convert_office_to_pdf(doc_path, output_dir)
 
@@ -1102,6 +1899,48 @@ class MineruParser(Parser):
             logging.error(f"Error in parse_office_doc: {str(e)}")
             raise
 
+    def parses_office_natively(self, doc_path: Union[str, Path]) -> bool:
+        """Whether an Office document is first tried with a native parser"""
+        from raganything.ooxml_parser import OOXML_FORMATS
+        from raganything.spreadsheet_parser import supports_natively
+
+        return self.office_parser != "pdf" and (
+            Path(doc_path).suffix.lower() in OOXML_FORMATS
+            or supports_natively(doc_path)
+        )
+
+    def _parse_office_natively(
+        self, doc_path: Union[str, Path], output_dir: Optional[str] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Parse a .docx/.pptx/.xlsx/.xls natively; None when the PDF route is needed"""
+        if not self.parses_office_natively(doc_path):
+            return None
+        from raganything.ooxml_parser import UnsupportedOOXMLError, parse_ooxml_file
+        from raganything.spreadsheet_parser import (
+            SPREADSHEET_FORMATS,
+            UnsupportedSpreadsheetError,
+            parse_spreadsheet_file,
+        )
+
+        doc_path = Path(doc_path)
+        if not doc_path.exists():
+            raise FileNotFoundError(f"Office document does not exist: {doc_path}")
+        base_output_dir = (
+            Path(output_dir) if output_dir else doc_path.parent / "mineru_output"
+        )
+        try:
+            if doc_path.suffix.lower() in SPREADSHEET_FORMATS:
+                return parse_spreadsheet_file(
+                    doc_path, rows_per_block=self.spreadsheet_rows_per_block
+                )
+            return parse_ooxml_file(doc_path, base_output_dir)
+        except (UnsupportedOOXMLError, UnsupportedSpreadsheetError) as e:
+            self.logger.info(
+                f"Native parsing of {doc_path.name} not possible ({e}), "
+                f"converting with LibreOffice"
+            )
+            return None
+
     def parse_text_file(
         self,
         text_path: Union[str, Path],
@@ -1112,7 +1951,8 @@ class MineruParser(Parser):
         """
         Parse text file by first converting to PDF, then parsing with MinerU 2.0
 
-        Supported formats: .txt, .md
+        Supported formats: .txt, .md. Both are read directly (Markdown into typed
+        items) unless the parser was created with ``text_parser="pdf"``.
 
         Args:
             text_path: Path to the text file (.txt, .md)
@@ -1124,6 +1964,9 @@ class MineruParser(Parser):
             List[Dict[str, Any]]: List of content blocks
         """
         try:
+            if self.parses_text_natively(text_path):
+                return self.parse_text_natively(text_path)
+
             # Convert text file to PDF using base class method
             pdf_path = self.convert_text_to_pdf(text_path, output_dir)
 
@@ -1136,6 +1979,209 @@ class MineruParser(Parser):
             logging.error(f"Error in parse_text_file: {str(e)}")
             raise
 
+    async def _aparse(self, method_name: str, **kwargs) -> List[Dict[str, Any]]:
+        """Run MinerU parses with asyncio subprocesses instead of a worker thread"""
+        native = {
+            "parse_pdf": self._aparse_pdf,
+            "parse_image": self._aparse_image,
+            "parse_office_doc": self._aparse_office_doc,
+            "parse_text_file": self._aparse_text_file,
+            "parse_document": self._aparse_document,
+        }.get(method_name)
+        if native is None:
+            return await super()._aparse(method_name, **kwargs)
+        return await native(**kwargs)
+
+    async def _aparse_pdf(
+        self,
+        pdf_path: Union[str, Path],
+        output_dir: Optional[str] = None,
+        method: str = "auto",
+        lang: Optional[str] = None,
+        **kwargs,
+    ) -> List[Dict[str, Any]]:
+        """Async version of parse_pdf"""
+        try:
+            pdf_path = Path(pdf_path)
+            if not pdf_path.exists():
+                raise FileNotFoundError(f"PDF file does not exist: {pdf_path}")
+
+            if output_dir:
+                base_output_dir = Path(output_dir)
+            else:
+                base_output_dir = pdf_path.parent / "mineru_output"
+            base_output_dir.mkdir(parents=True, exist_ok=True)
+
+            text_layer = await asyncio.to_thread(
+                self._plan_text_layer,
+                pdf_path,
+                method,
+                kwargs.get("start_page"),
+                kwargs.get("end_page"),
+            )
+            if text_layer:
+                shards, text_pages = text_layer
+                return await self._aparse_pdf_sharded(
+                    pdf_path,
+                    base_output_dir,
+                    shards,
+                    method=method,
+                    lang=lang,
+                    text_pages=text_pages,
+                    **kwargs,
+                )
+
+            shards = await asyncio.to_thread(
+                self._plan_shards,
+                pdf_path,
+                kwargs.get("start_page"),
+                kwargs.get("end_page"),
+            )
+            if shards:
+                return await self._aparse_pdf_sharded(
+                    pdf_path,
+                    base_output_dir,
+                    shards,
+                    method=method,
+                    lang=lang,
+                    **kwargs,
+                )
+
+            await self._arun_mineru(
+                input_path=pdf_path,
+                output_dir=base_output_dir,
+                method=method,
+                lang=lang,
+                **kwargs,
+            )
+
+            backend = kwargs.get("backend", "")
+            if backend.startswith("vlm-"):
+                method = "vlm"
+            content_list, _ = await asyncio.to_thread(
+                self._read_output_files, base_output_dir, pdf_path.stem, method
+            )
+            return content_list
+
+        except MineruExecutionError:
+            raise
+        except Exception as e:
+            logging.error(f"Error in parse_pdf: {str(e)}")
+            raise
+
+    async def _aparse_image(
+        self,
+        image_path: Union[str, Path],
+        output_dir: Optional[str] = None,
+        lang: Optional[str] = None,
+        **kwargs,
+    ) -> List[Dict[str, Any]]:
+        """Async version of parse_image"""
+        try:
+            image_path = Path(image_path)
+            actual_image_path, temp_converted_file = await asyncio.to_thread(
+                self._prepare_image_input, image_path
+            )
+
+            if output_dir:
+                base_output_dir = Path(output_dir)
+            else:
+                base_output_dir = image_path.parent / "mineru_output"
+            base_output_dir.mkdir(parents=True, exist_ok=True)
+
+            try:
+                # Images are processed with the OCR method
+                await self._arun_mineru(
+                    input_path=actual_image_path,
+                    output_dir=base_output_dir,
+                    method="ocr",
+                    lang=lang,
+                    **kwargs,
+                )
+                content_list, _ = await asyncio.to_thread(
+                    self._read_output_files, base_output_dir, image_path.stem, "ocr"
+                )
+                return content_list
+            finally:
+                self._remove_converted_image(temp_converted_file)
+
+        except MineruExecutionError:
+            raise
+        except Exception as e:
+            logging.error(f"Error in parse_image: {str(e)}")
+            raise
+
+    async def _aparse_office_doc(
+        self,
+        doc_path: Union[str, Path],
+        output_dir: Optional[str] = None,
+        lang: Optional[str] = None,
+        **kwargs,
+    ) -> List[Dict[str, Any]]:
+        """Async version of parse_office_doc"""
+        content_list = await asyncio.to_thread(
+            self._parse_office_natively, doc_path, output_dir
+        )
+        if content_list is not None:
+            return content_list
+        # LibreOffice conversion has its own timeout
+        pdf_path = await asyncio.to_thread(
+            self.convert_office_to_pdf, doc_path, output_dir
+        )
+        return await self._aparse_pdf(
+            pdf_path=pdf_path, output_dir=output_dir, lang=lang, **kwargs
+        )
+
+    async def _aparse_text_file(
+        self,
+        text_path: Union[str, Path],
+        output_dir: Optional[str] = None,
+        lang: Optional[str] = None,
+        **kwargs,
+    ) -> List[Dict[str, Any]]:
+        """Async version of parse_text_file"""
+        if self.parses_text_natively(text_path):
+            return await asyncio.to_thread(self.parse_text_natively, text_path)
+        pdf_path = await asyncio.to_thread(
+            self.convert_text_to_pdf, text_path, output_dir
+        )
+        return await self._aparse_pdf(
+            pdf_path=pdf_path, output_dir=output_dir, lang=lang, **kwargs
+        )
+
+    async def _aparse_document(
+        self,
+        file_path: Union[str, Path],
+        method: str = "auto",
+        output_dir: Optional[str] = None,
+        lang: Optional[str] = None,
+        **kwargs,
+    ) -> List[Dict[str, Any]]:
+        """Async version of parse_document"""
+        file_path = Path(file_path)
+        if not file_path.exists():
+            raise FileNotFoundError(f"File does not exist: {file_path}")
+
+        ext = file_path.suffix.lower()
+        if ext == ".pdf":
+            return await self._aparse_pdf(file_path, output_dir, method, lang, **kwargs)
+        elif ext in self.IMAGE_FORMATS:
+            return await self._aparse_image(file_path, output_dir, lang, **kwargs)
+        elif ext in self.OFFICE_FORMATS:
+            logging.warning(
+                f"Warning: Office document detected ({ext}). "
+                f"MinerU 2.0 requires conversion to PDF first."
+            )
+            return await self._aparse_office_doc(file_path, output_dir, lang, **kwargs)
+        elif ext in self.TEXT_FORMATS:
+            return await self._aparse_text_file(file_path, output_dir, lang, **kwargs)
+        else:
+            logging.warning(
+                f"Warning: Unsupported file extension '{ext}', "
+                f"attempting to parse as PDF"
+            )
+            return await self._aparse_pdf(file_path, output_dir, method, lang, **kwargs)
+
     def parse_document(
         self,
         file_path: Union[str, Path],
@@ -1231,9 +2277,23 @@ class DoclingParser(Parser):
     # Define Docling-specific formats
     HTML_FORMATS = {".html", ".htm", ".xhtml"}
 
-    def __init__(self) -> None:
-        """Initialize DoclingParser"""
-        super().__init__()
+    def __init__(
+        self,
+        converter_pool=None,
+        text_parser: str = "native",
+        text_page_chars: int = 3000,
+    ) -> None:
+        """Initialize DoclingParser
+
+        Args:
+            converter_pool: Optional ``DoclingConverterPool`` of warm in-process
+                converters. Without it every document runs the ``docling`` CLI.
+            text_parser: 'native' to parse text and Markdown files directly, or
+                'pdf' (not supported by Docling)
+            text_page_chars: Characters per synthetic page of natively parsed text
+        """
+        super().__init__(text_parser=text_parser, text_page_chars=text_page_chars)
+        self.converter_pool = converter_pool
 
     def parse_pdf(
         self,
@@ -1326,6 +2386,8 @@ class DoclingParser(Parser):
             return self.parse_office_doc(file_path, output_dir, lang, **kwargs)
         elif ext in self.HTML_FORMATS:
             return self.parse_html(file_path, output_dir, lang, **kwargs)
+        elif self.parses_text_natively(file_path):
+            return self.parse_text_natively(file_path)
         else:
             raise ValueError(
                 f"Unsupported file format: {ext}. "
@@ -1353,18 +2415,21 @@ class DoclingParser(Parser):
         file_output_dir = Path(output_dir) / file_stem / "docling"
         file_output_dir.mkdir(parents=True, exist_ok=True)
 
-        cmd_json = [
+        if self.converter_pool is not None:
+            # One in-process conversion yields both the JSON and the markdown
+            logging.info(
+                f"Converting {Path(input_path).name} with warm Docling converter"
+            )
+            self.converter_pool.convert(input_path, file_output_dir)
+            return
+
+        # A single run exports both formats from the same conversion
+        cmd = [
             "docling",
             "--output",
             str(file_output_dir),
             "--to",
             "json",
-            str(input_path),
-        ]
-        cmd_md = [
-            "docling",
-            "--output",
-            str(file_output_dir),
             "--to",
             "md",
             str(input_path),
@@ -1374,25 +2439,60 @@ class DoclingParser(Parser):
             # Prepare subprocess parameters to hide console window on Windows
             import platform
 
+            from raganything.parse_scheduler import (
+                subprocess_env,
+                track_process,
+                wait_unreaped,
+            )
+
             docling_subprocess_kwargs = {
-                "capture_output": True,
+                "stdout": subprocess.PIPE,
+                "stderr": subprocess.PIPE,
                 "text": True,
-                "check": True,
                 "encoding": "utf-8",
                 "errors": "ignore",
+                # Thread budget of the batch worker running this file, if any
+                "env": subprocess_env(),
             }
 
             # Hide console window on Windows
             if platform.system() == "Windows":
                 docling_subprocess_kwargs["creationflags"] = subprocess.CREATE_NO_WINDOW
+            else:
+                # Own process group, so that the whole tree can be killed
+                docling_subprocess_kwargs["start_new_session"] = True
 
-            result_json = subprocess.run(cmd_json, **docling_subprocess_kwargs)
-            result_md = subprocess.run(cmd_md, **docling_subprocess_kwargs)
+            with subprocess.Popen(cmd, **docling_subprocess_kwargs) as process:
+                cpu_usage = track_process(process.pid)
+                untrack = _track_parse_process(process)
+                try:
+                    # Like communicate(), but the CPU time is charged before
+                    # the exited process is reaped
+                    stderr_chunks: List[str] = []
+                    stderr_reader = threading.Thread(
+                        target=lambda: stderr_chunks.append(process.stderr.read()),
+                        daemon=True,
+                    )
+                    stderr_reader.start()
+                    stdout = process.stdout.read()
+                    stderr_reader.join()
+                    stderr = "".join(stderr_chunks)
+                    wait_unreaped(process)
+                    cpu_usage.finish()
+                    process.wait()
+                except BaseException:
+                    # Interrupted (e.g. Ctrl-C): the group gets no SIGINT
+                    _kill_process_tree(process)
+                    raise
+                finally:
+                    untrack()
+            if process.returncode:
+                raise subprocess.CalledProcessError(
+                    process.returncode, cmd, output=stdout, stderr=stderr
+                )
             logging.info("Docling command executed successfully")
-            if result_json.stdout:
-                logging.debug(f"JSON cmd output: {result_json.stdout}")
-            if result_md.stdout:
-                logging.debug(f"Markdown cmd output: {result_md.stdout}")
+            if stdout:
+                logging.debug(f"Docling cmd output: {stdout}")
         except subprocess.CalledProcessError as e:
             logging.error(f"Error running docling command: {e}")
             if e.stderr:
@@ -1438,60 +2538,161 @@ class DoclingParser(Parser):
             try:
                 with open(json_file, "r", encoding="utf-8") as f:
                     docling_content = json.load(f)
-                    # Convert docling format to minerU format
-                    content_list = self.read_from_block_recursive(
-                        docling_content["body"],
-                        "body",
-                        file_subdir,
-                        0,
-                        "0",
-                        docling_content,
-                    )
+                # Convert docling format to minerU format
+                content_list = self.convert_docling_document(
+                    docling_content, file_subdir
+                )
             except Exception as e:
                 logging.warning(f"Could not read or convert JSON file {json_file}: {e}")
         return content_list, md_content
 
-    def read_from_block_recursive(
+    # DoclingDocument collections that ``$ref`` pointers can target
+    REF_COLLECTIONS = (
+        "texts",
+        "pictures",
+        "tables",
+        "groups",
+        "key_value_items",
+        "form_items",
+    )
+
+    @classmethod
+    def _build_ref_index(
+        cls, docling_content: Dict[str, Any]
+    ) -> Dict[str, Tuple[str, str, Dict[str, Any]]]:
+        """Map each ``$ref`` pointer to (collection, index, block) in one pass"""
+        ref_index = {}
+        for collection in cls.REF_COLLECTIONS:
+            for position, block in enumerate(docling_content.get(collection) or []):
+                target = (collection, str(position), block)
+                ref_index[f"#/{collection}/{position}"] = target
+                self_ref = block.get("self_ref")
+                if self_ref:
+                    ref_index.setdefault(self_ref, target)
+        return ref_index
+
+    @staticmethod
+    def _page_idx_from_prov(block: Dict[str, Any]) -> Optional[int]:
+        """0-based page of a block from its Docling provenance, if it has one"""
+        for prov in block.get("prov") or []:
+            page_no = prov.get("page_no") if isinstance(prov, dict) else None
+            if isinstance(page_no, int):
+                return max(0, page_no - 1)
+        return None
+
+    def convert_docling_document(
         self,
-        block,
-        type: str,
-        output_dir: Path,
-        cnt: int,
-        num: str,
         docling_content: Dict[str, Any],
+        output_dir: Path,
+        image_workers: int = 4,
     ) -> List[Dict[str, Any]]:
-        content_list = []
-        if not block.get("children"):
-            cnt += 1
-            content_list.append(self.read_from_block(block, type, output_dir, cnt, num))
-        else:
-            if type not in ["groups", "body"]:
-                cnt += 1
-                content_list.append(
-                    self.read_from_block(block, type, output_dir, cnt, num)
-                )
-            members = block["children"]
-            for member in members:
-                cnt += 1
-                member_tag = member["$ref"]
-                member_type = member_tag.split("/")[1]
-                member_num = member_tag.split("/")[2]
-                member_block = docling_content[member_type][int(member_num)]
-                content_list.extend(
-                    self.read_from_block_recursive(
-                        member_block,
-                        member_type,
-                        output_dir,
-                        cnt,
-                        member_num,
-                        docling_content,
+        """
+        Convert a Docling JSON document into a MinerU-style content list
+
+        The body is walked in reading order with an explicit stack, resolving
+        ``$ref`` pointers through an index built once. ``page_idx`` comes from
+        the Docling provenance; blocks without one (e.g. Word documents) keep the
+        page of the previous block. Embedded pictures are decoded and written by
+        a thread pool while walking, with a bounded number in flight.
+
+        Args:
+            docling_content: Parsed Docling JSON document
+            output_dir: Directory receiving the ``images`` folder
+            image_workers: Threads decoding and writing pictures
+
+        Returns:
+            List[Dict[str, Any]]: List of content blocks
+        """
+        ref_index = self._build_ref_index(docling_content)
+        content_list: List[Dict[str, Any]] = []
+        image_jobs: List[Tuple[int, Any, Dict[str, Any], str]] = []
+        in_flight: deque = deque()
+        max_in_flight = max(1, image_workers) * 2
+        page_idx = 0
+        visited = set()
+
+        with ThreadPoolExecutor(
+            max_workers=max(1, image_workers), thread_name_prefix="docling-images"
+        ) as executor:
+
+            def save_image(image_path: Path, base64_str: str, block, num) -> None:
+                # Bound the number of payloads held by pending jobs
+                while len(in_flight) >= max_in_flight:
+                    in_flight.popleft().exception()
+                future = executor.submit(self._write_image, image_path, base64_str)
+                in_flight.append(future)
+                image_jobs.append((len(content_list), future, block, num))
+
+            stack = [(docling_content.get("body") or {}, "body", "0")]
+            while stack:
+                block, block_type, num = stack.pop()
+                # Marked when visited, so a repeated reference keeps its first place
+                if block_type != "body":
+                    if (block_type, num) in visited:
+                        continue
+                    visited.add((block_type, num))
+                block_page = self._page_idx_from_prov(block)
+                if block_page is not None:
+                    page_idx = block_page
+
+                children = block.get("children") or []
+                if block_type not in ("groups", "body"):
+                    content_list.append(
+                        self.read_from_block(
+                            block, block_type, output_dir, page_idx, num, save_image
+                        )
                     )
-                )
+                # Push children reversed so they are visited in reading order
+                for child in reversed(children):
+                    ref = child.get("$ref") if isinstance(child, dict) else None
+                    target = ref_index.get(ref)
+                    if target is None:
+                        logging.warning(f"Skipping unresolved Docling reference {ref}")
+                        continue
+                    collection, child_num, child_block = target
+                    if (collection, child_num) not in visited:
+                        stack.append((child_block, collection, child_num))
+
+        # The executor has finished every job; replace pictures that failed
+        for position, future, block, num in image_jobs:
+            error = future.exception()
+            if error is not None:
+                logging.warning(f"Failed to process image {num}: {error}")
+                content_list[position] = {
+                    "type": "text",
+                    "text": f"[Image processing failed: {block.get('caption', '')}]",
+                    "page_idx": content_list[position]["page_idx"],
+                }
         return content_list
 
+    @staticmethod
+    def _write_image(image_path: Path, base64_str: str) -> None:
+        """Decode a base64 picture payload to disk"""
+        image_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(image_path, "wb") as f:
+            f.write(base64.b64decode(base64_str))
+
     def read_from_block(
-        self, block, type: str, output_dir: Path, cnt: int, num: str
+        self,
+        block,
+        type: str,
+        output_dir: Path,
+        page_idx: int,
+        num: str,
+        save_image: Optional[Callable] = None,
     ) -> Dict[str, Any]:
+        """
+        Convert one Docling block into a content block
+
+        Args:
+            block: Docling block
+            type: Docling collection of the block
+            output_dir: Directory receiving the ``images`` folder
+            page_idx: 0-based page of the block
+            num: Index of the block in its collection
+            save_image: Called as ``save_image(path, base64_str, block, num)`` to
+                write pictures asynchronously; written synchronously if omitted
+        """
         if type == "texts":
             if block["label"] == "formula":
                 return {
@@ -1499,37 +2700,37 @@ class DoclingParser(Parser):
                     "img_path": "",
                     "text": block["orig"],
                     "text_format": "unknown",
-                    "page_idx": cnt // 10,
+                    "page_idx": page_idx,
                 }
             else:
                 return {
                     "type": "text",
                     "text": block["orig"],
-                    "page_idx": cnt // 10,
+                    "page_idx": page_idx,
                 }
         elif type == "pictures":
             try:
                 base64_uri = block["image"]["uri"]
                 base64_str = base64_uri.split(",")[1]
-                # Create images directory within the docling subdirectory
-                image_dir = output_dir / "images"
-                image_dir.mkdir(parents=True, exist_ok=True)  # Ensure directory exists
-                image_path = image_dir / f"image_{num}.png"
-                with open(image_path, "wb") as f:
-                    f.write(base64.b64decode(base64_str))
+                # Images go to an images directory within the docling subdirectory
+                image_path = output_dir / "images" / f"image_{num}.png"
+                if save_image is not None:
+                    save_image(image_path, base64_str, block, num)
+                else:
+                    self._write_image(image_path, base64_str)
                 return {
                     "type": "image",
                     "img_path": str(image_path.resolve()),  # Convert to absolute path
                     "image_caption": block.get("caption", ""),
                     "image_footnote": block.get("footnote", ""),
-                    "page_idx": cnt // 10,
+                    "page_idx": page_idx,
                 }
             except Exception as e:
                 logging.warning(f"Failed to process image {num}: {e}")
                 return {
                     "type": "text",
                     "text": f"[Image processing failed: {block.get('caption', '')}]",
-                    "page_idx": cnt // 10,
+                    "page_idx": page_idx,
                 }
         else:
             try:
@@ -1539,14 +2740,14 @@ class DoclingParser(Parser):
                     "table_caption": block.get("caption", ""),
                     "table_footnote": block.get("footnote", ""),
                     "table_body": block.get("data", []),
-                    "page_idx": cnt // 10,
+                    "page_idx": page_idx,
                 }
             except Exception as e:
                 logging.warning(f"Failed to process table {num}: {e}")
                 return {
                     "type": "text",
                     "text": f"[Table processing failed: {block.get('caption', '')}]",
-                    "page_idx": cnt // 10,
+                    "page_idx": page_idx,
                 }
 
     def parse_office_doc(
@@ -1699,12 +2900,190 @@ class DoclingParser(Parser):
             return False
 
 
+class HtmlParser(Parser):
+    """
+    Lightweight native HTML parsing utility class.
+
+    Reads HTML pages directly with the standard library, without starting
+    Docling or LibreOffice, which makes it suited to large crawls of web pages.
+    Text and Markdown files are parsed natively as well; PDF, Office and image
+    files are handed to the fallback parser (usually MinerU), so a mixed corpus
+    can be processed with the html parser selected.
+    """
+
+    HTML_FORMATS = {".html", ".htm", ".xhtml"}
+
+    # Keyword naming the input file of each parse method
+    _PATH_ARGUMENTS = ("pdf_path", "image_path", "doc_path", "file_path")
+
+    def __init__(
+        self,
+        text_parser: str = "native",
+        text_page_chars: int = 3000,
+        fallback_parser: Optional[Parser] = None,
+    ) -> None:
+        """Initialize HtmlParser
+
+        Args:
+            text_parser: 'native' to parse text and Markdown files directly, or
+                'pdf' to hand them to the fallback parser
+            text_page_chars: Characters per synthetic page of parsed pages and text
+            fallback_parser: Parser for PDF, Office and image files (None = such
+                files are rejected)
+        """
+        super().__init__(text_parser=text_parser, text_page_chars=text_page_chars)
+        self.fallback_parser = fallback_parser
+
+    def _parses_natively(self, file_path: Union[str, Path]) -> bool:
+        suffix = Path(file_path).suffix.lower()
+        return suffix in self.HTML_FORMATS or self.parses_text_natively(file_path)
+
+    def _fallback_for(self, file_path: Union[str, Path]) -> Parser:
+        """The fallback parser for a file this parser cannot read itself"""
+        if self.fallback_parser is None:
+            raise ValueError(
+                f"Unsupported file format: {Path(file_path).suffix}. "
+                f"The html parser only supports HTML formats "
+                f"({', '.join(sorted(self.HTML_FORMATS))}) and text files; "
+                f"use the mineru or docling parser for other documents"
+            )
+        return self.fallback_parser
+
+    async def _aparse(self, method_name: str, **kwargs) -> List[Dict[str, Any]]:
+        """Run files the html parser cannot read with the fallback's async API"""
+        file_path = next(
+            (kwargs[name] for name in self._PATH_ARGUMENTS if name in kwargs), None
+        )
+        if file_path is not None and not self._parses_natively(file_path):
+            return await self._fallback_for(file_path)._aparse(method_name, **kwargs)
+        return await super()._aparse(method_name, **kwargs)
+
+    def parses_office_natively(self, doc_path: Union[str, Path]) -> bool:
+        """Whether the fallback parser reads an Office document without LibreOffice"""
+        if not hasattr(self.fallback_parser, "parses_office_natively"):
+            return False
+        return self.fallback_parser.parses_office_natively(doc_path)
+
+    def parse_pdf(
+        self,
+        pdf_path: Union[str, Path],
+        output_dir: Optional[str] = None,
+        method: str = "auto",
+        lang: Optional[str] = None,
+        **kwargs,
+    ) -> List[Dict[str, Any]]:
+        """Parse a PDF file with the fallback parser"""
+        return self._fallback_for(pdf_path).parse_pdf(
+            pdf_path=pdf_path, output_dir=output_dir, method=method, lang=lang, **kwargs
+        )
+
+    def parse_image(
+        self,
+        image_path: Union[str, Path],
+        output_dir: Optional[str] = None,
+        lang: Optional[str] = None,
+        **kwargs,
+    ) -> List[Dict[str, Any]]:
+        """Parse an image file with the fallback parser"""
+        return self._fallback_for(image_path).parse_image(
+            image_path=image_path, output_dir=output_dir, lang=lang, **kwargs
+        )
+
+    def parse_office_doc(
+        self,
+        doc_path: Union[str, Path],
+        output_dir: Optional[str] = None,
+        lang: Optional[str] = None,
+        **kwargs,
+    ) -> List[Dict[str, Any]]:
+        """Parse an HTML page, or an Office document with the fallback parser"""
+        if Path(doc_path).suffix.lower() not in self.HTML_FORMATS:
+            return self._fallback_for(doc_path).parse_office_doc(
+                doc_path=doc_path, output_dir=output_dir, lang=lang, **kwargs
+            )
+        return self.parse_html(doc_path, output_dir, lang, **kwargs)
+
+    def parse_html(
+        self,
+        html_path: Union[str, Path],
+        output_dir: Optional[str] = None,
+        lang: Optional[str] = None,
+        **kwargs,
+    ) -> List[Dict[str, Any]]:
+        """
+        Parse an HTML page natively
+
+        Supported formats: .html, .htm, .xhtml
+
+        Args:
+            html_path: Path to the HTML file
+            output_dir: Output directory path (embedded images are written here)
+            lang: Unused, accepted for interface compatibility
+            **kwargs: Unused parser options
+
+        Returns:
+            List[Dict[str, Any]]: List of content blocks
+        """
+        from raganything.html_parser import parse_html_file
+
+        html_path = Path(html_path)
+        if not html_path.exists():
+            raise FileNotFoundError(f"HTML file does not exist: {html_path}")
+        if html_path.suffix.lower() not in self.HTML_FORMATS:
+            raise ValueError(f"Unsupported HTML format: {html_path.suffix}")
+        return parse_html_file(
+            html_path,
+            output_dir=output_dir or html_path.parent / "html_output",
+            page_chars=self.text_page_chars,
+        )
+
+    def parse_document(
+        self,
+        file_path: Union[str, Path],
+        method: str = "auto",
+        output_dir: Optional[str] = None,
+        lang: Optional[str] = None,
+        **kwargs,
+    ) -> List[Dict[str, Any]]:
+        """
+        Parse an HTML page or a text file natively, other files with the fallback
+
+        Args:
+            file_path: Path to the file to be parsed
+            method: Unused, accepted for interface compatibility
+            output_dir: Output directory path
+            lang: Unused, accepted for interface compatibility
+            **kwargs: Unused parser options
+
+        Returns:
+            List[Dict[str, Any]]: List of content blocks
+        """
+        file_path = Path(file_path)
+        if not file_path.exists():
+            raise FileNotFoundError(f"File does not exist: {file_path}")
+        if file_path.suffix.lower() in self.HTML_FORMATS:
+            return self.parse_html(file_path, output_dir, lang, **kwargs)
+        if self.parses_text_natively(file_path):
+            return self.parse_text_natively(file_path)
+        return self._fallback_for(file_path).parse_document(
+            file_path=file_path,
+            method=method,
+            output_dir=output_dir,
+            lang=lang,
+            **kwargs,
+        )
+
+    def check_installation(self) -> bool:
+        """The html parser only needs the standard library"""
+        return True
+
+
 def main():
     """
     Main function to run the document parser from command line
     """
     parser = argparse.ArgumentParser(
-        description="Parse documents using MinerU 2.0 or Docling"
+        description="Parse documents using MinerU 2.0, Docling or native HTML parsing"
     )
     parser.add_argument("file_path", help="Path to the document to parse")
     parser.add_argument("--output", "-o", help="Output directory path")
@@ -1763,7 +3142,7 @@ def main():
     )
     parser.add_argument(
         "--parser",
-        choices=["mineru", "docling"],
+        choices=["mineru", "docling", "html"],
         default="mineru",
         help="Parser selection",
     )
@@ -1776,7 +3155,9 @@ def main():
 
     # Check installation if requested
     if args.check:
-        doc_parser = DoclingParser() if args.parser == "docling" else MineruParser()
+        doc_parser = {"docling": DoclingParser, "html": HtmlParser}.get(
+            args.parser, MineruParser
+        )()
         if doc_parser.check_installation():
             print(f"✅ {args.parser.title()} is properly installed")
             return 0
@@ -1786,7 +3167,9 @@ def main():
 
     try:
         # Parse the document
-        doc_parser = DoclingParser() if args.parser == "docling" else MineruParser()
+        doc_parser = {"docling": DoclingParser, "html": HtmlParser}.get(
+            args.parser, MineruParser
+        )()
         content_list = doc_parser.parse_document(
             file_path=args.file_path,
             method=args.method,
@@ -0,0 +1,343 @@
+"""
+Text-layer fast path for born-digital PDFs
+
+Most pages of born-digital PDFs carry a clean embedded text layer, and running
+the MinerU layout and OCR models on them mostly recovers that same text. Each
+page is checked first:
+
+- pages with large images (figures, scans with an OCR layer), ruled tables,
+  vector drawings, formulas, or an unreadable text layer are left to MinerU
+- the other pages are read directly, with headings recognised by font size
+  and paragraphs rebuilt from line spacing
+
+The text layer is read with pypdfium2, which is installed with MinerU; without
+it every page goes to MinerU as before.
+"""
+
+import importlib.util
+import logging
+import re
+import statistics
+import threading
+import unicodedata
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+PDFIUM_AVAILABLE = importlib.util.find_spec("pypdfium2") is not None
+
+# Images covering more than this share of the page are figures or scans
+_FIGURE_AREA = 0.04
+# Paths thinner than this (in points) are rules: table borders and underlines
+_RULE_THICKNESS = 2.0
+# Vector drawings: many paths, or a single complex one, over a share of the page
+_DRAWING_PATHS = 25
+_DRAWING_SEGMENTS = 40
+_DRAWING_AREA = 0.05
+# Text layers with more unreadable characters than this are broken
+_MAX_UNREADABLE = 0.01
+_MIN_ALNUM = 0.5
+# Share of math symbols above which a page holds formulas
+_MAX_MATH_SYMBOLS = 0.02
+# Font size ratios to the body text for heading levels 1 and 2
+_HEADING_RATIOS = (1.6, 1.2)
+_MAX_HEADING_CHARS = 150
+# Each MinerU run loads its models: text pages in gaps this short between two
+# MinerU ranges go to MinerU with them, and a document needing more runs than
+# this, or MinerU for most of its pages, is parsed in one MinerU run instead
+_MAX_TEXT_GAP = 3
+_MAX_MINERU_RUNS = 4
+_MAX_MINERU_SHARE = 0.5
+
+_LINE = re.compile(r"[^\r\n]+")
+_PAGE_NUMBER = re.compile(
+    r"^(?:page\s*)?[-–(]?\s*\d+\s*(?:(?:/|of)\s*\d+)?\s*[-–)]?$",
+    re.IGNORECASE,
+)
+# pdfium replaces a hyphen at a line break with U+FFFE and joins the lines
+_HYPHEN_JOIN = "\ufffe"
+_SENTENCE_END = (".", "!", "?", ":", ";", "。")
+
+# pdfium is not thread-safe
+_PDFIUM_LOCK = threading.Lock()
+
+
+class _Line:
+    __slots__ = ("text", "size", "bottom", "right")
+
+    def __init__(self, text: str, size: float, box: Tuple[float, ...], right: float):
+        self.text = text
+        self.size = size
+        self.bottom = box[1]
+        self.right = right
+
+
+def _is_unreadable(char: str) -> bool:
+    return char == "\ufffd" or unicodedata.category(char) in ("Co", "Cn", "Cc")
+
+
+def _text_is_usable(text: str) -> bool:
+    """Whether extracted text is real text rather than broken font encodings"""
+    chars = [char for char in text if not char.isspace() and char != _HYPHEN_JOIN]
+    if not chars:
+        return True
+    total = len(chars)
+    if sum(map(_is_unreadable, chars)) > _MAX_UNREADABLE * total:
+        return False
+    if sum(char.isalnum() for char in chars) < _MIN_ALNUM * total:
+        return False
+    math_symbols = sum(unicodedata.category(char) == "Sm" for char in chars)
+    return math_symbols <= _MAX_MATH_SYMBOLS * total
+
+
+def _bounds(obj) -> Tuple[float, float, float, float]:
+    # get_pos() was renamed get_bounds() in pypdfium2 5
+    get_bounds = getattr(obj, "get_bounds", None) or obj.get_pos
+    return get_bounds()
+
+
+def _needs_layout_model(page, pdfium_c) -> Optional[str]:
+    """Why a page has to go through MinerU, or None"""
+    width, height = page.get_size()
+    area = max(width * height, 1.0)
+
+    for obj in page.get_objects(filter=(pdfium_c.FPDF_PAGEOBJ_IMAGE,), max_depth=2):
+        left, bottom, right, top = _bounds(obj)
+        if (right - left) * (top - bottom) > _FIGURE_AREA * area:
+            return "image"
+
+    horizontal = vertical = drawing_paths = 0
+    drawing_box = [width, height, 0.0, 0.0]
+    for obj in page.get_objects(filter=(pdfium_c.FPDF_PAGEOBJ_PATH,), max_depth=2):
+        left, bottom, right, top = _bounds(obj)
+        path_width, path_height = right - left, top - bottom
+        if path_height <= _RULE_THICKNESS and path_width >= 0.05 * width:
+            horizontal += 1
+            continue
+        if path_width <= _RULE_THICKNESS and path_height >= 0.02 * height:
+            vertical += 1
+            continue
+        if (
+            path_width * path_height > _DRAWING_AREA * area
+            and pdfium_c.FPDFPath_CountSegments(obj.raw) > _DRAWING_SEGMENTS
+        ):
+            return "drawing"
+        drawing_paths += 1
+        drawing_box = [
+            min(drawing_box[0], left),
+            min(drawing_box[1], bottom),
+            max(drawing_box[2], right),
+            max(drawing_box[3], top),
+        ]
+
+    if horizontal >= 3 and (vertical >= 2 or horizontal >= 5):
+        return "table"
+    if drawing_paths >= _DRAWING_PATHS:
+        box_area = (drawing_box[2] - drawing_box[0]) * (drawing_box[3] - drawing_box[1])
+        if box_area > 2 * _DRAWING_AREA * area:
+            return "drawing"
+    return None
+
+
+def _read_lines(textpage, text: str, pdfium_c) -> List[_Line]:
+    char_count = textpage.count_chars()
+    lines: List[_Line] = []
+    for match in _LINE.finditer(text):
+        raw = match.group()
+        line = raw.strip().replace(_HYPHEN_JOIN, "")
+        if not line:
+            continue
+        first = match.start() + len(raw) - len(raw.lstrip())
+        last = match.start() + len(raw.rstrip()) - 1
+        if last >= char_count:
+            # Text and character indices disagree; geometry is unavailable
+            lines.append(_Line(line, 0.0, (0.0, 0.0, 0.0, 0.0), 0.0))
+            continue
+        lines.append(
+            _Line(
+                line,
+                pdfium_c.FPDFText_GetFontSize(textpage.raw, first),
+                textpage.get_charbox(first),
+                textpage.get_charbox(last)[2],
+            )
+        )
+    return lines
+
+
+def _heading_level(line: _Line, body_size: float) -> Optional[int]:
+    if not body_size or len(line.text) > _MAX_HEADING_CHARS:
+        return None
+    for level, ratio in enumerate(_HEADING_RATIOS, start=1):
+        if line.size >= ratio * body_size:
+            return level
+    return None
+
+
+def _join_lines(lines: List[str]) -> str:
+    text = lines[0]
+    for line in lines[1:]:
+        if text.endswith("-") and line[:1].islower():
+            text = text[:-1] + line
+        else:
+            text += " " + line
+    return text
+
+
+def _lines_to_items(lines: List[_Line]) -> List[Dict[str, Any]]:
+    """Group the lines of a page into heading and paragraph items"""
+    # Running page numbers
+    while lines and _PAGE_NUMBER.match(lines[-1].text):
+        lines.pop()
+    while lines and _PAGE_NUMBER.match(lines[0].text):
+        lines.pop(0)
+    if not lines:
+        return []
+
+    sized = [line for line in lines if line.size > 0]
+    body_size = (
+        statistics.median_high(
+            [line.size for line in sized for _ in range(len(line.text) // 10 + 1)]
+        )
+        if sized
+        else 0.0
+    )
+    pitches = [
+        previous.bottom - line.bottom
+        for previous, line in zip(lines, lines[1:])
+        if previous.bottom - line.bottom > 0
+    ]
+    pitch = statistics.median(pitches) if pitches else 0.0
+    right_margin = max(line.right for line in lines)
+
+    items: List[Dict[str, Any]] = []
+    block: List[str] = []
+    block_level: Optional[int] = None
+    previous: Optional[_Line] = None
+    for line in lines:
+        level = _heading_level(line, body_size)
+        starts_block = previous is None or level != block_level
+        if not starts_block:
+            gap = previous.bottom - line.bottom
+            short_end = previous.text.endswith(_SENTENCE_END) and (
+                previous.right < 0.85 * right_margin
+            )
+            # A wide gap, a jump back up (next column) or a short last line
+            starts_block = short_end or (pitch > 0 and (gap > 1.5 * pitch or gap < 0))
+        if starts_block and block:
+            items.append(_text_item(block, block_level))
+            block = []
+        block.append(line.text)
+        block_level = level
+        previous = line
+    if block:
+        items.append(_text_item(block, block_level))
+    return items
+
+
+def _text_item(lines: List[str], level: Optional[int]) -> Dict[str, Any]:
+    if level:
+        return {"type": "text", "text": " ".join(lines), "text_level": level}
+    return {"type": "text", "text": _join_lines(lines)}
+
+
+def _read_page(page, pdfium_c) -> Optional[List[Dict[str, Any]]]:
+    """Content items of a page read from its text layer, or None for MinerU"""
+    if _needs_layout_model(page, pdfium_c):
+        return None
+    textpage = page.get_textpage()
+    try:
+        text = textpage.get_text_range()
+        if not _text_is_usable(text):
+            return None
+        return _lines_to_items(_read_lines(textpage, text, pdfium_c))
+    finally:
+        textpage.close()
+
+
+def read_text_layer(
+    pdf_path: Union[str, Path],
+    start_page: Optional[int] = None,
+    end_page: Optional[int] = None,
+) -> Optional[Dict[int, Optional[List[Dict[str, Any]]]]]:
+    """Read the pages of a PDF whose text layer can replace layout analysis
+
+    Args:
+        pdf_path: PDF file
+        start_page: First page (0-based, inclusive)
+        end_page: Last page (0-based, inclusive)
+
+    Returns:
+        Mapping of every page in the range to its text items (``page_idx`` not
+        set), or to None for pages that need MinerU; None when pypdfium2 is not
+        installed or the document cannot be opened
+    """
+    if not PDFIUM_AVAILABLE:
+        return None
+    import pypdfium2 as pdfium
+    import pypdfium2.raw as pdfium_c
+
+    pages: Dict[int, Optional[List[Dict[str, Any]]]] = {}
+    with _PDFIUM_LOCK:
+        try:
+            pdf = pdfium.PdfDocument(str(pdf_path))
+        except Exception as e:
+            logger.info(f"Cannot read the text layer of {pdf_path}: {e}")
+            return None
+        try:
+            first = max(0, start_page or 0)
+            last = len(pdf) - 1 if end_page is None else min(end_page, len(pdf) - 1)
+            for index in range(first, last + 1):
+                page = pdf[index]
+                try:
+                    pages[index] = _read_page(page, pdfium_c)
+                except Exception as e:
+                    logger.debug(f"Page {index} of {pdf_path} left to MinerU: {e}")
+                    pages[index] = None
+                finally:
+                    page.close()
+        finally:
+            pdf.close()
+
+    direct = sum(items is not None for items in pages.values())
+    logger.info(
+        f"Text layer of {Path(pdf_path).name}: {direct} of {len(pages)} pages "
+        f"read directly"
+    )
+    return pages
+
+
+def plan_mineru_ranges(
+    pages: Dict[int, Optional[List[Dict[str, Any]]]],
+) -> Optional[List[Tuple[int, int]]]:
+    """Group the pages that need MinerU into few inclusive (start, end) ranges
+
+    Args:
+        pages: Result of :func:`read_text_layer`
+
+    Returns:
+        The ranges for MinerU (pages inside them are parsed by MinerU even if
+        they were read), or None when one MinerU run over all pages is cheaper
+    """
+    ranges: List[Tuple[int, int]] = []
+    for page in sorted(pages):
+        if pages[page] is not None:
+            continue
+        if ranges and page - ranges[-1][1] - 1 <= _MAX_TEXT_GAP:
+            ranges[-1] = (ranges[-1][0], page)
+        else:
+            ranges.append((page, page))
+    mineru_pages = sum(end - start + 1 for start, end in ranges)
+    if len(ranges) > _MAX_MINERU_RUNS or mineru_pages > _MAX_MINERU_SHARE * len(pages):
+        return None
+    return ranges
+
+
+def text_items_to_markdown(items: List[Dict[str, Any]]) -> str:
+    """Markdown of text-layer items, for the merged ``.md`` output"""
+    return "\n\n".join(
+        "#" * item["text_level"] + " " + item["text"]
+        if item.get("text_level")
+        else item["text"]
+        for item in items
+    )
@@ -12,7 +12,16 @@ from typing import Dict, List, Any, Tuple, Optional
 from pathlib import Path
 
 from raganything.base import DocStatus
-from raganything.parser import MineruParser, DoclingParser, MineruExecutionError
+from raganything.parser import (
+    DoclingParser,
+    HtmlParser,
+    MineruExecutionError,
+    MineruParser,
+    Parser,
+)
+from raganything.mineru_worker import configure_mineru_worker_pool
+from raganything.docling_backend import configure_docling_pool
+from raganything.office_converter import configure_office_converter
 from raganything.utils import (
     separate_content,
     insert_text_content,
@@ -41,6 +50,44 @@ class ProcessorMixin:
         else:
             return os.path.basename(file_path)
 
+    def _create_doc_parser(self, parser: Optional[str] = None):
+        """
+        Create the document parser selected in the configuration
+
+        Args:
+            parser: Parser name overriding ``config.parser``
+
+        Returns:
+            DoclingParser with the shared converter pool, HtmlParser (with a
+            MineruParser for PDF, Office and image files), or MineruParser with
+            the shared MinerU workers and PDF sharding options
+        """
+        parser = parser or self.config.parser
+        # Office documents go through the shared LibreOffice slots of this config
+        configure_office_converter(self.config)
+        if parser == "html":
+            return HtmlParser(
+                text_parser=self.config.text_parser,
+                text_page_chars=self.config.text_page_chars,
+                fallback_parser=self._create_doc_parser("mineru"),
+            )
+        if parser == "docling":
+            return DoclingParser(
+                converter_pool=configure_docling_pool(self.config),
+                text_parser=self.config.text_parser,
+                text_page_chars=self.config.text_page_chars,
+            )
+        return MineruParser(
+            worker_pool=configure_mineru_worker_pool(self.config),
+            shard_pages=self.config.pdf_shard_pages,
+            shard_workers=self.config.pdf_shard_workers,
+            text_parser=self.config.text_parser,
+            text_page_chars=self.config.text_page_chars,
+            office_parser=self.config.office_parser,
+            spreadsheet_rows_per_block=self.config.spreadsheet_rows_per_block,
+            pdf_text_layer=self.config.pdf_text_layer,
+        )
+
     def _generate_cache_key(
         self, file_path: Path, parse_method: str = None, **kwargs
     ) -> str:
@@ -67,6 +114,20 @@ class ProcessorMixin:
             "parse_method": parse_method or self.config.parse_method,
         }
 
+        # Text files parse differently natively and through a rendered PDF
+        if file_path.suffix.lower() in Parser.TEXT_FORMATS:
+            config_dict["text_parser"] = self.config.text_parser
+            config_dict["text_page_chars"] = self.config.text_page_chars
+        elif file_path.suffix.lower() in (".docx", ".pptx"):
+            config_dict["office_parser"] = self.config.office_parser
+        elif file_path.suffix.lower() in (".xlsx", ".xls"):
+            config_dict["office_parser"] = self.config.office_parser
+            config_dict["spreadsheet_rows_per_block"] = (
+                self.config.spreadsheet_rows_per_block
+            )
+        elif file_path.suffix.lower() == ".pdf":
+            config_dict["pdf_text_layer"] = self.config.pdf_text_layer
+
         # Add relevant kwargs to config
         relevant_kwargs = {
             k: v
@@ -332,9 +393,8 @@ class ProcessorMixin:
         ext = file_path.suffix.lower()
 
         try:
-            doc_parser = (
-                DoclingParser() if self.config.parser == "docling" else MineruParser()
-            )
+            doc_parser = self._create_doc_parser()
+            timeout = self.config.parse_timeout or None
 
             # Log parser and method information
             self.logger.info(
@@ -343,11 +403,11 @@ class ProcessorMixin:
 
             if ext in [".pdf"]:
                 self.logger.info("Detected PDF file, using parser for PDF...")
-                content_list = await asyncio.to_thread(
-                    doc_parser.parse_pdf,
+                content_list = await doc_parser.aparse_pdf(
                     pdf_path=file_path,
                     output_dir=output_dir,
                     method=parse_method,
+                    timeout=timeout,
                     **kwargs,
                 )
             elif ext in [
@@ -363,10 +423,10 @@ class ProcessorMixin:
                 self.logger.info("Detected image file, using parser for images...")
                 # Use the selected parser's image parsing capability
                 if hasattr(doc_parser, "parse_image"):
-                    content_list = await asyncio.to_thread(
-                        doc_parser.parse_image,
+                    content_list = await doc_parser.aparse_image(
                         image_path=file_path,
                         output_dir=output_dir,
+                        timeout=timeout,
                         **kwargs,
                     )
                 else:
@@ -374,8 +434,13 @@ class ProcessorMixin:
                     self.logger.warning(
                         f"{self.config.parser} parser doesn't support image parsing, falling back to MinerU"
                     )
-                    content_list = MineruParser().parse_image(
-                        image_path=file_path, output_dir=output_dir, **kwargs
+                    content_list = await self._create_doc_parser(
+                        "mineru"
+                    ).aparse_image(
+                        image_path=file_path,
+                        output_dir=output_dir,
+                        timeout=timeout,
+                        **kwargs,
                     )
             elif ext in [
                 ".doc",
@@ -391,10 +456,10 @@ class ProcessorMixin:
                 self.logger.info(
                     "Detected Office or HTML document, using parser for Office/HTML..."
                 )
-                content_list = await asyncio.to_thread(
-                    doc_parser.parse_office_doc,
+                content_list = await doc_parser.aparse_office_doc(
                     doc_path=file_path,
                     output_dir=output_dir,
+                    timeout=timeout,
                     **kwargs,
                 )
             else:
@@ -402,11 +467,11 @@ class ProcessorMixin:
                 self.logger.info(
                     f"Using generic parser for {ext} file (method={parse_method})..."
                 )
-                content_list = await asyncio.to_thread(
-                    doc_parser.parse_document,
+                content_list = await doc_parser.aparse_document(
                     file_path=file_path,
                     method=parse_method,
                     output_dir=output_dir,
+                    timeout=timeout,
                     **kwargs,
                 )
 
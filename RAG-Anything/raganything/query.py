@@ -4,17 +4,18 @@ Query functionality for RAGAnything
 Contains all query-related methods for both text and multimodal queries
 """
 
+import asyncio
 import json
 import hashlib
 import re
-from typing import Dict, List, Any
+from typing import Dict, List, Any, AsyncIterator
 from pathlib import Path
 from lightrag import QueryParam
 from lightrag.utils import always_get_an_event_loop
 from raganything.prompt import PROMPTS
 from raganything.utils import (
     get_processor_for_type,
-    encode_image_to_base64,
+    aprepare_image_for_vlm,
     validate_image_file,
 )
 
@@ -327,9 +328,43 @@ class QueryMixin:
 
         self.logger.info(f"Executing VLM enhanced query: {query[:100]}...")
 
+        messages = await self._prepare_vlm_enhanced_messages(
+            query, mode=mode, system_prompt=system_prompt, **kwargs
+        )
+
+        if messages is None:
+            # Fallback to normal query
+            query_param = QueryParam(mode=mode, **kwargs)
+            return await self.lightrag.aquery(
+                query, param=query_param, system_prompt=system_prompt
+            )
+
+        # 4. Call VLM for question answering
+        result = await self._call_vlm_with_multimodal_content(messages)
+
+        self.logger.info("VLM enhanced query completed")
+        return result
+
+    async def _prepare_vlm_enhanced_messages(
+        self, query: str, mode: str = "mix", system_prompt: str | None = None, **kwargs
+    ) -> List[Dict] | None:
+        """
+        Retrieve context for a query and build VLM messages with embedded images
+
+        Args:
+            query: User query
+            mode: Underlying LightRAG query mode
+            system_prompt: Optional system prompt to include
+            **kwargs: Other query parameters
+
+        Returns:
+            List[Dict] | None: VLM messages, or None if no valid images were found
+        """
         # Clear previous image cache
         if hasattr(self, "_current_images_base64"):
             delattr(self, "_current_images_base64")
+        if hasattr(self, "_current_images_mime"):
+            delattr(self, "_current_images_mime")
 
         # 1. Get original retrieval prompt (without generating final answer)
         query_param = QueryParam(mode=mode, only_need_prompt=True, **kwargs)
@@ -344,24 +379,87 @@ class QueryMixin:
 
         if not images_found:
             self.logger.info("No valid images found, falling back to normal query")
-            # Fallback to normal query
-            query_param = QueryParam(mode=mode, **kwargs)
-            return await self.lightrag.aquery(
-                query, param=query_param, system_prompt=system_prompt
-            )
+            return None
 
         self.logger.info(f"Processed {images_found} images for VLM")
 
         # 3. Build VLM message format
-        messages = self._build_vlm_messages_with_images(
+        return self._build_vlm_messages_with_images(
             enhanced_prompt, query, system_prompt
         )
 
-        # 4. Call VLM for question answering
-        result = await self._call_vlm_with_multimodal_content(messages)
+    async def aquery_stream(
+        self, query: str, mode: str = "mix", system_prompt: str | None = None, **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        Streaming text query - yields answer tokens as they are generated
 
-        self.logger.info("VLM enhanced query completed")
-        return result
+        Retrieval runs exactly as in aquery(); only answer generation is streamed,
+        so the first token is delivered as soon as the model produces it.
+
+        Args:
+            query: Query text
+            mode: Query mode ("local", "global", "hybrid", "naive", "mix", "bypass")
+            system_prompt: Optional system prompt to include.
+            **kwargs: Other query parameters, will be passed to QueryParam
+                - vlm_enhanced: bool, default True when vision_model_func is available.
+
+        Yields:
+            str: Answer tokens (model output chunks)
+        """
+        if self.lightrag is None:
+            raise ValueError(
+                "No LightRAG instance available. Please process documents first or provide a pre-initialized LightRAG instance."
+            )
+
+        kwargs.pop("stream", None)
+        vlm_enhanced = kwargs.pop("vlm_enhanced", None)
+        vlm_available = (
+            hasattr(self, "vision_model_func") and self.vision_model_func is not None
+        )
+        if vlm_enhanced is None:
+            vlm_enhanced = vlm_available
+        elif vlm_enhanced and not vlm_available:
+            self.logger.warning(
+                "VLM enhanced query requested but vision_model_func is not available, falling back to normal query"
+            )
+            vlm_enhanced = False
+
+        self.logger.info(f"Executing streaming query: {query[:100]}...")
+
+        result = None
+        if vlm_enhanced:
+            await self._ensure_lightrag_initialized()
+            messages = await self._prepare_vlm_enhanced_messages(
+                query, mode=mode, system_prompt=system_prompt, **kwargs
+            )
+            if messages is not None:
+                result = await self._call_vlm_with_multimodal_content(
+                    messages, stream=True
+                )
+
+        if result is None:
+            query_param = QueryParam(mode=mode, stream=True, **kwargs)
+            result = await self.lightrag.aquery(
+                query, param=query_param, system_prompt=system_prompt
+            )
+
+        # Model functions without streaming support return the full answer
+        if isinstance(result, str):
+            yield result
+        else:
+            try:
+                async for chunk in result:
+                    if chunk:
+                        yield chunk
+            finally:
+                # A consumer that stops early (or is cancelled) must not leave
+                # the model stream and its HTTP connection open
+                aclose = getattr(result, "aclose", None)
+                if aclose is not None:
+                    await aclose()
+
+        self.logger.info("Streaming query completed")
 
     async def _process_multimodal_query_content(
         self, base_query: str, multimodal_content: List[Dict[str, Any]]
@@ -456,7 +554,7 @@ class QueryMixin:
 
         if image_path and Path(image_path).exists():
             # If image exists, use vision model to generate description
-            image_base64 = processor._encode_image_to_base64(image_path)
+            image_base64 = await processor._aencode_image_to_base64(image_path)
             if image_base64:
                 prompt = PROMPTS["QUERY_IMAGE_DESCRIPTION"]
                 description = await processor.modal_caption_func(
@@ -545,6 +643,7 @@ class QueryMixin:
 
         # Initialize image cache
         self._current_images_base64 = []
+        self._current_images_mime = []
 
         # Enhanced regex pattern for matching image paths
         # Matches only the path ending with image file extensions
@@ -556,48 +655,60 @@ class QueryMixin:
         matches = re.findall(image_path_pattern, prompt)
         self.logger.info(f"Found {len(matches)} image path matches in prompt")
 
-        def replace_image_path(match):
-            nonlocal images_processed
-
-            image_path = match.group(1).strip()
-            self.logger.debug(f"Processing image path: '{image_path}'")
-
+        # Validate and prepare all referenced images up front, concurrently and
+        # off the event loop (downscaled, re-encoded and cached by content hash)
+        valid_paths = []
+        for image_path in dict.fromkeys(match.strip() for match in matches):
             # Validate path format (basic check)
             if not image_path or len(image_path) < 3:
                 self.logger.warning(f"Invalid image path format: {image_path}")
-                return match.group(0)  # Keep original
+                continue
 
             # Use utility function to validate image file
             self.logger.debug(f"Calling validate_image_file for: {image_path}")
-            is_valid = validate_image_file(image_path)
-            self.logger.debug(f"Validation result for {image_path}: {is_valid}")
-
-            if not is_valid:
+            if validate_image_file(image_path):
+                valid_paths.append(image_path)
+            else:
                 self.logger.warning(f"Image validation failed for: {image_path}")
-                return match.group(0)  # Keep original if validation fails
 
-            try:
-                # Encode image to base64 using utility function
-                self.logger.debug(f"Attempting to encode image: {image_path}")
-                image_base64 = encode_image_to_base64(image_path)
-                if image_base64:
-                    images_processed += 1
-                    # Save base64 to instance variable for later use
-                    self._current_images_base64.append(image_base64)
-
-                    # Keep original path info and add VLM marker
-                    result = f"Image Path: {image_path}\n[VLM_IMAGE_{images_processed}]"
-                    self.logger.debug(
-                        f"Successfully processed image {images_processed}: {image_path}"
+        vision_model = self.config.vision_model_name if self.backend == "api" else None
+        prepared_images = dict(
+            zip(
+                valid_paths,
+                await asyncio.gather(
+                    *(
+                        aprepare_image_for_vlm(image_path, vision_model)
+                        for image_path in valid_paths
                     )
-                    return result
-                else:
-                    self.logger.error(f"Failed to encode image: {image_path}")
-                    return match.group(0)  # Keep original if encoding failed
+                ),
+            )
+        )
 
-            except Exception as e:
-                self.logger.error(f"Failed to process image {image_path}: {e}")
-                return match.group(0)  # Keep original
+        def replace_image_path(match):
+            nonlocal images_processed
+
+            image_path = match.group(1).strip()
+            self.logger.debug(f"Processing image path: '{image_path}'")
+
+            if image_path not in prepared_images:
+                return match.group(0)  # Keep original if validation failed
+
+            prepared = prepared_images[image_path]
+            if prepared is None:
+                self.logger.error(f"Failed to encode image: {image_path}")
+                return match.group(0)  # Keep original if encoding failed
+
+            images_processed += 1
+            # Save base64 and MIME type to instance variables for later use
+            self._current_images_base64.append(prepared.data_b64)
+            self._current_images_mime.append(prepared.mime_type)
+
+            # Keep original path info and add VLM marker
+            result = f"Image Path: {image_path}\n[VLM_IMAGE_{images_processed}]"
+            self.logger.debug(
+                f"Successfully processed image {images_processed}: {image_path}"
+            )
+            return result
 
         # Execute replacement
         enhanced_prompt = re.sub(
@@ -620,6 +731,7 @@ class QueryMixin:
             List[Dict]: VLM message format
         """
         images_base64 = getattr(self, "_current_images_base64", [])
+        images_mime = getattr(self, "_current_images_mime", [])
 
         if not images_base64:
             # Pure text mode
@@ -652,11 +764,16 @@ class QueryMixin:
 
                     # Insert corresponding image
                     if 0 <= image_num < len(images_base64):
+                        mime_type = (
+                            images_mime[image_num]
+                            if image_num < len(images_mime)
+                            else "image/jpeg"
+                        )
                         content_parts.append(
                             {
                                 "type": "image_url",
                                 "image_url": {
-                                    "url": f"data:image/jpeg;base64,{images_base64[image_num]}"
+                                    "url": f"data:{mime_type};base64,{images_base64[image_num]}"
                                 },
                             }
                         )
@@ -690,16 +807,22 @@ class QueryMixin:
             },
         ]
 
-    async def _call_vlm_with_multimodal_content(self, messages: List[Dict]) -> str:
+    async def _call_vlm_with_multimodal_content(
+        self, messages: List[Dict], stream: bool = False
+    ) -> str | AsyncIterator[str]:
         """
         Call VLM to process multimodal content
 
         Args:
             messages: VLM message format
+            stream: Request a token stream from the VLM (only passed when True,
+                so vision functions without streaming support keep working)
 
         Returns:
-            str: VLM response result
+            str | AsyncIterator[str]: VLM response result, or a token iterator
+                when streaming is supported by vision_model_func
         """
+        stream_kwargs = {"stream": True} if stream else {}
         try:
             user_message = messages[1]
             content = user_message["content"]
@@ -708,13 +831,14 @@ class QueryMixin:
             if isinstance(content, str):
                 # Pure text mode
                 result = await self.vision_model_func(
-                    content, system_prompt=system_prompt
+                    content, system_prompt=system_prompt, **stream_kwargs
                 )
             else:
                 # Multimodal mode - pass complete messages directly to VLM
                 result = await self.vision_model_func(
                     "",  # Empty prompt since we're using messages format
                     messages=messages,
+                    **stream_kwargs,
                 )
 
             return result
@@ -33,7 +33,28 @@ from raganything.query import QueryMixin
 from raganything.processor import ProcessorMixin
 from raganything.batch import BatchMixin
 from raganything.utils import get_processor_supports
-from raganything.parser import MineruParser, DoclingParser
+from raganything.parser import MineruParser
+from raganything.image_prep import configure_image_preparer
+from raganything.embedding_quant import (
+    EmbeddingFormat,
+    FullPrecisionReranker,
+    resolve_embedding_format,
+    wrap_embedding_func_with_truncation,
+)
+from raganything.embedding_cache import (
+    create_embedding_cache,
+    wrap_embedding_func_with_cache,
+)
+from raganything.shared_quota import (
+    configure_shared_quota,
+    default_quota_limit,
+    wrap_func_with_quota,
+)
+from raganything.cassette import (
+    create_cassette,
+    wrap_embedding_func_with_cassette,
+    wrap_model_func_with_cassette,
+)
 
 # Import specialized processors
 from raganything.modalprocessors import (
@@ -101,6 +122,27 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
     _parser_installation_checked: bool = field(default=False, init=False)
     """Flag to track if parser installation has been checked."""
 
+    _http_pool: Optional[Any] = field(default=None, init=False)
+    """Shared HTTP client pool used by the 'api' backend, released on finalize."""
+
+    _embedding_cache: Optional[Any] = field(default=None, init=False)
+    """Persistent embedding cache wrapped around embedding_func."""
+
+    _rerank_embedding_cache: Optional[Any] = field(default=None, init=False)
+    """float32 embedding cache of the full-precision re-ranker, when the main cache is lossy."""
+
+    _uncached_embedding_func: Optional[Callable] = field(default=None, init=False)
+    """embedding_func before the embedding cache wrapper."""
+
+    _embedding_format: Optional[EmbeddingFormat] = field(default=None, init=False)
+    """Storage format (dimension, dtype) of the vectors in the working directory."""
+
+    _api_embedding_dimensions: Optional[int] = field(default=None, init=False)
+    """Shortened output dimension requested from the embedding API, if any."""
+
+    _cassette: Optional[Any] = field(default=None, init=False)
+    """Record/replay store wrapped around the model functions."""
+
     def __post_init__(self):
         """Post-initialization setup with optional API backend"""
         # Initialize configuration if not provided
@@ -110,6 +152,13 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
         # Set up logger early
         self.logger = logger
 
+        # Model functions supplied by the user (the API clients apply the shared quota themselves)
+        user_model_funcs = {
+            "chat": self.llm_model_func is not None,
+            "vision": self.vision_model_func is not None,
+            "embedding": self.embedding_func is not None,
+        }
+
         # --- API Backend Configuration ---
         if self.backend == "api":
             self.logger.info("Backend is set to 'api'. Configuring API-based models.")
@@ -117,18 +166,38 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
             if not self.config.api_key:
                 raise ValueError("API_KEY must be set in environment variables or config for 'api' backend.")
 
-            from raganything.api_clients import get_llm_answer_from_api, get_vision_answer_from_api
-            from raganything.embedders import APIEmbedder
+            from functools import partial
+            from lightrag.utils import EmbeddingFunc
+            from raganything.api_clients import (
+                embed_texts_with_api,
+                get_chat_completion_from_api,
+                get_vision_answer_from_api,
+            )
+            from raganything.http_pool import configure_http_pool
+
+            # Share keep-alive connections across all API calls of this process
+            self._http_pool = configure_http_pool(self.config).acquire()
             
             # If user hasn't provided their own function, use the default API one.
             # This allows mixing and matching, e.g., API for LLM, local for embedding.
             if self.embedding_func is None:
-                api_embedder = APIEmbedder()
-                self.embedding_func = api_embedder.embed
+                self._api_embedding_dimensions = (
+                    self._resolve_api_embedding_dimensions()
+                )
+                # LightRAG expects an EmbeddingFunc returning a numpy array
+                self.embedding_func = EmbeddingFunc(
+                    embedding_dim=self._api_embedding_dimensions
+                    or self.config.embedding_dimension,
+                    func=partial(
+                        embed_texts_with_api, dimensions=self._api_embedding_dimensions
+                    ),
+                    model_name=self.config.embedding_model_name,
+                )
                 self.logger.info("Using API-based function for embeddings.")
             
             if self.llm_model_func is None:
-                self.llm_model_func = get_llm_answer_from_api
+                # LightRAG calls llm_model_func(prompt, system_prompt=..., history_messages=...)
+                self.llm_model_func = get_chat_completion_from_api
                 self.logger.info("Using API-based function for LLM.")
             
             if self.vision_model_func is None:
@@ -136,13 +205,32 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
                 self.logger.info("Using API-based function for Vision.")
         # --- End of API Backend Configuration ---
 
+        # Wait for room in the quota shared with co-located processes
+        self._setup_shared_quota(user_model_funcs)
+
+        # Record or replay model calls (cache hits are not recorded, replays use no quota)
+        self._setup_cassette()
+
+        # Serve repeated texts from the persistent embedding cache
+        if self.embedding_func is not None:
+            if self._embedding_format is None:
+                self._embedding_format = resolve_embedding_format(
+                    self.config.working_dir,
+                    self._requested_embedding_format(*self._describe_embedding_model()),
+                )
+            self._setup_embedding_cache()
+
+            # Reduced-dimension storage and full-precision re-ranking
+            self._setup_embedding_storage()
+
+        # Share one prepared-image cache between ingest and query
+        configure_image_preparer(self.config)
+
         # Set working directory
         self.working_dir = self.config.working_dir
 
         # Set up document parser
-        self.doc_parser = (
-            DoclingParser() if self.config.parser == "docling" else MineruParser()
-        )
+        self.doc_parser = self._create_doc_parser()
 
         # Register close method for cleanup
         atexit.register(self.close)
@@ -165,6 +253,158 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
         )
         self.logger.info(f"  Max concurrent files: {self.config.max_concurrent_files}")
 
+    def _setup_shared_quota(self, user_model_funcs: Dict[str, bool]):
+        """Wrap user-supplied model functions with the cross-process quota"""
+        quota = configure_shared_quota(self.config)
+        if quota is None:
+            return
+        if user_model_funcs["chat"]:
+            self.llm_model_func = wrap_func_with_quota(
+                self.llm_model_func,
+                quota,
+                self.config.chat_model_name,
+                default_quota_limit(self.config, "chat"),
+            )
+        if user_model_funcs["vision"] and self.vision_model_func is not None:
+            self.vision_model_func = wrap_func_with_quota(
+                self.vision_model_func,
+                quota,
+                self.config.vision_model_name,
+                default_quota_limit(self.config, "vision"),
+            )
+        if user_model_funcs["embedding"]:
+            self.embedding_func = wrap_func_with_quota(
+                self.embedding_func,
+                quota,
+                getattr(self.embedding_func, "model_name", None)
+                or self.config.embedding_model_name,
+                default_quota_limit(self.config, "embedding"),
+                embedding=True,
+            )
+
+    def _setup_cassette(self):
+        """Wrap the model functions with the record/replay cassette"""
+        self._cassette = create_cassette(self.config)
+        if self._cassette is None:
+            return
+        if self.llm_model_func is not None:
+            self.llm_model_func = wrap_model_func_with_cassette(
+                self.llm_model_func, self._cassette, "llm"
+            )
+        if self.vision_model_func is not None:
+            self.vision_model_func = wrap_model_func_with_cassette(
+                self.vision_model_func, self._cassette, "vision"
+            )
+        if self.embedding_func is not None:
+            self.embedding_func = wrap_embedding_func_with_cassette(
+                self.embedding_func, self._cassette
+            )
+
+    def _setup_embedding_cache(self):
+        """Wrap embedding_func with the content-addressed embedding cache"""
+        model_name, dimension = self._describe_embedding_model()
+        if self.config.embedding_cache_model_name:
+            model_name = self.config.embedding_cache_model_name
+
+        self._uncached_embedding_func = self.embedding_func
+        self._embedding_cache = create_embedding_cache(
+            self.config, model_name, dimension
+        )
+        if self._embedding_cache is not None:
+            self.embedding_func = wrap_embedding_func_with_cache(
+                self.embedding_func, self._embedding_cache
+            )
+            self.logger.info(
+                f"Embedding cache enabled: {self._embedding_cache.db_path} "
+                f"(model: {model_name}, dimension: {dimension})"
+            )
+
+    def _describe_embedding_model(self) -> tuple[str, int]:
+        """Model name and full output dimension of the configured embeddings"""
+        if hasattr(self.embedding_func, "embedding_dim"):
+            inner = getattr(self.embedding_func, "func", None)
+            model_name = getattr(self.embedding_func, "model_name", None) or getattr(
+                inner, "__qualname__", "embedding_func"
+            )
+            return model_name, self.embedding_func.embedding_dim
+        if self.backend == "api":
+            return (
+                self.config.embedding_model_name,
+                self._api_embedding_dimensions or self.config.embedding_dimension,
+            )
+        model_name = getattr(self.embedding_func, "__qualname__", "embedding_func")
+        return model_name, self.config.embedding_dimension
+
+    def _requested_embedding_format(
+        self, model_name: str, full_dimension: int
+    ) -> EmbeddingFormat:
+        """Embedding storage format requested by the config"""
+        dimension = self.config.embedding_storage_dimension
+        if not dimension or dimension >= full_dimension:
+            dimension = full_dimension
+        truncation = self.config.embedding_truncation_mode
+        if truncation == "api" and self.config.enable_embedding_rerank:
+            # Re-ranking needs full-dimension vectors, which local truncation keeps
+            self.logger.info(
+                "Full-precision re-rank enabled: truncating embeddings locally"
+            )
+            truncation = "local"
+        return EmbeddingFormat(
+            model_name=model_name,
+            full_dimension=full_dimension,
+            dimension=dimension,
+            dtype=self.config.embedding_storage_dtype,
+            truncation=truncation if dimension < full_dimension else "none",
+        )
+
+    def _resolve_api_embedding_dimensions(self) -> Optional[int]:
+        """Output dimension to request from the embedding API ('api' truncation)"""
+        self._embedding_format = resolve_embedding_format(
+            self.config.working_dir,
+            self._requested_embedding_format(
+                self.config.embedding_model_name, self.config.embedding_dimension
+            ),
+        )
+        if self._embedding_format.truncation == "api":
+            return self._embedding_format.dimension
+        return None
+
+    def _setup_embedding_storage(self):
+        """Truncate stored vectors and register the full-precision re-ranker"""
+        full_precision_func = self.embedding_func
+        fmt = self._embedding_format
+        cache = self._embedding_cache
+        if (
+            self.config.enable_embedding_rerank
+            and cache is not None
+            and cache.dtype != "float32"
+        ):
+            # The main cache serves float16/int8-decoded vectors: re-rank with
+            # float32 ones, cached separately in the same database
+            self._rerank_embedding_cache = cache.with_dtype("float32")
+            full_precision_func = wrap_embedding_func_with_cache(
+                self._uncached_embedding_func, self._rerank_embedding_cache
+            )
+
+        if fmt.is_truncated and self._api_embedding_dimensions is None:
+            self.embedding_func = wrap_embedding_func_with_truncation(
+                self.embedding_func, fmt.dimension
+            )
+        if fmt.is_truncated:
+            self.logger.info(
+                f"Storing {fmt.dimension}-dim embeddings "
+                f"(full: {fmt.full_dimension}, truncation: {fmt.truncation})"
+            )
+
+        if (
+            self.config.enable_embedding_rerank
+            and "rerank_model_func" not in self.lightrag_kwargs
+        ):
+            self.lightrag_kwargs["rerank_model_func"] = FullPrecisionReranker(
+                full_precision_func
+            )
+            self.logger.info("Full-precision embedding re-rank enabled")
+
     def close(self):
         """Cleanup resources when object is destroyed"""
         try:
@@ -419,6 +659,12 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
                 tasks.append(self.lightrag.finalize_storages())
                 self.logger.debug("Scheduled LightRAG storages finalization")
 
+            # Release the shared API connection pool (closed when no users remain)
+            if self._http_pool is not None:
+                tasks.append(self._http_pool.release())
+                self._http_pool = None
+                self.logger.debug("Scheduled API connection pool release")
+
             # Run all finalization tasks concurrently
             if tasks:
                 await asyncio.gather(*tasks)
@@ -426,6 +672,17 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
             else:
                 self.logger.debug("No storages to finalize")
 
+            # Close the embedding cache after storages no longer need embeddings
+            if self._embedding_cache is not None:
+                self._embedding_cache.close()
+                self._embedding_cache = None
+            if self._rerank_embedding_cache is not None:
+                self._rerank_embedding_cache.close()
+                self._rerank_embedding_cache = None
+
+            if self._cassette is not None:
+                self._cassette.close()
+
         except Exception as e:
             self.logger.error(f"Error during storage finalization: {e}")
             raise
@@ -566,6 +823,40 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
             except Exception as e:
                 self.logger.error(f"Failed to update context configuration: {e}")
 
+    def get_embedding_cache_stats(self) -> Dict[str, Any]:
+        """Get hit/miss statistics of the embedding cache
+
+        Returns:
+            Dict[str, Any]: Cache statistics, empty if the cache is disabled
+        """
+        if self._embedding_cache is None:
+            return {}
+        return self._embedding_cache.get_stats()
+
+    def get_cassette_stats(self) -> Dict[str, Any]:
+        """Get record/replay statistics of the model cassette
+
+        Returns:
+            Dict[str, Any]: Cassette statistics, empty if the cassette is off
+        """
+        if self._cassette is None:
+            return {}
+        return self._cassette.get_stats()
+
+    def get_api_client_stats(self) -> Dict[str, Any]:
+        """Get runtime statistics of the 'api' backend clients
+
+        Returns:
+            Dict[str, Any]: Connection pool statistics (requests, connections
+            opened and reused, HTTP versions). Empty if the 'api' backend is not used.
+        """
+        if self.backend != "api":
+            return {}
+
+        from raganything.api_clients import get_api_client_stats
+
+        return get_api_client_stats()
+
     def get_processor_info(self) -> Dict[str, Any]:
         """Get processor information"""
         base_info = {
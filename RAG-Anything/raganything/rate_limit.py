@@ -0,0 +1,349 @@
+"""
+Adaptive rate limiting for the 'api' backend
+
+Each request kind (chat, vision, embedding) gets its own limiter made of:
+
+- two token buckets, one in requests/minute and one in tokens/minute, matching
+  the way providers express their quotas;
+- an additive-increase/multiplicative-decrease (AIMD) controller for the number
+  of in-flight requests, which backs off on 429s (and optionally on high latency)
+  and slowly probes for more concurrency while calls succeed;
+- retries with exponential backoff and jitter that honor ``Retry-After``.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+from lightrag.utils import logger
+
+# Status codes worth retrying: throttling and transient server errors
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 429, 500, 502, 503, 504})
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP date) into seconds"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at ``rate_per_minute``
+
+    Callers reserve capacity up front and sleep off any deficit, so concurrent
+    callers queue fairly without holding a lock across ``await``.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, amount: float) -> float:
+        """Take ``amount`` tokens and return how long the caller must wait"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= amount
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    async def acquire(self, amount: float = 1.0) -> float:
+        """Wait until ``amount`` tokens are available; returns the time waited"""
+        wait = self._reserve(amount)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def pause(self, seconds: float) -> None:
+        """Empty the bucket so that nothing is sent for ``seconds``"""
+        with self._lock:
+            self._tokens = min(self._tokens, -seconds * self.rate)
+            self._updated = time.monotonic()
+
+
+class AIMDConcurrencyController:
+    """Limit in-flight requests with an AIMD-adjusted concurrency limit
+
+    The limit grows by one after a full window of successful requests and is
+    multiplied by ``decrease_factor`` on throttling (at most once per cooldown,
+    so a burst of 429s from the same window only counts once).
+    """
+
+    def __init__(
+        self,
+        initial: int = 8,
+        minimum: int = 1,
+        maximum: int = 64,
+        decrease_factor: float = 0.5,
+        latency_target: float = 0.0,
+        cooldown: float = 1.0,
+    ):
+        """Initialize the controller
+
+        Args:
+            initial: Starting concurrency limit
+            minimum: Lower bound of the concurrency limit
+            maximum: Upper bound of the concurrency limit
+            decrease_factor: Multiplier applied to the limit on congestion
+            latency_target: Latency in seconds treated as congestion (0 disables)
+            cooldown: Minimum seconds between two decreases
+        """
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = float(min(self.maximum, max(self.minimum, initial)))
+        self.decrease_factor = min(max(decrease_factor, 0.1), 0.95)
+        self.latency_target = latency_target
+        self.cooldown = cooldown
+
+        self._in_flight = 0
+        self._waiters: List[asyncio.Future] = []
+        self._lock = threading.Lock()
+        self._last_decrease = 0.0
+
+        # Statistics
+        self.increases = 0
+        self.decreases = 0
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    async def acquire(self) -> None:
+        """Wait for a free concurrency slot"""
+        with self._lock:
+            if self._in_flight < int(self.limit) and not self._waiters:
+                self._in_flight += 1
+                return
+            future = asyncio.get_running_loop().create_future()
+            self._waiters.append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                if future in self._waiters:
+                    self._waiters.remove(future)
+                    granted = False
+                else:
+                    granted = future.done() and not future.cancelled()
+            if granted:
+                self.release()
+            raise
+
+    def release(self) -> None:
+        """Free a concurrency slot and hand it to the next waiter"""
+        with self._lock:
+            self._in_flight = max(0, self._in_flight - 1)
+            self._wake_waiters()
+
+    def _wake_waiters(self) -> None:
+        """Grant slots to waiters while below the limit (lock must be held)"""
+        while self._waiters and self._in_flight < int(self.limit):
+            future = self._waiters.pop(0)
+            self._in_flight += 1
+            future.get_loop().call_soon_threadsafe(self._grant, future)
+
+    def _grant(self, future: asyncio.Future) -> None:
+        if future.cancelled():
+            # The waiter gave up after the slot was handed over
+            self.release()
+        elif not future.done():
+            future.set_result(None)
+
+    def on_success(self, latency: float) -> None:
+        """Additive increase, or decrease when latency exceeds the target"""
+        if self.latency_target and latency > self.latency_target:
+            self.on_congestion()
+            return
+        with self._lock:
+            if self.limit < self.maximum:
+                previous = int(self.limit)
+                self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+                if int(self.limit) > previous:
+                    self.increases += 1
+                    self._wake_waiters()
+
+    def on_congestion(self) -> None:
+        """Multiplicative decrease, at most once per cooldown period"""
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_decrease < self.cooldown:
+                return
+            self._last_decrease = now
+            self.limit = max(self.minimum, self.limit * self.decrease_factor)
+            self.decreases += 1
+
+
+class RateLimiter:
+    """Request/token buckets, AIMD concurrency and retries for one request kind"""
+
+    def __init__(
+        self,
+        kind: str,
+        requests_per_minute: float = 0,
+        tokens_per_minute: float = 0,
+        max_retries: int = 5,
+        retry_base_delay: float = 1.0,
+        retry_max_delay: float = 60.0,
+        concurrency: Optional[AIMDConcurrencyController] = None,
+    ):
+        """Initialize the limiter
+
+        Args:
+            kind: Request kind, used in logs and statistics
+            requests_per_minute: Request quota (0 disables the request bucket)
+            tokens_per_minute: Token quota (0 disables the token bucket)
+            max_retries: Maximum number of retries per request
+            retry_base_delay: Base delay in seconds of the exponential backoff
+            retry_max_delay: Maximum backoff delay in seconds
+            concurrency: In-flight request controller (a default one if None)
+        """
+        self.kind = kind
+        self.request_bucket = (
+            TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        )
+        self.token_bucket = (
+            TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        )
+        self.max_retries = max(0, max_retries)
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.concurrency = concurrency or AIMDConcurrencyController()
+
+        # Statistics
+        self.requests = 0
+        self.retries = 0
+        self.throttled = 0
+        self.failures = 0
+        self.queue_wait = 0.0
+
+    def _backoff(self, attempt: int) -> float:
+        """Exponential backoff with full jitter"""
+        ceiling = min(self.retry_max_delay, self.retry_base_delay * (2**attempt))
+        return random.uniform(0, ceiling)
+
+    def _pause(self, seconds: float) -> None:
+        """Stop issuing requests of this kind for ``seconds``"""
+        for bucket in (self.request_bucket, self.token_bucket):
+            if bucket is not None:
+                bucket.pause(seconds)
+
+    async def _wait_for_capacity(self, tokens: int) -> None:
+        start = time.monotonic()
+        if self.request_bucket is not None:
+            await self.request_bucket.acquire(1)
+        if self.token_bucket is not None and tokens:
+            await self.token_bucket.acquire(tokens)
+        await self.concurrency.acquire()
+        self.queue_wait += time.monotonic() - start
+
+    async def execute(
+        self, send: Callable[[], Awaitable[httpx.Response]], tokens: int = 0
+    ) -> httpx.Response:
+        """Send a request within the limits, retrying throttled and transient failures
+
+        ``send`` must issue a fresh request on every call. The final response is
+        returned even if it is an error so that callers keep their own
+        ``raise_for_status()`` handling. For streamed responses the concurrency
+        slot covers the time until the response headers arrive.
+        """
+        attempt = 0
+        while True:
+            await self._wait_for_capacity(tokens)
+            self.requests += 1
+            start = time.monotonic()
+            try:
+                response = await send()
+            except httpx.TransportError as e:
+                self.concurrency.release()
+                self.concurrency.on_congestion()
+                if attempt >= self.max_retries:
+                    self.failures += 1
+                    raise
+                delay = self._backoff(attempt)
+                reason = f"{type(e).__name__}: {e}"
+            except BaseException:
+                # Cancelled, or failed before a response: no feedback, free the slot
+                self.concurrency.release()
+                raise
+            else:
+                latency = time.monotonic() - start
+                self.concurrency.release()
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    self.concurrency.on_success(latency)
+                    return response
+
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                if response.status_code == 429:
+                    self.throttled += 1
+                    self.concurrency.on_congestion()
+                    if retry_after:
+                        self._pause(retry_after)
+                if attempt >= self.max_retries:
+                    self.failures += 1
+                    return response
+                await response.aclose()
+                delay = (
+                    min(retry_after, self.retry_max_delay)
+                    if retry_after is not None
+                    else self._backoff(attempt)
+                )
+                reason = f"HTTP {response.status_code}"
+
+            attempt += 1
+            self.retries += 1
+            logger.warning(
+                f"{self.kind} API request failed ({reason}), "
+                f"retry {attempt}/{self.max_retries} in {delay:.2f}s"
+            )
+            await asyncio.sleep(delay)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get limiter statistics"""
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "throttled": self.throttled,
+            "failures": self.failures,
+            "queue_wait_seconds": round(self.queue_wait, 3),
+            "concurrency_limit": int(self.concurrency.limit),
+            "in_flight": self.concurrency.in_flight,
+            "concurrency_increases": self.concurrency.increases,
+            "concurrency_decreases": self.concurrency.decreases,
+        }
+
+
+def create_rate_limiter(config, kind: str) -> RateLimiter:
+    """Create the limiter for a request kind ('chat', 'vision' or 'embedding')"""
+    return RateLimiter(
+        kind,
+        requests_per_minute=getattr(config, f"api_{kind}_rpm"),
+        tokens_per_minute=getattr(config, f"api_{kind}_tpm"),
+        max_retries=config.api_max_retries,
+        retry_base_delay=config.api_retry_base_delay,
+        retry_max_delay=config.api_retry_max_delay,
+        concurrency=AIMDConcurrencyController(
+            initial=config.api_initial_concurrency,
+            minimum=config.api_min_concurrency,
+            maximum=config.api_max_concurrency,
+            latency_target=config.api_latency_target,
+        ),
+    )
@@ -0,0 +1,381 @@
+"""
+Cross-process request and token quota
+
+Rate limiters in ``raganything.rate_limit`` only see the calls of their own
+process. When several ingestion workers and a query server share one provider
+account, each of them would consume the full quota. The shared quota keeps a
+sliding one-minute ledger of requests and tokens per model in an SQLite
+database (WAL mode, ``BEGIN IMMEDIATE`` transactions), so every process on the
+host sees the same usage and waits for room before sending a request.
+
+Token counts are estimated before a call, including the ``max_tokens`` output
+allowance, and corrected afterwards with the provider's reported usage, or
+with the length of the returned text when no usage is reported.
+"""
+
+import asyncio
+import functools
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from lightrag.utils import EmbeddingFunc, logger
+
+from raganything.embedding_batcher import estimate_tokens
+
+# Rough token cost of one image input
+IMAGE_TOKEN_ESTIMATE = 765
+
+# Keyword arguments of model functions that carry no prompt text
+_NON_PROMPT_KWARGS = frozenset({"hashing_kv", "stream", "keyword_extraction"})
+
+
+@dataclass(frozen=True)
+class QuotaLimit:
+    """Requests and tokens per minute allowed for one model (0 = unlimited)"""
+
+    rpm: int = 0
+    tpm: int = 0
+
+    @property
+    def unlimited(self) -> bool:
+        return self.rpm <= 0 and self.tpm <= 0
+
+
+def parse_quota_limits(spec: str) -> Dict[str, QuotaLimit]:
+    """Parse per-model limits given as ``model=rpm:tpm,...``"""
+    limits = {}
+    for entry in spec.split(","):
+        entry = entry.strip()
+        if not entry or "=" not in entry:
+            continue
+        model, _, values = entry.partition("=")
+        rpm, _, tpm = values.partition(":")
+        try:
+            limits[model.strip()] = QuotaLimit(
+                rpm=int(rpm) if rpm else 0, tpm=int(tpm) if tpm else 0
+            )
+        except ValueError:
+            logger.warning(f"Ignoring invalid shared quota limit: {entry}")
+    return limits
+
+
+def estimate_call_tokens(args: tuple, kwargs: Dict[str, Any]) -> int:
+    """Estimate the input tokens of a model function call from its arguments"""
+
+    def count(value: Any, key: Optional[str] = None) -> int:
+        if key == "image_data" and value:
+            return IMAGE_TOKEN_ESTIMATE
+        if isinstance(value, str):
+            if value.startswith("data:image"):
+                return IMAGE_TOKEN_ESTIMATE
+            return estimate_tokens(value) if value else 0
+        if isinstance(value, dict):
+            if value.get("type") == "image_url":
+                return IMAGE_TOKEN_ESTIMATE
+            return sum(count(item, name) for name, item in value.items())
+        if isinstance(value, (list, tuple)):
+            return sum(count(item) for item in value)
+        return 0
+
+    return count(list(args)) + sum(
+        count(value, key)
+        for key, value in kwargs.items()
+        if key not in _NON_PROMPT_KWARGS
+    )
+
+
+def response_tokens(response: Any) -> Optional[int]:
+    """Total tokens reported by a model response, or None if it has no usage"""
+    usage = (
+        response.get("usage")
+        if isinstance(response, dict)
+        else getattr(response, "usage", None)
+    )
+    if isinstance(usage, dict):
+        total = usage.get("total_tokens")
+    else:
+        total = getattr(usage, "total_tokens", None)
+    return total if isinstance(total, int) and total > 0 else None
+
+
+class SharedQuota:
+    """SQLite sliding-window ledger of requests and tokens shared by all processes"""
+
+    def __init__(
+        self,
+        db_path: str,
+        limits: Optional[Dict[str, QuotaLimit]] = None,
+        window: float = 60.0,
+        max_poll: float = 1.0,
+    ):
+        """Initialize the ledger
+
+        Args:
+            db_path: SQLite database shared by the co-located processes
+            limits: Per-model limits overriding the limits passed to acquire()
+            window: Length of the sliding window in seconds
+            max_poll: Longest sleep between two checks while waiting for room
+        """
+        self.db_path = db_path
+        self.limits = limits or {}
+        self.window = window
+        self.max_poll = max_poll
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(
+            db_path, timeout=30.0, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS quota_usage ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "model TEXT NOT NULL, ts REAL NOT NULL, tokens INTEGER NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS quota_usage_model_ts ON quota_usage (model, ts)"
+        )
+
+        # Statistics
+        self.acquired = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+
+    def limit_for(self, model: str, default: QuotaLimit) -> QuotaLimit:
+        return self.limits.get(model, default)
+
+    def _try_acquire(
+        self, model: str, tokens: int, limit: QuotaLimit
+    ) -> Tuple[Optional[int], float]:
+        """Record the call if it fits; otherwise return how long to wait"""
+        if limit.tpm > 0:
+            # A single call larger than the whole quota only needs an empty window
+            tokens_to_fit = min(tokens, limit.tpm)
+        else:
+            tokens_to_fit = 0
+        with self._lock:
+            now = time.time()
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "DELETE FROM quota_usage WHERE ts < ?", (now - self.window,)
+                )
+                used_requests, used_tokens = self._conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(tokens), 0) FROM quota_usage "
+                    "WHERE model = ?",
+                    (model,),
+                ).fetchone()
+                excess_requests = used_requests + 1 - limit.rpm if limit.rpm > 0 else 0
+                excess_tokens = (
+                    used_tokens + tokens_to_fit - limit.tpm if limit.tpm > 0 else 0
+                )
+                if excess_requests <= 0 and excess_tokens <= 0:
+                    cursor = self._conn.execute(
+                        "INSERT INTO quota_usage (model, ts, tokens) VALUES (?, ?, ?)",
+                        (model, now, tokens),
+                    )
+                    self._conn.execute("COMMIT")
+                    return cursor.lastrowid, 0.0
+
+                # Wait until enough of the oldest calls leave the window
+                wait = self.window
+                freed_requests = freed_tokens = 0
+                for ts, row_tokens in self._conn.execute(
+                    "SELECT ts, tokens FROM quota_usage WHERE model = ? ORDER BY ts",
+                    (model,),
+                ):
+                    freed_requests += 1
+                    freed_tokens += row_tokens
+                    if (
+                        freed_requests >= excess_requests
+                        and freed_tokens >= excess_tokens
+                    ):
+                        wait = ts + self.window - now
+                        break
+                self._conn.execute("COMMIT")
+                return None, max(wait, 0.01)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    async def acquire(
+        self, model: str, tokens: int = 0, default: Optional[QuotaLimit] = None
+    ) -> Optional[int]:
+        """Wait until one request of ``tokens`` fits the quota of ``model``
+
+        Returns the ledger entry of the call (for settle()), or None when the
+        model has no limit.
+        """
+        limit = self.limit_for(model, default or QuotaLimit())
+        if limit.unlimited:
+            return None
+        start = time.monotonic()
+        waited = False
+        while True:
+            row_id, wait = await asyncio.to_thread(
+                self._try_acquire, model, tokens, limit
+            )
+            if row_id is not None:
+                self.acquired += 1
+                if waited:
+                    self.waits += 1
+                    self.wait_seconds += time.monotonic() - start
+                return row_id
+            waited = True
+            # Jitter keeps waiting processes from polling in lockstep
+            await asyncio.sleep(min(wait, self.max_poll) * random.uniform(1.0, 1.2))
+
+    def settle(self, row_id: Optional[int], tokens: int) -> None:
+        """Replace the estimated tokens of a call with the reported usage"""
+        if row_id is None:
+            return
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "UPDATE quota_usage SET tokens = ? WHERE id = ?", (tokens, row_id)
+                )
+            except sqlite3.Error as e:
+                logger.debug(f"Could not settle shared quota entry {row_id}: {e}")
+
+    def get_usage(self, model: str) -> Dict[str, int]:
+        """Requests and tokens of ``model`` in the current window, across processes"""
+        with self._lock:
+            requests, tokens = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(tokens), 0) FROM quota_usage "
+                "WHERE model = ? AND ts >= ?",
+                (model, time.time() - self.window),
+            ).fetchone()
+        return {"requests": requests, "tokens": tokens}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get waiting statistics of this process"""
+        return {
+            "db_path": self.db_path,
+            "acquired": self.acquired,
+            "waits": self.waits,
+            "wait_seconds": round(self.wait_seconds, 3),
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            try:
+                self._conn.close()
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to close shared quota ledger: {e}")
+
+    def __deepcopy__(self, memo) -> "SharedQuota":
+        # LightRAG deep-copies its config; the ledger connection is shared
+        return self
+
+
+class QuotaModelFunc:
+    """Model function wrapper that waits for room in the shared quota"""
+
+    def __init__(
+        self,
+        func: Callable,
+        quota: SharedQuota,
+        model: str,
+        default: QuotaLimit,
+        embedding: bool = False,
+    ):
+        self.func = func
+        self.quota = quota
+        self.model = model
+        self.default = default
+        self.embedding = embedding
+        functools.update_wrapper(self, func, updated=())
+
+    async def __call__(self, *args, **kwargs):
+        if self.embedding and args:
+            texts = [args[0]] if isinstance(args[0], str) else args[0]
+            tokens = sum(estimate_tokens(text) for text in texts)
+        else:
+            # Like API requests, reserve the output allowance up front
+            tokens = estimate_call_tokens(args, kwargs)
+            max_tokens = kwargs.get("max_tokens")
+            if isinstance(max_tokens, int):
+                tokens += max_tokens
+        row_id = await self.quota.acquire(self.model, tokens, self.default)
+        result = await self.func(*args, **kwargs)
+        if row_id is not None and not self.embedding:
+            used = response_tokens(result)
+            if used is None and isinstance(result, str):
+                used = estimate_call_tokens(args, kwargs) + estimate_tokens(result)
+            if used:
+                self.quota.settle(row_id, used)
+        return result
+
+
+def wrap_func_with_quota(
+    func: Callable,
+    quota: SharedQuota,
+    model: str,
+    default: QuotaLimit,
+    embedding: bool = False,
+) -> Callable:
+    """Wrap a model function with the shared quota, preserving EmbeddingFunc attributes"""
+    wrapped = QuotaModelFunc(func, quota, model, default, embedding=embedding)
+    if isinstance(func, EmbeddingFunc):
+        return replace(func, func=wrapped, send_dimensions=False)
+    return wrapped
+
+
+def default_quota_limit(config, kind: str) -> QuotaLimit:
+    """Limits of a request kind from the per-process rate limit settings"""
+    return QuotaLimit(
+        rpm=int(getattr(config, f"api_{kind}_rpm")),
+        tpm=int(getattr(config, f"api_{kind}_tpm")),
+    )
+
+
+_quota: Optional[SharedQuota] = None
+_quota_configured = False
+_quota_lock = threading.Lock()
+
+
+def configure_shared_quota(config) -> Optional[SharedQuota]:
+    """Create (or return) the process-wide ledger from a RAGAnythingConfig
+
+    Returns None when the shared quota is disabled. The first configuration wins.
+    """
+    global _quota, _quota_configured
+    with _quota_lock:
+        if not _quota_configured:
+            _quota_configured = True
+            if config.enable_shared_quota:
+                db_path = config.shared_quota_path or os.path.join(
+                    tempfile.gettempdir(), "raganything_quota.sqlite"
+                )
+                try:
+                    _quota = SharedQuota(
+                        db_path, limits=parse_quota_limits(config.shared_quota_limits)
+                    )
+                    logger.info(f"Shared request/token quota ledger: {db_path}")
+                except (sqlite3.Error, OSError) as e:
+                    logger.warning(
+                        f"Shared quota disabled, failed to open {db_path}: {e}"
+                    )
+        return _quota
+
+
+def get_shared_quota() -> Optional[SharedQuota]:
+    """Get the process-wide ledger, configuring it from the default config if needed"""
+    if not _quota_configured:
+        from raganything.config import RAGAnythingConfig
+
+        return configure_shared_quota(RAGAnythingConfig())
+    return _quota
+
+
+def get_existing_shared_quota() -> Optional[SharedQuota]:
+    """Get the process-wide ledger if it has been configured, without opening it"""
+    return _quota
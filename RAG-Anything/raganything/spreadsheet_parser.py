@@ -0,0 +1,322 @@
+"""
+Native parsing of spreadsheets (.xlsx, .xls)
+
+Spreadsheets are tables already; rendering them to PDF splits wide sheets
+across pages before OCR reads them back. Each visible sheet is streamed row by
+row instead and emitted as ``table`` items with a compact pipe-table
+``table_body``. Large sheets are cut into blocks of rows, each repeating the
+header row, so memory stays bounded and every block stands on its own.
+
+.xlsx files are read with the standard library (rows are dropped once read);
+.xls files need the optional ``xlrd`` package and otherwise keep the
+LibreOffice route.
+"""
+
+import importlib.util
+import logging
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from raganything.ooxml_parser import OOXMLPackage
+
+logger = logging.getLogger(__name__)
+
+XLRD_AVAILABLE = importlib.util.find_spec("xlrd") is not None
+
+SPREADSHEET_FORMATS = {".xlsx", ".xls"}
+
+DEFAULT_ROWS_PER_BLOCK = 100
+
+_S = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_R = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+
+# Built-in number formats that display dates or times
+_BUILTIN_DATE_FORMATS = set(range(14, 23)) | set(range(27, 37)) | {45, 46, 47}
+_BUILTIN_DATE_FORMATS |= set(range(50, 59))
+_FORMAT_NOISE = re.compile(r'"[^"]*"|\[[^\]]*\]|\\.')
+
+Row = Tuple[int, List[str]]
+
+
+class UnsupportedSpreadsheetError(Exception):
+    """Raised when a spreadsheet cannot be parsed natively"""
+
+
+def supports_natively(file_path: Union[str, Path]) -> bool:
+    """Whether a spreadsheet can be read without LibreOffice"""
+    ext = Path(file_path).suffix.lower()
+    return ext == ".xlsx" or (ext == ".xls" and XLRD_AVAILABLE)
+
+
+def _format_number(value: float) -> str:
+    if value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return f"{value:.15g}"
+
+
+def _format_serial_date(serial: float, epoch: datetime) -> str:
+    moment = epoch + timedelta(days=serial)
+    if serial < 1:
+        return moment.time().replace(microsecond=0).isoformat()
+    if serial.is_integer():
+        return moment.date().isoformat()
+    return moment.replace(microsecond=0).isoformat(sep=" ")
+
+
+def _column_index(ref: str) -> int:
+    """Zero-based column of a cell reference such as 'AB12'"""
+    index = 0
+    for char in ref:
+        if "A" <= char <= "Z":
+            index = index * 26 + ord(char) - 64
+        else:
+            break
+    return index - 1
+
+
+class _TableBlocks:
+    """Turn the rows of each sheet into table items of bounded size"""
+
+    def __init__(self, rows_per_block: int):
+        self.rows_per_block = max(1, rows_per_block)
+        self.content_list: List[Dict[str, Any]] = []
+
+    def add_sheet(self, name: str, rows: Iterable[Row]) -> None:
+        header: Optional[List[str]] = None
+        block: List[Row] = []
+        emitted = False
+        for row_number, cells in rows:
+            while cells and not cells[-1]:
+                cells.pop()
+            if not cells:
+                continue
+            if header is None:
+                header = cells
+                continue
+            block.append((row_number, cells))
+            if len(block) >= self.rows_per_block:
+                self._emit(name, header, block)
+                block = []
+                emitted = True
+        if header is not None and (block or not emitted):
+            self._emit(name, header, block)
+
+    def _emit(self, name: str, header: List[str], block: List[Row]) -> None:
+        rows = [header] + [cells for _, cells in block]
+        width = max(len(cells) for cells in rows)
+        lead = min(
+            next((i for i, value in enumerate(cells) if value), width) for cells in rows
+        )
+
+        def line(cells: List[str]) -> str:
+            values = cells[lead:] + [""] * (width - len(cells))
+            return "| " + " | ".join(values) + " |"
+
+        table_body = "\n".join(
+            [line(header), "|" + "---|" * (width - lead)]
+            + [line(cells) for cells in rows[1:]]
+        )
+        caption = f"Sheet {name}"
+        if block:
+            caption += f", rows {block[0][0]}-{block[-1][0]}"
+        self.content_list.append(
+            {
+                "type": "table",
+                "table_body": table_body,
+                "table_caption": [caption],
+                "table_footnote": [],
+                "page_idx": len(self.content_list),
+            }
+        )
+
+
+def _cell_text(value: str) -> str:
+    return value.strip().replace("|", "\\|").replace("\n", " ")
+
+
+class _XlsxReader:
+    """Stream the visible worksheets of an .xlsx package"""
+
+    def __init__(self, package: OOXMLPackage):
+        self.package = package
+        workbook = package.xml("xl/workbook.xml")
+        properties = workbook.find(f"{_S}workbookPr")
+        self.epoch = (
+            datetime(1904, 1, 1)
+            if properties is not None and properties.get("date1904") in ("1", "true")
+            else datetime(1899, 12, 30)
+        )
+        rels = package.rels("xl/workbook.xml")
+        self.sheets: List[Tuple[str, str]] = []
+        for sheet in workbook.iter(f"{_S}sheet"):
+            rel = rels.get(sheet.get(f"{_R}id"))
+            if rel is None or rel[1] or sheet.get("state") in ("hidden", "veryHidden"):
+                continue
+            self.sheets.append((sheet.get("name", ""), rel[0]))
+        self.shared_strings = self._read_shared_strings()
+        self.date_styles = self._read_date_styles()
+
+    def _read_shared_strings(self) -> List[str]:
+        strings: List[str] = []
+        try:
+            source = self.package.zf.open("xl/sharedStrings.xml")
+        except KeyError:
+            return strings
+        with source:
+            for _, element in ET.iterparse(source):
+                if element.tag == f"{_S}si":
+                    # Phonetic runs (rPh) are not part of the value
+                    strings.append(
+                        "".join(
+                            text.text or "" for text in element.iterfind(f"./{_S}t")
+                        )
+                        + "".join(
+                            text.text or ""
+                            for text in element.iterfind(f"./{_S}r/{_S}t")
+                        )
+                    )
+                    element.clear()
+        return strings
+
+    def _read_date_styles(self) -> Set[int]:
+        """Indices of cell formats that display dates"""
+        try:
+            styles = self.package.xml("xl/styles.xml")
+        except KeyError:
+            return set()
+        date_formats = set(_BUILTIN_DATE_FORMATS)
+        for number_format in styles.iter(f"{_S}numFmt"):
+            code = _FORMAT_NOISE.sub("", number_format.get("formatCode", "")).lower()
+            if any(char in code for char in "dmyhs"):
+                date_formats.add(int(number_format.get("numFmtId", "0")))
+        cell_formats = styles.find(f"{_S}cellXfs")
+        if cell_formats is None:
+            return set()
+        return {
+            index
+            for index, xf in enumerate(cell_formats.findall(f"{_S}xf"))
+            if int(xf.get("numFmtId", "0")) in date_formats
+        }
+
+    def _value(self, cell: ET.Element) -> str:
+        kind = cell.get("t", "n")
+        if kind == "inlineStr":
+            return _cell_text("".join(text.text or "" for text in cell.iter(f"{_S}t")))
+        value = cell.find(f"{_S}v")
+        if value is None or value.text is None:
+            return ""
+        raw = value.text
+        if kind == "s":
+            return _cell_text(self.shared_strings[int(raw)])
+        if kind == "b":
+            return "TRUE" if raw == "1" else "FALSE"
+        if kind == "n":
+            number = float(raw)
+            if int(cell.get("s", "0")) in self.date_styles:
+                return _format_serial_date(number, self.epoch)
+            return _format_number(number)
+        return _cell_text(raw)
+
+    def rows(self, part: str) -> Iterator[Row]:
+        with self.package.zf.open(part) as source:
+            sheet_data = None
+            row_number = 0
+            for event, element in ET.iterparse(source, events=("start", "end")):
+                if event == "start":
+                    if element.tag == f"{_S}sheetData":
+                        sheet_data = element
+                    continue
+                if element.tag != f"{_S}row":
+                    continue
+                row_number = int(element.get("r") or row_number + 1)
+                cells: List[str] = []
+                for cell in element.iterfind(f"{_S}c"):
+                    ref = cell.get("r")
+                    column = _column_index(ref) if ref else len(cells)
+                    value = self._value(cell)
+                    if not value:
+                        continue
+                    if column >= len(cells):
+                        cells.extend([""] * (column - len(cells) + 1))
+                    cells[column] = value
+                yield row_number, cells
+                # Drop the row so memory does not grow with the sheet
+                element.clear()
+                if sheet_data is not None:
+                    sheet_data.remove(element)
+
+
+def _xls_sheets(path: Path) -> Iterator[Tuple[str, Iterator[Row]]]:
+    """Visible sheets of an .xls workbook, loaded one at a time"""
+    import xlrd
+
+    book = xlrd.open_workbook(str(path), on_demand=True)
+    epoch = datetime(1904, 1, 1) if book.datemode else datetime(1899, 12, 30)
+
+    def value(cell) -> str:
+        if cell.ctype == xlrd.XL_CELL_TEXT:
+            return _cell_text(cell.value)
+        if cell.ctype == xlrd.XL_CELL_NUMBER:
+            return _format_number(float(cell.value))
+        if cell.ctype == xlrd.XL_CELL_DATE:
+            return _format_serial_date(float(cell.value), epoch)
+        if cell.ctype == xlrd.XL_CELL_BOOLEAN:
+            return "TRUE" if cell.value else "FALSE"
+        if cell.ctype == xlrd.XL_CELL_ERROR:
+            return xlrd.error_text_from_code.get(cell.value, "#ERR")
+        return ""
+
+    try:
+        for index, name in enumerate(book.sheet_names()):
+            sheet = book.sheet_by_index(index)
+            if not sheet.visibility:
+                yield (
+                    name,
+                    (
+                        (row_index + 1, [value(cell) for cell in row])
+                        for row_index, row in enumerate(sheet.get_rows())
+                    ),
+                )
+            book.unload_sheet(index)
+    finally:
+        book.release_resources()
+
+
+def parse_spreadsheet_file(
+    file_path: Union[str, Path], rows_per_block: int = DEFAULT_ROWS_PER_BLOCK
+) -> List[Dict[str, Any]]:
+    """Parse the visible sheets of a workbook into ``table`` items
+
+    Args:
+        file_path: .xlsx or .xls file
+        rows_per_block: Data rows per table item; larger sheets are split
+
+    Raises:
+        UnsupportedSpreadsheetError: If the workbook cannot be read natively
+    """
+    file_path = Path(file_path)
+    if not supports_natively(file_path):
+        raise UnsupportedSpreadsheetError(f"unsupported format {file_path.suffix}")
+    blocks = _TableBlocks(rows_per_block)
+    try:
+        if file_path.suffix.lower() == ".xlsx":
+            with zipfile.ZipFile(file_path) as zf:
+                reader = _XlsxReader(OOXMLPackage(zf, file_path.parent))
+                for name, part in reader.sheets:
+                    blocks.add_sheet(name, reader.rows(part))
+        else:
+            for name, rows in _xls_sheets(file_path):
+                blocks.add_sheet(name, rows)
+    except UnsupportedSpreadsheetError:
+        raise
+    except Exception as e:
+        raise UnsupportedSpreadsheetError(f"unreadable workbook: {e}") from e
+
+    logger.info(
+        f"Parsed {file_path.name} natively: {len(blocks.content_list)} table blocks"
+    )
+    return blocks.content_list
@@ -0,0 +1,170 @@
+"""
+Native parsing of plain-text files
+
+Plain text already is the content MinerU would recover from a rendered PDF, so
+it is turned into ``content_list`` text blocks directly: one block per
+paragraph, with synthetic ``page_idx`` values from fixed-size character
+windows (a form feed also starts a new page). Files are read once and their
+encoding is detected from the bytes.
+"""
+
+import codecs
+import logging
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple, Union
+
+try:
+    from charset_normalizer import from_bytes
+
+    CHARSET_NORMALIZER_AVAILABLE = True
+except ImportError:
+    CHARSET_NORMALIZER_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Characters per synthetic page, roughly one printed page of text
+DEFAULT_PAGE_CHARS = 3000
+
+# Longer UTF-32 BOMs first: the UTF-32 LE BOM starts with the UTF-16 LE BOM
+_BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+# Tried in order when the bytes are not UTF-8 and detection is unavailable
+_FALLBACK_ENCODINGS = ("gbk", "cp1252")
+
+# Bytes given to the encoding detector
+_DETECTION_SAMPLE = 64 * 1024
+
+_PARAGRAPH_BREAK = re.compile(r"\n[ \t]*\n+")
+
+
+def decode_text(data: bytes) -> Tuple[str, str]:
+    """Decode file bytes, returning the text and the detected encoding"""
+    for bom, encoding in _BOMS:
+        if data.startswith(bom):
+            return data.decode(encoding), encoding
+    try:
+        return data.decode("utf-8"), "utf-8"
+    except UnicodeDecodeError:
+        pass
+
+    if CHARSET_NORMALIZER_AVAILABLE:
+        best = from_bytes(data[:_DETECTION_SAMPLE]).best()
+        if best is not None:
+            return data.decode(best.encoding, errors="replace"), best.encoding
+
+    for encoding in _FALLBACK_ENCODINGS:
+        try:
+            return data.decode(encoding), encoding
+        except UnicodeDecodeError:
+            continue
+    return data.decode("latin-1"), "latin-1"
+
+
+def read_text_file(text_path: Union[str, Path]) -> Tuple[str, str]:
+    """Read a text file with newlines normalized, returning the text and its encoding"""
+    text_path = Path(text_path)
+    text, encoding = decode_text(text_path.read_bytes())
+    if encoding not in ("utf-8", "utf-8-sig"):
+        logger.info(f"Read {text_path.name} with {encoding} encoding")
+    return text.replace("\r\n", "\n").replace("\r", "\n"), encoding
+
+
+class SyntheticPages:
+    """Assign page indices to blocks from fixed-size character windows"""
+
+    def __init__(self, page_chars: int = DEFAULT_PAGE_CHARS):
+        self.page_chars = max(1, page_chars)
+        self.page_idx = 0
+        self.used = 0
+
+    def place(self, size: int) -> int:
+        """Page index of the next block of ``size`` characters"""
+        if self.used and self.used + size > self.page_chars:
+            self.page_idx += 1
+            self.used = 0
+        self.used += size
+        return self.page_idx
+
+    def break_page(self) -> None:
+        """Start a new page unless the current one is empty"""
+        if self.used:
+            self.page_idx += 1
+            self.used = 0
+
+
+def split_long_paragraph(paragraph: str, limit: int) -> Iterator[str]:
+    """Split a paragraph longer than ``limit`` at line breaks, then at spaces"""
+    if len(paragraph) <= limit:
+        yield paragraph
+        return
+
+    current: List[str] = []
+    size = 0
+    for line in paragraph.split("\n"):
+        while len(line) > limit:
+            cut = line.rfind(" ", 0, limit)
+            cut = cut if cut > 0 else limit
+            if current:
+                yield "\n".join(current)
+                current, size = [], 0
+            yield line[:cut]
+            line = line[cut:].lstrip()
+        if current and size + len(line) + 1 > limit:
+            yield "\n".join(current)
+            current, size = [], 0
+        current.append(line)
+        size += len(line) + 1
+    if current:
+        yield "\n".join(current)
+
+
+def text_to_content_list(
+    text: str, page_chars: int = DEFAULT_PAGE_CHARS
+) -> List[Dict[str, Any]]:
+    """Split text into paragraph blocks with synthetic page indices
+
+    Args:
+        text: Text with ``\\n`` line endings
+        page_chars: Characters per synthetic page; paragraphs are also cut to
+            at most this size
+
+    Returns:
+        List of ``{"type": "text", "text": ..., "page_idx": ...}`` blocks
+    """
+    pages = SyntheticPages(page_chars)
+    content_list: List[Dict[str, Any]] = []
+    for page_text in text.split("\f"):
+        for paragraph in _PARAGRAPH_BREAK.split(page_text):
+            paragraph = paragraph.strip()
+            if not paragraph:
+                continue
+            for block in split_long_paragraph(paragraph, pages.page_chars):
+                content_list.append(
+                    {"type": "text", "text": block, "page_idx": pages.place(len(block))}
+                )
+        # A form feed starts a new page
+        pages.break_page()
+    return content_list
+
+
+def parse_text_file(
+    text_path: Union[str, Path], page_chars: int = DEFAULT_PAGE_CHARS
+) -> List[Dict[str, Any]]:
+    """Parse a plain-text file into ``content_list`` text blocks"""
+    text_path = Path(text_path)
+    if not text_path.exists():
+        raise FileNotFoundError(f"Text file does not exist: {text_path}")
+    text, _ = read_text_file(text_path)
+    content_list = text_to_content_list(text, page_chars)
+    logger.info(
+        f"Parsed {text_path.name} natively: {len(content_list)} text blocks "
+        f"on {content_list[-1]['page_idx'] + 1 if content_list else 0} pages"
+    )
+    return content_list
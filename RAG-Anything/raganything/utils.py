@@ -4,10 +4,10 @@ Utility functions for RAGAnything
 Contains helper functions for content separation, text insertion, and other utilities
 """
 
-import base64
 from typing import Dict, List, Any, Tuple
 from pathlib import Path
 from lightrag.utils import logger
+from raganything.image_prep import PreparedImage, get_image_preparer
 
 
 def separate_content(
@@ -60,6 +60,9 @@ def encode_image_to_base64(image_path: str) -> str:
     """
     Encode image file to base64 string
 
+    The image is downscaled and re-encoded for vision models (see
+    raganything.image_prep), so the result is JPEG unless configured otherwise.
+
     Args:
         image_path: Path to the image file
 
@@ -67,14 +70,32 @@ def encode_image_to_base64(image_path: str) -> str:
         str: Base64 encoded string, empty string if encoding fails
     """
     try:
-        with open(image_path, "rb") as image_file:
-            encoded_string = base64.b64encode(image_file.read()).decode("utf-8")
-        return encoded_string
+        return get_image_preparer().prepare(image_path).data_b64
     except Exception as e:
         logger.error(f"Failed to encode image {image_path}: {e}")
         return ""
 
 
+async def aprepare_image_for_vlm(
+    image_path: str, model: str | None = None
+) -> PreparedImage | None:
+    """
+    Prepare an image for a vision model in a worker thread
+
+    Args:
+        image_path: Path to the image file
+        model: Optional vision model name used to select size limits
+
+    Returns:
+        PreparedImage | None: Base64 payload and MIME type, None if preparation fails
+    """
+    try:
+        return await get_image_preparer().prepare_async(image_path, model)
+    except Exception as e:
+        logger.error(f"Failed to prepare image {image_path}: {e}")
+        return None
+
+
 def validate_image_file(image_path: str, max_size_mb: int = 50) -> bool:
     """
     Validate if a file is a valid image file
@@ -0,0 +1,268 @@
+#!/usr/bin/env python
+"""
+Throughput benchmark of the 'api' backend against the local mock server
+
+Starts raganything.mock_server in-process (or targets --base-url), drives
+RAGAnything(backend="api") through insert_content_list() and aquery(), and
+reports items/s, per-operation latency percentiles, request counts seen by the
+server and the client-side statistics (connection reuse, batching, retries,
+hedging, endpoints).
+
+Examples:
+    python scripts/benchmark_api_backend.py --documents 20 --queries 20
+    python scripts/benchmark_api_backend.py --latency lognormal:0.3:0.6 --rate-429 0.05
+    python scripts/benchmark_api_backend.py --base-url http://localhost:8765/v1
+
+Recorded model responses can be replayed offline (see CASSETTE_MODE):
+    CASSETTE_MODE=record CASSETTE_PATH=run.jsonl python scripts/benchmark_api_backend.py
+    CASSETTE_MODE=replay CASSETTE_PATH=run.jsonl CASSETTE_LATENCY_SCALE=0 \
+        python scripts/benchmark_api_backend.py --base-url http://127.0.0.1:1/v1
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root directory to Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+WORDS = (
+    "Alpha Beta Gamma Delta Orion Vega Lyra Cygnus Atlas Helios Nova Quasar "
+    "pipeline index retrieval graph entity vector latency model table figure "
+    "equation dataset result method analysis experiment baseline"
+).split()
+
+
+def percentiles(samples):
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+    return {
+        f"p{p}": round(ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))], 4)
+        for p in (50, 90, 99)
+    }
+
+
+def make_image(path: Path, rng: random.Random, size: int) -> str:
+    from PIL import Image
+
+    image = Image.new("RGB", (size, size), tuple(rng.randrange(256) for _ in range(3)))
+    image.save(path, format="PNG")
+    return str(path)
+
+
+def make_content_list(index: int, args, rng: random.Random, image_dir: Path):
+    content_list = []
+    for page in range(args.pages):
+        text = " ".join(rng.choice(WORDS) for _ in range(args.words))
+        content_list.append({"type": "text", "text": text, "page_idx": page})
+        for _ in range(args.tables):
+            content_list.append(
+                {
+                    "type": "table",
+                    "table_body": "| Metric | Value |\n|---|---|\n"
+                    f"| Accuracy | {rng.random():.3f} |",
+                    "table_caption": [f"Table {index}.{page}"],
+                    "page_idx": page,
+                }
+            )
+        for image_index in range(args.images):
+            image_path = make_image(
+                image_dir / f"doc{index}_p{page}_{image_index}.png",
+                rng,
+                args.image_size,
+            )
+            content_list.append(
+                {
+                    "type": "image",
+                    "img_path": image_path,
+                    "image_caption": [f"Figure {index}.{page}.{image_index}"],
+                    "page_idx": page,
+                }
+            )
+    return content_list
+
+
+async def timed(samples, coro):
+    start = time.perf_counter()
+    result = await coro
+    samples.append(time.perf_counter() - start)
+    return result
+
+
+async def fetch_server_stats(base_url: str):
+    import httpx
+
+    try:
+        async with httpx.AsyncClient() as client:
+            response = await client.get(f"{base_url}/stats")
+    except httpx.HTTPError:
+        # Offline replay or a server without the mock's /stats route
+        return {}
+    return response.json() if response.status_code == 200 else {}
+
+
+def free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def run(args, mock_config):
+    from raganything import RAGAnything, RAGAnythingConfig
+    from raganything.mock_server import MockOpenAIServer
+
+    server = None
+    base_url = args.base_url
+    if mock_config is not None:
+        server = await MockOpenAIServer(mock_config).start()
+
+    working_dir = tempfile.mkdtemp(prefix="raganything_bench_")
+    image_dir = Path(working_dir) / "images"
+    image_dir.mkdir()
+    rng = random.Random(args.seed)
+    documents = [
+        make_content_list(index, args, rng, image_dir)
+        for index in range(args.documents)
+    ]
+    queries = [
+        " ".join(rng.choice(WORDS) for _ in range(6)) + "?" for _ in range(args.queries)
+    ]
+
+    rag = RAGAnything(
+        config=RAGAnythingConfig(working_dir=working_dir),
+        backend="api",
+    )
+    # Content lists need no document parser, so skip the parser installation check
+    rag._parser_installation_checked = True
+
+    insert_latency, query_latency = [], []
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def insert(index, content_list):
+        async with semaphore:
+            await timed(
+                insert_latency,
+                rag.insert_content_list(
+                    content_list,
+                    file_path=f"bench_doc_{index}.json",
+                    doc_id=f"bench-doc-{index}",
+                    display_stats=False,
+                ),
+            )
+
+    async def query(text):
+        async with semaphore:
+            await timed(
+                query_latency, rag.aquery(text, mode=args.mode, vlm_enhanced=False)
+            )
+
+    start = time.perf_counter()
+    await asyncio.gather(*(insert(i, doc) for i, doc in enumerate(documents)))
+    insert_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    await asyncio.gather(*(query(text) for text in queries))
+    query_seconds = time.perf_counter() - start
+
+    items = sum(len(doc) for doc in documents)
+    report = {
+        "insert": {
+            "documents": len(documents),
+            "items": items,
+            "seconds": round(insert_seconds, 3),
+            "documents_per_second": round(len(documents) / insert_seconds, 3),
+            "items_per_second": round(items / insert_seconds, 3),
+            "latency": percentiles(insert_latency),
+        },
+        "query": {
+            "queries": len(queries),
+            "seconds": round(query_seconds, 3),
+            "queries_per_second": round(len(queries) / query_seconds, 3)
+            if queries
+            else 0.0,
+            "latency": percentiles(query_latency),
+        },
+        "server": await fetch_server_stats(base_url),
+        "client": rag.get_api_client_stats(),
+        "cassette": rag.get_cassette_stats(),
+    }
+
+    await rag.finalize_storages()
+    if server is not None:
+        await server.stop()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the RAG-Anything 'api' backend. Unknown options "
+        "are passed to the mock server (see python -m raganything.mock_server --help)."
+    )
+    parser.add_argument(
+        "--base-url",
+        default=None,
+        help="Use a running OpenAI-compatible server instead of the in-process mock",
+    )
+    parser.add_argument("--documents", type=int, default=10)
+    parser.add_argument("--pages", type=int, default=2)
+    parser.add_argument("--words", type=int, default=200, help="Words per page")
+    parser.add_argument("--tables", type=int, default=1, help="Tables per page")
+    parser.add_argument(
+        "--images", type=int, default=0, help="Images per page (needs Pillow)"
+    )
+    parser.add_argument("--image-size", type=int, default=1024)
+    parser.add_argument("--queries", type=int, default=10)
+    parser.add_argument("--mode", default="hybrid")
+    parser.add_argument(
+        "--concurrency", type=int, default=4, help="Concurrent documents/queries"
+    )
+    parser.add_argument("--embedding-dimension", type=int, default=1536)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="Write the report as JSON")
+    args, mock_argv = parser.parse_known_args()
+
+    if args.base_url is None:
+        port = free_port()
+        args.base_url = f"http://127.0.0.1:{port}/v1"
+        mock_argv += [
+            "--port",
+            str(port),
+            "--embedding-dimension",
+            str(args.embedding_dimension),
+            "--seed",
+            str(args.seed),
+        ]
+
+    # Config defaults are read from the environment when raganything is imported
+    os.environ.setdefault("API_KEY", "mock-key")
+    os.environ["CHAT_API_URL"] = f"{args.base_url}/chat/completions"
+    os.environ["VISION_API_URL"] = f"{args.base_url}/chat/completions"
+    os.environ["EMBEDDING_API_URL"] = f"{args.base_url}/embeddings"
+    os.environ["EMBEDDING_DIMENSION"] = str(args.embedding_dimension)
+
+    mock_config = None
+    if "--port" in mock_argv:
+        from raganything.mock_server import build_arg_parser, config_from_args
+
+        mock_config = config_from_args(build_arg_parser().parse_args(mock_argv))
+    elif mock_argv:
+        parser.error(f"unrecognized arguments: {' '.join(mock_argv)}")
+
+    report = asyncio.run(run(args, mock_config))
+    text = json.dumps(report, indent=2, default=str)
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -63,6 +63,7 @@ extras_require = {
     "image": ["Pillow>=10.0.0"],  # For image format conversion (BMP, TIFF, GIF, WebP)
     "text": ["reportlab>=4.0.0"],  # For text file to PDF conversion (TXT, MD)
     "office": [],  # Office document processing requires LibreOffice (external program)
+    "api": ["httpx[http2]"],  # Pooled HTTP/2 clients for the 'api' backend
     "all": ["Pillow>=10.0.0", "reportlab>=4.0.0"],  # All optional features
     "markdown": [
         "markdown>=3.4.0",
@@ -0,0 +1,30 @@
+from raganything import api_clients, http_pool
+
+
+def test_stats_do_not_create_an_embedding_coalescer(monkeypatch):
+    monkeypatch.setattr(api_clients, "_embedding_coalescers", {})
+    stats = api_clients.get_api_client_stats()
+    assert stats["embedding_batching"] == {}
+    assert api_clients._embedding_coalescers == {}
+
+
+def test_stats_report_the_coalescers_in_use(monkeypatch):
+    monkeypatch.setattr(api_clients, "_embedding_coalescers", {})
+    coalescer = api_clients.get_embedding_coalescer(1024)
+    stats = api_clients.get_api_client_stats()
+    assert stats["embedding_batching"] == coalescer.get_stats()
+    # No default-dimension coalescer was added alongside it
+    assert list(api_clients._embedding_coalescers) == [1024]
+
+    api_clients.get_embedding_coalescer()
+    stats = api_clients.get_api_client_stats()
+    assert set(stats["embedding_batching"]) == {"1024", "default"}
+
+
+def test_stats_do_not_create_the_http_pool(monkeypatch):
+    monkeypatch.setattr(http_pool, "_pool", None)
+    assert api_clients.get_api_client_stats()["connection_pool"] == {}
+    assert http_pool._pool is None
+
+    pool = http_pool.configure_http_pool(api_clients.config)
+    assert api_clients.get_api_client_stats()["connection_pool"] == pool.get_stats()
@@ -0,0 +1,136 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from raganything.cassette import (
+    Cassette,
+    CassetteMissError,
+    request_key,
+    wrap_embedding_func_with_cassette,
+    wrap_model_func_with_cassette,
+)
+
+
+class FakeModel:
+    """Model function counting its calls"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def complete(self, prompt, system_prompt=None, **kwargs):
+        self.calls.append(prompt)
+        return f"answer to {prompt}"
+
+    async def stream(self, prompt, **kwargs):
+        self.calls.append(prompt)
+
+        async def chunks():
+            for chunk in ("one ", "two ", "three"):
+                yield chunk
+
+        return chunks()
+
+    async def embed(self, texts):
+        self.calls.append(list(texts))
+        return np.array([[len(text), 1.0, 0.5] for text in texts], dtype=np.float32)
+
+
+def _cassette(tmp_path, mode: str) -> Cassette:
+    return Cassette(str(tmp_path / "calls.jsonl"), mode=mode, latency_scale=0)
+
+
+async def _collect(func, prompt):
+    return [chunk async for chunk in await func(prompt)]
+
+
+def test_request_keys_ignore_bookkeeping_kwargs():
+    key = request_key("llm", ("prompt",), {"system_prompt": "be brief"})
+    assert key == request_key(
+        "llm", ("prompt",), {"system_prompt": "be brief", "hashing_kv": object()}
+    )
+    assert key != request_key("llm", ("prompt",), {"system_prompt": "be long"})
+    assert key != request_key("vision", ("prompt",), {"system_prompt": "be brief"})
+
+
+def test_record_then_replay_completions(tmp_path):
+    model = FakeModel()
+    recording = _cassette(tmp_path, "record")
+    func = wrap_model_func_with_cassette(model.complete, recording, "llm")
+    assert asyncio.run(func("q1", system_prompt="s")) == "answer to q1"
+    recording.close()
+
+    model.calls.clear()
+    replaying = _cassette(tmp_path, "replay")
+    func = wrap_model_func_with_cassette(model.complete, replaying, "llm")
+    assert asyncio.run(func("q1", system_prompt="s")) == "answer to q1"
+    assert model.calls == []
+    assert replaying.get_stats()["hits"] == 1
+
+
+def test_replay_miss_raises(tmp_path):
+    _cassette(tmp_path, "record").close()
+    model = FakeModel()
+    func = wrap_model_func_with_cassette(
+        model.complete, _cassette(tmp_path, "replay"), "llm"
+    )
+    with pytest.raises(CassetteMissError):
+        asyncio.run(func("never recorded"))
+    assert model.calls == []
+
+
+def test_auto_mode_records_only_misses(tmp_path):
+    model = FakeModel()
+    recording = _cassette(tmp_path, "record")
+    asyncio.run(wrap_model_func_with_cassette(model.complete, recording, "llm")("a"))
+    recording.close()
+
+    model.calls.clear()
+    auto = _cassette(tmp_path, "auto")
+    func = wrap_model_func_with_cassette(model.complete, auto, "llm")
+    assert asyncio.run(func("a")) == "answer to a"
+    assert asyncio.run(func("b")) == "answer to b"
+    assert model.calls == ["b"]
+    auto.close()
+    assert len(_cassette(tmp_path, "replay")._entries) == 2
+
+
+def test_streams_are_recorded_as_chunks(tmp_path):
+    model = FakeModel()
+    recording = _cassette(tmp_path, "record")
+    func = wrap_model_func_with_cassette(model.stream, recording, "llm")
+    assert asyncio.run(_collect(func, "s")) == ["one ", "two ", "three"]
+    recording.close()
+
+    func = wrap_model_func_with_cassette(
+        model.stream, _cassette(tmp_path, "replay"), "llm"
+    )
+    assert asyncio.run(_collect(func, "s")) == ["one ", "two ", "three"]
+    assert model.calls == ["s"]
+
+
+def test_embeddings_replay_per_text_across_batches(tmp_path):
+    model = FakeModel()
+    recording = _cassette(tmp_path, "record")
+    func = wrap_embedding_func_with_cassette(model.embed, recording)
+    recorded = asyncio.run(func(["alpha", "be"]))
+    recording.close()
+
+    func = wrap_embedding_func_with_cassette(model.embed, _cassette(tmp_path, "replay"))
+    replayed = asyncio.run(func(["be", "alpha"]))
+    assert np.array_equal(replayed, recorded[::-1])
+    assert model.calls == [["alpha", "be"]]
+
+    with pytest.raises(CassetteMissError):
+        asyncio.run(func(["alpha", "gamma"]))
+
+
+def test_truncated_last_line_is_skipped(tmp_path):
+    model = FakeModel()
+    recording = _cassette(tmp_path, "record")
+    asyncio.run(wrap_model_func_with_cassette(model.complete, recording, "llm")("a"))
+    recording.close()
+    with open(tmp_path / "calls.jsonl", "a", encoding="utf-8") as f:
+        f.write('{"key": "interrupted", "kind"')
+
+    assert len(_cassette(tmp_path, "replay")._entries) == 1
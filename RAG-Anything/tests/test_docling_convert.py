@@ -0,0 +1,96 @@
+import base64
+from pathlib import Path
+
+from raganything.parser import DoclingParser
+
+PNG = b"\x89PNG\r\n\x1a\nfake image data"
+
+
+def _text(text: str, page_no=None, label: str = "text"):
+    block = {"label": label, "orig": text, "children": []}
+    if page_no is not None:
+        block["prov"] = [{"page_no": page_no, "bbox": {}}]
+    return block
+
+
+def _document():
+    """Docling JSON with a group, out-of-order collections and pictures"""
+    return {
+        "body": {
+            "children": [
+                {"$ref": "#/texts/2"},
+                {"$ref": "#/groups/0"},
+                {"$ref": "#/tables/0"},
+                {"$ref": "#/pictures/0"},
+                {"$ref": "#/pictures/1"},
+                {"$ref": "#/texts/404"},
+                {"$ref": "#/texts/2"},
+            ]
+        },
+        "groups": [
+            {
+                "self_ref": "#/groups/0",
+                "children": [{"$ref": "#/texts/0"}, {"$ref": "#/texts/1"}],
+            }
+        ],
+        "texts": [
+            _text("List item without provenance"),
+            _text("E = mc^2", page_no=3, label="formula"),
+            _text("Title on page one", page_no=1),
+        ],
+        "tables": [
+            {
+                "children": [],
+                "prov": [{"page_no": 4}],
+                "caption": "Results",
+                "data": {"num_rows": 1},
+            }
+        ],
+        "pictures": [
+            {
+                "children": [],
+                "caption": "Good figure",
+                "image": {
+                    "uri": "data:image/png;base64," + base64.b64encode(PNG).decode()
+                },
+            },
+            {
+                "children": [],
+                "prov": [{"page_no": 5}],
+                "caption": "Broken figure",
+                "image": {"uri": "data:image/png;base64,@@not base64@@"},
+            },
+        ],
+    }
+
+
+def test_reading_order_pages_and_references(tmp_path):
+    content_list = DoclingParser().convert_docling_document(_document(), tmp_path)
+
+    assert [(item["type"], item["page_idx"]) for item in content_list] == [
+        ("text", 0),
+        # Blocks without provenance keep the page of the previous block
+        ("text", 0),
+        ("equation", 2),
+        ("table", 3),
+        ("image", 3),
+        ("text", 4),
+    ]
+    assert content_list[0]["text"] == "Title on page one"
+    assert content_list[1]["text"] == "List item without provenance"
+    assert content_list[3]["table_caption"] == "Results"
+
+
+def test_pictures_are_written_and_failures_replaced(tmp_path):
+    content_list = DoclingParser().convert_docling_document(
+        _document(), tmp_path, image_workers=2
+    )
+
+    image = content_list[4]
+    assert Path(image["img_path"]) == (tmp_path / "images" / "image_0.png").resolve()
+    assert Path(image["img_path"]).read_bytes() == PNG
+    assert content_list[5] == {
+        "type": "text",
+        "text": "[Image processing failed: Broken figure]",
+        "page_idx": 4,
+    }
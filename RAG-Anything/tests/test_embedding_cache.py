@@ -0,0 +1,107 @@
+import asyncio
+import itertools
+
+import numpy as np
+import pytest
+
+from raganything import embedding_cache
+from raganything.embedding_cache import EmbeddingCache, wrap_embedding_func_with_cache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Strictly increasing time, so that eviction order is deterministic"""
+    ticks = itertools.count(1)
+    monkeypatch.setattr(embedding_cache.time, "time", lambda: float(next(ticks)))
+
+
+def _cache(tmp_path, **kwargs) -> EmbeddingCache:
+    options = {"cache_dir": str(tmp_path), "model_name": "model-a", "dimension": 4}
+    options.update(kwargs)
+    return EmbeddingCache(**options)
+
+
+def _vector(seed: int) -> np.ndarray:
+    return np.arange(4, dtype=np.float32) + seed
+
+
+def test_keys_depend_on_model_dimension_and_normalized_text(tmp_path):
+    cache = _cache(tmp_path)
+    key = cache.key_for("Hello   world")
+    assert key == cache.key_for("Hello world\n")
+    assert key != cache.key_for("hello world")
+    assert key != _cache(tmp_path, model_name="model-b").key_for("Hello world")
+    assert key != _cache(tmp_path, dimension=8).key_for("Hello world")
+    assert key != cache.key_for("Hello world", context="query")
+
+
+def test_memory_then_disk_hits(tmp_path):
+    cache = _cache(tmp_path, max_memory_items=1)
+    cache.put_many({"a": _vector(0), "b": _vector(1)})
+    # "a" fell out of the one-item LRU but is still on disk
+    found = cache.get_many(["a", "b", "c"])
+    assert set(found) == {"a", "b"}
+    np.testing.assert_array_equal(found["a"], _vector(0))
+    stats = cache.get_stats()
+    assert (stats["memory_hits"], stats["disk_hits"], stats["misses"]) == (1, 1, 1)
+    cache.close()
+
+    # A new instance reads the same database
+    reopened = _cache(tmp_path)
+    np.testing.assert_array_equal(reopened.get_many(["b"])["b"], _vector(1))
+    reopened.close()
+
+
+def test_least_recently_used_disk_entries_are_evicted(tmp_path, clock):
+    cache = _cache(tmp_path, max_memory_items=0, max_disk_entries=10)
+    for index in range(10):
+        cache.put_many({f"k{index}": _vector(index)})
+    cache.get_many(["k0"])  # k0 is now the most recently used
+    cache.put_many({"k10": _vector(10)})
+
+    # Down to 90% of the limit, oldest first
+    assert cache.get_stats()["disk_entries"] == 9
+    assert cache.evictions == 2
+    remaining = cache.get_many([f"k{index}" for index in range(11)])
+    assert set(remaining) == {"k0"} | {f"k{index}" for index in range(3, 11)}
+    cache.close()
+
+
+def test_cached_function_embeds_each_text_once(tmp_path):
+    calls = []
+
+    async def embed(texts):
+        calls.append(list(texts))
+        return [[float(len(text))] * 4 for text in texts]
+
+    cached = wrap_embedding_func_with_cache(embed, _cache(tmp_path))
+
+    async def scenario():
+        first = await cached(["one", "three", "one"])
+        second = await cached(["three", "seven"])
+        single = await cached("seven")
+        return first, second, single
+
+    first, second, single = asyncio.run(scenario())
+    assert calls == [["one", "three"], ["seven"]]
+    assert first == [[3.0] * 4, [5.0] * 4, [3.0] * 4]
+    assert second == [[5.0] * 4, [5.0] * 4]
+    assert single == [5.0] * 4
+
+
+def test_api_embedder_goes_through_the_cache(tmp_path, monkeypatch):
+    pytest.importorskip("lightrag.core")
+    from raganything import embedders
+
+    calls = []
+
+    class Coalescer:
+        async def embed_many(self, texts):
+            calls.append(texts)
+            return [[1.0, 2.0, 3.0, 4.0] for _ in texts]
+
+    monkeypatch.setattr(embedders, "get_embedding_coalescer", lambda d: Coalescer())
+    embedder = embedders.APIEmbedder(dimensions=4, cache=_cache(tmp_path))
+    asyncio.run(embedder.embed(["a", "b"]))
+    asyncio.run(embedder.embed(["a", "b"]))
+    assert calls == [["a", "b"]]
@@ -0,0 +1,139 @@
+import asyncio
+import json
+
+import numpy as np
+import pytest
+from lightrag.utils import EmbeddingFunc
+
+from raganything.embedding_quant import (
+    FORMAT_MANIFEST,
+    EmbeddingFormat,
+    FullPrecisionReranker,
+    decode_vector,
+    encode_vector,
+    load_embedding_format,
+    resolve_embedding_format,
+    truncate_embeddings,
+    wrap_embedding_func_with_truncation,
+)
+
+
+def _vector(dimension: int = 64, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).standard_normal(dimension).astype(np.float32)
+
+
+def test_float32_round_trip_is_exact():
+    vector = _vector()
+    assert np.array_equal(decode_vector(encode_vector(vector)), vector)
+
+
+@pytest.mark.parametrize(
+    "dtype, size, tolerance", [("float16", 2 * 64, 1e-2), ("int8", 4 + 64, 2e-2)]
+)
+def test_quantized_round_trip(dtype, size, tolerance):
+    vector = _vector()
+    blob = encode_vector(vector, dtype)
+    assert len(blob) == size
+
+    decoded = decode_vector(blob, dtype)
+    assert decoded.dtype == np.float32
+    assert np.max(np.abs(decoded - vector)) <= tolerance * np.max(np.abs(vector))
+    cosine = decoded @ vector / (np.linalg.norm(decoded) * np.linalg.norm(vector))
+    assert cosine > 0.999
+
+
+def test_int8_keeps_the_peak_and_zero_vectors():
+    vector = np.array([0.5, -2.0, 1.0], dtype=np.float32)
+    assert decode_vector(encode_vector(vector, "int8"), "int8")[1] == pytest.approx(
+        -2.0
+    )
+    zeros = np.zeros(3, dtype=np.float32)
+    assert np.array_equal(decode_vector(encode_vector(zeros, "int8"), "int8"), zeros)
+
+
+def test_truncation_renormalizes():
+    vectors = np.stack([_vector(seed=1), _vector(seed=2)])
+    truncated = truncate_embeddings(vectors, 16)
+    assert truncated.shape == (2, 16)
+    assert np.allclose(np.linalg.norm(truncated, axis=1), 1.0)
+    assert np.allclose(
+        truncated[0], vectors[0, :16] / np.linalg.norm(vectors[0, :16]), atol=1e-6
+    )
+    # Single vectors and vectors already small enough
+    assert truncate_embeddings(vectors[0], 16).shape == (16,)
+    assert truncate_embeddings(vectors, 128).shape == (2, 64)
+
+
+def test_wrapped_embedding_func_reports_the_reduced_dimension():
+    async def embed(texts):
+        return np.stack([_vector(seed=i) for i, _ in enumerate(texts)])
+
+    func = EmbeddingFunc(embedding_dim=64, func=embed, max_token_size=8192)
+    wrapped = wrap_embedding_func_with_truncation(func, 16)
+    assert wrapped.embedding_dim == 16
+    vectors = asyncio.run(wrapped.func(["a", "b"]))
+    assert vectors.shape == (2, 16)
+
+
+def _requested(
+    dimension: int = 256, full: int = 1536, dtype: str = "int8"
+) -> EmbeddingFormat:
+    return EmbeddingFormat(
+        model_name="text-embedding-3-small",
+        full_dimension=full,
+        dimension=dimension,
+        dtype=dtype,
+        truncation="api",
+    )
+
+
+def test_format_manifest_is_recorded_and_reloaded(tmp_path):
+    fmt = resolve_embedding_format(str(tmp_path), _requested())
+    assert fmt == _requested()
+    assert load_embedding_format(str(tmp_path)) == fmt
+    assert json.loads((tmp_path / FORMAT_MANIFEST).read_text())["dimension"] == 256
+
+    # A later run asking for another dimension keeps the recorded one
+    reloaded = resolve_embedding_format(
+        str(tmp_path), _requested(dimension=512, dtype="float16")
+    )
+    assert reloaded.dimension == 256
+    assert reloaded.dtype == "float16"
+    assert load_embedding_format(str(tmp_path)).dtype == "float16"
+
+
+def test_existing_index_without_manifest_stays_full_dimension(tmp_path):
+    (tmp_path / "vdb_chunks.json").write_text("{}")
+    fmt = resolve_embedding_format(str(tmp_path), _requested())
+    assert fmt.dimension == 1536
+    assert fmt.truncation == "none"
+    assert load_embedding_format(str(tmp_path)).dimension == 1536
+
+
+def test_new_embedding_model_replaces_the_manifest(tmp_path):
+    resolve_embedding_format(str(tmp_path), _requested())
+    fmt = resolve_embedding_format(str(tmp_path), _requested(dimension=512, full=3072))
+    assert (fmt.full_dimension, fmt.dimension) == (3072, 512)
+
+
+def test_unreadable_manifest_is_ignored(tmp_path):
+    (tmp_path / FORMAT_MANIFEST).write_text("{not json")
+    assert load_embedding_format(str(tmp_path)) is None
+
+
+def test_reranker_orders_by_full_precision_cosine():
+    vectors = {
+        "query": [1.0, 0.0, 0.0],
+        "near": [0.9, 0.1, 0.0],
+        "far": [0.0, 1.0, 0.0],
+        "middle": [0.5, 0.5, 0.0],
+    }
+
+    async def embed(texts):
+        return np.array([vectors[text] for text in texts])
+
+    reranker = FullPrecisionReranker(embed)
+    results = asyncio.run(reranker("query", ["far", "near", "middle"], top_n=2))
+    assert [result["index"] for result in results] == [1, 2]
+    assert results[0]["relevance_score"] > results[1]["relevance_score"]
+    assert asyncio.run(reranker("query", [])) == []
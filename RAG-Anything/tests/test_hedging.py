@@ -0,0 +1,66 @@
+import asyncio
+import itertools
+
+import httpx
+
+from raganything.hedging import HedgeBudget, Hedger
+from raganything.rate_limit import AIMDConcurrencyController, RateLimiter
+
+
+def test_hedged_calls_release_limiter_slots():
+    async def scenario():
+        limiter = RateLimiter(
+            "chat",
+            max_retries=0,
+            concurrency=AIMDConcurrencyController(initial=4, maximum=4),
+        )
+        hedger = Hedger("chat", HedgeBudget(ratio=1.0), min_delay=0.01, min_samples=1)
+        hedger.tracker.record(0.01)
+        attempts = itertools.count()
+
+        async def send() -> httpx.Response:
+            # Every primary is slow, every hedge is fast
+            if next(attempts) % 2 == 0:
+                await asyncio.sleep(60)
+            return httpx.Response(200)
+
+        # Far more hedged calls than the limiter has slots
+        for _ in range(20):
+            response = await hedger.call(lambda: limiter.execute(send))
+            assert response.status_code == 200
+            # The losing primary has already given its slot back
+            assert limiter.concurrency.in_flight == 0
+
+        assert hedger.hedges == 20
+        assert hedger.hedge_wins == 20
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_hedged_call_cancels_both_attempts():
+    async def scenario():
+        limiter = RateLimiter(
+            "chat",
+            max_retries=0,
+            concurrency=AIMDConcurrencyController(initial=4, maximum=4),
+        )
+        hedger = Hedger("chat", HedgeBudget(ratio=1.0), min_delay=0.01, min_samples=1)
+        hedger.tracker.record(0.01)
+
+        async def send() -> httpx.Response:
+            await asyncio.sleep(60)
+
+        async def cancelled_call() -> int:
+            try:
+                await hedger.call(lambda: limiter.execute(send))
+            except asyncio.CancelledError:
+                # Both attempts have already given their slots back
+                return limiter.concurrency.in_flight
+
+        task = asyncio.ensure_future(cancelled_call())
+        while limiter.concurrency.in_flight < 2:
+            await asyncio.sleep(0.01)
+        task.cancel()
+        assert await task == 0
+
+    asyncio.run(scenario())
@@ -0,0 +1,54 @@
+import pytest
+
+from raganything.html_parser import html_to_content_list
+
+ARTICLE = """
+<p>The harbour reopened on Monday after three weeks of dredging work.</p>
+<p>Shipping companies expect the backlog of container vessels to clear
+within a fortnight, according to the port authority.</p>
+"""
+
+
+def _page(wrapper_class: str) -> str:
+    return f"""<html><head><title>Harbour news</title></head><body>
+<div class="{wrapper_class}">
+  <div class="sidebar"><a href="/">Home</a> <a href="/news">News</a></div>
+  <div class="content">
+    <h1>Harbour reopens</h1>
+    {ARTICLE}
+  </div>
+</div>
+<div class="site-footer">(c) 2024 Bo Y te</div>
+</body></html>"""
+
+
+def _texts(html: str):
+    return [item["text"] for item in html_to_content_list(html)]
+
+
+@pytest.mark.parametrize("wrapper", ["has-sidebar", "main-menu-and-content", "share"])
+def test_boilerplate_name_on_a_page_wrapper_keeps_the_article(wrapper):
+    texts = _texts(_page(wrapper))
+    assert texts[0] == "Harbour reopens"
+    assert any(text.startswith("The harbour reopened") for text in texts)
+    assert any("container vessels" in text for text in texts)
+    # The real furniture inside the wrapper is still dropped
+    assert not any("Home" in text for text in texts)
+    assert not any("Bo Y te" in text for text in texts)
+
+
+def test_wrapper_without_headings_but_most_of_the_text_is_kept():
+    html = f'<body><div class="page-nav-layout">{ARTICLE}</div><nav>Home</nav></body>'
+    texts = _texts(html)
+    assert len(texts) == 2
+    assert "container vessels" in texts[1]
+
+
+def test_small_named_furniture_is_dropped():
+    html = (
+        '<body><div class="cookie-banner">We use cookies</div>'
+        f'<div class="breadcrumbs">Home / News</div><article>{ARTICLE}</article></body>'
+    )
+    texts = _texts(html)
+    assert len(texts) == 2
+    assert texts[0].startswith("The harbour reopened")
@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+
+from raganything.parser import HtmlParser, Parser
+
+
+class RecordingParser(Parser):
+    """Stands in for MinerU: records which files were handed over"""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    def _record(self, method, path):
+        self.calls.append((method, path.name))
+        return [{"type": "text", "text": method, "page_idx": 0}]
+
+    def parse_pdf(self, pdf_path, output_dir=None, method="auto", lang=None, **kw):
+        return self._record("parse_pdf", pdf_path)
+
+    def parse_image(self, image_path, output_dir=None, lang=None, **kw):
+        return self._record("parse_image", image_path)
+
+    def parse_office_doc(self, doc_path, output_dir=None, lang=None, **kw):
+        return self._record("parse_office_doc", doc_path)
+
+    def parse_document(self, file_path, method="auto", output_dir=None, **kw):
+        return self._record("parse_document", file_path)
+
+    def check_installation(self) -> bool:
+        return True
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    (tmp_path / "page.html").write_text("<html><body><p>Hello web</p></body></html>")
+    (tmp_path / "notes.txt").write_text("Plain notes")
+    for name in ("report.pdf", "scan.png", "slides.pptx"):
+        (tmp_path / name).write_bytes(b"binary")
+    return tmp_path
+
+
+def test_mixed_corpus_goes_to_the_fallback(corpus):
+    fallback = RecordingParser()
+    parser = HtmlParser(fallback_parser=fallback)
+
+    async def parse_all():
+        return [
+            await parser.aparse_office_doc(doc_path=corpus / "page.html"),
+            await parser.aparse_document(file_path=corpus / "notes.txt"),
+            await parser.aparse_pdf(pdf_path=corpus / "report.pdf"),
+            await parser.aparse_image(image_path=corpus / "scan.png"),
+            await parser.aparse_office_doc(doc_path=corpus / "slides.pptx"),
+        ]
+
+    html, text, *handed_over = asyncio.run(parse_all())
+    assert "Hello web" in html[0]["text"]
+    assert "Plain notes" in text[0]["text"]
+    assert [blocks[0]["text"] for blocks in handed_over] == [
+        "parse_pdf",
+        "parse_image",
+        "parse_office_doc",
+    ]
+    assert fallback.calls == [
+        ("parse_pdf", "report.pdf"),
+        ("parse_image", "scan.png"),
+        ("parse_office_doc", "slides.pptx"),
+    ]
+
+
+def test_without_fallback_other_files_are_rejected(corpus):
+    parser = HtmlParser()
+    with pytest.raises(ValueError, match="html parser only supports"):
+        parser.parse_document(corpus / "report.pdf")
+    with pytest.raises(ValueError, match="html parser only supports"):
+        asyncio.run(parser.aparse_image(image_path=corpus / "scan.png"))
+
+
+def test_text_files_follow_the_text_parser_setting(corpus):
+    fallback = RecordingParser()
+    parser = HtmlParser(text_parser="pdf", fallback_parser=fallback)
+
+    assert parser.parse_document(corpus / "notes.txt")[0]["text"] == "parse_document"
+    blocks = asyncio.run(parser.aparse_document(file_path=corpus / "notes.txt"))
+    assert blocks[0]["text"] == "parse_document"
+    assert "Hello web" in parser.parse_document(corpus / "page.html")[0]["text"]
+    assert fallback.calls == [
+        ("parse_document", "notes.txt"),
+        ("parse_document", "notes.txt"),
+    ]
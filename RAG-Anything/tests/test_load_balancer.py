@@ -0,0 +1,22 @@
+from raganything.load_balancer import Endpoint, parse_endpoints
+
+
+def test_parse_endpoints_with_weights_and_models():
+    endpoints = parse_endpoints(
+        "https://gw.example.com/v1/chat/completions|3, "
+        "http://ollama:11434/v1/chat/completions||llama3.1,"
+    )
+    assert endpoints == [
+        Endpoint(url="https://gw.example.com/v1/chat/completions", weight=3.0),
+        Endpoint(
+            url="http://ollama:11434/v1/chat/completions", weight=1.0, model="llama3.1"
+        ),
+    ]
+
+
+def test_parse_endpoints_skips_invalid_weights():
+    endpoints = parse_endpoints(
+        "http://a/v1|heavy,http://b/v1|0,http://c/v1|-1,http://d/v1|nan,"
+        "http://e/v1|inf,http://f/v1|2"
+    )
+    assert [endpoint.url for endpoint in endpoints] == ["http://f/v1"]
@@ -0,0 +1,64 @@
+import pytest
+
+from raganything.markdown_parser import markdown_to_content_list
+
+
+def _types(text: str):
+    return [item["type"] for item in markdown_to_content_list(text)]
+
+
+@pytest.mark.parametrize(
+    "line",
+    ["$$a$$ and $$b$$", "$$a$$ and more", r"\[a\] and \[b\]"],
+)
+def test_inline_math_stays_in_the_paragraph(line):
+    items = markdown_to_content_list(f"Intro\n{line}\n")
+    assert [item["type"] for item in items] == ["text"]
+    assert line in items[0]["text"]
+
+
+@pytest.mark.parametrize("line", ["$$ E = mc^2 $$", r"\[ E = mc^2 \]"])
+def test_single_line_display_math(line):
+    items = markdown_to_content_list(f"{line}\n")
+    assert [item["type"] for item in items] == ["equation"]
+    assert "E = mc^2" in items[0]["text"]
+
+
+def test_multi_line_display_math():
+    assert _types("$$\na + b\n= c\n$$\n") == ["equation"]
+
+
+def _texts(text: str):
+    return [item["text"] for item in markdown_to_content_list(text)]
+
+
+def test_yaml_front_matter_is_skipped():
+    text = (
+        "---\n"
+        "title: Quarterly report\n"
+        "tags:\n"
+        "  - finance\n"
+        "- draft\n"
+        "# a YAML comment\n"
+        "---\n"
+        "# Results\n"
+        "Revenue grew.\n"
+    )
+    assert _texts(text) == ["Results", "Revenue grew."]
+
+
+def test_leading_horizontal_rule_is_not_front_matter():
+    text = (
+        "---\n"
+        "Opening paragraph after a rule.\n"
+        "\n"
+        "The plan was simple: keep the text.\n"
+        "\n"
+        "---\n"
+        "Closing paragraph.\n"
+    )
+    assert _texts(text) == [
+        "Opening paragraph after a rule.",
+        "The plan was simple: keep the text.",
+        "Closing paragraph.",
+    ]
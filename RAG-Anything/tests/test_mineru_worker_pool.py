@@ -0,0 +1,70 @@
+import itertools
+
+import pytest
+
+from raganything import mineru_worker
+from raganything.mineru_worker import MineruWorkerPool, WorkerUnavailableError
+
+
+class FakeWorker:
+    """Stands in for a resident MinerU process"""
+
+    pids = itertools.count(1000)
+    healthy = True
+    fail_start = False
+
+    def __init__(self, env_key, startup_timeout=600.0):
+        if FakeWorker.fail_start:
+            raise WorkerUnavailableError("worker did not start")
+        self.env_key = env_key
+        self.pid = next(self.pids)
+        self.jobs_done = 0
+        self.last_used = 0.0  # long idle: health checked on the next job
+        self.stopped = False
+
+    def ping(self) -> bool:
+        return FakeWorker.healthy
+
+    def request(self, command, timeout=None, **job):
+        return {"ok": True, "output_path": job["output_dir"]}
+
+    def kill(self) -> None:
+        self.stopped = True
+
+    def stop(self) -> None:
+        self.stopped = True
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(mineru_worker, "MineruWorker", FakeWorker)
+    monkeypatch.setattr(FakeWorker, "healthy", True)
+    monkeypatch.setattr(FakeWorker, "fail_start", False)
+    pool = MineruWorkerPool(size=1, health_check_interval=1.0)
+    yield pool
+    pool.close()
+
+
+def test_unhealthy_worker_is_replaced(pool):
+    pool.run(input_path="a.pdf", output_dir="out")
+    FakeWorker.healthy = False
+    pool.run(input_path="b.pdf", output_dir="out")
+    assert pool.workers_replaced == 1
+    assert pool.workers_started == 2
+    assert pool.get_stats()["workers"] == 1
+
+
+def test_failed_replacement_is_counted_once(pool):
+    pool.run(input_path="a.pdf", output_dir="out")
+    FakeWorker.healthy = False
+    FakeWorker.fail_start = True
+    with pytest.raises(WorkerUnavailableError):
+        pool.run(input_path="b.pdf", output_dir="out")
+    # The failed worker left the pool exactly once
+    assert pool.get_stats()["workers"] == 0
+
+    FakeWorker.healthy = True
+    FakeWorker.fail_start = False
+    pool.run(input_path="c.pdf", output_dir="out")
+    assert pool.get_stats()["workers"] == 1
+    assert pool._total <= pool.size
@@ -0,0 +1,53 @@
+import asyncio
+import json
+
+import httpx
+
+from raganything.mock_server import MockOpenAIServer, MockServerConfig
+
+MESSAGES = [
+    {"role": "system", "content": "You are a helpful assistant."},
+    {"role": "user", "content": "What does the quarterly report say about revenue?"},
+]
+
+
+def _check_usage(usage):
+    assert usage["prompt_tokens"] > 0
+    assert usage["completion_tokens"] > 0
+    assert usage["total_tokens"] == usage["prompt_tokens"] + usage["completion_tokens"]
+
+
+def test_chat_usage_reports_all_token_counts():
+    async def scenario():
+        server = await MockOpenAIServer(MockServerConfig(port=0)).start()
+        try:
+            async with httpx.AsyncClient(base_url=server.base_url) as client:
+                response = await client.post(
+                    "/chat/completions",
+                    json={"model": "mock-chat", "messages": MESSAGES},
+                )
+                streamed = await client.post(
+                    "/chat/completions",
+                    json={
+                        "model": "mock-chat",
+                        "messages": MESSAGES,
+                        "stream": True,
+                        "stream_options": {"include_usage": True},
+                    },
+                )
+        finally:
+            await server.stop()
+        return response.json(), streamed.text
+
+    completion, stream = asyncio.run(scenario())
+    _check_usage(completion["usage"])
+
+    chunks = [
+        json.loads(line[len("data: ") :])
+        for line in stream.splitlines()
+        if line.startswith("data: {")
+    ]
+    # Only the last chunk carries the usage, and it matches the full answer
+    assert all("usage" not in chunk for chunk in chunks[:-1])
+    assert chunks[-1]["choices"] == []
+    assert chunks[-1]["usage"] == completion["usage"]
@@ -0,0 +1,111 @@
+import threading
+from pathlib import Path
+
+import pytest
+
+from raganything.office_converter import OfficeConversionError, OfficeConverter
+
+
+def _listener_converter(tmp_path, convert_with_listener, size=1) -> OfficeConverter:
+    converter = OfficeConverter(size=size, work_dir=str(tmp_path / "office"))
+    converter._binary = lambda: "soffice"
+    converter.use_listener = True
+    for slot in converter._all_slots:
+        slot.use_listener = True
+        slot.ensure_listener = lambda binary, timeout: None
+        slot.convert_with_listener = convert_with_listener
+    return converter
+
+
+def test_interrupted_listener_conversion_leaves_no_cache_hit(tmp_path):
+    doc = tmp_path / "report.docx"
+    doc.write_bytes(b"docx")
+
+    def fail_midway(doc_path, pdf_path, timeout):
+        pdf_path.write_bytes(b"%PDF-1.7 truncated")
+        raise OfficeConversionError("listener died")
+
+    converter = _listener_converter(tmp_path, fail_midway)
+    with pytest.raises(OfficeConversionError):
+        converter.convert(doc)
+    assert not converter.cached_pdf_path(doc).exists()
+    assert list(converter.cache_dir.iterdir()) == []
+
+
+def test_listener_conversion_is_moved_into_the_cache(tmp_path):
+    doc = tmp_path / "report.docx"
+    doc.write_bytes(b"docx")
+
+    def convert(doc_path, pdf_path, timeout):
+        pdf_path.write_bytes(b"%PDF-1.7 complete")
+
+    converter = _listener_converter(tmp_path, convert)
+    pdf_path = converter.convert(doc)
+    assert pdf_path == converter.cached_pdf_path(doc)
+    assert pdf_path.read_bytes() == b"%PDF-1.7 complete"
+    assert list(converter.cache_dir.iterdir()) == [pdf_path]
+    # Served from the cache afterwards
+    assert converter.convert(doc) == pdf_path
+    assert converter.cache_hits == 1
+
+
+def test_listener_batch_uses_one_thread_per_slot(tmp_path):
+    docs = []
+    for index in range(200):
+        doc = tmp_path / f"doc{index}.doc"
+        doc.write_bytes(b"doc")
+        docs.append(doc)
+
+    lock = threading.Lock()
+    threads_seen = set()
+
+    def convert(doc_path, pdf_path, timeout):
+        with lock:
+            threads_seen.add(threading.get_ident())
+        if doc_path.name != "doc7.doc":
+            pdf_path.write_bytes(b"%PDF-1.7")
+
+    converter = _listener_converter(tmp_path, convert, size=3)
+    before = threading.active_count()
+    results = converter.convert_batch(docs)
+    assert threading.active_count() == before
+    assert len(threads_seen) <= 3
+    assert len(results) == 199
+    stats = converter.get_stats()
+    assert (stats["conversions"], stats["failures"]) == (199, 1)
+
+    # A second pass is served from the cache
+    assert len(converter.convert_batch(docs)) == 199
+    assert converter.get_stats()["cache_hits"] == 199
+
+
+def test_cli_batch_converts_in_sessions_with_unique_stems(tmp_path):
+    docs = []
+    for folder in ("a", "b"):
+        (tmp_path / folder).mkdir()
+        for name in ("report.docx", "notes.docx"):
+            doc = tmp_path / folder / name
+            doc.write_bytes(folder.encode() + name.encode())
+            docs.append(doc)
+
+    converter = OfficeConverter(
+        size=2, use_listener=False, work_dir=str(tmp_path / "w")
+    )
+    converter._binary = lambda: "soffice"
+    sessions = []
+
+    def convert_with_cli(binary, doc_paths, out_dir, timeout):
+        sessions.append(sorted(path.stem for path in doc_paths))
+        for path in doc_paths:
+            (out_dir / f"{path.stem}.pdf").write_bytes(path.read_bytes())
+
+    for slot in converter._all_slots:
+        slot.convert_with_cli = convert_with_cli
+
+    results = converter.convert_batch(docs, session_size=50)
+    assert sorted(sessions) == [["notes", "report"], ["notes", "report"]]
+    assert {Path(p).read_bytes() for p in results.values()} == {
+        doc.read_bytes() for doc in docs
+    }
+    assert converter.get_stats()["batch_sessions"] == 2
+    assert converter.get_stats()["conversions"] == 4
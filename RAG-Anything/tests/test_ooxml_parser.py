@@ -0,0 +1,230 @@
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from raganything.ooxml_parser import UnsupportedOOXMLError, parse_ooxml_file
+
+W_NS = (
+    'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships" '
+    'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" '
+    'xmlns:wp="http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing" '
+    'xmlns:m="http://schemas.openxmlformats.org/officeDocument/2006/math"'
+)
+P_NS = (
+    'xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main" '
+    'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"'
+)
+REL_NS = 'xmlns="http://schemas.openxmlformats.org/package/2006/relationships"'
+PNG = b"\x89PNG\r\n\x1a\nfake image data"
+
+
+def _rels(*targets) -> str:
+    entries = "".join(
+        f'<Relationship Id="{r_id}" Target="{target}" Type="t"/>'
+        for r_id, target in targets
+    )
+    return f"<Relationships {REL_NS}>{entries}</Relationships>"
+
+
+def _package(path: Path, parts) -> Path:
+    with zipfile.ZipFile(path, "w") as zf:
+        for name, data in parts.items():
+            zf.writestr(name, data)
+    return path
+
+
+def _p(text: str, style: str = "", extra: str = "") -> str:
+    properties = f'<w:pPr><w:pStyle w:val="{style}"/></w:pPr>' if style else ""
+    return f"<w:p>{properties}{extra}<w:r><w:t>{text}</w:t></w:r></w:p>"
+
+
+def _tc(text: str, properties: str = "") -> str:
+    return f"<w:tc><w:tcPr>{properties}</w:tcPr>{_p(text)}</w:tc>"
+
+
+STYLES = f"""<w:styles {W_NS}>
+<w:style w:type="paragraph" w:styleId="Heading1"><w:name w:val="heading 1"/></w:style>
+<w:style w:type="paragraph" w:styleId="MyHeading"><w:name w:val="My Heading"/>
+  <w:basedOn w:val="Heading2"/></w:style>
+<w:style w:type="paragraph" w:styleId="Heading2"><w:name w:val="heading 2"/></w:style>
+<w:style w:type="paragraph" w:styleId="Caption"><w:name w:val="caption"/></w:style>
+</w:styles>"""
+
+
+def _docx(tmp_path: Path, body: str, name: str = "report.docx") -> Path:
+    return _package(
+        tmp_path / name,
+        {
+            "word/document.xml": f"<w:document {W_NS}><w:body>{body}</w:body></w:document>",
+            "word/styles.xml": STYLES,
+            "word/_rels/document.xml.rels": _rels(("rId5", "media/image1.png")),
+            "word/media/image1.png": PNG,
+        },
+    )
+
+
+def test_docx_headings_paragraphs_and_page_breaks(tmp_path):
+    body = (
+        _p("Annual report", "Heading1")
+        + _p("Intro paragraph")
+        + _p("Derived heading", "MyHeading")
+        + '<w:p><w:r><w:br w:type="page"/></w:r></w:p>'
+        + _p("Second page")
+    )
+    content_list = parse_ooxml_file(_docx(tmp_path, body), tmp_path / "out")
+    assert content_list == [
+        {"type": "text", "text": "Annual report", "text_level": 1, "page_idx": 0},
+        {"type": "text", "text": "Intro paragraph", "page_idx": 0},
+        {"type": "text", "text": "Derived heading", "text_level": 2, "page_idx": 0},
+        {"type": "text", "text": "Second page", "page_idx": 1},
+    ]
+
+
+def test_docx_rendered_page_breaks_win_over_explicit_ones(tmp_path):
+    body = (
+        _p("One")
+        + '<w:p><w:r><w:br w:type="page"/></w:r></w:p>'
+        + "<w:p><w:r><w:lastRenderedPageBreak/><w:t>Two</w:t></w:r></w:p>"
+    )
+    content_list = parse_ooxml_file(_docx(tmp_path, body), tmp_path / "out")
+    assert [item["page_idx"] for item in content_list] == [0, 1]
+
+
+def test_docx_tables_with_merged_cells_and_captions(tmp_path):
+    table = (
+        "<w:tbl>"
+        "<w:tr>"
+        + _tc("Region", '<w:vMerge w:val="restart"/>')
+        + _tc("Sales &amp; costs", '<w:gridSpan w:val="2"/>')
+        + "</w:tr><w:tr>"
+        + _tc("", "<w:vMerge/>")
+        + _tc("Q1")
+        + _tc("Q2")
+        + "</w:tr></w:tbl>"
+    )
+    body = table + _p("Table 1: Results", "Caption")
+    content_list = parse_ooxml_file(_docx(tmp_path, body), tmp_path / "out")
+    assert content_list == [
+        {
+            "type": "table",
+            "table_body": (
+                '<table><tr><td rowspan="2">Region</td>'
+                '<td colspan="2">Sales &amp; costs</td></tr>'
+                "<tr><td>Q1</td><td>Q2</td></tr></table>"
+            ),
+            "table_caption": ["Table 1: Results"],
+            "table_footnote": [],
+            "page_idx": 0,
+        }
+    ]
+
+
+def test_docx_pictures_are_extracted_once(tmp_path):
+    drawing = (
+        '<w:r><w:drawing><wp:inline><wp:docPr id="1" descr="Sales chart"/>'
+        '<a:graphic><a:graphicData uri="pic"><a:blip r:embed="rId5"/>'
+        "</a:graphicData></a:graphic></wp:inline></w:drawing></w:r>"
+    )
+    body = f"<w:p>{drawing}</w:p><w:p>{drawing}</w:p>"
+    content_list = parse_ooxml_file(_docx(tmp_path, body), tmp_path / "out")
+
+    assert len(content_list) == 1
+    image = content_list[0]
+    assert image["type"] == "image"
+    assert image["image_caption"] == ["Sales chart"]
+    assert Path(image["img_path"]).read_bytes() == PNG
+    assert (
+        Path(image["img_path"]).parent
+        == (tmp_path / "out" / "report" / "ooxml" / "images").resolve()
+    )
+
+
+def test_docx_equations_need_the_fallback(tmp_path):
+    body = "<w:p><m:oMath><m:r><m:t>x</m:t></m:r></m:oMath></w:p>"
+    with pytest.raises(UnsupportedOOXMLError, match="equations"):
+        parse_ooxml_file(_docx(tmp_path, body), tmp_path / "out")
+
+
+def test_broken_packages_need_the_fallback(tmp_path):
+    broken = tmp_path / "broken.docx"
+    broken.write_bytes(b"not a zip file")
+    with pytest.raises(UnsupportedOOXMLError):
+        parse_ooxml_file(broken, tmp_path / "out")
+
+
+def _slide(shapes: str, show: str = "") -> str:
+    return f"<p:sld {P_NS}{show}><p:cSld><p:spTree>{shapes}</p:spTree></p:cSld></p:sld>"
+
+
+def _shape(lines, placeholder: str = "") -> str:
+    nv = f'<p:nvSpPr><p:nvPr><p:ph type="{placeholder}"/></p:nvPr></p:nvSpPr>'
+    paragraphs = "".join(f"<a:p><a:r><a:t>{line}</a:t></a:r></a:p>" for line in lines)
+    return f"<p:sp>{nv if placeholder else ''}<p:txBody>{paragraphs}</p:txBody></p:sp>"
+
+
+def _pptx(tmp_path: Path, slides) -> Path:
+    ids = "".join(
+        f'<p:sldId id="{256 + i}" r:id="rId{i + 1}"/>' for i in range(len(slides))
+    )
+    parts = {
+        "ppt/presentation.xml": (
+            f"<p:presentation {P_NS}><p:sldIdLst>{ids}</p:sldIdLst></p:presentation>"
+        ),
+        "ppt/_rels/presentation.xml.rels": _rels(
+            *((f"rId{i + 1}", f"slides/slide{i + 1}.xml") for i in range(len(slides)))
+        ),
+        "ppt/media/image1.png": PNG,
+    }
+    for i, slide in enumerate(slides):
+        parts[f"ppt/slides/slide{i + 1}.xml"] = slide
+        parts[f"ppt/slides/_rels/slide{i + 1}.xml.rels"] = _rels(
+            ("rId2", "../media/image1.png")
+        )
+    return _package(tmp_path / "deck.pptx", parts)
+
+
+def test_pptx_slides_titles_tables_and_pictures(tmp_path):
+    table = (
+        '<p:graphicFrame><a:graphic><a:graphicData uri="table"><a:tbl>'
+        '<a:tr><a:tc gridSpan="2"><a:txBody><a:p><a:r><a:t>Total</a:t></a:r></a:p>'
+        '</a:txBody></a:tc><a:tc hMerge="1"/></a:tr>'
+        "</a:tbl></a:graphicData></a:graphic></p:graphicFrame>"
+    )
+    picture = (
+        '<p:pic><p:nvPicPr><p:cNvPr id="4" name="Picture" descr="Team photo"/>'
+        '</p:nvPicPr><p:blipFill><a:blip r:embed="rId2"/></p:blipFill></p:pic>'
+    )
+    slides = [
+        _slide(
+            _shape(["Quarterly review"], "title") + _shape(["Revenue up", "Costs down"])
+        ),
+        _slide(_shape(["Hidden slide"]), show=' show="0"'),
+        _slide(f"<p:grpSp>{table}{picture}</p:grpSp>"),
+    ]
+    content_list = parse_ooxml_file(_pptx(tmp_path, slides), tmp_path / "out")
+
+    assert content_list[:2] == [
+        {"type": "text", "text": "Quarterly review", "text_level": 1, "page_idx": 0},
+        {"type": "text", "text": "Revenue up\nCosts down", "page_idx": 0},
+    ]
+    table_item, image_item = content_list[2:]
+    assert table_item["table_body"] == (
+        '<table><tr><td colspan="2">Total</td></tr></table>'
+    )
+    assert table_item["page_idx"] == 2
+    assert image_item["image_caption"] == ["Team photo"]
+    assert image_item["page_idx"] == 2
+    assert Path(image_item["img_path"]).read_bytes() == PNG
+
+
+def test_pptx_charts_need_the_fallback(tmp_path):
+    chart = (
+        '<p:graphicFrame><a:graphic><a:graphicData uri="'
+        'http://schemas.openxmlformats.org/drawingml/2006/chart"/>'
+        "</a:graphic></p:graphicFrame>"
+    )
+    with pytest.raises(UnsupportedOOXMLError, match="charts"):
+        parse_ooxml_file(_pptx(tmp_path, [_slide(chart)]), tmp_path / "out")
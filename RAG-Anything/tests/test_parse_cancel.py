@@ -0,0 +1,84 @@
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+from raganything.parser import MineruParser, Parser
+
+pytestmark = pytest.mark.skipif(
+    not sys.platform.startswith("linux"), reason="POSIX sessions and /proc"
+)
+
+# A MinerU stand-in whose child outlives it unless the whole tree is killed
+FAKE_MINERU = """#!{python}
+import os, subprocess, sys, time
+out = sys.argv[sys.argv.index("-o") + 1]
+child = subprocess.Popen(["sleep", "60"])
+with open(os.path.join(out, "pids"), "w") as f:
+    f.write(f"{{os.getpid()}} {{child.pid}}")
+time.sleep(60)
+"""
+
+
+def _alive(pid: int) -> bool:
+    try:
+        with open(f"/proc/{pid}/stat") as stat:
+            return stat.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except OSError:
+        return False
+
+
+@pytest.fixture
+def fake_mineru(tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    script = bin_dir / "mineru"
+    script.write_text(FAKE_MINERU.format(python=sys.executable))
+    script.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    return tmp_path
+
+
+def test_cancelled_threaded_shard_parse_kills_every_process_tree(fake_mineru):
+    pdf_path = fake_mineru / "doc.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4")
+    output_dir = fake_mineru / "out"
+    parser = MineruParser(shard_pages=1, shard_workers=2)
+    shards = [(0, 0), (1, 1)]
+
+    async def scenario():
+        # The blocking parse in a worker thread, as for non-native async parsers
+        task = asyncio.ensure_future(
+            Parser._aparse(
+                parser,
+                "_parse_pdf_sharded",
+                pdf_path=pdf_path,
+                base_output_dir=output_dir,
+                shards=shards,
+            )
+        )
+        pid_files = [
+            parser._shard_dir(output_dir, "doc", shard) / "pids" for shard in shards
+        ]
+        deadline = time.monotonic() + 30
+        while not all(path.exists() and path.read_text() for path in pid_files):
+            assert time.monotonic() < deadline, "fake mineru did not start"
+            await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return [int(pid) for path in pid_files for pid in path.read_text().split()]
+
+    started = time.monotonic()
+    pids = asyncio.run(scenario())
+    # The shard threads ended with their killed processes, not after 60 s
+    assert time.monotonic() - started < 30
+    deadline = time.monotonic() + 5
+    while any(_alive(pid) for pid in pids) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    survivors = [pid for pid in pids if _alive(pid)]
+    for pid in survivors:
+        os.kill(pid, 9)
+    assert survivors == []
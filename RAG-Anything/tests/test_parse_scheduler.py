@@ -0,0 +1,52 @@
+import asyncio
+import subprocess
+import sys
+
+import pytest
+
+from raganything.parse_scheduler import (
+    ParseScheduler,
+    process_exited,
+    track_process,
+    wait_unreaped,
+)
+from raganything.parser import run_command_async
+
+pytestmark = pytest.mark.skipif(
+    not sys.platform.startswith("linux"), reason="reads /proc"
+)
+
+# Busy for about 0.3 s of CPU time, well under the sampling interval
+BURN = "import time\nend = time.process_time() + 0.3\nwhile time.process_time() < end: pass"
+
+
+def test_short_process_cpu_is_charged_before_reaping():
+    with ParseScheduler(workers=1) as scheduler:
+        with scheduler.slot() as stats:
+            process = subprocess.Popen([sys.executable, "-c", BURN])
+            usage = track_process(process.pid)
+            wait_unreaped(process)
+            assert process_exited(process)
+            usage.finish()
+            assert process.wait() == 0
+            cpu_seconds = stats.cpu_seconds
+    assert cpu_seconds >= 0.25
+
+
+def test_run_command_async_gets_slot_env_and_tracking():
+    lines = []
+    with ParseScheduler(workers=1, threads_per_worker=3) as scheduler:
+        with scheduler.slot():
+            code = asyncio.run(
+                run_command_async(
+                    [
+                        sys.executable,
+                        "-c",
+                        BURN + "\nimport os\nprint(os.environ['OMP_NUM_THREADS'])",
+                    ],
+                    on_stdout=lines.append,
+                )
+            )
+            assert code == 0
+            assert not scheduler.slots[0].processes
+    assert lines == ["3"]
@@ -0,0 +1,84 @@
+import json
+from pathlib import Path
+
+from raganything.parser import MineruParser
+
+
+def _write_shard(parser, base: Path, stem: str, shard, pages: int) -> None:
+    """MinerU output of a page range, with pages numbered from 0"""
+    out = parser._shard_dir(base, stem, shard) / stem / "auto"
+    (out / "images").mkdir(parents=True)
+    content_list = []
+    for page in range(pages):
+        content_list.append(
+            {"type": "text", "text": f"page {shard[0] + page}", "page_idx": page}
+        )
+    content_list.append(
+        {"type": "image", "img_path": "images/fig.jpg", "page_idx": pages - 1}
+    )
+    (out / f"{stem}_content_list.json").write_text(json.dumps(content_list))
+    (out / f"{stem}.md").write_text(f"Shard {shard[0]}\n\n![](images/fig.jpg)")
+
+
+def test_plan_shards_splits_the_requested_range(monkeypatch):
+    parser = MineruParser(shard_pages=10)
+    monkeypatch.setattr(parser, "_count_pdf_pages", lambda path: 35)
+    assert parser._plan_shards(Path("doc.pdf")) == [
+        (0, 9),
+        (10, 19),
+        (20, 29),
+        (30, 34),
+    ]
+    assert parser._plan_shards(Path("doc.pdf"), start_page=12, end_page=40) == [
+        (12, 21),
+        (22, 31),
+        (32, 34),
+    ]
+    assert parser._plan_shards(Path("doc.pdf"), start_page=30) is None
+    assert MineruParser(shard_pages=0)._plan_shards(Path("doc.pdf")) is None
+
+
+def test_merge_offsets_page_idx_by_shard_start(tmp_path):
+    parser = MineruParser(shard_pages=2)
+    shards = [(14, 15), (10, 11)]
+    for shard in shards:
+        _write_shard(parser, tmp_path, "doc", shard, pages=2)
+    # Pages 12 and 13 were read from the text layer
+    text_pages = {
+        13: [{"type": "text", "text": "page 13"}],
+        12: [{"type": "text", "text": "Heading 12", "text_level": 1}],
+    }
+
+    content_list = parser._merge_pdf_shards(
+        Path("doc.pdf"), tmp_path, shards, text_pages=text_pages
+    )
+
+    texts = [(item.get("text"), item["page_idx"]) for item in content_list]
+    assert texts == [
+        ("page 10", 0),
+        ("page 11", 1),
+        (None, 1),
+        ("Heading 12", 2),
+        ("page 13", 3),
+        ("page 14", 4),
+        ("page 15", 5),
+        (None, 5),
+    ]
+    images = [item["img_path"] for item in content_list if item["type"] == "image"]
+    assert images == [
+        str(
+            (
+                parser._shard_dir(tmp_path, "doc", shard) / "doc/auto/images/fig.jpg"
+            ).resolve()
+        )
+        for shard in sorted(shards)
+    ]
+
+    # The merged output sits where an unsharded run writes it
+    merged = tmp_path / "doc" / "auto"
+    assert json.loads((merged / "doc_content_list.json").read_text()) == content_list
+    markdown = (merged / "doc.md").read_text()
+    assert markdown.index("Shard 10") < markdown.index("# Heading 12")
+    assert markdown.index("# Heading 12") < markdown.index("Shard 14")
+    assert "](../shards/00010-00011/doc/auto/images/fig.jpg)" in markdown
+    assert "](../shards/00014-00015/doc/auto/images/fig.jpg)" in markdown
@@ -0,0 +1,114 @@
+import pytest
+
+from raganything.pdf_text_layer import (
+    _Line,
+    _lines_to_items,
+    _text_is_usable,
+    plan_mineru_ranges,
+    read_text_layer,
+    text_items_to_markdown,
+)
+
+TEXT = [{"type": "text", "text": "page text"}]
+
+
+def _pages(count: int, mineru=()):
+    return {page: None if page in mineru else TEXT for page in range(count)}
+
+
+def test_plan_groups_close_mineru_pages():
+    # Text pages in gaps of up to 3 pages join the surrounding MinerU range
+    assert plan_mineru_ranges(_pages(40, mineru={2, 5, 6, 20, 30})) == [
+        (2, 6),
+        (20, 20),
+        (30, 30),
+    ]
+
+
+def test_plan_without_mineru_pages():
+    assert plan_mineru_ranges(_pages(10)) == []
+
+
+def test_plan_prefers_one_run_for_scattered_pages():
+    # More than 4 runs would each load the models again
+    assert plan_mineru_ranges(_pages(50, mineru={0, 10, 20, 30, 40})) is None
+
+
+def test_plan_prefers_one_run_when_most_pages_need_mineru():
+    assert plan_mineru_ranges(_pages(10, mineru=range(6))) is None
+    assert plan_mineru_ranges(_pages(10, mineru=range(5))) == [(0, 4)]
+
+
+def test_broken_text_layers_are_left_to_mineru():
+    assert _text_is_usable("Plain words, numbers 123 and punctuation.")
+    assert _text_is_usable("")
+    assert not _text_is_usable("��� broken font")
+    assert not _text_is_usable("∑ ∫ ≤ ≥ x + y = z")
+
+
+def _line(text, size=10.0, bottom=700.0, right=500.0) -> _Line:
+    return _Line(text, size, (72.0, bottom, 0.0, 0.0), right)
+
+
+def test_lines_become_headings_and_paragraphs():
+    lines = [
+        _line("Chapter One", size=20, bottom=750),
+        _line("Methods", size=13, bottom=720),
+        _line("The first paragraph starts here and is long", bottom=700),
+        _line("enough to wrap onto a second line with a hy-", bottom=688),
+        _line("phenated word at the end.", bottom=676, right=200),
+        _line("A second paragraph follows directly.", bottom=664),
+        _line("After a wide gap", bottom=620),
+        _line("12", bottom=50),
+    ]
+    assert _lines_to_items(lines) == [
+        {"type": "text", "text": "Chapter One", "text_level": 1},
+        {"type": "text", "text": "Methods", "text_level": 2},
+        {
+            "type": "text",
+            "text": (
+                "The first paragraph starts here and is long enough to wrap onto "
+                "a second line with a hyphenated word at the end."
+            ),
+        },
+        {"type": "text", "text": "A second paragraph follows directly."},
+        {"type": "text", "text": "After a wide gap"},
+    ]
+
+
+def test_markdown_of_text_items():
+    items = [
+        {"type": "text", "text": "Title", "text_level": 1},
+        {"type": "text", "text": "Body"},
+    ]
+    assert text_items_to_markdown(items) == "# Title\n\nBody"
+
+
+def test_read_text_layer_of_a_generated_pdf(tmp_path):
+    pytest.importorskip("pypdfium2")
+    canvas = pytest.importorskip("reportlab.pdfgen.canvas")
+
+    path = tmp_path / "doc.pdf"
+    pdf = canvas.Canvas(str(path))
+    pdf.setFont("Helvetica-Bold", 24)
+    pdf.drawString(72, 750, "Introduction")
+    pdf.setFont("Helvetica", 11)
+    for i, y in enumerate(range(720, 640, -14)):
+        pdf.drawString(72, y, f"Body line {i} of the first page with plain text")
+    pdf.showPage()
+    # A ruled table is left to MinerU
+    pdf.setFont("Helvetica", 11)
+    for row in range(8):
+        for column in range(4):
+            pdf.rect(72 + column * 110, 600 - row * 20, 110, 20)
+            pdf.drawString(76 + column * 110, 606 - row * 20, f"r{row}c{column}")
+    pdf.showPage()
+    pdf.save()
+
+    pages = read_text_layer(path)
+    assert set(pages) == {0, 1}
+    assert pages[0][0] == {"type": "text", "text": "Introduction", "text_level": 1}
+    assert pages[0][1]["text"].startswith("Body line 0 of the first page")
+    assert pages[1] is None
+
+    assert set(read_text_layer(path, start_page=1, end_page=5)) == {1}
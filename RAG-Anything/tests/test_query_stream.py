@@ -0,0 +1,48 @@
+import asyncio
+import logging
+
+from raganything.query import QueryMixin
+
+
+class StreamingLightRAG:
+    def __init__(self):
+        self.closed = False
+
+    async def aquery(self, query, param=None, system_prompt=None):
+        async def tokens():
+            try:
+                for token in ("The", " answer", " is", " 42"):
+                    yield token
+            finally:
+                self.closed = True
+
+        return tokens()
+
+
+class StreamingRAG(QueryMixin):
+    def __init__(self):
+        self.lightrag = StreamingLightRAG()
+        self.logger = logging.getLogger(__name__)
+
+
+def test_stream_consumed_in_full():
+    rag = StreamingRAG()
+
+    async def collect():
+        return [token async for token in rag.aquery_stream("question", mode="naive")]
+
+    assert "".join(asyncio.run(collect())) == "The answer is 42"
+    assert rag.lightrag.closed
+
+
+def test_stream_closed_when_consumer_stops_early():
+    rag = StreamingRAG()
+
+    async def first_token():
+        stream = rag.aquery_stream("question", mode="naive")
+        token = await stream.__anext__()
+        await stream.aclose()
+        # Closed right away, not when the event loop shuts down
+        return token, rag.lightrag.closed
+
+    assert asyncio.run(first_token()) == ("The", True)
@@ -0,0 +1,77 @@
+import asyncio
+
+import httpx
+import pytest
+
+from raganything.rate_limit import AIMDConcurrencyController, RateLimiter
+
+
+def _limiter() -> RateLimiter:
+    return RateLimiter(
+        "chat",
+        max_retries=0,
+        concurrency=AIMDConcurrencyController(initial=2, maximum=2),
+    )
+
+
+def test_cancelled_execute_releases_slot():
+    async def scenario():
+        limiter = _limiter()
+        started = asyncio.Event()
+
+        async def send() -> httpx.Response:
+            started.set()
+            await asyncio.sleep(60)
+
+        for _ in range(3):
+            started.clear()
+            task = asyncio.ensure_future(limiter.execute(send))
+            await started.wait()
+            assert limiter.concurrency.in_flight == 1
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            assert limiter.concurrency.in_flight == 0
+
+        # The limiter still admits requests after the cancellations
+        async def ok() -> httpx.Response:
+            return httpx.Response(200)
+
+        response = await asyncio.wait_for(limiter.execute(ok), timeout=5)
+        assert response.status_code == 200
+        assert limiter.concurrency.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_non_transport_error_releases_slot():
+    async def scenario():
+        limiter = _limiter()
+        decreases = limiter.concurrency.decreases
+
+        async def send() -> httpx.Response:
+            raise RuntimeError("quota store unavailable")
+
+        for _ in range(3):
+            with pytest.raises(RuntimeError):
+                await limiter.execute(send)
+        assert limiter.concurrency.in_flight == 0
+        # Not a congestion signal
+        assert limiter.concurrency.decreases == decreases
+
+    asyncio.run(scenario())
+
+
+def test_transport_error_releases_slot_and_backs_off():
+    async def scenario():
+        limiter = _limiter()
+
+        async def send() -> httpx.Response:
+            raise httpx.ConnectError("refused")
+
+        with pytest.raises(httpx.ConnectError):
+            await limiter.execute(send)
+        assert limiter.concurrency.in_flight == 0
+        assert limiter.concurrency.decreases == 1
+
+    asyncio.run(scenario())
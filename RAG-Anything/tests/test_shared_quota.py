@@ -0,0 +1,130 @@
+import asyncio
+
+import pytest
+
+from raganything import shared_quota
+from raganything.embedding_batcher import estimate_tokens
+from raganything.shared_quota import (
+    QuotaLimit,
+    SharedQuota,
+    estimate_call_tokens,
+    parse_quota_limits,
+    wrap_func_with_quota,
+)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Wall clock of the ledger, moved by hand"""
+    now = [1000.0]
+    monkeypatch.setattr(shared_quota.time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    quotas = []
+
+    def open_ledger(**kwargs) -> SharedQuota:
+        quota = SharedQuota(str(tmp_path / "quota.sqlite"), **kwargs)
+        quotas.append(quota)
+        return quota
+
+    yield open_ledger
+    for quota in quotas:
+        quota.close()
+
+
+def test_parse_quota_limits_skips_invalid_entries():
+    limits = parse_quota_limits("gpt-4o=500:30000, small=:1000, bad=x:1, noequals")
+    assert limits == {
+        "gpt-4o": QuotaLimit(rpm=500, tpm=30000),
+        "small": QuotaLimit(rpm=0, tpm=1000),
+    }
+
+
+def test_calls_leave_the_window(clock, ledger):
+    quota = ledger()
+    limit = QuotaLimit(rpm=2)
+    assert quota._try_acquire("m", 10, limit)[0] is not None
+    clock[0] += 30
+    assert quota._try_acquire("m", 10, limit)[0] is not None
+    assert quota._try_acquire("m", 10, limit)[0] is None
+
+    clock[0] += 31
+    assert quota.get_usage("m") == {"requests": 1, "tokens": 10}
+    assert quota._try_acquire("m", 10, limit)[0] is not None
+
+
+def test_wait_until_enough_calls_leave_the_window(clock, ledger):
+    quota = ledger()
+    limit = QuotaLimit(tpm=100)
+    for tokens in (40, 40):
+        assert quota._try_acquire("m", tokens, limit)[0] is not None
+        clock[0] += 10
+
+    # 80 used, 50 more need the first 40 to expire: 60 s after the first call
+    row_id, wait = quota._try_acquire("m", 50, limit)
+    assert row_id is None
+    assert wait == pytest.approx(40.0)
+
+    # 90 more need both calls to expire
+    row_id, wait = quota._try_acquire("m", 90, limit)
+    assert row_id is None
+    assert wait == pytest.approx(50.0)
+
+    # A call larger than the whole quota only waits for an empty window
+    clock[0] += 51
+    assert quota._try_acquire("m", 500, limit)[0] is not None
+
+
+def test_two_connections_share_one_ledger(clock, ledger):
+    first, second = ledger(), ledger()
+    limit = QuotaLimit(rpm=3, tpm=1000)
+    for quota in (first, second, first):
+        assert quota._try_acquire("m", 100, limit)[0] is not None
+    assert second._try_acquire("m", 100, limit)[0] is None
+    assert second.get_usage("m") == {"requests": 3, "tokens": 300}
+    # Other models have their own budget
+    assert second._try_acquire("other", 100, limit)[0] is not None
+
+
+def test_settle_replaces_the_estimate(clock, ledger):
+    first, second = ledger(), ledger()
+    row_id = asyncio.run(first.acquire("m", 500, QuotaLimit(tpm=1000)))
+    first.settle(row_id, 120)
+    assert second.get_usage("m")["tokens"] == 120
+
+
+def test_unlimited_models_are_not_recorded(clock, ledger):
+    quota = ledger(limits={"limited": QuotaLimit(rpm=1)})
+    assert asyncio.run(quota.acquire("free", 100)) is None
+    assert quota.get_usage("free") == {"requests": 0, "tokens": 0}
+    assert asyncio.run(quota.acquire("limited", 100)) is not None
+
+
+def test_model_func_reserves_output_and_settles_with_text(clock, ledger):
+    quota = ledger()
+    reserved = []
+
+    async def model_func(prompt, system_prompt=None, **kwargs):
+        reserved.append(quota.get_usage("m")["tokens"])
+        return "word " * 40
+
+    wrapped = wrap_func_with_quota(model_func, quota, "m", QuotaLimit(tpm=100000))
+    result = asyncio.run(wrapped("Describe the table", max_tokens=4000))
+
+    prompt_tokens = estimate_call_tokens(("Describe the table",), {})
+    assert reserved == [prompt_tokens + 4000]
+    assert quota.get_usage("m")["tokens"] == prompt_tokens + estimate_tokens(result)
+
+
+def test_model_func_settles_with_reported_usage(clock, ledger):
+    quota = ledger()
+
+    async def model_func(prompt, **kwargs):
+        return {"content": "ok", "usage": {"total_tokens": 321}}
+
+    wrapped = wrap_func_with_quota(model_func, quota, "m", QuotaLimit(rpm=10))
+    asyncio.run(wrapped("hello"))
+    assert quota.get_usage("m") == {"requests": 1, "tokens": 321}
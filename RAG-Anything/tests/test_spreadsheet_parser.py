@@ -0,0 +1,174 @@
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from raganything.spreadsheet_parser import (
+    UnsupportedSpreadsheetError,
+    parse_spreadsheet_file,
+)
+
+S_NS = (
+    'xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"'
+)
+REL_NS = 'xmlns="http://schemas.openxmlformats.org/package/2006/relationships"'
+
+STYLES = f"""<styleSheet {S_NS}>
+<numFmts><numFmt numFmtId="164" formatCode="yyyy\\-mm\\-dd"/>
+<numFmt numFmtId="165" formatCode="&quot;day &quot;0"/></numFmts>
+<cellXfs><xf numFmtId="0"/><xf numFmtId="14"/><xf numFmtId="164"/>
+<xf numFmtId="165"/><xf numFmtId="22"/></cellXfs>
+</styleSheet>"""
+
+
+def _cell(ref: str, value) -> str:
+    if isinstance(value, tuple):
+        number, style = value
+        return f'<c r="{ref}" s="{style}"><v>{number}</v></c>'
+    if isinstance(value, bool):
+        return f'<c r="{ref}" t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float)):
+        return f'<c r="{ref}"><v>{value}</v></c>'
+    return f'<c r="{ref}" t="inlineStr"><is><t>{value}</t></is></c>'
+
+
+def _sheet(rows) -> str:
+    xml_rows = []
+    for number, cells in rows:
+        xml_cells = "".join(
+            _cell(f"{column}{number}", value) for column, value in cells.items()
+        )
+        xml_rows.append(f'<row r="{number}">{xml_cells}</row>')
+    return f"<worksheet {S_NS}><sheetData>{''.join(xml_rows)}</sheetData></worksheet>"
+
+
+def _xlsx(tmp_path: Path, sheets, shared_strings=(), date1904=False) -> Path:
+    entries = "".join(
+        f'<sheet name="{name}" sheetId="{i + 1}" r:id="rId{i + 1}" state="{state}"/>'
+        for i, (name, state, _) in enumerate(sheets)
+    )
+    properties = '<workbookPr date1904="1"/>' if date1904 else ""
+    parts = {
+        "xl/workbook.xml": (
+            f"<workbook {S_NS}>{properties}<sheets>{entries}</sheets></workbook>"
+        ),
+        "xl/_rels/workbook.xml.rels": (
+            f"<Relationships {REL_NS}>"
+            + "".join(
+                f'<Relationship Id="rId{i + 1}" Type="t" '
+                f'Target="worksheets/sheet{i + 1}.xml"/>'
+                for i in range(len(sheets))
+            )
+            + "</Relationships>"
+        ),
+        "xl/styles.xml": STYLES,
+        "xl/sharedStrings.xml": (
+            f"<sst {S_NS}>"
+            + "".join(f"<si><t>{text}</t></si>" for text in shared_strings)
+            + "</sst>"
+        ),
+    }
+    for i, (_, _, rows) in enumerate(sheets):
+        parts[f"xl/worksheets/sheet{i + 1}.xml"] = (
+            rows if isinstance(rows, str) else _sheet(rows)
+        )
+    path = tmp_path / "book.xlsx"
+    with zipfile.ZipFile(path, "w") as zf:
+        for name, data in parts.items():
+            zf.writestr(name, data)
+    return path
+
+
+def test_sheets_become_pipe_tables(tmp_path):
+    rows = [
+        (1, {"A": "Name", "B": "Amount", "C": "Paid"}),
+        (2, {"A": "Widget | large", "B": 12.5, "C": True}),
+        (4, {"A": "Gadget", "B": 3}),
+    ]
+    hidden = [(1, {"A": "secret"}), (2, {"A": "value"})]
+    path = _xlsx(
+        tmp_path, [("Orders", "visible", rows), ("Internal", "hidden", hidden)]
+    )
+    assert parse_spreadsheet_file(path) == [
+        {
+            "type": "table",
+            "table_body": (
+                "| Name | Amount | Paid |\n"
+                "|---|---|---|\n"
+                "| Widget \\| large | 12.5 | TRUE |\n"
+                "| Gadget | 3 |  |"
+            ),
+            "table_caption": ["Sheet Orders, rows 2-4"],
+            "table_footnote": [],
+            "page_idx": 0,
+        }
+    ]
+
+
+def test_large_sheets_are_blocked_with_repeated_headers(tmp_path):
+    rows = [(1, {"B": "Id", "C": "Value"})] + [
+        (number, {"B": number - 1, "C": f"v{number - 1}"}) for number in range(2, 8)
+    ]
+    content_list = parse_spreadsheet_file(
+        _xlsx(tmp_path, [("Data", "visible", rows)]), rows_per_block=4
+    )
+
+    assert [item["table_caption"] for item in content_list] == [
+        ["Sheet Data, rows 2-5"],
+        ["Sheet Data, rows 6-7"],
+    ]
+    assert [item["page_idx"] for item in content_list] == [0, 1]
+    for item in content_list:
+        # Leading empty columns are dropped and every block has the header
+        assert item["table_body"].startswith("| Id | Value |\n|---|---|\n")
+    assert content_list[1]["table_body"].endswith("| 5 | v5 |\n| 6 | v6 |")
+
+
+def test_dates_follow_cell_formats(tmp_path):
+    rows = [
+        (1, {"A": "Built-in", "B": "Custom", "C": "Literal text", "D": "Date time"}),
+        (2, {"A": (45292, 1), "B": (45293, 2), "C": (7, 3), "D": (45292.75, 4)}),
+    ]
+    content_list = parse_spreadsheet_file(_xlsx(tmp_path, [("Dates", "visible", rows)]))
+    assert content_list[0]["table_body"].splitlines()[-1] == (
+        "| 2024-01-01 | 2024-01-02 | 7 | 2024-01-01 18:00:00 |"
+    )
+
+
+def test_1904_date_system(tmp_path):
+    rows = [(1, {"A": "Day"}), (2, {"A": (0, 1)})]
+    content_list = parse_spreadsheet_file(
+        _xlsx(tmp_path, [("Mac", "visible", rows)], date1904=True)
+    )
+    assert content_list[0]["table_body"].endswith("| 00:00:00 |")
+
+    rows = [(1, {"A": "Day"}), (2, {"A": (366, 1)})]
+    content_list = parse_spreadsheet_file(
+        _xlsx(tmp_path, [("Mac", "visible", rows)], date1904=True)
+    )
+    assert content_list[0]["table_body"].endswith("| 1905-01-01 |")
+
+
+def test_shared_strings(tmp_path):
+    sheet = (
+        f"<worksheet {S_NS}><sheetData>"
+        '<row r="1"><c r="A1" t="s"><v>0</v></c></row>'
+        '<row r="2"><c r="A2" t="s"><v>1</v></c></row>'
+        "</sheetData></worksheet>"
+    )
+    path = _xlsx(
+        tmp_path, [("S", "visible", sheet)], shared_strings=("Header", "Row one")
+    )
+    assert parse_spreadsheet_file(path)[0]["table_body"] == (
+        "| Header |\n|---|\n| Row one |"
+    )
+
+
+def test_unreadable_workbooks_need_the_fallback(tmp_path):
+    broken = tmp_path / "broken.xlsx"
+    broken.write_bytes(b"not a zip file")
+    with pytest.raises(UnsupportedSpreadsheetError):
+        parse_spreadsheet_file(broken)
+    with pytest.raises(UnsupportedSpreadsheetError):
+        parse_spreadsheet_file(tmp_path / "legacy.ods")
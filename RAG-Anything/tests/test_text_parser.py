@@ -0,0 +1,64 @@
+import codecs
+
+import pytest
+
+from raganything.text_parser import (
+    decode_text,
+    parse_text_file,
+    split_long_paragraph,
+    text_to_content_list,
+)
+
+
+@pytest.mark.parametrize(
+    "data, encoding",
+    [
+        ("naïve café".encode("utf-8"), "utf-8"),
+        (codecs.BOM_UTF8 + "naïve café".encode("utf-8"), "utf-8-sig"),
+        ("naïve café".encode("utf-16"), "utf-16"),
+        ("naïve café".encode("utf-32"), "utf-32"),
+    ],
+)
+def test_decode_detects_unicode_encodings(data, encoding):
+    assert decode_text(data) == ("naïve café", encoding)
+
+
+def test_decode_falls_back_for_legacy_encodings():
+    text, encoding = decode_text("Grüße aus Köln, déjà vu".encode("cp1252"))
+    assert encoding != "utf-8"
+    assert "Köln" in text
+
+
+def test_one_block_per_paragraph():
+    content_list = text_to_content_list("First line\nsame paragraph\n\n \nSecond\n")
+    assert content_list == [
+        {"type": "text", "text": "First line\nsame paragraph", "page_idx": 0},
+        {"type": "text", "text": "Second", "page_idx": 0},
+    ]
+
+
+def test_pages_from_character_windows_and_form_feeds():
+    paragraphs = "\n\n".join(["x" * 40] * 5)
+    content_list = text_to_content_list(paragraphs + "\fafter break", page_chars=100)
+    assert [item["page_idx"] for item in content_list] == [0, 0, 1, 1, 2, 3]
+    assert content_list[-1]["text"] == "after break"
+
+
+def test_long_paragraphs_are_cut_at_lines_then_spaces():
+    paragraph = "short line\n" + " ".join(["word"] * 30)
+    blocks = list(split_long_paragraph(paragraph, 50))
+    assert all(len(block) <= 50 for block in blocks)
+    assert " ".join(" ".join(blocks).split()) == " ".join(paragraph.split())
+    assert blocks[0] == "short line"
+
+
+def test_parse_text_file_normalizes_newlines(tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_bytes(b"Title\r\n\r\nBody line one\rBody line two\r\n")
+    assert [item["text"] for item in parse_text_file(path)] == [
+        "Title",
+        "Body line one\nBody line two",
+    ]
+
+    with pytest.raises(FileNotFoundError):
+        parse_text_file(tmp_path / "missing.txt")